@@ -2,7 +2,7 @@
 from PyInstaller.utils.hooks import collect_data_files
 from PyInstaller.utils.hooks import collect_submodules
 
-datas = [('assets', 'assets'), ('locales', 'locales')]
+datas = [('assets', 'assets'), ('locales', 'locales'), ('schemas', 'schemas')]
 hiddenimports = ['qfluentwidgets', 'qfluentwidgets.widgets', 'qfluentwidgets.components', 'qfluentwidgets.common', 'qfluentwidgets.window']
 datas += collect_data_files('qfluentwidgets')
 hiddenimports += collect_submodules('qfluentwidgets')
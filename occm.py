@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCCM 命令行工具 - 无界面批量操作 OpenCode / Oh My OpenCode 配置
+
+只依赖 occm_core，不加载 PyQt5，适合脚本、CI 与远程主机使用。
+
+用法示例:
+    python occm.py validate
+    python occm.py export claude --provider my-relay --model claude-sonnet-4
+    python occm.py group list --presets
+    python occm.py group apply <group_id>
+    python occm.py import --source ccswitch --overwrite
+    python occm.py backup
+    python occm.py backup --list
+    python occm.py restore <backup_file>
+
+退出码: 0 成功, 1 操作失败或验证未通过, 2 参数错误
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from occm_core import (
+    AgentGroupManager,
+    BackupManager,
+    CLIExportManager,
+    ConfigManager,
+    ConfigPaths,
+    ConfigTransaction,
+    ConfigTransactionError,
+    ConfigValidator,
+    ImportService,
+)
+
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+
+CLI_TARGETS = ["claude", "codex", "gemini"]
+IMPORT_SOURCES = ["claude", "claude_providers", "codex", "gemini", "ccswitch"]
+
+
+def _print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+
+
+def _error(message: str) -> None:
+    print(f"错误: {message}", file=sys.stderr)
+
+
+def _load_config(path: Path) -> Dict:
+    """读取配置文件，不存在或解析失败时返回空字典"""
+    if not path.exists():
+        return {}
+    return ConfigManager.load_json(path) or {}
+
+
+def _save_config(path: Path, data: Dict) -> bool:
+    """保存配置文件（保存前自动备份）"""
+    success, jsonc_warning = ConfigManager.save_json(
+        path, data, backup_manager=BackupManager()
+    )
+    if jsonc_warning:
+        print(f"注意: {path} 原有的 JSONC 注释已丢失，已自动备份原文件")
+    return success
+
+
+def _group_manager() -> AgentGroupManager:
+    return AgentGroupManager(ConfigPaths.get_config_base_dir())
+
+
+# ==================== validate ====================
+def cmd_validate(args) -> int:
+    targets = []
+    if args.target in ("opencode", "all"):
+        targets.append(
+            (
+                ConfigPaths.get_opencode_config(),
+                ConfigValidator.validate_opencode_config,
+            )
+        )
+    if args.target in ("omo", "all"):
+        targets.append(
+            (
+                ConfigPaths.get_ohmyopencode_config(),
+                ConfigValidator.validate_ohmyopencode_config,
+            )
+        )
+
+    report = {}
+    has_error = False
+    for path, validate in targets:
+        if not path.exists():
+            # 未安装的配置跳过，不视为失败
+            report[str(path)] = None
+            continue
+        issues = validate(ConfigManager.load_json(path) or {})
+        report[str(path)] = issues
+        if any(issue["level"] == "error" for issue in issues):
+            has_error = True
+
+    if args.json:
+        _print_json(report)
+    else:
+        for path, issues in report.items():
+            print(f"[{path}]")
+            if issues is None:
+                print("  (文件不存在，已跳过)")
+                continue
+            for issue in issues:
+                pointer = issue.get("pointer") or "(root)"
+                print(f"  {issue['level']:<7} {pointer}: {issue['message']}")
+            print(ConfigValidator.get_issues_summary(issues))
+    return EXIT_FAILURE if has_error else EXIT_OK
+
+
+# ==================== export ====================
+def cmd_export(args) -> int:
+    config = _load_config(ConfigPaths.get_opencode_config())
+    providers = config.get("provider", {})
+    provider = providers.get(args.provider)
+    if not isinstance(provider, dict):
+        _error(f'Provider "{args.provider}" 不存在')
+        if providers:
+            print("可用 Provider: " + ", ".join(providers), file=sys.stderr)
+        return EXIT_FAILURE
+
+    export_provider = dict(provider)
+    if args.base_url:
+        export_provider["baseURL"] = args.base_url
+
+    model = args.model or next(iter(provider.get("models", {}) or {}), "")
+    targets = CLI_TARGETS if args.cli == "all" else [args.cli]
+    result = CLIExportManager().batch_export(
+        export_provider, {cli_type: model for cli_type in targets}, targets
+    )
+
+    for item in result.results:
+        if item.success:
+            files = ", ".join(str(p) for p in item.files_written)
+            print(f"✓ {item.cli_type}: {files}")
+            if item.backup_path:
+                print(f"  备份: {item.backup_path}")
+        else:
+            print(f"✗ {item.cli_type}: {item.error_message}")
+    return EXIT_OK if result.all_success else EXIT_FAILURE
+
+
+# ==================== group ====================
+def cmd_group_list(args) -> int:
+    groups = _group_manager().list_groups(include_presets=args.presets)
+    if args.json:
+        _print_json(groups)
+        return EXIT_OK
+    if not groups:
+        print("暂无分组（使用 --presets 查看预设模板）")
+    for group in groups:
+        print(f"{group['id']:<24} [{group.get('type', 'custom')}] {group['name']}")
+    return EXIT_OK
+
+
+def cmd_group_apply(args) -> int:
+    manager = _group_manager()
+    if manager.find_group(args.group_id) is None:
+        _error(f'分组 "{args.group_id}" 不存在')
+        return EXIT_FAILURE
+
+    opencode_path = ConfigPaths.get_opencode_config()
+    omo_path = ConfigPaths.get_ohmyopencode_config()
+    # 只有在 Oh My OpenCode 已安装时才修改其配置
+    plan = manager.plan_group(
+        args.group_id,
+        _load_config(opencode_path),
+        _load_config(omo_path) if omo_path.exists() else None,
+    )
+
+    if args.dry_run:
+        _print_json(
+            {"opencode": plan.opencode_config, "oh-my-opencode": plan.omo_config}
+        )
+        return EXIT_OK
+
+    for change in plan.changes:
+        print(change.describe())
+    if not plan.changes:
+        print("配置已与分组一致，无需修改")
+    try:
+        manager.commit_plan(
+            plan, opencode_path, omo_path, backup_manager=BackupManager()
+        )
+    except ConfigTransactionError as e:
+        _error(str(e))
+        return EXIT_FAILURE
+    print(f'已应用分组 "{args.group_id}"')
+    return EXIT_OK
+
+
+# ==================== import ====================
+def cmd_import(args) -> int:
+    service = ImportService()
+    scanned = service.scan_external_configs()
+    sources = [
+        (name, info)
+        for name, info in scanned.items()
+        if info.get("data") and (not args.source or info.get("type") == args.source)
+    ]
+    if not sources:
+        _error("未找到可导入的外部配置")
+        return EXIT_FAILURE
+
+    config_path = ConfigPaths.get_opencode_config()
+    config = _load_config(config_path)
+    added: List[str] = []
+    skipped: List[str] = []
+    for name, info in sources:
+        converted = service.convert_to_opencode(info["type"], info["data"])
+        if not converted:
+            print(f"跳过 {name}: 无法转换格式")
+            continue
+        for provider_name, provider_data in converted.get("provider", {}).items():
+            if provider_name in config.get("provider", {}) and not args.overwrite:
+                skipped.append(provider_name)
+                continue
+            config.setdefault("provider", {})[provider_name] = provider_data
+            added.append(provider_name)
+        for tool, perm in converted.get("permission", {}).items():
+            config.setdefault("permission", {})[tool] = perm
+        print(f"已读取 {name}: {info['path']}")
+
+    if added:
+        print("导入 Provider: " + ", ".join(added))
+    if skipped:
+        print("已存在，跳过 (使用 --overwrite 覆盖): " + ", ".join(skipped))
+
+    if args.dry_run:
+        _print_json(config)
+        return EXIT_OK
+    return EXIT_OK if _save_config(config_path, config) else EXIT_FAILURE
+
+
+# ==================== backup / restore ====================
+def _config_targets(target: str) -> List[Path]:
+    paths = []
+    if target in ("opencode", "all"):
+        paths.append(ConfigPaths.get_opencode_config())
+    if target in ("omo", "all"):
+        paths.append(ConfigPaths.get_ohmyopencode_config())
+    return paths
+
+
+def cmd_backup(args) -> int:
+    manager = BackupManager()
+    if args.list:
+        backups = []
+        for path in _config_targets(args.target):
+            backups.extend(manager.list_backups(path.stem))
+        backups.sort(key=lambda x: x["timestamp"], reverse=True)
+        if args.json:
+            _print_json(backups)
+        else:
+            for backup in backups:
+                print(f"{backup['display']:<60} {backup['path']}")
+        return EXIT_OK
+
+    failed = False
+    for path in _config_targets(args.target):
+        if not path.exists():
+            continue
+        backup_path = manager.backup(path, tag=args.tag)
+        if backup_path:
+            print(f"✓ {path} -> {backup_path}")
+        else:
+            failed = True
+    return EXIT_FAILURE if failed else EXIT_OK
+
+
+def _resolve_restore_target(backup_path: Path, target: Optional[str]) -> Optional[Path]:
+    """根据 --target 或备份文件名（<配置名>.<时间戳>.<标签>.bak）确定恢复目标"""
+    candidates = _config_targets(target or "all")
+    if target:
+        return candidates[0]
+    name = backup_path.name.split(".", 1)[0]
+    for path in candidates:
+        if path.stem == name:
+            return path
+    return None
+
+
+def cmd_restore(args) -> int:
+    manager = BackupManager()
+    backup_path = Path(args.backup)
+    if not backup_path.exists():
+        backup_path = manager.backup_dir / args.backup
+    if not backup_path.exists():
+        _error(f"备份文件不存在: {args.backup}")
+        return EXIT_FAILURE
+
+    target_path = _resolve_restore_target(backup_path, args.target)
+    if target_path is None:
+        _error("无法从文件名判断恢复目标，请使用 --target 指定")
+        return EXIT_USAGE
+    if not manager.restore(backup_path, target_path):
+        return EXIT_FAILURE
+    print(f"已恢复 {target_path} (原文件已备份)")
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="occm", description="OpenCode Config Manager 命令行工具"
+    )
+    sub = parser.add_subparsers(dest="command", metavar="<command>")
+    sub.required = True
+
+    p = sub.add_parser("validate", help="验证配置文件格式")
+    p.add_argument("--target", choices=["opencode", "omo", "all"], default="all")
+    p.add_argument("--json", action="store_true", help="以 JSON 输出问题列表")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("export", help="导出 Provider 到 CLI 工具配置")
+    p.add_argument("cli", choices=CLI_TARGETS + ["all"])
+    p.add_argument("--provider", required=True, help="OpenCode 中的 Provider 名称")
+    p.add_argument("--model", help="默认模型 ID（默认取 Provider 的第一个模型）")
+    p.add_argument("--base-url", help="覆盖导出的 API 地址")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("group", help="Agent 分组管理")
+    group_sub = p.add_subparsers(dest="group_command", metavar="<action>")
+    group_sub.required = True
+    gp = group_sub.add_parser("list", help="列出分组")
+    gp.add_argument("--presets", action="store_true", help="包含预设模板")
+    gp.add_argument("--json", action="store_true")
+    gp.set_defaults(func=cmd_group_list)
+    gp = group_sub.add_parser("apply", help="应用分组到配置")
+    gp.add_argument("group_id")
+    gp.add_argument("--dry-run", action="store_true", help="只输出结果，不写入文件")
+    gp.set_defaults(func=cmd_group_apply)
+
+    p = sub.add_parser("import", help="从 Claude/Codex/Gemini/cc-switch 导入 Provider")
+    p.add_argument("--source", choices=IMPORT_SOURCES, help="只导入指定来源")
+    p.add_argument("--overwrite", action="store_true", help="覆盖同名 Provider")
+    p.add_argument("--dry-run", action="store_true", help="只输出结果，不写入文件")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("backup", help="备份配置文件")
+    p.add_argument("--target", choices=["opencode", "omo", "all"], default="all")
+    p.add_argument("--tag", default="cli", help="备份标签")
+    p.add_argument("--list", action="store_true", help="列出已有备份")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("restore", help="从备份恢复配置文件")
+    p.add_argument("backup", help="备份文件路径或备份目录中的文件名")
+    p.add_argument("--target", choices=["opencode", "omo"])
+    p.set_defaults(func=cmd_restore)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # 回滚上次中断的多文件写入
+    for path in ConfigTransaction.recover(ConfigPaths.get_journal_dir()):
+        print(f"注意: 上次写入未完成，已回滚 {path}", file=sys.stderr)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return EXIT_FAILURE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
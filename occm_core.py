@@ -0,0 +1,5441 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCCM 核心模块 - 不依赖 Qt 的配置管理引擎
+
+包含配置路径、配置读写与备份、配置验证、外部配置导入、CLI 工具导出、
+Agent 分组、原生 Provider 认证、Skill 发现与插件管理等逻辑。
+图形界面 (opencode_config_manager_fluent.py) 与命令行工具 (occm.py) 共用此模块，
+脚本中可直接 import 而无需加载 PyQt5。
+"""
+
+import os
+import sys
+import json
+import re
+import shutil
+import hashlib
+import fnmatch
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+from dataclasses import dataclass
+
+
+# ==================== CLI 导出模块数据类 ====================
+@dataclass
+class CLIToolStatus:
+    """CLI 工具安装状态"""
+
+    cli_type: str  # "claude" | "codex" | "gemini"
+    installed: bool  # 是否已安装（配置目录存在）
+    config_dir: Optional[Path]  # 配置目录路径
+    has_config: bool  # 是否已有配置文件
+    version: Optional[str] = None  # CLI 版本（如果可检测）
+
+
+@dataclass
+class ValidationResult:
+    """Provider 配置验证结果"""
+
+    valid: bool
+    errors: List[str]  # 错误信息列表
+    warnings: List[str]  # 警告信息列表
+
+    @staticmethod
+    def success() -> "ValidationResult":
+        """创建成功的验证结果"""
+        return ValidationResult(valid=True, errors=[], warnings=[])
+
+    @staticmethod
+    def failure(
+        errors: List[str], warnings: Optional[List[str]] = None
+    ) -> "ValidationResult":
+        """创建失败的验证结果"""
+        return ValidationResult(valid=False, errors=errors, warnings=warnings or [])
+
+
+@dataclass
+class ExportResult:
+    """单个 CLI 工具导出结果"""
+
+    success: bool
+    cli_type: str
+    backup_path: Optional[Path]
+    error_message: Optional[str]
+    files_written: List[Path]
+
+    @staticmethod
+    def ok(
+        cli_type: str, files_written: List[Path], backup_path: Optional[Path] = None
+    ) -> "ExportResult":
+        """创建成功的导出结果"""
+        return ExportResult(
+            success=True,
+            cli_type=cli_type,
+            backup_path=backup_path,
+            error_message=None,
+            files_written=files_written,
+        )
+
+    @staticmethod
+    def fail(
+        cli_type: str, error_message: str, backup_path: Optional[Path] = None
+    ) -> "ExportResult":
+        """创建失败的导出结果"""
+        return ExportResult(
+            success=False,
+            cli_type=cli_type,
+            backup_path=backup_path,
+            error_message=error_message,
+            files_written=[],
+        )
+
+
+@dataclass
+class BatchExportResult:
+    """批量导出结果"""
+
+    total: int
+    successful: int
+    failed: int
+    results: List[ExportResult]
+
+    @property
+    def all_success(self) -> bool:
+        """是否全部成功"""
+        return self.failed == 0
+
+    @property
+    def partial_success(self) -> bool:
+        """是否部分成功"""
+        return self.successful > 0 and self.failed > 0
+
+
+@dataclass
+class BackupInfo:
+    """备份信息"""
+
+    path: Path
+    cli_type: str
+    created_at: datetime
+    files: List[str]
+
+
+# ==================== CLI 导出模块异常类 ====================
+class CLIExportError(Exception):
+    """CLI 导出错误基类"""
+
+    pass
+
+
+class ProviderValidationError(CLIExportError):
+    """Provider 配置验证错误"""
+
+    def __init__(self, missing_fields: List[str]):
+        self.missing_fields = missing_fields
+        super().__init__(f"Provider 配置不完整: 缺少 {', '.join(missing_fields)}")
+
+
+class ConfigWriteError(CLIExportError):
+    """配置写入错误"""
+
+    def __init__(self, path: Path, reason: str):
+        self.path = path
+        self.reason = reason
+        super().__init__(f"写入配置失败 ({path}): {reason}")
+
+
+class ConfigParseError(CLIExportError):
+    """配置解析错误"""
+
+    def __init__(self, path: Path, format_type: str, reason: str):
+        self.path = path
+        self.format_type = format_type
+        self.reason = reason
+        super().__init__(f"解析 {format_type} 配置失败 ({path}): {reason}")
+
+
+class BackupError(CLIExportError):
+    """备份操作错误"""
+
+    def __init__(self, cli_type: str, reason: str):
+        self.cli_type = cli_type
+        self.reason = reason
+        super().__init__(f"备份 {cli_type} 配置失败: {reason}")
+
+
+class RestoreError(CLIExportError):
+    """恢复操作错误"""
+
+    def __init__(self, backup_path: Path, reason: str):
+        self.backup_path = backup_path
+        self.reason = reason
+        super().__init__(f"恢复备份失败 ({backup_path}): {reason}")
+
+
+# ==================== Agent 分组管理 ====================
+@dataclass(frozen=True)
+class ConfigChange:
+    """配置中的一处结构化变化
+
+    - target: 配置名称，如 "opencode"、"oh-my-opencode"
+    - path: 变化位置，如 ("agent", "build", "disable")
+    - kind: "added" / "removed" / "changed"
+    """
+
+    target: str
+    path: Tuple[str, ...]
+    kind: str
+    old: Any = None
+    new: Any = None
+
+    def describe(self, max_len: int = 60) -> str:
+        """单行描述，如 ~ opencode: agent.build.disable: false -> true"""
+        location = ".".join(self.path) or "(root)"
+        if self.kind == "added":
+            detail = self.brief(self.new, max_len)
+            return f"+ {self.target}: {location} = {detail}"
+        if self.kind == "removed":
+            return f"- {self.target}: {location}"
+        old, new = self.brief(self.old, max_len), self.brief(self.new, max_len)
+        return f"~ {self.target}: {location}: {old} -> {new}"
+
+    @staticmethod
+    def brief(value: Any, max_len: int = 60) -> str:
+        text = json.dumps(value, ensure_ascii=False)
+        return text if len(text) <= max_len else text[: max_len - 3] + "..."
+
+
+def diff_configs(
+    target: str, old: Any, new: Any, max_depth: int = 3, path: Tuple[str, ...] = ()
+) -> List[ConfigChange]:
+    """比较两份配置，返回最多细化到 max_depth 层的变化列表（未变化的子树整体跳过）"""
+    if old == new:
+        return []
+    if not (isinstance(old, dict) and isinstance(new, dict) and len(path) < max_depth):
+        return [ConfigChange(target, path, "changed", old, new)]
+    changes: List[ConfigChange] = []
+    for key, value in new.items():
+        if key not in old:
+            changes.append(ConfigChange(target, path + (key,), "added", None, value))
+        else:
+            changes.extend(
+                diff_configs(target, old[key], value, max_depth, path + (key,))
+            )
+    for key, value in old.items():
+        if key not in new:
+            changes.append(ConfigChange(target, path + (key,), "removed", value, None))
+    return changes
+
+
+@dataclass
+class GroupApplyPlan:
+    """分组应用计划：应用后的配置副本与相对当前配置的变化，确认后再提交"""
+
+    group: Dict
+    opencode_config: Dict
+    omo_config: Optional[Dict]  # None 表示不修改 Oh My OpenCode 配置
+    changes: List[ConfigChange]
+
+    def targets(self) -> List[str]:
+        """发生变化的配置名称"""
+        return sorted({change.target for change in self.changes})
+
+
+class AgentGroupManager:
+    """Agent分组管理器
+
+    管理OpenCode和Oh My OpenCode的Agent分组配置，支持：
+    - 创建、编辑、删除自定义分组
+    - 快速应用预设或自定义分组
+    - 导入/导出分组配置
+    - 使用统计追踪
+    """
+
+    # 预设模板定义
+    PRESETS = [
+        {
+            "id": "preset-minimal",
+            "name": "最小化配置",
+            "name_en": "Minimal",
+            "description": "仅启用核心Agent，适合简单任务",
+            "description_en": "Core agents only, for simple tasks",
+            "icon": "⚡",
+            "agents": {
+                "opencode": [{"agent_id": "build", "enabled": True, "config": {}}],
+                "oh_my_opencode": [{"agent_id": "sisyphus-junior", "enabled": True}],
+            },
+        },
+        {
+            "id": "preset-standard",
+            "name": "标准配置",
+            "name_en": "Standard",
+            "description": "平衡的Agent组合，适合大多数任务",
+            "description_en": "Balanced agent combination for most tasks",
+            "icon": "⚙️",
+            "agents": {
+                "opencode": [
+                    {"agent_id": "build", "enabled": True, "config": {}},
+                    {"agent_id": "plan", "enabled": True, "config": {}},
+                ],
+                "oh_my_opencode": [
+                    {"agent_id": "prometheus", "enabled": True},
+                    {"agent_id": "sisyphus-junior", "enabled": True},
+                    {"agent_id": "oracle", "enabled": True},
+                ],
+            },
+        },
+        {
+            "id": "preset-full",
+            "name": "常用配置",
+            "name_en": "Common",
+            "description": "常用Agent组合，适合大多数复杂项目",
+            "description_en": "Common agent combination for most complex projects",
+            "icon": "🚀",
+            "agents": {
+                "opencode": [
+                    {"agent_id": "build", "enabled": True, "config": {}},
+                    {"agent_id": "plan", "enabled": True, "config": {}},
+                    {"agent_id": "explore", "enabled": True, "config": {}},
+                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
+                ],
+                "oh_my_opencode": [
+                    {"agent_id": "prometheus", "enabled": True},
+                    {"agent_id": "sisyphus-junior", "enabled": True},
+                    {"agent_id": "oracle", "enabled": True},
+                    {"agent_id": "librarian", "enabled": True},
+                    {"agent_id": "explore", "enabled": True},
+                ],
+            },
+        },
+        {
+            "id": "preset-complete",
+            "name": "完整配置",
+            "name_en": "Complete",
+            "description": "启用所有Agent，最大化功能",
+            "description_en": "All agents enabled, maximum functionality",
+            "icon": "💎",
+            "agents": {
+                "opencode": [
+                    {"agent_id": "build", "enabled": True, "config": {}},
+                    {"agent_id": "plan", "enabled": True, "config": {}},
+                    {"agent_id": "explore", "enabled": True, "config": {}},
+                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
+                    {"agent_id": "oracle", "enabled": True, "config": {}},
+                    {"agent_id": "librarian", "enabled": True, "config": {}},
+                    {"agent_id": "prometheus", "enabled": True, "config": {}},
+                ],
+                "oh_my_opencode": [
+                    {"agent_id": "prometheus", "enabled": True},
+                    {"agent_id": "sisyphus-junior", "enabled": True},
+                    {"agent_id": "oracle", "enabled": True},
+                    {"agent_id": "librarian", "enabled": True},
+                    {"agent_id": "explore", "enabled": True},
+                    {"agent_id": "atlas", "enabled": True},
+                    {"agent_id": "metis", "enabled": True},
+                ],
+            },
+        },
+        {
+            "id": "preset-frontend",
+            "name": "前端开发",
+            "name_en": "Frontend",
+            "description": "针对前端UI/UX开发优化",
+            "description_en": "Optimized for frontend UI/UX development",
+            "icon": "🎨",
+            "agents": {
+                "opencode": [
+                    {"agent_id": "build", "enabled": True, "config": {}},
+                    {"agent_id": "plan", "enabled": True, "config": {}},
+                ],
+                "oh_my_opencode": [
+                    {"agent_id": "prometheus", "enabled": True},
+                    {"agent_id": "sisyphus-junior", "enabled": True},
+                ],
+            },
+        },
+        {
+            "id": "preset-backend",
+            "name": "后端开发",
+            "name_en": "Backend",
+            "description": "针对后端API/数据库开发优化",
+            "description_en": "Optimized for backend API/database development",
+            "icon": "🔧",
+            "agents": {
+                "opencode": [
+                    {"agent_id": "build", "enabled": True, "config": {}},
+                    {"agent_id": "plan", "enabled": True, "config": {}},
+                    {"agent_id": "explore", "enabled": True, "config": {}},
+                ],
+                "oh_my_opencode": [
+                    {"agent_id": "prometheus", "enabled": True},
+                    {"agent_id": "sisyphus-junior", "enabled": True},
+                    {"agent_id": "oracle", "enabled": True},
+                ],
+            },
+        },
+    ]
+
+    def __init__(self, config_dir: Path):
+        """初始化分组管理器
+
+        Args:
+            config_dir: 配置文件目录 (~/.config/opencode)
+        """
+        self.config_dir = config_dir
+        self.groups_file = config_dir / "agent-groups.json"
+        self.log_file = config_dir / "agent-groups.log"
+        self.groups_data = {}
+        # 日志中最后一条操作的序号，以及快照已包含到的序号与日志字节位置
+        self._log_seq = 0
+        self._snapshot_seq = 0
+        self._snapshot_offset = 0
+        # 预设模板只读，索引与列表条目只需构建一次
+        self._presets_by_id = {preset["id"]: preset for preset in self.PRESETS}
+        self._preset_entries = [{**preset, "type": "preset"} for preset in self.PRESETS]
+        # 自定义分组索引，由 _reindex 在分组增删改后重建
+        self._groups_by_id: Dict[str, Dict] = {}
+        self._group_by_signature: Dict[Tuple[FrozenSet[str], FrozenSet[str]], str] = {}
+        # 使用统计只在内存中累计，随 flush_usage_stats 或分组应用事务写入日志
+        self._pending_usage: Dict[str, Dict] = {}
+        self.load_groups()
+
+    # ========== 数据加载/保存 ==========
+    #
+    # agent-groups.json 是快照，agent-groups.log 是只追加的操作日志（每行一个
+    # JSON 操作）。每次修改只追加一行，日志累计 COMPACT_AFTER 条后才重写快照；
+    # 快照记录已包含的日志序号与字节位置，加载时只重放其后的操作。
+    # 日志从不截断，第一条为 reset（完整数据），可重建任意历史状态。
+
+    COMPACT_AFTER = 50
+
+    @staticmethod
+    def _default_data() -> Dict:
+        return {
+            "version": "1.0.0",
+            "groups": [],
+            "settings": {
+                "auto_backup": True,
+                "show_usage_stats": True,
+                "default_group_id": None,
+            },
+        }
+
+    def load_groups(self) -> None:
+        """从快照加载分组配置，并重放快照之后的日志"""
+        self._pending_usage.clear()
+        log_meta: Dict = {}
+        if not self.groups_file.exists():
+            # 初始化默认配置
+            self.groups_data = self._default_data()
+        else:
+            try:
+                with open(self.groups_file, "r", encoding="utf-8") as f:
+                    self.groups_data = json.load(f)
+                log_meta = self.groups_data.pop("log", None) or {}
+
+                # 确保必要的字段存在
+                if "groups" not in self.groups_data:
+                    self.groups_data["groups"] = []
+                if "settings" not in self.groups_data:
+                    self.groups_data["settings"] = self._default_data()["settings"]
+            except Exception as e:
+                print(f"加载分组配置失败: {e}")
+                # 快照损坏时从日志起点重建
+                self.groups_data = self._default_data()
+                if self.log_file.exists():
+                    log_meta = {"seq": 0, "offset": 0}
+
+        self._snapshot_seq = log_meta.get("seq", 0)
+        self._snapshot_offset = log_meta.get("offset", 0)
+        self._log_seq = self._snapshot_seq
+        log_size = self.log_file.stat().st_size if self.log_file.exists() else 0
+        if log_meta and log_size >= self._snapshot_offset:
+            for op in self._read_log(self._snapshot_offset):
+                if op["seq"] > self._log_seq:
+                    self.groups_data = self._apply_op(self.groups_data, op)
+                    self._log_seq = op["seq"]
+            self._reindex()
+            if self._log_seq - self._snapshot_seq >= self.COMPACT_AFTER:
+                self.save_groups()
+        else:
+            # 首次使用日志，或日志已丢失：以当前数据作为日志起点
+            self._reindex()
+            self._commit_op({"op": "reset", "data": self.groups_data})
+            self.save_groups()
+
+    @staticmethod
+    def group_signature(agents: Dict) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """分组启用的 (OpenCode Agent 集合, Oh My OpenCode Agent 集合)"""
+        return (
+            frozenset(
+                cfg["agent_id"] for cfg in agents.get("opencode", []) if cfg["enabled"]
+            ),
+            frozenset(
+                cfg["agent_id"]
+                for cfg in agents.get("oh_my_opencode", [])
+                if cfg["enabled"]
+            ),
+        )
+
+    @staticmethod
+    def config_signature(
+        opencode_config: Dict, omo_config: Dict
+    ) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """当前配置启用的 Agent 集合，与 group_signature 可直接比较"""
+        return (
+            frozenset(
+                agent_id
+                for agent_id, config in opencode_config.get("agent", {}).items()
+                if not config.get("disable", False)
+            ),
+            frozenset(omo_config.get("agents", {}).keys()),
+        )
+
+    def _reindex(self) -> None:
+        """重建分组 ID 索引与启用 Agent 签名索引
+
+        签名相同时保留 list_groups(include_presets=True) 顺序中的第一个分组
+        """
+        self._groups_by_id = {
+            group["id"]: group for group in self.groups_data["groups"]
+        }
+        self._group_by_signature = {}
+        for group in self.groups_data["groups"] + self.PRESETS:
+            self._group_by_signature.setdefault(
+                self.group_signature(group["agents"]), group["id"]
+            )
+
+    def save_groups(self) -> None:
+        """写入待保存的使用统计，并把当前数据压缩为快照（原子替换）"""
+        try:
+            self.flush_usage_stats()
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            offset = self.log_file.stat().st_size if self.log_file.exists() else 0
+            snapshot = {
+                **self.groups_data,
+                "log": {"seq": self._log_seq, "offset": offset},
+            }
+            tmp_file = self.groups_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.groups_file)
+            self._snapshot_seq = self._log_seq
+            self._snapshot_offset = offset
+        except Exception as e:
+            print(f"保存分组配置失败: {e}")
+            raise
+
+    def _commit_op(self, op: Dict) -> None:
+        """应用一条操作并追加到日志，日志足够长时压缩为快照"""
+        self.groups_data = self._apply_op(self.groups_data, op)
+        if op["op"] != "usage":
+            self._reindex()
+        self._append_log(self._log_lines([op]))
+        if self._log_seq - self._snapshot_seq >= self.COMPACT_AFTER:
+            self.save_groups()
+
+    def _log_lines(self, ops: List[Dict]) -> str:
+        """为操作分配序号并序列化为日志行（序号在写入成功后才生效）"""
+        now = datetime.now().isoformat()
+        return "".join(
+            json.dumps({"seq": self._log_seq + i, "ts": now, **op}, ensure_ascii=False)
+            + "\n"
+            for i, op in enumerate(ops, 1)
+        )
+
+    def _append_log(self, lines: str) -> None:
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_seq += lines.count("\n")
+
+    def _read_log(self, offset: int = 0) -> List[Dict]:
+        """读取 offset 之后的日志操作；末尾写了一半的行（进程中断）被截掉"""
+        if not self.log_file.exists():
+            return []
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with open(self.log_file, "r+b") as f:
+                f.truncate(offset + complete)
+        ops = []
+        for line in data[:complete].splitlines():
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                continue
+        return ops
+
+    @staticmethod
+    def _apply_op(data: Dict, op: Dict) -> Dict:
+        """把一条日志操作应用到分组数据，返回新的数据（reset 时为新对象）"""
+        kind = op["op"]
+        if kind == "reset":
+            return copy_json(op["data"])
+        groups = data["groups"]
+        if kind == "create":
+            groups.append(copy_json(op["group"]))
+        elif kind == "update":
+            for group in groups:
+                if group["id"] == op["id"]:
+                    group.update(copy_json(op["fields"]))
+        elif kind == "delete":
+            data["groups"] = [g for g in groups if g["id"] != op["id"]]
+        elif kind == "usage":
+            for group in groups:
+                if group["id"] == op["id"]:
+                    group["statistics"] = copy_json(op["statistics"])
+        return data
+
+    def get_history(self) -> List[Dict]:
+        """列出日志中的全部操作（序号、时间、类型、分组ID）"""
+        return [
+            {
+                "seq": op["seq"],
+                "ts": op.get("ts"),
+                "op": op["op"],
+                "id": op.get("id") or op.get("group", {}).get("id"),
+            }
+            for op in self._read_log()
+        ]
+
+    def get_state_at(self, seq: int) -> Dict:
+        """从日志重建第 seq 条操作之后的分组数据"""
+        data = self._default_data()
+        for op in self._read_log():
+            if op["seq"] > seq:
+                break
+            data = self._apply_op(data, op)
+        return data
+
+    # ========== 分组CRUD操作 ==========
+
+    def create_group(
+        self, name: str, description: str, agents: Dict, icon: str = "📁"
+    ) -> str:
+        """创建新分组
+
+        Args:
+            name: 分组名称
+            description: 分组描述
+            agents: Agent配置字典
+            icon: 分组图标
+
+        Returns:
+            str: 分组ID (UUID)
+        """
+        import uuid
+
+        group_id = f"group-{uuid.uuid4().hex[:8]}"
+        now = datetime.now().isoformat()
+
+        group = {
+            "id": group_id,
+            "name": name,
+            "description": description,
+            "type": "custom",
+            "icon": icon,
+            "created_at": now,
+            "updated_at": now,
+            "agents": agents,
+            "statistics": {"usage_count": 0, "last_used": None},
+        }
+
+        self._commit_op({"op": "create", "group": group})
+
+        return group_id
+
+    def update_group(self, group_id: str, **kwargs) -> bool:
+        """更新分组配置
+
+        Args:
+            group_id: 分组ID
+            **kwargs: 要更新的字段
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self.get_group(group_id):
+            return False
+
+        # 更新字段与时间戳
+        fields = {
+            key: value
+            for key, value in kwargs.items()
+            if key in ["name", "description", "icon", "agents"]
+        }
+        fields["updated_at"] = datetime.now().isoformat()
+
+        self._commit_op({"op": "update", "id": group_id, "fields": fields})
+        return True
+
+    def delete_group(self, group_id: str) -> bool:
+        """删除分组
+
+        Args:
+            group_id: 分组ID
+
+        Returns:
+            bool: 是否成功
+        """
+        if not self.get_group(group_id):
+            return False
+
+        self._pending_usage.pop(group_id, None)
+        self._commit_op({"op": "delete", "id": group_id})
+        return True
+
+    def get_group(self, group_id: str) -> Optional[Dict]:
+        """获取分组配置
+
+        Args:
+            group_id: 分组ID
+
+        Returns:
+            Optional[Dict]: 分组配置，不存在返回None
+        """
+        return self._groups_by_id.get(group_id)
+
+    def find_group(self, group_id: str) -> Optional[Dict]:
+        """按 ID 查找自定义分组或预设模板
+
+        Args:
+            group_id: 分组ID或预设模板ID
+
+        Returns:
+            Optional[Dict]: 分组配置，不存在返回None
+        """
+        return self._groups_by_id.get(group_id) or self._presets_by_id.get(group_id)
+
+    def list_groups(self, include_presets: bool = False) -> List[Dict]:
+        """列出所有分组
+
+        Args:
+            include_presets: 是否包含预设模板
+
+        Returns:
+            List[Dict]: 分组列表
+        """
+        groups = self.groups_data["groups"].copy()
+
+        if include_presets:
+            # 添加预设模板（标记为preset类型）
+            groups.extend(self._preset_entries)
+
+        return groups
+
+    # ========== 分组应用 ==========
+
+    def plan_group(
+        self, group_id: str, opencode_config: Dict, omo_config: Optional[Dict]
+    ) -> Optional[GroupApplyPlan]:
+        """计算应用分组后的配置与变化，不修改传入的配置，也不写入任何文件
+
+        Args:
+            group_id: 分组ID（支持预设模板）
+            opencode_config: 当前OpenCode配置
+            omo_config: 当前Oh My OpenCode配置，None 表示未安装、不做修改
+
+        Returns:
+            Optional[GroupApplyPlan]: 应用计划，分组不存在返回None
+        """
+        group = self.find_group(group_id)
+        if not group:
+            return None
+
+        new_opencode = copy_json(opencode_config or {})
+        new_omo = copy_json(omo_config) if omo_config is not None else None
+        self._apply_agents(group, new_opencode, new_omo)
+
+        changes = diff_configs("opencode", opencode_config or {}, new_opencode)
+        if new_omo is not None:
+            changes += diff_configs("oh-my-opencode", omo_config, new_omo)
+        return GroupApplyPlan(group, new_opencode, new_omo, changes)
+
+    def apply_group(
+        self, group_id: str, opencode_config: Dict, omo_config: Dict
+    ) -> Tuple[Dict, Dict]:
+        """应用分组配置到OpenCode和Oh My OpenCode
+
+        返回应用后的配置副本；使用统计只在内存中更新，需要落盘时
+        使用 commit_plan 或 flush_usage_stats
+
+        Args:
+            group_id: 分组ID
+            opencode_config: 当前OpenCode配置
+            omo_config: 当前Oh My OpenCode配置
+
+        Returns:
+            Tuple[Dict, Dict]: 更新后的(opencode_config, omo_config)
+        """
+        plan = self.plan_group(group_id, opencode_config, omo_config)
+        if plan is None:
+            return opencode_config, omo_config
+        self.update_usage_stats(group_id)
+        return plan.opencode_config, plan.omo_config
+
+    def commit_plan(
+        self,
+        plan: GroupApplyPlan,
+        opencode_path: Path,
+        omo_path: Optional[Path] = None,
+        backup_manager=None,
+    ) -> List[Path]:
+        """以一个事务写入发生变化的配置文件与分组文件（含使用统计）
+
+        任一文件写入失败时全部回滚并抛出 ConfigTransactionError，
+        内存中的使用统计同时恢复原值
+
+        Returns:
+            List[Path]: 写入的文件
+        """
+        group = self.get_group(plan.group["id"])
+        previous_stats = copy_json(group.get("statistics")) if group else None
+        previous_pending = dict(self._pending_usage)
+        if group:
+            self.update_usage_stats(group["id"])
+
+        targets = plan.targets()
+        transaction = ConfigTransaction(
+            ConfigPaths.get_journal_dir(), backup_manager, backup_tag="before-group"
+        )
+        if "opencode" in targets:
+            transaction.stage(opencode_path, plan.opencode_config)
+        if "oh-my-opencode" in targets and omo_path is not None:
+            transaction.stage(omo_path, plan.omo_config)
+        usage_lines = self._log_lines(self._usage_ops())
+        if usage_lines:
+            # 使用统计只向分组日志追加一行，回滚时截断
+            transaction.stage_append(self.log_file, usage_lines)
+
+        try:
+            written = transaction.commit()
+        except ConfigTransactionError:
+            if group:
+                group["statistics"] = previous_stats
+            self._pending_usage = previous_pending
+            raise
+        self._log_seq += usage_lines.count("\n")
+        self._pending_usage.clear()
+        return written
+
+    def _apply_agents(
+        self, group: Dict, opencode_config: Dict, omo_config: Optional[Dict]
+    ) -> None:
+        """把分组的 Agent 启用状态与配置写入两份配置（原地修改）"""
+        # 1. 更新OpenCode Agent配置
+        if "agent" not in opencode_config:
+            opencode_config["agent"] = {}
+
+        # 获取所有OpenCode Agent ID
+        all_opencode_agents = set()
+        for agent_cfg in group["agents"].get("opencode", []):
+            all_opencode_agents.add(agent_cfg["agent_id"])
+
+        # 应用分组配置
+        for agent_cfg in group["agents"].get("opencode", []):
+            agent_id = agent_cfg["agent_id"]
+            if agent_cfg["enabled"]:
+                # 启用Agent并应用配置
+                if agent_id not in opencode_config["agent"]:
+                    opencode_config["agent"][agent_id] = {}
+
+                # 合并配置（复制，避免配置与分组数据共享对象）
+                config = agent_cfg.get("config", {})
+                opencode_config["agent"][agent_id].update(copy_json(config))
+
+                # 确保disable字段为False或不存在
+                if "disable" in opencode_config["agent"][agent_id]:
+                    opencode_config["agent"][agent_id]["disable"] = False
+            else:
+                # 禁用Agent
+                if agent_id in opencode_config["agent"]:
+                    opencode_config["agent"][agent_id]["disable"] = True
+
+        # 2. 更新Oh My OpenCode Agent配置
+        if omo_config is None:
+            return
+        if "agents" not in omo_config:
+            omo_config["agents"] = {}
+
+        # 获取所有Oh My OpenCode Agent ID
+        all_omo_agents = set()
+        for agent_cfg in group["agents"].get("oh_my_opencode", []):
+            all_omo_agents.add(agent_cfg["agent_id"])
+
+        # 应用分组配置
+        for agent_cfg in group["agents"].get("oh_my_opencode", []):
+            agent_id = agent_cfg["agent_id"]
+            if agent_cfg["enabled"]:
+                # 启用Agent并应用配置
+                omo_config["agents"][agent_id] = {
+                    "provider": agent_cfg.get("provider", ""),
+                    "model": agent_cfg.get("model", ""),
+                }
+            else:
+                # 禁用Agent（从配置中移除）
+                if agent_id in omo_config["agents"]:
+                    del omo_config["agents"][agent_id]
+
+    def get_current_group_match(
+        self, opencode_config: Dict, omo_config: Dict
+    ) -> Optional[str]:
+        """检测当前配置是否匹配某个分组
+
+        Args:
+            opencode_config: 当前OpenCode配置
+            omo_config: 当前Oh My OpenCode配置
+
+        Returns:
+            Optional[str]: 匹配的分组ID，无匹配返回None
+        """
+        # 所有分组（包括预设）的签名已预先建立索引，匹配只需一次哈希查找
+        return self._group_by_signature.get(
+            self.config_signature(opencode_config, omo_config)
+        )
+
+    # ========== 预设模板 ==========
+
+    def get_presets(self) -> List[Dict]:
+        """获取所有预设模板
+
+        Returns:
+            List[Dict]: 预设模板列表
+        """
+        return self.PRESETS.copy()
+
+    def create_from_preset(
+        self, preset_id: str, name: str, description: Optional[str] = None
+    ) -> Optional[str]:
+        """从预设模板创建分组
+
+        Args:
+            preset_id: 预设模板ID
+            name: 新分组名称
+            description: 新分组描述（可选）
+
+        Returns:
+            Optional[str]: 新分组ID，失败返回None
+        """
+        # 查找预设模板
+        preset = self._presets_by_id.get(preset_id)
+        if not preset:
+            return None
+
+        # 使用预设的描述（如果未提供）
+        if description is None:
+            description = preset["description"]
+
+        # 创建新分组
+        return self.create_group(
+            name=name,
+            description=description,
+            agents=preset["agents"],
+            icon=preset["icon"],
+        )
+
+    # ========== 导入/导出 ==========
+
+    def export_group(self, group_id: str, file_path: Path) -> bool:
+        """导出分组到文件
+
+        Args:
+            group_id: 分组ID
+            file_path: 导出文件路径
+
+        Returns:
+            bool: 是否成功
+        """
+        group = self.get_group(group_id)
+        if not group:
+            return False
+
+        try:
+            # 创建导出数据
+            export_data = {
+                "version": "1.0.0",
+                "exported_at": datetime.now().isoformat(),
+                "group": group,
+            }
+
+            # 写入文件
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(export_data, f, indent=2, ensure_ascii=False)
+
+            return True
+        except Exception as e:
+            print(f"导出分组失败: {e}")
+            return False
+
+    def import_group(self, file_path: Path, overwrite: bool = False) -> Optional[str]:
+        """从文件导入分组
+
+        Args:
+            file_path: 导入文件路径
+            overwrite: 是否覆盖同名分组
+
+        Returns:
+            Optional[str]: 导入的分组ID，失败返回None
+        """
+        try:
+            # 读取文件
+            with open(file_path, "r", encoding="utf-8") as f:
+                import_data = json.load(f)
+
+            # 验证格式
+            if "group" not in import_data:
+                print("导入文件格式错误：缺少group字段")
+                return None
+
+            group = import_data["group"]
+
+            # 检查同名分组
+            existing_group = None
+            for g in self.groups_data["groups"]:
+                if g["name"] == group["name"]:
+                    existing_group = g
+                    break
+
+            if existing_group and not overwrite:
+                print(f"分组 '{group['name']}' 已存在")
+                return None
+
+            if existing_group and overwrite:
+                # 覆盖现有分组
+                group_id = existing_group["id"]
+                self.update_group(
+                    group_id,
+                    description=group["description"],
+                    icon=group.get("icon", "📁"),
+                    agents=group["agents"],
+                )
+                return group_id
+            else:
+                # 创建新分组
+                return self.create_group(
+                    name=group["name"],
+                    description=group["description"],
+                    agents=group["agents"],
+                    icon=group.get("icon", "📁"),
+                )
+        except Exception as e:
+            print(f"导入分组失败: {e}")
+            return None
+
+    # ========== 统计信息 ==========
+
+    def update_usage_stats(self, group_id: str) -> None:
+        """更新分组使用统计（仅内存，随下一次保存批量写入）
+
+        Args:
+            group_id: 分组ID
+        """
+        group = self.get_group(group_id)
+        if not group:
+            return
+
+        if "statistics" not in group:
+            group["statistics"] = {"usage_count": 0, "last_used": None}
+
+        group["statistics"]["usage_count"] = (
+            group["statistics"].get("usage_count", 0) + 1
+        )
+        group["statistics"]["last_used"] = datetime.now().isoformat()
+        self._pending_usage[group_id] = group["statistics"]
+
+    def _usage_ops(self) -> List[Dict]:
+        return [
+            {"op": "usage", "id": group_id, "statistics": copy_json(statistics)}
+            for group_id, statistics in self._pending_usage.items()
+        ]
+
+    def flush_usage_stats(self) -> None:
+        """把尚未保存的使用统计追加到日志"""
+        if self._pending_usage:
+            self._append_log(self._log_lines(self._usage_ops()))
+            self._pending_usage.clear()
+
+    def get_usage_stats(self, group_id: str) -> Dict:
+        """获取分组使用统计
+
+        Args:
+            group_id: 分组ID
+
+        Returns:
+            Dict: 统计信息
+        """
+        group = self.get_group(group_id)
+        if not group:
+            return {"usage_count": 0, "last_used": None}
+
+        return group.get("statistics", {"usage_count": 0, "last_used": None})
+
+
+# ==================== 原生 Provider 认证管理 ====================
+class AuthManager:
+    """认证凭证管理器 - 管理 auth.json 文件的读写操作
+
+    auth.json 存储原生 Provider 的认证凭证，路径：
+    - Windows: %LOCALAPPDATA%/opencode/auth.json 或 ~/.local/share/opencode/auth.json
+    - macOS/Linux: ~/.local/share/opencode/auth.json
+    """
+
+    def __init__(self):
+        self._auth_path: Optional[Path] = None
+
+    @property
+    def auth_path(self) -> Path:
+        """获取 auth.json 路径（延迟初始化）"""
+        if self._auth_path is None:
+            self._auth_path = self._get_auth_path()
+        return self._auth_path
+
+    def _get_auth_path(self) -> Path:
+        """获取 auth.json 路径（跨平台支持）
+
+        Windows: 优先使用 %LOCALAPPDATA%/opencode，回退到 ~/.local/share/opencode
+        Unix: 使用 ~/.local/share/opencode
+        """
+        if sys.platform == "win32":
+            # Windows: 优先使用 LOCALAPPDATA
+            local_app_data = os.environ.get("LOCALAPPDATA", "")
+            if local_app_data:
+                base = Path(local_app_data) / "opencode"
+            else:
+                # 回退到 Unix 风格路径
+                base = Path.home() / ".local" / "share" / "opencode"
+        else:
+            # macOS / Linux
+            base = Path.home() / ".local" / "share" / "opencode"
+
+        return base / "auth.json"
+
+    def _ensure_parent_dir(self) -> None:
+        """确保 auth.json 的父目录存在"""
+        parent = self.auth_path.parent
+        if not parent.exists():
+            parent.mkdir(parents=True, exist_ok=True)
+
+    def read_auth(self) -> Dict[str, Any]:
+        """读取 auth.json 文件
+
+        Returns:
+            认证配置字典，文件不存在时返回空字典
+
+        Raises:
+            json.JSONDecodeError: 当文件格式错误时（由调用方处理）
+        """
+        if not self.auth_path.exists():
+            return {}
+
+        try:
+            with open(self.auth_path, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+                if not content:
+                    return {}
+                return json.loads(content)
+        except json.JSONDecodeError:
+            # 重新抛出，让调用方决定如何处理
+            raise
+        except Exception:
+            # 其他读取错误，返回空字典
+            return {}
+
+    def write_auth(self, auth_data: Dict[str, Any]) -> None:
+        """写入 auth.json 文件
+
+        Args:
+            auth_data: 要写入的认证配置字典
+        """
+        self._ensure_parent_dir()
+        with open(self.auth_path, "w", encoding="utf-8") as f:
+            json.dump(auth_data, f, indent=2, ensure_ascii=False)
+
+    def get_provider_auth(self, provider_id: str) -> Optional[Dict[str, Any]]:
+        """获取指定 Provider 的认证信息
+
+        Args:
+            provider_id: Provider 标识符（如 'anthropic', 'openai'）
+
+        Returns:
+            Provider 的认证配置字典，不存在时返回 None
+            返回格式兼容旧格式：{'apiKey': 'xxx'} 用于UI显示
+        """
+        auth_data = self.read_auth()
+        provider_auth = auth_data.get(provider_id)
+
+        if not provider_auth:
+            return None
+
+        # 如果是新格式 {"type": "api", "key": "xxx"}，转换为UI兼容格式
+        if "key" in provider_auth and "type" in provider_auth:
+            return {"apiKey": provider_auth["key"], "type": provider_auth["type"]}
+
+        # 保持原格式（用于特殊Provider或旧数据）
+        return provider_auth
+
+    def set_provider_auth(self, provider_id: str, auth_config: Dict[str, Any]) -> None:
+        """设置指定 Provider 的认证信息
+
+        Args:
+            provider_id: Provider 标识符
+            auth_config: 认证配置字典（如 {'apiKey': 'sk-xxx'}）
+        """
+        auth_data = self.read_auth()
+
+        # 转换为OpenCode官方格式：{"type": "api", "key": "xxx"}
+        # 支持输入格式：{'apiKey': 'xxx'} 或 {'key': 'xxx'}
+        api_key = auth_config.get("apiKey") or auth_config.get("key")
+        auth_type = auth_config.get("type", "api")  # 默认为api类型
+
+        if api_key:
+            auth_data[provider_id] = {"type": auth_type, "key": api_key}
+        else:
+            # 如果没有apiKey/key字段，保持原样（用于特殊Provider如AWS）
+            auth_data[provider_id] = auth_config
+
+        self.write_auth(auth_data)
+
+    def delete_provider_auth(self, provider_id: str) -> bool:
+        """删除指定 Provider 的认证信息
+
+        Args:
+            provider_id: Provider 标识符
+
+        Returns:
+            是否成功删除（Provider 不存在时返回 False）
+        """
+        auth_data = self.read_auth()
+        if provider_id in auth_data:
+            del auth_data[provider_id]
+            self.write_auth(auth_data)
+            return True
+        return False
+
+    @staticmethod
+    def mask_api_key(api_key: str) -> str:
+        """遮蔽 API Key，只显示首尾字符
+
+        Args:
+            api_key: 原始 API Key
+
+        Returns:
+            遮蔽后的字符串：
+            - 长度 > 8: 显示首 4 字符 + ... + 尾 4 字符
+            - 长度 <= 8: 显示 ****
+        """
+        if not api_key:
+            return ""
+        if len(api_key) <= 8:
+            return "****"
+        return f"{api_key[:4]}...{api_key[-4:]}"
+
+
+# ==================== 原生 Provider 配置数据类 ====================
+@dataclass
+class AuthField:
+    """认证字段定义"""
+
+    key: str  # 字段键名（如 'apiKey', 'accessKeyId'）
+    label: str  # 显示标签（如 'API Key', 'Access Key ID'）
+    field_type: str  # 字段类型: text, password, file
+    required: bool  # 是否必填
+    placeholder: str  # 占位符文本
+
+
+@dataclass
+class OptionField:
+    """选项字段定义"""
+
+    key: str  # 字段键名（如 'baseURL', 'region'）
+    label: str  # 显示标签
+    field_type: str  # 字段类型: text, select
+    options: List[str]  # 可选值（select 类型时使用）
+    default: str  # 默认值
+
+
+@dataclass
+class NativeProviderConfig:
+    """原生 Provider 配置定义"""
+
+    id: str  # Provider ID（如 'anthropic', 'openai'）
+    name: str  # 显示名称（如 'Anthropic (Claude)'）
+    sdk: str  # SDK 包名（如 '@ai-sdk/anthropic'）
+    auth_fields: List[AuthField]  # 认证字段列表
+    option_fields: List[OptionField]  # 选项字段列表
+    env_vars: List[str]  # 相关环境变量
+    test_endpoint: Optional[str]  # 测试端点（用于连接测试）
+
+
+# 所有支持的原生 Provider 配置
+NATIVE_PROVIDERS: List[NativeProviderConfig] = [
+    NativeProviderConfig(
+        id="anthropic",
+        name="Anthropic (Claude)",
+        sdk="@ai-sdk/anthropic",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "sk-ant-..."),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["ANTHROPIC_API_KEY"],
+        test_endpoint="/v1/models",
+    ),
+    NativeProviderConfig(
+        id="openai",
+        name="OpenAI",
+        sdk="@ai-sdk/openai",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "sk-..."),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["OPENAI_API_KEY"],
+        test_endpoint="/v1/models",
+    ),
+    NativeProviderConfig(
+        id="gemini",
+        name="Google Gemini",
+        sdk="@ai-sdk/google",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["GEMINI_API_KEY", "GOOGLE_API_KEY"],
+        test_endpoint="/v1/models",
+    ),
+    NativeProviderConfig(
+        id="amazon-bedrock",
+        name="Amazon Bedrock",
+        sdk="@ai-sdk/amazon-bedrock",
+        auth_fields=[
+            AuthField("accessKeyId", "Access Key ID", "password", False, "AKIA..."),
+            AuthField("secretAccessKey", "Secret Access Key", "password", False, ""),
+            AuthField("profile", "AWS Profile", "text", False, "default"),
+        ],
+        option_fields=[
+            OptionField(
+                "region",
+                "Region",
+                "select",
+                ["us-east-1", "us-west-2", "eu-west-1", "ap-northeast-1"],
+                "us-east-1",
+            ),
+            OptionField("endpoint", "VPC Endpoint", "text", [], ""),
+        ],
+        env_vars=[
+            "AWS_ACCESS_KEY_ID",
+            "AWS_SECRET_ACCESS_KEY",
+            "AWS_PROFILE",
+            "AWS_REGION",
+        ],
+        test_endpoint=None,
+    ),
+    NativeProviderConfig(
+        id="azure",
+        name="Azure OpenAI",
+        sdk="@ai-sdk/azure",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+            AuthField("resourceName", "Resource Name", "text", True, ""),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["AZURE_OPENAI_API_KEY", "AZURE_RESOURCE_NAME"],
+        test_endpoint=None,
+    ),
+    NativeProviderConfig(
+        id="github-copilot",
+        name="GitHub Copilot",
+        sdk="@ai-sdk/openai",
+        auth_fields=[
+            AuthField("token", "GitHub Token", "password", True, ""),
+        ],
+        option_fields=[],
+        env_vars=[],
+        test_endpoint=None,
+    ),
+    NativeProviderConfig(
+        id="xai",
+        name="xAI (Grok)",
+        sdk="@ai-sdk/xai",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["XAI_API_KEY"],
+        test_endpoint="/v1/models",
+    ),
+    NativeProviderConfig(
+        id="groq",
+        name="Groq",
+        sdk="@ai-sdk/groq",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "gsk_..."),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], ""),
+        ],
+        env_vars=["GROQ_API_KEY"],
+        test_endpoint="/openai/v1/models",
+    ),
+    NativeProviderConfig(
+        id="openrouter",
+        name="OpenRouter",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "sk-or-..."),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL", "Base URL", "text", [], "https://openrouter.ai/api/v1"
+            ),
+        ],
+        env_vars=["OPENROUTER_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="google-vertex",
+        name="Google Vertex AI",
+        sdk="@ai-sdk/google-vertex",
+        auth_fields=[
+            AuthField("credentials", "Service Account JSON", "file", False, ""),
+            AuthField("projectId", "Project ID", "text", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "location",
+                "Location",
+                "select",
+                ["global", "us-central1", "us-east1", "europe-west1", "asia-east1"],
+                "global",
+            ),
+        ],
+        env_vars=[
+            "GOOGLE_APPLICATION_CREDENTIALS",
+            "GOOGLE_CLOUD_PROJECT",
+            "VERTEX_LOCATION",
+        ],
+        test_endpoint=None,
+    ),
+    NativeProviderConfig(
+        id="deepseek",
+        name="DeepSeek",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "sk-..."),
+        ],
+        option_fields=[
+            OptionField("baseURL", "Base URL", "text", [], "https://api.deepseek.com"),
+        ],
+        env_vars=["DEEPSEEK_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="zhipuai",
+        name="Zhipu AI (智谱GLM)",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "text",
+                [],
+                "https://open.bigmodel.cn/api/paas/v4",
+            ),
+        ],
+        env_vars=["ZHIPU_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="zhipuai-coding-plan",
+        name="Zhipu AI Coding Plan (智谱GLM编码套餐)",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "text",
+                [],
+                "https://open.bigmodel.cn/api/coding/paas/v4",
+            ),
+        ],
+        env_vars=["ZHIPU_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="zai",
+        name="Z.AI",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "text",
+                [],
+                "https://api.z.ai/api/paas/v4",
+            ),
+        ],
+        env_vars=["ZHIPU_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="zai-coding-plan",
+        name="Z.AI Coding Plan",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "text",
+                [],
+                "https://api.z.ai/api/coding/paas/v4",
+            ),
+        ],
+        env_vars=["ZHIPU_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="qwen",
+        name="千问 Qwen",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, "sk-..."),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "text",
+                [],
+                "https://dashscope.aliyuncs.com/compatible-mode/v1",
+            ),
+        ],
+        env_vars=["DASHSCOPE_API_KEY", "QWEN_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="moonshot",
+        name="Moonshot AI (Kimi)",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL", "Base URL", "text", [], "https://api.moonshot.cn/v1"
+            ),
+        ],
+        env_vars=["MOONSHOT_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="yi",
+        name="零一万物 Yi",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL", "Base URL", "text", [], "https://api.lingyiwanwu.com/v1"
+            ),
+        ],
+        env_vars=["YI_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="minimax",
+        name="MiniMax",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL",
+                "Base URL",
+                "select",
+                [
+                    "https://api.minimax.io/v1",
+                    "https://api.minimaxi.com/v1",
+                ],
+                "https://api.minimax.io/v1",
+            ),
+        ],
+        env_vars=["MINIMAX_API_KEY"],
+        test_endpoint="/models",
+    ),
+    NativeProviderConfig(
+        id="opencode",
+        name="OpenCode Zen",
+        sdk="@ai-sdk/openai-compatible",
+        auth_fields=[
+            AuthField("apiKey", "API Key", "password", True, ""),
+        ],
+        option_fields=[
+            OptionField(
+                "baseURL", "Base URL", "text", [], "https://api.opencode.ai/v1"
+            ),
+        ],
+        env_vars=[],
+        test_endpoint="/models",
+    ),
+]
+
+
+def get_native_provider(provider_id: str) -> Optional[NativeProviderConfig]:
+    """根据 ID 获取原生 Provider 配置"""
+    for provider in NATIVE_PROVIDERS:
+        if provider.id == provider_id:
+            return provider
+    return None
+
+
+# 原生 Provider 未配置 baseURL（且选项无默认值）时使用的 API 地址，
+# 与各 Provider 的 test_endpoint 相对；需要主机根地址的调用方自行去掉版本后缀
+NATIVE_DEFAULT_BASE_URLS: Dict[str, str] = {
+    "anthropic": "https://api.anthropic.com",
+    "openai": "https://api.openai.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "xai": "https://api.x.ai",
+    "groq": "https://api.groq.com",
+    "openrouter": "https://openrouter.ai/api",
+    "deepseek": "https://api.deepseek.com",
+    "opencode": "https://api.opencode.ai/v1",
+    "zhipuai": "https://open.bigmodel.cn/api/paas/v4",
+    "zhipuai-coding-plan": "https://open.bigmodel.cn/api/coding/paas/v4",
+    "zai": "https://api.z.ai/api/paas/v4",
+    "zai-coding-plan": "https://api.z.ai/api/coding/paas/v4",
+}
+
+
+# ==================== 环境变量检测器 ====================
+class EnvVarDetector:
+    """环境变量检测器 - 检测系统中已设置的 Provider 相关环境变量"""
+
+    # Provider 与环境变量的映射
+    PROVIDER_ENV_VARS: Dict[str, List[str]] = {
+        "anthropic": ["ANTHROPIC_API_KEY"],
+        "openai": ["OPENAI_API_KEY"],
+        "gemini": ["GEMINI_API_KEY", "GOOGLE_API_KEY"],
+        "amazon-bedrock": [
+            "AWS_ACCESS_KEY_ID",
+            "AWS_SECRET_ACCESS_KEY",
+            "AWS_PROFILE",
+            "AWS_REGION",
+        ],
+        "azure": ["AZURE_OPENAI_API_KEY", "AZURE_RESOURCE_NAME"],
+        "xai": ["XAI_API_KEY"],
+        "groq": ["GROQ_API_KEY"],
+        "openrouter": ["OPENROUTER_API_KEY"],
+        "google-vertex": [
+            "GOOGLE_APPLICATION_CREDENTIALS",
+            "GOOGLE_CLOUD_PROJECT",
+            "VERTEX_LOCATION",
+        ],
+        "deepseek": ["DEEPSEEK_API_KEY"],
+        "zhipuai": ["ZHIPU_API_KEY"],
+        "zhipuai-coding-plan": ["ZHIPU_API_KEY"],
+        "zai": ["ZHIPU_API_KEY"],
+        "zai-coding-plan": ["ZHIPU_API_KEY"],
+        "qwen": ["DASHSCOPE_API_KEY", "QWEN_API_KEY"],
+        "moonshot": ["MOONSHOT_API_KEY"],
+        "yi": ["YI_API_KEY"],
+        "minimax": ["MINIMAX_API_KEY"],
+    }
+
+    # 环境变量到认证字段的映射
+    ENV_TO_AUTH_FIELD: Dict[str, str] = {
+        "ANTHROPIC_API_KEY": "apiKey",
+        "OPENAI_API_KEY": "apiKey",
+        "GEMINI_API_KEY": "apiKey",
+        "GOOGLE_API_KEY": "apiKey",
+        "AWS_ACCESS_KEY_ID": "accessKeyId",
+        "AWS_SECRET_ACCESS_KEY": "secretAccessKey",
+        "AWS_PROFILE": "profile",
+        "AZURE_OPENAI_API_KEY": "apiKey",
+        "AZURE_RESOURCE_NAME": "resourceName",
+        "XAI_API_KEY": "apiKey",
+        "GROQ_API_KEY": "apiKey",
+        "OPENROUTER_API_KEY": "apiKey",
+        "GOOGLE_APPLICATION_CREDENTIALS": "credentials",
+        "GOOGLE_CLOUD_PROJECT": "projectId",
+        "DEEPSEEK_API_KEY": "apiKey",
+    }
+
+    def detect_env_vars(self, provider_id: str) -> Dict[str, str]:
+        """检测指定 Provider 的环境变量
+
+        Args:
+            provider_id: Provider 标识符
+
+        Returns:
+            已设置的环境变量字典 {变量名: 值}
+        """
+        env_vars = self.PROVIDER_ENV_VARS.get(provider_id, [])
+        detected = {}
+        for var in env_vars:
+            value = os.environ.get(var)
+            if value:
+                detected[var] = value
+        return detected
+
+    def detect_all_env_vars(self) -> Dict[str, Dict[str, str]]:
+        """检测所有 Provider 的环境变量
+
+        Returns:
+            {provider_id: {变量名: 值}}
+        """
+        result = {}
+        for provider_id in self.PROVIDER_ENV_VARS:
+            detected = self.detect_env_vars(provider_id)
+            if detected:
+                result[provider_id] = detected
+        return result
+
+    @staticmethod
+    def format_env_reference(var_name: str) -> str:
+        """格式化环境变量引用
+
+        Args:
+            var_name: 环境变量名
+
+        Returns:
+            格式化的引用字符串 {env:VARIABLE_NAME}
+        """
+        return f"{{env:{var_name}}}"
+
+    def get_auth_field_for_env(self, env_var: str) -> Optional[str]:
+        """获取环境变量对应的认证字段名
+
+        Args:
+            env_var: 环境变量名
+
+        Returns:
+            对应的认证字段名，未找到时返回 None
+        """
+        return self.ENV_TO_AUTH_FIELD.get(env_var)
+
+
+# ==================== 核心服务类 ====================
+class ConfigPaths:
+    """
+    配置文件路径管理 - 跨平台支持 (Windows/Linux/macOS)
+
+    默认路径：
+    - Windows: C:/Users/<user>/.config/opencode/
+    - Linux: /home/<user>/.config/opencode/
+    - macOS: /Users/<user>/.config/opencode/
+
+    支持 .json 和 .jsonc 扩展名，支持自定义路径
+    """
+
+    # 自定义路径存储（None 表示使用默认路径）
+    _custom_opencode_path: Optional[Path] = None
+    _custom_ohmyopencode_path: Optional[Path] = None
+    _custom_backup_path: Optional[Path] = None
+    _custom_import_paths: Optional[Dict[str, Path]] = None
+
+    @staticmethod
+    def get_user_home() -> Path:
+        """获取用户主目录（跨平台）"""
+        return Path.home()
+
+    @staticmethod
+    def get_platform() -> str:
+        """获取当前平台: windows, linux, macos"""
+        import platform
+
+        system = platform.system().lower()
+        if system == "darwin":
+            return "macos"
+        return system
+
+    @classmethod
+    def get_config_base_dir(cls) -> Path:
+        """
+        获取配置文件基础目录（跨平台）
+
+        所有平台统一使用 ~/.config/opencode/
+        """
+        return cls.get_user_home() / ".config" / "opencode"
+
+    @classmethod
+    def _get_config_path(cls, base_dir: Path, base_name: str) -> Path:
+        """获取配置文件路径，优先检测 .jsonc，其次 .json"""
+        jsonc_path = base_dir / f"{base_name}.jsonc"
+        json_path = base_dir / f"{base_name}.json"
+
+        # 优先返回存在的 .jsonc 文件
+        if jsonc_path.exists():
+            return jsonc_path
+        # 其次返回存在的 .json 文件
+        if json_path.exists():
+            return json_path
+        # 都不存在时，默认返回 .json 路径（用于创建新文件）
+        return json_path
+
+    @classmethod
+    def check_config_conflict(cls, base_name: str) -> Optional[Tuple[Path, Path]]:
+        """
+        检查是否同时存在 .json 和 .jsonc 配置文件
+
+        Args:
+            base_name: 配置文件基础名称（如 "opencode" 或 "oh-my-opencode"）
+
+        Returns:
+            如果存在冲突，返回 (json_path, jsonc_path)；否则返回 None
+        """
+        base_dir = cls.get_config_base_dir()
+        jsonc_path = base_dir / f"{base_name}.jsonc"
+        json_path = base_dir / f"{base_name}.json"
+
+        if jsonc_path.exists() and json_path.exists():
+            return (json_path, jsonc_path)
+        return None
+
+    @classmethod
+    def get_config_file_info(cls, path: Path) -> Dict:
+        """获取配置文件信息（大小、修改时间）"""
+        import os
+        from datetime import datetime
+
+        if not path.exists():
+            return {"exists": False}
+
+        stat = os.stat(path)
+        return {
+            "exists": True,
+            "size": stat.st_size,
+            "size_str": f"{stat.st_size:,} 字节",
+            "mtime": datetime.fromtimestamp(stat.st_mtime),
+            "mtime_str": datetime.fromtimestamp(stat.st_mtime).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+        }
+
+    @classmethod
+    def get_opencode_config(cls) -> Path:
+        """获取 OpenCode 配置路径（优先使用自定义路径）"""
+        if cls._custom_opencode_path is not None:
+            return cls._custom_opencode_path
+        return cls._get_config_path(cls.get_config_base_dir(), "opencode")
+
+    @classmethod
+    def set_opencode_config(cls, path: Optional[Path]) -> None:
+        """设置自定义 OpenCode 配置路径"""
+        cls._custom_opencode_path = path
+
+    @classmethod
+    def get_ohmyopencode_config(cls) -> Path:
+        """获取 Oh My OpenCode 配置路径（优先使用自定义路径）"""
+        if cls._custom_ohmyopencode_path is not None:
+            return cls._custom_ohmyopencode_path
+        return cls._get_config_path(cls.get_config_base_dir(), "oh-my-opencode")
+
+    @classmethod
+    def set_ohmyopencode_config(cls, path: Optional[Path]) -> None:
+        """设置自定义 Oh My OpenCode 配置路径"""
+        cls._custom_ohmyopencode_path = path
+
+    @classmethod
+    def is_custom_path(cls, config_type: str) -> bool:
+        """检查是否使用自定义路径"""
+        if config_type == "opencode":
+            return cls._custom_opencode_path is not None
+        elif config_type == "ohmyopencode":
+            return cls._custom_ohmyopencode_path is not None
+        elif config_type == "backup":
+            return cls._custom_backup_path is not None
+        return False
+
+    @classmethod
+    def reset_to_default(cls, config_type: str) -> None:
+        """重置为默认路径"""
+        if config_type == "opencode":
+            cls._custom_opencode_path = None
+        elif config_type == "ohmyopencode":
+            cls._custom_ohmyopencode_path = None
+        elif config_type == "backup":
+            cls._custom_backup_path = None
+
+    @classmethod
+    def get_claude_settings(cls) -> Path:
+        """获取 Claude Code 设置路径"""
+        base_dir = cls.get_user_home() / ".claude"
+        return cls._get_config_path(base_dir, "settings")
+
+    @classmethod
+    def get_claude_providers(cls) -> Path:
+        """获取 Claude Code providers 路径"""
+        base_dir = cls.get_user_home() / ".claude"
+        return cls._get_config_path(base_dir, "providers")
+
+    @classmethod
+    def get_backup_dir(cls) -> Path:
+        """获取备份目录（优先使用自定义路径）"""
+        if cls._custom_backup_path is not None:
+            return cls._custom_backup_path
+        return cls.get_config_base_dir() / "backups"
+
+    @classmethod
+    def get_journal_dir(cls) -> Path:
+        """获取多文件事务日志目录"""
+        return cls.get_config_base_dir() / ".occm-journal"
+
+    @classmethod
+    def set_backup_dir(cls, path: Optional[Path]) -> None:
+        """设置自定义备份目录"""
+        cls._custom_backup_path = path
+
+    @classmethod
+    def get_import_path(cls, source_type: str) -> Optional[Path]:
+        """获取自定义导入路径"""
+        if cls._custom_import_paths is None:
+            return None
+        return cls._custom_import_paths.get(source_type)
+
+    @classmethod
+    def set_import_path(cls, source_type: str, path: Optional[Path]) -> None:
+        """设置自定义导入路径"""
+        if cls._custom_import_paths is None:
+            cls._custom_import_paths = {}
+        if path is None:
+            cls._custom_import_paths.pop(source_type, None)
+            return
+        cls._custom_import_paths[source_type] = path
+
+
+class ConfigManager:
+    """配置文件读写管理 - 支持 JSON 和 JSONC (带注释的JSON)"""
+
+    @staticmethod
+    def strip_jsonc_comments(content: str) -> str:
+        """移除 JSONC 中的注释，支持 // 单行注释和 /* */ 多行注释"""
+        result = []
+        i = 0
+        in_string = False
+        escape_next = False
+
+        while i < len(content):
+            char = content[i]
+
+            # 处理字符串内的转义
+            if escape_next:
+                result.append(char)
+                escape_next = False
+                i += 1
+                continue
+
+            # 检测转义字符
+            if char == "\\" and in_string:
+                result.append(char)
+                escape_next = True
+                i += 1
+                continue
+
+            # 检测字符串边界
+            if char == '"' and not escape_next:
+                in_string = not in_string
+                result.append(char)
+                i += 1
+                continue
+
+            # 不在字符串内时处理注释
+            if not in_string:
+                # 检测单行注释 //
+                if char == "/" and i + 1 < len(content) and content[i + 1] == "/":
+                    # 跳过到行尾
+                    while i < len(content) and content[i] != "\n":
+                        i += 1
+                    # 保留换行符（如果存在）
+                    if i < len(content) and content[i] == "\n":
+                        result.append("\n")
+                        i += 1
+                    continue
+
+                # 检测多行注释 /* */
+                if char == "/" and i + 1 < len(content) and content[i + 1] == "*":
+                    i += 2  # 跳过 /*
+                    # 查找 */
+                    while i < len(content):
+                        if (
+                            content[i] == "*"
+                            and i + 1 < len(content)
+                            and content[i + 1] == "/"
+                        ):
+                            i += 2  # 跳过 */
+                            break
+                        i += 1
+                    continue
+
+            result.append(char)
+            i += 1
+
+        return "".join(result)
+
+    @staticmethod
+    def load_json(path: Path) -> Optional[Dict]:
+        """加载 JSON/JSONC 文件"""
+        try:
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+
+                # 尝试直接解析 JSON
+                try:
+                    return json.loads(content)
+                except json.JSONDecodeError as e1:
+                    # 如果失败，尝试移除注释后再解析 (JSONC)
+                    try:
+                        stripped_content = ConfigManager.strip_jsonc_comments(content)
+                        return json.loads(stripped_content)
+                    except json.JSONDecodeError as e2:
+                        # 详细记录解析失败原因
+                        print(f"Load failed {path}:")
+                        print(f"  - 标准JSON解析失败: {e1}")
+                        print(f"  - JSONC解析失败: {e2}")
+                        print(f"  - 文件大小: {len(content)} 字节")
+                        # 打印前200个字符用于调试
+                        preview = content[:200].replace("\n", "\\n")
+                        print(f"  - 文件预览: {preview}...")
+                        return None
+        except Exception as e:
+            print(f"Load failed {path}: {e}")
+        return None
+
+    @staticmethod
+    def is_jsonc_file(path: Path) -> bool:
+        """检查文件是否为 JSONC 格式（包含注释）"""
+        try:
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                # 尝试直接解析，如果失败说明可能有注释
+                try:
+                    json.loads(content)
+                    return False  # 标准 JSON
+                except json.JSONDecodeError:
+                    return True  # 可能是 JSONC
+        except Exception:
+            pass
+        return False
+
+    @staticmethod
+    def has_jsonc_comments(path: Path) -> bool:
+        """检查文件是否包含 JSONC 注释（// 或 /* */）"""
+        try:
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                # 检查是否包含注释标记（简单检测）
+                # 需要排除字符串内的 // 和 /*
+                in_string = False
+                escape_next = False
+                i = 0
+                while i < len(content):
+                    char = content[i]
+                    if escape_next:
+                        escape_next = False
+                        i += 1
+                        continue
+                    if char == "\\" and in_string:
+                        escape_next = True
+                        i += 1
+                        continue
+                    if char == '"' and not escape_next:
+                        in_string = not in_string
+                        i += 1
+                        continue
+                    if not in_string:
+                        # 检测 // 或 /*
+                        if char == "/" and i + 1 < len(content):
+                            next_char = content[i + 1]
+                            if next_char == "/" or next_char == "*":
+                                return True
+                    i += 1
+        except Exception:
+            pass
+        return False
+
+    @staticmethod
+    def save_json(
+        path: Path, data: Dict, backup_manager=None, backup_before_save: bool = True
+    ) -> Tuple[bool, bool]:
+        """
+        保存为标准 JSON 格式
+
+        注意：如果原文件是 JSONC 格式（带注释），保存后注释会丢失。
+        会自动检测并备份 JSONC 文件。
+
+        Args:
+            path: 保存路径
+            data: 要保存的数据
+            backup_manager: 备份管理器实例（用于自动备份 JSONC 文件）
+            backup_before_save: 是否在保存前备份当前文件（JSONC 文件始终备份）
+
+        Returns:
+            Tuple[bool, bool]: (保存是否成功, 是否为 JSONC 文件且注释已丢失)
+        """
+        jsonc_warning = False
+        try:
+            # 保存前自动备份当前文件
+            if backup_manager and backup_before_save and path.exists():
+                backup_manager.backup(path, tag="before-save")
+
+            # 检测是否为 JSONC 文件（包含注释）
+            if path.exists() and ConfigManager.has_jsonc_comments(path):
+                jsonc_warning = True
+                # 自动备份 JSONC 文件
+                if backup_manager:
+                    backup_manager.backup(path, tag="jsonc-auto")
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(ConfigManager.serialize(path, data))
+            return True, jsonc_warning
+        except Exception as e:
+            print(f"Save failed {path}: {e}")
+            return False, jsonc_warning
+
+    @staticmethod
+    def serialize(path: Path, data: Dict) -> str:
+        """生成保存到 path 的 JSON 文本"""
+        # 如果是 oh-my-opencode 配置文件，自动添加 $schema 字段
+        if "oh-my-opencode" in str(path):
+            # 创建新的数据副本，避免修改原始数据
+            data_to_save = data.copy()
+            # 添加 $schema 字段到最前面
+            schema_url = "https://raw.githubusercontent.com/code-yeongyu/oh-my-opencode/master/assets/oh-my-opencode.schema.json"
+            # 使用 OrderedDict 确保 $schema 在最前面
+            from collections import OrderedDict
+
+            ordered_data = OrderedDict()
+            ordered_data["$schema"] = schema_url
+            # 添加其他字段
+            for key, value in data_to_save.items():
+                if key != "$schema":  # 避免重复
+                    ordered_data[key] = value
+            data_to_save = ordered_data
+        else:
+            data_to_save = data
+        return json.dumps(data_to_save, indent=2, ensure_ascii=False)
+
+
+class BackupManager:
+    """备份管理器"""
+
+    def __init__(self):
+        self.backup_dir = ConfigPaths.get_backup_dir()
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+
+    def backup(self, config_path: Path, tag: str = "auto") -> Optional[Path]:
+        """创建配置文件备份，支持自定义标签"""
+        try:
+            if not config_path.exists():
+                return None
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = f"{config_path.stem}.{timestamp}.{tag}.bak"
+            backup_path = self.backup_dir / backup_name
+            shutil.copy2(config_path, backup_path)
+            return backup_path
+        except Exception as e:
+            print(f"Backup failed: {e}")
+            return None
+
+    def backup_data(
+        self, config_path: Path, data: Dict, tag: str = "memory"
+    ) -> Optional[Path]:
+        """备份当前内存态配置（不依赖磁盘内容）"""
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = f"{config_path.stem}.{timestamp}.{tag}.bak"
+            backup_path = self.backup_dir / backup_name
+            with open(backup_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            return backup_path
+        except Exception as e:
+            print(f"Backup data failed: {e}")
+            return None
+
+    @staticmethod
+    def file_hash(path: Path) -> Optional[str]:
+        """计算文件哈希，用于检测外部修改"""
+        try:
+            if not path.exists():
+                return None
+            with open(path, "rb") as f:
+                data = f.read()
+            return hashlib.md5(data).hexdigest()
+        except Exception as e:
+            print(f"Hash failed: {e}")
+            return None
+
+    def list_backups(self, config_name: Optional[str] = None) -> List[Dict]:
+        """列出所有备份文件，按时间倒序"""
+        try:
+            backups = []
+            for f in self.backup_dir.glob("*.bak"):
+                parts = f.stem.split(".")
+                if len(parts) >= 3:
+                    name = parts[0]
+                    timestamp = parts[1]
+                    tag = parts[2] if len(parts) > 2 else "auto"
+                    if config_name is None or name == config_name:
+                        backups.append(
+                            {
+                                "path": f,
+                                "name": name,
+                                "timestamp": timestamp,
+                                "tag": tag,
+                                "display": f"{name} - {timestamp} ({tag})",
+                            }
+                        )
+            backups.sort(key=lambda x: x["timestamp"], reverse=True)
+            return backups
+        except Exception as e:
+            print(f"List backups failed: {e}")
+            return []
+
+    def restore(self, backup_path: Path, target_path: Path) -> bool:
+        """从备份恢复配置"""
+        try:
+            if not backup_path.exists():
+                return False
+            self.backup(target_path, tag="before_restore")
+            shutil.copy2(backup_path, target_path)
+            return True
+        except Exception as e:
+            print(f"Restore failed: {e}")
+            return False
+
+    def delete_backup(self, backup_path: Path) -> bool:
+        """删除指定备份"""
+        try:
+            if backup_path.exists():
+                backup_path.unlink()
+                return True
+            return False
+        except Exception as e:
+            print(f"Delete backup failed: {e}")
+            return False
+
+
+class ConfigTransactionError(Exception):
+    """多文件事务提交失败（已回滚）"""
+
+    def __init__(self, path: Path, reason: str):
+        self.path = path
+        self.reason = reason
+        super().__init__(f"写入配置失败，已回滚 ({path}): {reason}")
+
+
+class ConfigTransaction:
+    """多个配置文件的原子提交
+
+    提交分三步：
+    1. 新内容写入目标同目录的临时文件，原内容复制到日志目录
+    2. 写入日志 journal.json，记录各目标的原内容与临时文件，
+       以及追加写入的文件的原长度
+    3. 依次用 os.replace 替换目标文件、追加内容，全部完成后删除日志
+
+    第 3 步失败时立即按日志回滚；进程在第 3 步中断时，下次启动调用 recover()
+    回滚。因此这些文件要么全部是新内容，要么全部是原内容。
+    """
+
+    JOURNAL_FILE = "journal.json"
+
+    def __init__(
+        self, journal_dir: Path, backup_manager=None, backup_tag: str = "before-save"
+    ):
+        self.journal_dir = journal_dir
+        self.backup_manager = backup_manager
+        self.backup_tag = backup_tag
+        self._staged: List[Tuple[Path, str, bool]] = []
+        self._appends: List[Tuple[Path, str]] = []
+
+    def stage(self, path: Path, data: Dict, backup: bool = True) -> None:
+        """登记要写入的文件；提供了备份管理器且 backup 为 True 时，提交前备份原文件"""
+        self._staged.append((path, ConfigManager.serialize(path, data), backup))
+
+    def stage_append(self, path: Path, text: str) -> None:
+        """登记要追加到文件末尾的内容（如操作日志），回滚时截断到原长度"""
+        self._appends.append((path, text))
+
+    def commit(self) -> List[Path]:
+        """提交所有登记的文件，失败时回滚并抛出 ConfigTransactionError"""
+        if not self._staged and not self._appends:
+            return []
+        # 上一次事务中断留下的日志先回滚，避免覆盖其中记录的原内容
+        self.recover(self.journal_dir)
+
+        entries: List[Dict[str, Any]] = []
+        path = (self._staged or self._appends)[0][0]
+        try:
+            self.journal_dir.mkdir(parents=True, exist_ok=True)
+            for index, (path, text, backup) in enumerate(self._staged):
+                original = None
+                if path.exists():
+                    if self.backup_manager:
+                        if backup:
+                            self.backup_manager.backup(path, tag=self.backup_tag)
+                        if ConfigManager.has_jsonc_comments(path):
+                            self.backup_manager.backup(path, tag="jsonc-auto")
+                    original = self.journal_dir / f"{index}.orig"
+                    shutil.copyfile(path, original)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pending = path.with_name(f".{path.name}.occm-pending")
+                self._write_synced(pending, text)
+                entries.append(
+                    {
+                        "target": str(path),
+                        "original": str(original) if original else None,
+                        "pending": str(pending),
+                    }
+                )
+            for path, _ in self._appends:
+                size = path.stat().st_size if path.exists() else None
+                entries.append({"target": str(path), "append_from": size})
+            journal_tmp = self.journal_dir / (self.JOURNAL_FILE + ".tmp")
+            self._write_synced(journal_tmp, json.dumps({"entries": entries}))
+            os.replace(journal_tmp, self.journal_dir / self.JOURNAL_FILE)
+        except OSError as e:
+            # 尚未替换任何目标文件，丢弃临时文件即可
+            self._rollback(entries)
+            raise ConfigTransactionError(path, str(e)) from e
+
+        try:
+            for entry in entries[: len(self._staged)]:
+                path = Path(entry["target"])
+                os.replace(entry["pending"], path)
+            for path, text in self._appends:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            self._rollback(entries)
+            raise ConfigTransactionError(path, str(e)) from e
+
+        # 删除日志即视为提交完成
+        self._clear_journal()
+        return [path for path, _, _ in self._staged] + [
+            path for path, _ in self._appends
+        ]
+
+    @classmethod
+    def recover(cls, journal_dir: Path) -> List[Path]:
+        """回滚中断的事务，返回被恢复的文件（没有未完成的事务时返回空列表）"""
+        journal_file = journal_dir / cls.JOURNAL_FILE
+        if not journal_file.exists():
+            shutil.rmtree(journal_dir, ignore_errors=True)
+            return []
+        try:
+            with open(journal_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)["entries"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"读取事务日志失败: {e}")
+            return []
+        transaction = cls(journal_dir)
+        transaction._rollback(entries)
+        return [Path(entry["target"]) for entry in entries]
+
+    def _rollback(self, entries: List[Dict[str, Any]]) -> None:
+        """按日志恢复原内容并清理临时文件与日志"""
+        for entry in entries:
+            target = Path(entry["target"])
+            try:
+                if "append_from" in entry:
+                    # 追加写入的文件截断回原长度
+                    if entry["append_from"] is None:
+                        target.unlink(missing_ok=True)
+                    elif target.exists():
+                        os.truncate(target, entry["append_from"])
+                    continue
+                if entry["original"]:
+                    restoring = target.with_name(f".{target.name}.occm-restore")
+                    shutil.copyfile(entry["original"], restoring)
+                    os.replace(restoring, target)
+                elif target.exists():
+                    # 事务前不存在的文件
+                    target.unlink()
+                Path(entry["pending"]).unlink(missing_ok=True)
+            except OSError as e:
+                print(f"回滚配置失败 ({target}): {e}")
+                # 保留日志，下次启动再尝试
+                return
+        self._clear_journal()
+
+    def _clear_journal(self) -> None:
+        (self.journal_dir / self.JOURNAL_FILE).unlink(missing_ok=True)
+        shutil.rmtree(self.journal_dir, ignore_errors=True)
+
+    @staticmethod
+    def _write_synced(path: Path, text: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ==================== CLI 导出模块 ====================
+class CLIConfigWriter:
+    """CLI 配置写入器 - 原子写入配置文件"""
+
+    @staticmethod
+    def get_claude_dir() -> Path:
+        """获取 Claude 配置目录 (~/.claude/)"""
+        return Path.home() / ".claude"
+
+    @staticmethod
+    def get_codex_dir() -> Path:
+        """获取 Codex 配置目录 (~/.codex/)"""
+        return Path.home() / ".codex"
+
+    @staticmethod
+    def get_gemini_dir() -> Path:
+        """获取 Gemini 配置目录 (~/.gemini/)"""
+        return Path.home() / ".gemini"
+
+    @staticmethod
+    def get_cli_dir(cli_type: str) -> Path:
+        """根据 CLI 类型获取配置目录"""
+        if cli_type == "claude":
+            return CLIConfigWriter.get_claude_dir()
+        elif cli_type == "codex":
+            return CLIConfigWriter.get_codex_dir()
+        elif cli_type == "gemini":
+            return CLIConfigWriter.get_gemini_dir()
+        else:
+            raise ValueError(f"Unknown CLI type: {cli_type}")
+
+    def atomic_write_json(self, path: Path, data: Dict) -> None:
+        """原子写入 JSON 文件
+
+        1. 写入临时文件 (path.tmp.timestamp)
+        2. 验证 JSON 格式
+        3. 重命名替换原文件
+
+        Raises:
+            ConfigWriteError: 写入失败时抛出
+        """
+        # 确保父目录存在
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 生成临时文件路径
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        temp_path = path.parent / f"{path.name}.tmp.{timestamp}"
+
+        try:
+            # 写入临时文件
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+            # 验证写入的 JSON 格式
+            with open(temp_path, "r", encoding="utf-8") as f:
+                json.load(f)
+
+            # 原子替换（Windows 需要先删除目标文件）
+            if sys.platform == "win32" and path.exists():
+                path.unlink()
+            temp_path.rename(path)
+
+        except json.JSONDecodeError as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise ConfigWriteError(path, f"JSON 格式验证失败: {e}")
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise ConfigWriteError(path, str(e))
+
+    def atomic_write_text(self, path: Path, content: str) -> None:
+        """原子写入文本文件 (用于 TOML/.env)
+
+        Raises:
+            ConfigWriteError: 写入失败时抛出
+        """
+        # 确保父目录存在
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 生成临时文件路径
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        temp_path = path.parent / f"{path.name}.tmp.{timestamp}"
+
+        try:
+            # 写入临时文件
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            # 原子替换
+            if sys.platform == "win32" and path.exists():
+                path.unlink()
+            temp_path.rename(path)
+
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise ConfigWriteError(path, str(e))
+
+    def set_file_permissions(self, path: Path, mode: int = 0o600) -> None:
+        """设置文件权限 (Unix only)
+
+        Args:
+            path: 文件路径
+            mode: 权限模式，默认 600 (仅所有者可读写)
+        """
+        if sys.platform != "win32" and path.exists():
+            try:
+                path.chmod(mode)
+            except Exception as e:
+                print(f"设置文件权限失败 ({path}): {e}")
+
+    def write_claude_settings(self, config: Dict, merge: bool = True) -> None:
+        """写入 Claude settings.json
+
+        Args:
+            config: 要写入的配置（包含 env 字段）
+            merge: 是否与现有配置合并 (保留非 env 字段)
+        """
+        settings_path = self.get_claude_dir() / "settings.json"
+
+        if merge and settings_path.exists():
+            try:
+                with open(settings_path, "r", encoding="utf-8") as f:
+                    existing = json.load(f)
+                # 合并配置：保留现有字段，更新 env
+                existing["env"] = config.get("env", {})
+                config = existing
+            except (json.JSONDecodeError, Exception):
+                # 现有文件无效，直接覆盖
+                pass
+
+        self.atomic_write_json(settings_path, config)
+
+    def write_codex_auth(self, auth: Dict) -> None:
+        """写入 Codex auth.json"""
+        auth_path = self.get_codex_dir() / "auth.json"
+        self.atomic_write_json(auth_path, auth)
+
+    def write_codex_config(self, config_toml: str, merge: bool = True) -> None:
+        """写入 Codex config.toml
+
+        Args:
+            config_toml: TOML 格式配置字符串
+            merge: 是否保留现有的 MCP 配置等
+        """
+        config_path = self.get_codex_dir() / "config.toml"
+
+        if merge and config_path.exists():
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    existing_content = f.read()
+                # 简单合并：保留 [mcp] 段
+                mcp_section = self._extract_toml_section(existing_content, "mcp")
+                if mcp_section:
+                    config_toml = config_toml.rstrip() + "\n\n" + mcp_section
+            except Exception:
+                pass
+
+        self.atomic_write_text(config_path, config_toml)
+
+    def _extract_toml_section(self, content: str, section_name: str) -> Optional[str]:
+        """从 TOML 内容中提取指定段落"""
+        lines = content.split("\n")
+        result = []
+        in_section = False
+
+        for line in lines:
+            stripped = line.strip()
+            if stripped.startswith(f"[{section_name}"):
+                in_section = True
+                result.append(line)
+            elif in_section:
+                if stripped.startswith("[") and not stripped.startswith(
+                    f"[{section_name}"
+                ):
+                    break
+                result.append(line)
+
+        return "\n".join(result) if result else None
+
+    def write_gemini_env(self, env_map: Dict[str, str]) -> None:
+        """写入 Gemini .env 文件
+
+        格式: KEY=VALUE (每行一个)
+        """
+        env_path = self.get_gemini_dir() / ".env"
+
+        # 生成 .env 内容
+        lines = [f"{key}={value}" for key, value in env_map.items()]
+        content = "\n".join(lines) + "\n"
+
+        self.atomic_write_text(env_path, content)
+
+        # 设置文件权限 (Unix: 600)
+        self.set_file_permissions(env_path, 0o600)
+
+    def write_gemini_settings(self, security_config: Dict, merge: bool = True) -> None:
+        """写入 Gemini settings.json
+
+        Args:
+            security_config: security.auth.selectedType 配置
+            merge: 是否保留现有的 mcpServers 等字段
+        """
+        settings_path = self.get_gemini_dir() / "settings.json"
+
+        config = {"security": security_config.get("security", security_config)}
+
+        if merge and settings_path.exists():
+            try:
+                with open(settings_path, "r", encoding="utf-8") as f:
+                    existing = json.load(f)
+                # 合并配置：保留 mcpServers 等字段
+                for key, value in existing.items():
+                    if key != "security":
+                        config[key] = value
+                # 深度合并 security 字段
+                if "security" in existing:
+                    existing_security = existing["security"]
+                    new_security = config.get("security", {})
+                    for key, value in existing_security.items():
+                        if key not in new_security:
+                            new_security[key] = value
+                    config["security"] = new_security
+            except (json.JSONDecodeError, Exception):
+                pass
+
+        self.atomic_write_json(settings_path, config)
+
+
+class CLIBackupManager:
+    """CLI 配置备份管理器"""
+
+    BACKUP_DIR = Path.home() / ".opencode-backup"
+    MAX_BACKUPS = 5
+
+    def __init__(self):
+        self.backup_dir = self.BACKUP_DIR
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+
+    def create_backup(self, cli_type: str) -> Optional[Path]:
+        """创建指定 CLI 工具的配置备份
+
+        Args:
+            cli_type: "claude" | "codex" | "gemini"
+
+        Returns:
+            备份目录路径，如 ~/.opencode-backup/claude_20250119_143052/
+
+        Raises:
+            BackupError: 备份失败时抛出
+        """
+        try:
+            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
+            if not cli_dir.exists():
+                return None
+
+            # 创建备份目录
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = self.backup_dir / f"{cli_type}_{timestamp}"
+            backup_path.mkdir(parents=True, exist_ok=True)
+
+            # 复制所有配置文件
+            files_backed_up = []
+            for item in cli_dir.iterdir():
+                if item.is_file():
+                    dest = backup_path / item.name
+                    shutil.copy2(item, dest)
+                    files_backed_up.append(item.name)
+
+            if not files_backed_up:
+                # 没有文件需要备份，删除空目录
+                backup_path.rmdir()
+                return None
+
+            # 清理旧备份
+            self.cleanup_old_backups(cli_type)
+
+            return backup_path
+
+        except Exception as e:
+            raise BackupError(cli_type, str(e))
+
+    def restore_backup(self, backup_path: Path, cli_type: str) -> bool:
+        """从备份恢复配置
+
+        Args:
+            backup_path: 备份目录路径
+            cli_type: CLI 类型
+
+        Returns:
+            是否恢复成功
+
+        Raises:
+            RestoreError: 恢复失败时抛出
+        """
+        try:
+            if not backup_path.exists():
+                raise RestoreError(backup_path, "备份目录不存在")
+
+            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
+            cli_dir.mkdir(parents=True, exist_ok=True)
+
+            # 先备份当前配置
+            self.create_backup(cli_type)
+
+            # 恢复备份文件
+            for item in backup_path.iterdir():
+                if item.is_file():
+                    dest = cli_dir / item.name
+                    shutil.copy2(item, dest)
+
+            return True
+
+        except RestoreError:
+            raise
+        except Exception as e:
+            raise RestoreError(backup_path, str(e))
+
+    def list_backups(self, cli_type: str) -> List[BackupInfo]:
+        """列出指定 CLI 工具的所有备份
+
+        Args:
+            cli_type: CLI 类型
+
+        Returns:
+            备份信息列表，按时间倒序
+        """
+        backups = []
+        prefix = f"{cli_type}_"
+
+        try:
+            for item in self.backup_dir.iterdir():
+                if item.is_dir() and item.name.startswith(prefix):
+                    # 解析时间戳
+                    timestamp_str = item.name[len(prefix) :]
+                    try:
+                        created_at = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+                    except ValueError:
+                        continue
+
+                    # 获取备份文件列表
+                    files = [f.name for f in item.iterdir() if f.is_file()]
+
+                    backups.append(
+                        BackupInfo(
+                            path=item,
+                            cli_type=cli_type,
+                            created_at=created_at,
+                            files=files,
+                        )
+                    )
+
+            # 按时间倒序排序
+            backups.sort(key=lambda x: x.created_at, reverse=True)
+
+        except Exception as e:
+            print(f"列出备份失败: {e}")
+
+        return backups
+
+    def cleanup_old_backups(self, cli_type: str) -> None:
+        """清理旧备份，保留最近 MAX_BACKUPS 个
+
+        Args:
+            cli_type: CLI 类型
+        """
+        backups = self.list_backups(cli_type)
+
+        # 删除超出限制的旧备份
+        for backup in backups[self.MAX_BACKUPS :]:
+            try:
+                shutil.rmtree(backup.path)
+            except Exception as e:
+                print(f"删除旧备份失败 ({backup.path}): {e}")
+
+
+class CLIConfigGenerator:
+    """CLI 配置生成器 - 将 OpenCode 配置转换为各 CLI 工具格式"""
+
+    def generate_claude_config(self, provider: Dict, model: str = None) -> Dict:
+        """生成 Claude Code settings.json 配置
+
+        Args:
+            provider: OpenCode Provider 配置，包含 baseURL 和 apiKey
+            model: 默认模型 ID，如果为 None 或空字符串则不包含 ANTHROPIC_MODEL
+
+        Returns:
+            Claude settings.json 配置字典
+        """
+        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
+            "baseURL", ""
+        )
+        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
+            "apiKey", ""
+        )
+
+        env = {
+            "ANTHROPIC_BASE_URL": base_url,
+            "ANTHROPIC_AUTH_TOKEN": api_key,
+        }
+
+        # 仅当 model 有值时才添加
+        if model:
+            env["ANTHROPIC_MODEL"] = model
+
+        # 添加模型映射（如果有）
+        model_mappings = provider.get("modelMappings", {})
+        if model_mappings.get("haiku"):
+            env["ANTHROPIC_DEFAULT_HAIKU_MODEL"] = model_mappings["haiku"]
+        if model_mappings.get("sonnet"):
+            env["ANTHROPIC_DEFAULT_SONNET_MODEL"] = model_mappings["sonnet"]
+        if model_mappings.get("opus"):
+            env["ANTHROPIC_DEFAULT_OPUS_MODEL"] = model_mappings["opus"]
+
+        return {"env": env}
+
+    def generate_codex_auth(self, provider: Dict) -> Dict:
+        """生成 Codex auth.json 配置
+
+        Args:
+            provider: OpenCode Provider 配置
+
+        Returns:
+            Codex auth.json 配置字典
+        """
+        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
+            "apiKey", ""
+        )
+        return {"OPENAI_API_KEY": api_key}
+
+    def generate_codex_config(self, provider: Dict, model: str) -> str:
+        """生成 Codex config.toml 配置
+
+        Args:
+            provider: OpenCode Provider 配置
+            model: 默认模型 ID
+
+        Returns:
+            TOML 格式配置字符串
+        """
+        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
+            "baseURL", ""
+        )
+
+        # 确保 base_url 以 /v1 结尾
+        if base_url and not base_url.rstrip("/").endswith("/v1"):
+            base_url = base_url.rstrip("/") + "/v1"
+
+        provider_name = provider.get("name", "newapi")
+
+        lines = [
+            f'model_provider = "{provider_name}"',
+            f'model = "{model}"',
+            'model_reasoning_effort = "high"',
+            "disable_response_storage = true",
+            "",
+            f"[model_providers.{provider_name}]",
+            f'name = "{provider_name}"',
+            f'base_url = "{base_url}"',
+            'wire_api = "responses"',
+            "requires_openai_auth = true",
+        ]
+
+        return "\n".join(lines) + "\n"
+
+    def generate_gemini_env(self, provider: Dict, model: str) -> Dict[str, str]:
+        """生成 Gemini .env 配置
+
+        Args:
+            provider: OpenCode Provider 配置
+            model: 默认模型 ID
+
+        Returns:
+            环境变量字典
+        """
+        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
+            "baseURL", ""
+        )
+        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
+            "apiKey", ""
+        )
+
+        return {
+            "GOOGLE_GEMINI_BASE_URL": base_url,
+            "GEMINI_API_KEY": api_key,
+            "GEMINI_MODEL": model,
+        }
+
+    def generate_gemini_settings(self, auth_type: str = "gemini-api-key") -> Dict:
+        """生成 Gemini settings.json 中的 security 配置
+
+        Args:
+            auth_type: 认证类型，默认 "gemini-api-key"
+
+        Returns:
+            security 配置字典
+        """
+        return {"security": {"auth": {"selectedType": auth_type}}}
+
+
+class CLIExportManager:
+    """CLI 工具导出管理器"""
+
+    def __init__(self):
+        self.config_generator = CLIConfigGenerator()
+        self.config_writer = CLIConfigWriter()
+        self.backup_manager = CLIBackupManager()
+
+    def detect_cli_tools(self) -> Dict[str, CLIToolStatus]:
+        """检测已安装的 CLI 工具
+
+        Returns:
+            {cli_type: CLIToolStatus} 字典
+        """
+        result = {}
+
+        for cli_type in ["claude", "codex", "gemini"]:
+            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
+            installed = cli_dir.exists()
+
+            # 检查是否有配置文件
+            has_config = False
+            if installed:
+                if cli_type == "claude":
+                    has_config = (cli_dir / "settings.json").exists()
+                elif cli_type == "codex":
+                    has_config = (cli_dir / "config.toml").exists() or (
+                        cli_dir / "auth.json"
+                    ).exists()
+                elif cli_type == "gemini":
+                    has_config = (cli_dir / "settings.json").exists() or (
+                        cli_dir / ".env"
+                    ).exists()
+
+            result[cli_type] = CLIToolStatus(
+                cli_type=cli_type,
+                installed=installed,
+                config_dir=cli_dir if installed else None,
+                has_config=has_config,
+                version=None,  # 版本检测暂不实现
+            )
+
+        return result
+
+    def validate_provider(self, provider: Dict) -> ValidationResult:
+        """验证 Provider 配置完整性
+
+        Args:
+            provider: OpenCode Provider 配置
+
+        Returns:
+            ValidationResult
+        """
+        errors = []
+        warnings = []
+
+        # 检查 baseURL
+        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
+            "baseURL", ""
+        )
+        if not base_url or not base_url.strip():
+            errors.append("缺少 API 地址 (baseURL)")
+
+        # 检查 apiKey
+        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
+            "apiKey", ""
+        )
+        if not api_key or not api_key.strip():
+            errors.append("缺少 API 密钥 (apiKey)")
+
+        # 检查 Model 配置
+        models = provider.get("models", {})
+        if not models:
+            warnings.append("未配置任何模型")
+
+        if errors:
+            return ValidationResult.failure(errors, warnings)
+        return ValidationResult(valid=True, errors=[], warnings=warnings)
+
+    def export_to_claude(self, provider: Dict, model: str) -> ExportResult:
+        """导出到 Claude Code
+
+        Args:
+            provider: OpenCode Provider 配置
+            model: 默认模型 ID
+
+        Returns:
+            ExportResult
+        """
+        cli_type = "claude"
+        backup_path = None
+
+        try:
+            # 验证 Provider
+            validation = self.validate_provider(provider)
+            if not validation.valid:
+                return ExportResult.fail(cli_type, "; ".join(validation.errors))
+
+            # 创建备份
+            backup_path = self.backup_manager.create_backup(cli_type)
+
+            # 生成配置
+            config = self.config_generator.generate_claude_config(provider, model)
+
+            # 写入配置
+            self.config_writer.write_claude_settings(config)
+
+            settings_path = CLIConfigWriter.get_claude_dir() / "settings.json"
+            return ExportResult.ok(cli_type, [settings_path], backup_path)
+
+        except CLIExportError as e:
+            return ExportResult.fail(cli_type, str(e), backup_path)
+        except Exception as e:
+            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+
+    def export_to_codex(self, provider: Dict, model: str) -> ExportResult:
+        """导出到 Codex CLI
+
+        Args:
+            provider: OpenCode Provider 配置
+            model: 默认模型 ID
+
+        Returns:
+            ExportResult
+        """
+        cli_type = "codex"
+        backup_path = None
+
+        try:
+            # 验证 Provider
+            validation = self.validate_provider(provider)
+            if not validation.valid:
+                return ExportResult.fail(cli_type, "; ".join(validation.errors))
+
+            # 创建备份
+            backup_path = self.backup_manager.create_backup(cli_type)
+
+            # 生成配置
+            auth = self.config_generator.generate_codex_auth(provider)
+            config_toml = self.config_generator.generate_codex_config(provider, model)
+
+            # 写入配置
+            self.config_writer.write_codex_auth(auth)
+            self.config_writer.write_codex_config(config_toml)
+
+            codex_dir = CLIConfigWriter.get_codex_dir()
+            return ExportResult.ok(
+                cli_type,
+                [codex_dir / "auth.json", codex_dir / "config.toml"],
+                backup_path,
+            )
+
+        except CLIExportError as e:
+            return ExportResult.fail(cli_type, str(e), backup_path)
+        except Exception as e:
+            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+
+    def export_to_gemini(self, provider: Dict, model: str) -> ExportResult:
+        """导出到 Gemini CLI
+
+        Args:
+            provider: OpenCode Provider 配置
+            model: 默认模型 ID
+
+        Returns:
+            ExportResult
+        """
+        cli_type = "gemini"
+        backup_path = None
+
+        try:
+            # 验证 Provider
+            validation = self.validate_provider(provider)
+            if not validation.valid:
+                return ExportResult.fail(cli_type, "; ".join(validation.errors))
+
+            # 创建备份
+            backup_path = self.backup_manager.create_backup(cli_type)
+
+            # 生成配置
+            env_map = self.config_generator.generate_gemini_env(provider, model)
+            settings = self.config_generator.generate_gemini_settings()
+
+            # 写入配置
+            self.config_writer.write_gemini_env(env_map)
+            self.config_writer.write_gemini_settings(settings)
+
+            gemini_dir = CLIConfigWriter.get_gemini_dir()
+            return ExportResult.ok(
+                cli_type,
+                [gemini_dir / ".env", gemini_dir / "settings.json"],
+                backup_path,
+            )
+
+        except CLIExportError as e:
+            return ExportResult.fail(cli_type, str(e), backup_path)
+        except Exception as e:
+            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+
+    def batch_export(
+        self, provider: Dict, models: Dict[str, str], targets: List[str]
+    ) -> BatchExportResult:
+        """批量导出到多个 CLI 工具
+
+        Args:
+            provider: OpenCode Provider 配置
+            models: {cli_type: model_id} 字典
+            targets: 要导出的 CLI 类型列表
+
+        Returns:
+            BatchExportResult
+        """
+        results = []
+
+        for cli_type in targets:
+            model = models.get(cli_type, "")
+
+            try:
+                if cli_type == "claude":
+                    result = self.export_to_claude(provider, model)
+                elif cli_type == "codex":
+                    result = self.export_to_codex(provider, model)
+                elif cli_type == "gemini":
+                    result = self.export_to_gemini(provider, model)
+                else:
+                    result = ExportResult.fail(cli_type, f"未知的 CLI 类型: {cli_type}")
+            except Exception as e:
+                result = ExportResult.fail(cli_type, f"导出异常: {e}")
+
+            results.append(result)
+
+        successful = sum(1 for r in results if r.success)
+        failed = len(results) - successful
+
+        return BatchExportResult(
+            total=len(results), successful=successful, failed=failed, results=results
+        )
+
+    def validate_exported_config(self, cli_type: str) -> ValidationResult:
+        """验证导出后的配置
+
+        Args:
+            cli_type: CLI 类型
+
+        Returns:
+            ValidationResult
+        """
+        errors = []
+        warnings = []
+
+        cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
+
+        if cli_type == "claude":
+            settings_path = cli_dir / "settings.json"
+            if not settings_path.exists():
+                errors.append("settings.json 文件不存在")
+            else:
+                try:
+                    with open(settings_path, "r", encoding="utf-8") as f:
+                        config = json.load(f)
+                    if "env" not in config:
+                        errors.append("settings.json 缺少 env 字段")
+                    else:
+                        env = config["env"]
+                        if "ANTHROPIC_BASE_URL" not in env:
+                            errors.append("缺少 ANTHROPIC_BASE_URL")
+                        if "ANTHROPIC_AUTH_TOKEN" not in env:
+                            errors.append("缺少 ANTHROPIC_AUTH_TOKEN")
+                except json.JSONDecodeError as e:
+                    errors.append(f"settings.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 settings.json 失败: {e}")
+
+        elif cli_type == "codex":
+            auth_path = cli_dir / "auth.json"
+            config_path = cli_dir / "config.toml"
+
+            if not auth_path.exists():
+                errors.append("auth.json 文件不存在")
+            else:
+                try:
+                    with open(auth_path, "r", encoding="utf-8") as f:
+                        auth = json.load(f)
+                    if "OPENAI_API_KEY" not in auth:
+                        errors.append("auth.json 缺少 OPENAI_API_KEY")
+                except json.JSONDecodeError as e:
+                    errors.append(f"auth.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 auth.json 失败: {e}")
+
+            if not config_path.exists():
+                errors.append("config.toml 文件不存在")
+            else:
+                try:
+                    with open(config_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                    if "model_provider" not in content:
+                        errors.append("config.toml 缺少 model_provider")
+                    if "model =" not in content:
+                        errors.append("config.toml 缺少 model")
+                except Exception as e:
+                    errors.append(f"读取 config.toml 失败: {e}")
+
+        elif cli_type == "gemini":
+            env_path = cli_dir / ".env"
+            settings_path = cli_dir / "settings.json"
+
+            if not env_path.exists():
+                errors.append(".env 文件不存在")
+            else:
+                try:
+                    with open(env_path, "r", encoding="utf-8") as f:
+                        content = f.read()
+                    if "GEMINI_API_KEY" not in content:
+                        errors.append(".env 缺少 GEMINI_API_KEY")
+                    if "GOOGLE_GEMINI_BASE_URL" not in content:
+                        errors.append(".env 缺少 GOOGLE_GEMINI_BASE_URL")
+                except Exception as e:
+                    errors.append(f"读取 .env 失败: {e}")
+
+            if not settings_path.exists():
+                warnings.append("settings.json 文件不存在")
+            else:
+                try:
+                    with open(settings_path, "r", encoding="utf-8") as f:
+                        config = json.load(f)
+                    if "security" not in config:
+                        warnings.append("settings.json 缺少 security 字段")
+                except json.JSONDecodeError as e:
+                    errors.append(f"settings.json 格式错误: {e}")
+                except Exception as e:
+                    errors.append(f"读取 settings.json 失败: {e}")
+
+        if errors:
+            return ValidationResult.failure(errors, warnings)
+        return ValidationResult(valid=True, errors=[], warnings=warnings)
+
+
+# ==================== JSON Schema 编译验证 ====================
+def json_pointer(parts) -> str:
+    """将路径片段转换为 JSON Pointer (RFC 6901)，空路径表示整个文档"""
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts
+    )
+
+
+class CompiledSchema:
+    """JSON Schema (draft-07 子集) 编译器
+
+    构造时将 schema 一次性生成为 Python 源码并编译成验证函数：类型判断、
+    必需字段、枚举等检查直接内联，验证时不再解释 schema；出错路径只在
+    产生问题时才拼接，正常数据的验证开销接近手写代码。
+    支持: type, enum, const, required, properties, additionalProperties,
+    items, minimum, maximum, minLength, anyOf, $ref (#/definitions/...)
+    遇到不支持的关键字直接报错，避免 schema 中的约束被静默忽略。
+    """
+
+    ANNOTATIONS = {
+        "$schema",
+        "$id",
+        "$comment",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "definitions",
+    }
+    KEYWORDS = {
+        "$ref",
+        "type",
+        "enum",
+        "const",
+        "required",
+        "properties",
+        "additionalProperties",
+        "items",
+        "minimum",
+        "maximum",
+        "minLength",
+        "anyOf",
+    }
+    TYPE_NAMES = {
+        "object": "对象",
+        "array": "数组",
+        "string": "字符串",
+        "boolean": "布尔值",
+        "integer": "整数",
+        "number": "数字",
+        "null": "null",
+    }
+    _TYPE_TESTS = {
+        "object": "isinstance({v}, dict)",
+        "array": "isinstance({v}, list)",
+        "string": "isinstance({v}, str)",
+        "boolean": "isinstance({v}, bool)",
+        "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+        "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+        "null": "{v} is None",
+    }
+
+    def __init__(self, schema: Dict, level: str = "error"):
+        self.level = level
+        self._root = schema
+        self._lines: List[str] = []
+        self._namespace: Dict[str, Any] = {
+            "_issue": self._issue,
+            "_any_of": self._check_any_of,
+            "_MISSING": object(),
+        }
+        self._refs: Dict[str, str] = {}
+        self._counter = 0
+        entry = self._define_function(schema)
+        self.source = "\n".join(self._lines)
+        exec(compile(self.source, "<schema>", "exec"), self._namespace)
+        self._validate = self._namespace[entry]
+
+    def validate(self, data: Any) -> List[Dict]:
+        """验证数据，返回问题列表（每项附带 JSON Pointer）"""
+        issues: List[Dict] = []
+        self._validate(data, (), issues)
+        return issues
+
+    def _issue(self, parts: Tuple, message: str) -> Dict:
+        path = ".".join(str(part) for part in parts) or "root"
+        return {
+            "level": self.level,
+            "path": path,
+            "pointer": json_pointer(parts),
+            "message": f"{path}: {message}",
+        }
+
+    # ---------- 代码生成 ----------
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _const(self, value: Any) -> str:
+        name = self._name("_c")
+        self._namespace[name] = value
+        return name
+
+    def _define_function(self, node: Any, name: Optional[str] = None) -> str:
+        """为 schema 节点生成独立函数 fn(v, p, issues)，返回函数名"""
+        name = name or self._name("_fn")
+        body = self._emit(node, "v", "p", 1)
+        self._lines.append(f"def {name}(v, p, issues):")
+        self._lines.extend(body or ["    pass"])
+        return name
+
+    def _emit(self, node: Any, v: str, p: str, depth: int) -> List[str]:
+        """生成验证 v 的语句列表；p 为路径元组表达式，只在产生问题时求值"""
+        pad = "    " * depth
+        if node is True or node == {}:
+            return []
+        if node is False:
+            return [f"{pad}issues.append(_issue({p}, '不允许出现该字段'))"]
+        unknown = set(node) - self.KEYWORDS - self.ANNOTATIONS
+        if unknown:
+            raise ValueError(f"不支持的 schema 关键字: {', '.join(sorted(unknown))}")
+        if "$ref" in node:
+            # draft-07: $ref 的同级关键字被忽略
+            return [f"{pad}{self._ref(node['$ref'])}({v}, {p}, issues)"]
+
+        expected = node.get("type")
+        names = [expected] if isinstance(expected, str) else list(expected or [])
+        # 类型不符时不再检查该节点的其他约束；类型已确定时省略重复的类型判断
+        rest = (
+            self._emit_enum(node, v, p, depth)
+            + self._emit_range(node, v, p, depth)
+            + self._emit_object(node, v, p, depth, names == ["object"])
+            + self._emit_items(node, v, p, depth, names == ["array"])
+            + self._emit_any_of(node, v, p, depth)
+        )
+        if not names:
+            return rest
+        test = " or ".join(self._TYPE_TESTS[n].format(v=v) for n in names)
+        message = "应为" + " 或 ".join(self.TYPE_NAMES[n] for n in names) + "，当前是 "
+        lines = [
+            f"{pad}if not ({test}):",
+            f"{pad}    issues.append(_issue({p}, {message!r} + type({v}).__name__))",
+        ]
+        if rest:
+            lines.append(f"{pad}else:")
+            lines.extend("    " + line for line in rest)
+        return lines
+
+    def _ref(self, ref: str) -> str:
+        if not ref.startswith("#/definitions/"):
+            raise ValueError(f"只支持本地 definitions 引用: {ref}")
+        key = ref[len("#/definitions/") :]
+        if key not in self._refs:
+            # 先登记函数名再生成函数体，支持递归引用
+            self._refs[key] = self._name("_ref")
+            self._define_function(self._root["definitions"][key], self._refs[key])
+        return self._refs[key]
+
+    def _emit_enum(self, node: Dict, v: str, p: str, depth: int) -> List[str]:
+        if "const" in node:
+            allowed = [node["const"]]
+        elif "enum" in node:
+            allowed = list(node["enum"])
+        else:
+            return []
+        pad = "    " * depth
+        label = ", ".join(json.dumps(x, ensure_ascii=False) for x in allowed)
+        message = repr(f"取值必须是 {label} 之一")
+        if all(isinstance(x, str) for x in allowed):
+            test = f"not isinstance({v}, str) or {v} not in {self._const(frozenset(allowed))}"
+        else:
+            # 同时比较类型，避免 True == 1 之类的误判
+            pairs = self._const([(type(x), x) for x in allowed])
+            test = f"(type({v}), {v}) not in {pairs}"
+        return [f"{pad}if {test}:", f"{pad}    issues.append(_issue({p}, {message}))"]
+
+    def _emit_range(self, node: Dict, v: str, p: str, depth: int) -> List[str]:
+        pad = "    " * depth
+        lines = []
+        numeric = []
+        if node.get("minimum") is not None:
+            numeric.append(
+                (f"{v} < {node['minimum']!r}", f"不能小于 {node['minimum']}")
+            )
+        if node.get("maximum") is not None:
+            numeric.append(
+                (f"{v} > {node['maximum']!r}", f"不能大于 {node['maximum']}")
+            )
+        if numeric:
+            lines.append(
+                f"{pad}if isinstance({v}, (int, float)) and not isinstance({v}, bool):"
+            )
+            for test, message in numeric:
+                lines.append(f"{pad}    if {test}:")
+                lines.append(f"{pad}        issues.append(_issue({p}, {message!r}))")
+        if node.get("minLength") is not None:
+            min_length = node["minLength"]
+            lines.append(f"{pad}if isinstance({v}, str) and len({v}) < {min_length!r}:")
+            lines.append(
+                f"{pad}    issues.append(_issue({p}, {f'长度不能小于 {min_length}'!r}))"
+            )
+        return lines
+
+    def _emit_object(
+        self, node: Dict, v: str, p: str, depth: int, is_dict: bool
+    ) -> List[str]:
+        # 已确定是对象时省略外层 isinstance 判断，语句整体少缩进一级
+        base = depth - 1 if is_dict else depth
+        pad = "    " * base
+        inner = []
+        for name in node.get("required", []):
+            inner.append(f"{pad}    if {name!r} not in {v}:")
+            inner.append(
+                f"{pad}        issues.append(_issue({p} + ({name!r},), '缺少必需字段'))"
+            )
+        properties = node.get("properties", {})
+        for name, sub in properties.items():
+            x = self._name("x")
+            body = self._emit(sub, x, f"{p} + ({name!r},)", base + 2)
+            if body:
+                inner.append(f"{pad}    {x} = {v}.get({name!r}, _MISSING)")
+                inner.append(f"{pad}    if {x} is not _MISSING:")
+                inner.extend(body)
+        additional = node.get("additionalProperties", True)
+        k, x = self._name("k"), self._name("x")
+        body = self._emit(
+            additional, x, f"{p} + ({k},)", base + (3 if properties else 2)
+        )
+        if body:
+            inner.append(f"{pad}    for {k}, {x} in {v}.items():")
+            if properties:
+                known = self._const(frozenset(properties))
+                inner.append(f"{pad}        if {k} not in {known}:")
+            inner.extend(body)
+        if not inner or is_dict:
+            return inner
+        return [f"{pad}if isinstance({v}, dict):"] + inner
+
+    def _emit_items(
+        self, node: Dict, v: str, p: str, depth: int, is_list: bool
+    ) -> List[str]:
+        if "items" not in node:
+            return []
+        base = depth - 1 if is_list else depth
+        pad = "    " * base
+        i, x = self._name("i"), self._name("x")
+        body = self._emit(node["items"], x, f"{p} + ({i},)", base + 2)
+        if not body:
+            return []
+        loop = [f"{pad}    for {i}, {x} in enumerate({v}):"] + body
+        return loop if is_list else [f"{pad}if isinstance({v}, list):"] + loop
+
+    def _emit_any_of(self, node: Dict, v: str, p: str, depth: int) -> List[str]:
+        if "anyOf" not in node:
+            return []
+        if any(option is True or option == {} for option in node["anyOf"]):
+            return []  # 其中一项无约束，任何值都满足
+        options = ", ".join(self._define_function(o) for o in node["anyOf"])
+        pad = "    " * depth
+        return [f"{pad}_any_of({v}, {p}, issues, ({options},))"]
+
+    def _check_any_of(self, value: Any, parts: Tuple, issues: List, options) -> None:
+        """anyOf: 任一分支无问题即通过"""
+        here = json_pointer(parts)
+        nested = None
+        for option in options:
+            trial: List[Dict] = []
+            option(value, parts, trial)
+            if not trial:
+                return
+            if nested is None and all(i["pointer"] != here for i in trial):
+                # 类型匹配但内部有问题的分支，报告其具体问题更有帮助
+                nested = trial
+        if nested is not None:
+            issues.extend(nested)
+        else:
+            issues.append(self._issue(parts, "不符合任何允许的格式"))
+
+
+class ConfigValidator:
+    """配置文件验证器 - 检查 OpenCode 配置格式是否正确"""
+
+    @staticmethod
+    def _is_blank(value: Any) -> bool:
+        if value is None:
+            return True
+        if isinstance(value, str):
+            return value.strip() == ""
+        return False
+
+    # Provider 必需字段
+    PROVIDER_REQUIRED_FIELDS = ["npm", "options"]
+    # Provider options 必需字段
+    PROVIDER_OPTIONS_REQUIRED = ["baseURL", "apiKey"]
+    # Model 推荐字段
+    MODEL_RECOMMENDED_FIELDS = ["name", "limit"]
+    # Oh My OpenCode 必需字段
+    OHMY_AGENT_REQUIRED_FIELDS = ["model"]
+    OHMY_CATEGORY_REQUIRED_FIELDS = ["model"]
+    # 有效的 npm 包
+    VALID_NPM_PACKAGES = [
+        "@ai-sdk/anthropic",
+        "@ai-sdk/openai",
+        "@ai-sdk/openai-compatible",
+        "@ai-sdk/google",
+        "@ai-sdk/azure",
+        "@ai-sdk/amazon-bedrock",
+        "@ai-sdk/google-vertex",
+        "@ai-sdk/mistral",
+        "@ai-sdk/xai",
+        "@ai-sdk/togetherai",
+        "@ai-sdk/cohere",
+        "@ai-sdk/deepseek",
+    ]
+    # 离线内置的 JSON Schema（schemas 目录），首次使用时编译
+    SCHEMA_FILES = {
+        "opencode": "opencode.schema.json",
+        "ohmy": "oh-my-opencode.schema.json",
+    }
+    _compiled_schemas: Dict[str, Optional[CompiledSchema]] = {}
+
+    @staticmethod
+    def _issue(level: str, parts: Tuple, message: str) -> Dict:
+        """构造问题条目: path 为点分路径（便于阅读），pointer 为 JSON Pointer（精确定位）"""
+        return {
+            "level": level,
+            "path": ".".join(str(part) for part in parts) or "root",
+            "pointer": json_pointer(parts),
+            "message": message,
+        }
+
+    @classmethod
+    def get_schema(cls, name: str) -> Optional[CompiledSchema]:
+        """加载并编译内置 schema（每个 schema 只编译一次），加载失败时返回 None"""
+        if name not in cls._compiled_schemas:
+            path = Path(__file__).parent / "schemas" / cls.SCHEMA_FILES[name]
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    # 内置 schema 只覆盖部分字段，违反时作为警告提示，不阻止保存或重新加载
+                    cls._compiled_schemas[name] = CompiledSchema(
+                        json.load(f), level="warning"
+                    )
+            except (OSError, ValueError) as e:
+                print(f"加载配置 schema 失败 {path}: {e}")
+                cls._compiled_schemas[name] = None
+        return cls._compiled_schemas[name]
+
+    @staticmethod
+    def _add_schema_issues(name: str, config: Dict, issues: List[Dict]) -> None:
+        """追加 schema 验证问题，跳过手写规则已在同一位置报告的问题"""
+        schema = ConfigValidator.get_schema(name)
+        if schema is None:
+            return
+        reported = {issue["pointer"] for issue in issues}
+        issues.extend(
+            issue
+            for issue in schema.validate(config)
+            if issue["pointer"] not in reported
+        )
+
+    @staticmethod
+    def validate_provider(provider_name: str, provider_data: Any) -> List[Dict]:
+        """验证单个 Provider 子树"""
+        issues = []
+        provider_path = ("provider", provider_name)
+
+        # 检查 provider 值是否为字典
+        if not isinstance(provider_data, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error",
+                    provider_path,
+                    f"Provider '{provider_name}' 的值必须是对象，当前是 {type(provider_data).__name__}",
+                )
+            )
+            return issues
+
+        # 检查必需字段
+        for field in ConfigValidator.PROVIDER_REQUIRED_FIELDS:
+            if field not in provider_data:
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        provider_path + (field,),
+                        f"Provider '{provider_name}' 缺少必需字段 '{field}'",
+                    )
+                )
+            elif ConfigValidator._is_blank(provider_data.get(field)):
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        provider_path + (field,),
+                        f"Provider '{provider_name}' 的 '{field}' 为空",
+                    )
+                )
+
+        # 检查 npm 包是否有效
+        npm = provider_data.get("npm", "")
+        if npm and npm not in ConfigValidator.VALID_NPM_PACKAGES:
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    provider_path + ("npm",),
+                    f"Provider '{provider_name}' 的 npm 包 '{npm}' 不在已知列表中",
+                )
+            )
+
+        # 检查 options
+        options = provider_data.get("options", {})
+        if not isinstance(options, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error",
+                    provider_path + ("options",),
+                    f"Provider '{provider_name}' 的 options 必须是对象",
+                )
+            )
+        else:
+            for opt_field in ConfigValidator.PROVIDER_OPTIONS_REQUIRED:
+                if opt_field not in options:
+                    issues.append(
+                        ConfigValidator._issue(
+                            "warning",
+                            provider_path + ("options", opt_field),
+                            f"Provider '{provider_name}' 的 options 缺少 '{opt_field}'",
+                        )
+                    )
+                elif ConfigValidator._is_blank(options.get(opt_field)):
+                    issues.append(
+                        ConfigValidator._issue(
+                            "warning",
+                            provider_path + ("options", opt_field),
+                            f"Provider '{provider_name}' 的 options.{opt_field} 为空",
+                        )
+                    )
+
+        # 检查 models
+        models = provider_data.get("models", {})
+        if not isinstance(models, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error",
+                    provider_path + ("models",),
+                    f"Provider '{provider_name}' 的 models 必须是对象",
+                )
+            )
+        else:
+            if not models:
+                issues.append(
+                    ConfigValidator._issue(
+                        "warning",
+                        provider_path + ("models",),
+                        f"Provider '{provider_name}' 没有配置任何模型",
+                    )
+                )
+            for model_id, model_data in models.items():
+                model_path = provider_path + ("models", model_id)
+                if ConfigValidator._is_blank(model_id):
+                    issues.append(
+                        ConfigValidator._issue(
+                            "error",
+                            model_path,
+                            f"Provider '{provider_name}' 存在空模型ID",
+                        )
+                    )
+                    continue
+                if not isinstance(model_data, dict):
+                    issues.append(
+                        ConfigValidator._issue(
+                            "error", model_path, f"Model '{model_id}' 的值必须是对象"
+                        )
+                    )
+                    continue
+
+                # 检查 limit 字段
+                limit = model_data.get("limit", {})
+                if not isinstance(limit, dict):
+                    issues.append(
+                        ConfigValidator._issue(
+                            "warning",
+                            model_path + ("limit",),
+                            f"Model '{model_id}' 的 limit 应该是对象",
+                        )
+                    )
+                elif limit:
+                    context = limit.get("context")
+                    output = limit.get("output")
+                    if context is not None and not isinstance(context, int):
+                        issues.append(
+                            ConfigValidator._issue(
+                                "warning",
+                                model_path + ("limit", "context"),
+                                f"Model '{model_id}' 的 context 应该是整数",
+                            )
+                        )
+                    if output is not None and not isinstance(output, int):
+                        issues.append(
+                            ConfigValidator._issue(
+                                "warning",
+                                model_path + ("limit", "output"),
+                                f"Model '{model_id}' 的 output 应该是整数",
+                            )
+                        )
+        return issues
+
+    @staticmethod
+    def validate_mcp(mcp_name: str, mcp_data: Any) -> List[Dict]:
+        """验证单个 MCP 子树"""
+        issues = []
+        mcp_path = ("mcp", mcp_name)
+        if not isinstance(mcp_data, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error", mcp_path, f"MCP '{mcp_name}' 的值必须是对象"
+                )
+            )
+            return issues
+
+        mcp_type = mcp_data.get("type")
+        if mcp_type == "local" and "command" not in mcp_data:
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    mcp_path + ("command",),
+                    f"Local MCP '{mcp_name}' 缺少 command 字段",
+                )
+            )
+        elif mcp_type == "remote" and "url" not in mcp_data:
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    mcp_path + ("url",),
+                    f"Remote MCP '{mcp_name}' 缺少 url 字段",
+                )
+            )
+        return issues
+
+    @staticmethod
+    def validate_ohmy_agent(agent_name: str, agent_data: Any) -> List[Dict]:
+        """验证单个 Oh My OpenCode Agent 子树"""
+        issues = []
+        agent_path = ("agents", agent_name)
+        if ConfigValidator._is_blank(agent_name):
+            issues.append(ConfigValidator._issue("error", agent_path, "Agent 名称为空"))
+            return issues
+        if not isinstance(agent_data, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error", agent_path, f"Agent '{agent_name}' 的值必须是对象"
+                )
+            )
+            return issues
+        for field in ConfigValidator.OHMY_AGENT_REQUIRED_FIELDS:
+            if field not in agent_data:
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        agent_path + (field,),
+                        f"Agent '{agent_name}' 缺少必需字段 '{field}'",
+                    )
+                )
+            elif ConfigValidator._is_blank(agent_data.get(field)):
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        agent_path + (field,),
+                        f"Agent '{agent_name}' 的 '{field}' 为空",
+                    )
+                )
+        if "description" in agent_data and ConfigValidator._is_blank(
+            agent_data.get("description")
+        ):
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    agent_path + ("description",),
+                    f"Agent '{agent_name}' 的 description 为空",
+                )
+            )
+        return issues
+
+    @staticmethod
+    def validate_ohmy_category(category_name: str, category_data: Any) -> List[Dict]:
+        """验证单个 Oh My OpenCode Category 子树"""
+        issues = []
+        category_path = ("categories", category_name)
+        if ConfigValidator._is_blank(category_name):
+            issues.append(
+                ConfigValidator._issue("error", category_path, "Category 名称为空")
+            )
+            return issues
+        if not isinstance(category_data, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error", category_path, f"Category '{category_name}' 的值必须是对象"
+                )
+            )
+            return issues
+        for field in ConfigValidator.OHMY_CATEGORY_REQUIRED_FIELDS:
+            if field not in category_data:
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        category_path + (field,),
+                        f"Category '{category_name}' 缺少必需字段 '{field}'",
+                    )
+                )
+            elif ConfigValidator._is_blank(category_data.get(field)):
+                issues.append(
+                    ConfigValidator._issue(
+                        "error",
+                        category_path + (field,),
+                        f"Category '{category_name}' 的 '{field}' 为空",
+                    )
+                )
+
+        temperature = category_data.get("temperature")
+        if temperature is not None and not isinstance(temperature, (int, float)):
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    category_path + ("temperature",),
+                    f"Category '{category_name}' 的 temperature 应该是数字",
+                )
+            )
+        if "description" in category_data and ConfigValidator._is_blank(
+            category_data.get("description")
+        ):
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    category_path + ("description",),
+                    f"Category '{category_name}' 的 description 为空",
+                )
+            )
+        return issues
+
+    @staticmethod
+    def validate_opencode_config(
+        config: Dict, progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Dict]:
+        """
+        验证 OpenCode 配置文件
+        返回问题列表: [{"level": "error/warning", "path": "provider.xxx",
+                       "pointer": "/provider/xxx", "message": "..."}]
+        progress: 可选进度回调 (已完成子树数, 子树总数)，在调用线程中执行
+        """
+        issues = []
+
+        # 区分 None 和空字典
+        if config is None:
+            issues.append(
+                ConfigValidator._issue("error", (), "配置文件无法解析或读取失败")
+            )
+            return issues
+
+        if not isinstance(config, dict):
+            issues.append(ConfigValidator._issue("error", (), "配置根必须是对象类型"))
+            return issues
+
+        # 空配置降级为警告（而非错误）
+        if not config or config == {}:
+            issues.append(
+                ConfigValidator._issue("warning", (), "配置为空，尚未添加任何Provider")
+            )
+            return issues
+
+        # 验证 $schema
+        schema = config.get("$schema")
+        if schema != "https://opencode.ai/config.json":
+            issues.append(
+                ConfigValidator._issue(
+                    "warning",
+                    ("$schema",),
+                    "建议设置 $schema 为 https://opencode.ai/config.json",
+                )
+            )
+
+        # 验证 provider 部分
+        providers = config.get("provider", {})
+        if not providers:
+            issues.append(
+                ConfigValidator._issue("warning", ("provider",), "未配置任何 Provider")
+            )
+        if not isinstance(providers, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error", ("provider",), "provider 必须是对象类型"
+                )
+            )
+            return issues
+
+        mcp = config.get("mcp", {})
+        total = len(providers) + (len(mcp) if isinstance(mcp, dict) else 0)
+        done = 0
+        for provider_name, provider_data in providers.items():
+            issues.extend(
+                ConfigValidator.validate_provider(provider_name, provider_data)
+            )
+            done += 1
+            if progress:
+                progress(done, total)
+
+        # 验证 mcp 部分
+        if mcp and not isinstance(mcp, dict):
+            issues.append(
+                ConfigValidator._issue("error", ("mcp",), "mcp 必须是对象类型")
+            )
+        elif isinstance(mcp, dict):
+            for mcp_name, mcp_data in mcp.items():
+                issues.extend(ConfigValidator.validate_mcp(mcp_name, mcp_data))
+                done += 1
+                if progress:
+                    progress(done, total)
+
+        # 验证 agent 部分
+        agent = config.get("agent", {})
+        if agent and not isinstance(agent, dict):
+            issues.append(
+                ConfigValidator._issue("error", ("agent",), "agent 必须是对象类型")
+            )
+
+        ConfigValidator._add_schema_issues("opencode", config, issues)
+        return issues
+
+    @staticmethod
+    def validate_ohmyopencode_config(
+        config: Dict, progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Dict]:
+        """
+        验证 Oh My OpenCode 配置文件
+        返回问题列表: [{"level": "error/warning", "path": "agents.xxx",
+                       "pointer": "/agents/xxx", "message": "..."}]
+        progress: 可选进度回调 (已完成子树数, 子树总数)，在调用线程中执行
+        """
+        issues = []
+        if not config:
+            issues.append(ConfigValidator._issue("error", (), "配置文件为空或无法解析"))
+            return issues
+        if not isinstance(config, dict):
+            issues.append(ConfigValidator._issue("error", (), "配置根必须是对象类型"))
+            return issues
+
+        agents = config.get("agents", {})
+        if not agents:
+            issues.append(
+                ConfigValidator._issue("warning", ("agents",), "未配置任何 Agent")
+            )
+        if agents and not isinstance(agents, dict):
+            issues.append(
+                ConfigValidator._issue("error", ("agents",), "agents 必须是对象类型")
+            )
+            return issues
+
+        categories = config.get("categories", {})
+        total = sum(len(x) for x in (agents, categories) if isinstance(x, dict))
+        done = 0
+        if isinstance(agents, dict):
+            for agent_name, agent_data in agents.items():
+                issues.extend(
+                    ConfigValidator.validate_ohmy_agent(agent_name, agent_data)
+                )
+                done += 1
+                if progress:
+                    progress(done, total)
+
+        if not categories:
+            issues.append(
+                ConfigValidator._issue(
+                    "warning", ("categories",), "未配置任何 Category"
+                )
+            )
+        if categories and not isinstance(categories, dict):
+            issues.append(
+                ConfigValidator._issue(
+                    "error", ("categories",), "categories 必须是对象类型"
+                )
+            )
+            return issues
+
+        if isinstance(categories, dict):
+            for category_name, category_data in categories.items():
+                issues.extend(
+                    ConfigValidator.validate_ohmy_category(category_name, category_data)
+                )
+                done += 1
+                if progress:
+                    progress(done, total)
+
+        ConfigValidator._add_schema_issues("ohmy", config, issues)
+        return issues
+
+    @staticmethod
+    def fix_provider_structure(config: Dict) -> Tuple[Dict, List[str]]:
+        """
+        修复 Provider 结构问题
+        返回: (修复后的配置, 修复日志列表)
+        """
+        fixes = []
+        if not config:
+            return config, fixes
+
+        providers = config.get("provider", {})
+        if not isinstance(providers, dict):
+            return config, fixes
+
+        fixed_providers = {}
+        for provider_name, provider_data in providers.items():
+            if not isinstance(provider_data, dict):
+                fixes.append(f"跳过无效 Provider '{provider_name}' (值不是对象)")
+                continue
+
+            # 确保必需字段存在
+            fixed_provider = dict(provider_data)
+
+            # 确保 npm 字段存在
+            if "npm" not in fixed_provider:
+                fixed_provider["npm"] = "@ai-sdk/openai"
+                fixes.append(f"Provider '{provider_name}': 添加默认 npm 字段")
+
+            # 确保 options 字段存在且为对象
+            if "options" not in fixed_provider or not isinstance(
+                fixed_provider.get("options"), dict
+            ):
+                fixed_provider["options"] = fixed_provider.get("options", {})
+                if not isinstance(fixed_provider["options"], dict):
+                    fixed_provider["options"] = {}
+                fixes.append(f"Provider '{provider_name}': 修复 options 字段")
+
+            # 确保 options 中有 baseURL 和 apiKey
+            if "baseURL" not in fixed_provider["options"]:
+                fixed_provider["options"]["baseURL"] = ""
+                fixes.append(f"Provider '{provider_name}': 添加空 baseURL")
+            if "apiKey" not in fixed_provider["options"]:
+                fixed_provider["options"]["apiKey"] = ""
+                fixes.append(f"Provider '{provider_name}': 添加空 apiKey")
+
+            # 确保 models 字段存在且为对象
+            if "models" not in fixed_provider:
+                fixed_provider["models"] = {}
+                fixes.append(f"Provider '{provider_name}': 添加空 models 字段")
+            elif not isinstance(fixed_provider.get("models"), dict):
+                fixed_provider["models"] = {}
+                fixes.append(f"Provider '{provider_name}': 修复 models 字段为对象")
+
+            # 规范化字段顺序: npm, name, options, models
+            ordered_provider = {}
+            if "npm" in fixed_provider:
+                ordered_provider["npm"] = fixed_provider["npm"]
+            if "name" in fixed_provider:
+                ordered_provider["name"] = fixed_provider["name"]
+            if "options" in fixed_provider:
+                ordered_provider["options"] = fixed_provider["options"]
+            if "models" in fixed_provider:
+                ordered_provider["models"] = fixed_provider["models"]
+            # 保留其他字段
+            for k, v in fixed_provider.items():
+                if k not in ordered_provider:
+                    ordered_provider[k] = v
+
+            fixed_providers[provider_name] = ordered_provider
+
+        config["provider"] = fixed_providers
+        return config, fixes
+
+    @staticmethod
+    def get_issues_summary(issues: List[Dict]) -> str:
+        """生成问题摘要"""
+        errors = [i for i in issues if i["level"] == "error"]
+        warnings = [i for i in issues if i["level"] == "warning"]
+
+        lines = []
+        if errors:
+            lines.append(f"❌ {len(errors)} 个错误:")
+            for e in errors[:5]:  # 最多显示5个
+                lines.append(f"  • {e['message']}")
+            if len(errors) > 5:
+                lines.append(f"  ... 还有 {len(errors) - 5} 个错误")
+
+        if warnings:
+            lines.append(f"⚠️ {len(warnings)} 个警告:")
+            for w in warnings[:5]:
+                lines.append(f"  • {w['message']}")
+            if len(warnings) > 5:
+                lines.append(f"  ... 还有 {len(warnings) - 5} 个警告")
+
+        return "\n".join(lines) if lines else "✅ 配置格式正确"
+
+
+class ModelRegistry:
+    """模型注册表 - 管理所有已配置的模型
+
+    可长期持有：配置变化后调用 invalidate()/set_config()，下次查询时才重建索引；
+    auth.json 通过文件时间戳和大小判断是否变化，未变化时不重复读取。
+    查询方法返回的列表为缓存的只读视图，调用方不要修改。
+    """
+
+    def __init__(
+        self,
+        opencode_config: Optional[Dict],
+        auth_manager: Optional[AuthManager] = None,
+    ):
+        self.config = opencode_config if opencode_config is not None else {}
+        self.auth_manager = auth_manager or AuthManager()
+        self.models: Dict[str, bool] = {}
+        self.native_providers: Dict[str, bool] = {}  # 已配置的原生 Provider
+        self._model_list: List[str] = []  # 配置顺序
+        self._sorted_models: List[str] = []
+        self._provider_of: Dict[str, str] = {}  # "provider/model" -> provider
+        self._providers_by_model_id: Dict[str, List[str]] = {}  # model -> providers
+        self._models_by_sdk: Dict[str, List[str]] = {}  # npm 包名 -> 模型引用
+        self._dirty = True
+        self._auth_stamp: Optional[Tuple[int, int]] = None
+        self.refresh()
+
+    def set_config(self, opencode_config: Optional[Dict]) -> None:
+        """切换到新的配置对象并标记需要重建"""
+        self.config = opencode_config if opencode_config is not None else {}
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        """配置内容已变化，下次查询时重建索引"""
+        self._dirty = True
+
+    def refresh(self):
+        self._refresh_models()
+        self._refresh_native_providers(self._read_auth_stamp())
+
+    def _refresh_models(self) -> None:
+        self.models = {}
+        provider_of: Dict[str, str] = {}
+        providers_by_model_id: Dict[str, List[str]] = {}
+        models_by_sdk: Dict[str, List[str]] = {}
+
+        # 获取自定义 Provider 的模型
+        providers = self.config.get("provider", {})
+        for provider_name, provider_data in providers.items():
+            if not isinstance(provider_data, dict):
+                continue
+            models = provider_data.get("models", {})
+            if not isinstance(models, dict):
+                continue
+            sdk_models = models_by_sdk.setdefault(provider_data.get("npm") or "", [])
+            for model_id in models.keys():
+                full_ref = f"{provider_name}/{model_id}"
+                self.models[full_ref] = True
+                provider_of[full_ref] = provider_name
+                providers_by_model_id.setdefault(model_id, []).append(provider_name)
+                sdk_models.append(full_ref)
+
+        self._model_list = list(self.models)
+        self._sorted_models = sorted(self._model_list, key=str.lower)
+        self._provider_of = provider_of
+        self._providers_by_model_id = providers_by_model_id
+        self._models_by_sdk = {sdk: refs for sdk, refs in models_by_sdk.items() if refs}
+        self._dirty = False
+
+    def _read_auth_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.auth_manager.auth_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh_native_providers(self, stamp: Optional[Tuple[int, int]]) -> None:
+        self.native_providers = {}
+        self._auth_stamp = stamp
+
+        # 获取已配置的原生 Provider
+        try:
+            auth_data = self.auth_manager.read_auth()
+            for provider_id in auth_data:
+                if auth_data[provider_id]:  # 有认证数据
+                    self.native_providers[provider_id] = True
+        except Exception:
+            pass
+
+    def _ensure_models(self) -> None:
+        if self._dirty:
+            self._refresh_models()
+
+    def _ensure_native_providers(self) -> None:
+        stamp = self._read_auth_stamp()
+        if stamp != self._auth_stamp:
+            self._refresh_native_providers(stamp)
+
+    def get_all_models(self) -> List[str]:
+        """按配置顺序返回所有 "provider/model" 引用"""
+        self._ensure_models()
+        return self._model_list
+
+    def get_sorted_models(self) -> List[str]:
+        """按名称排序（不区分大小写）返回所有模型引用"""
+        self._ensure_models()
+        return self._sorted_models
+
+    def has_model(self, model_ref: str) -> bool:
+        self._ensure_models()
+        return model_ref in self.models
+
+    def get_provider(self, model_ref: str) -> Optional[str]:
+        """模型引用所属的 Provider，未配置时返回 None"""
+        self._ensure_models()
+        return self._provider_of.get(model_ref)
+
+    def find_providers(self, model_id: str) -> List[str]:
+        """提供指定模型 ID 的所有 Provider（按配置顺序）"""
+        self._ensure_models()
+        return self._providers_by_model_id.get(model_id, [])
+
+    def get_models_by_sdk(self) -> Dict[str, List[str]]:
+        """按 Provider 的 npm SDK 包名分组的模型引用（未指定 SDK 的键为空字符串）"""
+        self._ensure_models()
+        return self._models_by_sdk
+
+    def get_configured_native_providers(self) -> List[str]:
+        """获取已配置的原生 Provider ID 列表"""
+        self._ensure_native_providers()
+        return list(self.native_providers.keys())
+
+    def is_native_provider_configured(self, provider_id: str) -> bool:
+        """检查原生 Provider 是否已配置"""
+        self._ensure_native_providers()
+        return provider_id in self.native_providers
+
+
+class ImportService:
+    """外部配置导入服务 - 支持Claude Code、Codex、Gemini、cc-switch等配置格式"""
+
+    @staticmethod
+    def _first_existing_path(paths: List[Path]) -> Path:
+        for path in paths:
+            if path.exists():
+                return path
+        return paths[0]
+
+    @staticmethod
+    def _parse_toml_value(value: str):
+        lower_value = value.lower()
+        if lower_value in {"true", "false"}:
+            return lower_value == "true"
+        if (value.startswith('"') and value.endswith('"')) or (
+            value.startswith("'") and value.endswith("'")
+        ):
+            return value[1:-1]
+        try:
+            if "." in value:
+                return float(value)
+            return int(value)
+        except ValueError:
+            return value
+
+    def _parse_toml_string(self, content: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        current_section: Dict[str, Any] = result
+        for line in content.split("\n"):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1]
+                current_section = result
+                for part in section.split("."):
+                    current_section = current_section.setdefault(part, {})
+                continue
+            if "=" in line:
+                key, value = line.split("=", 1)
+                key = key.strip()
+                value = self._parse_toml_value(value.strip())
+                current_section[key] = value
+        return result
+
+    @staticmethod
+    def _normalize_base_url(base_url: str, require_v1: bool) -> str:
+        if not base_url:
+            return ""
+        trimmed = base_url.rstrip("/")
+        if require_v1 and not trimmed.endswith("/v1"):
+            trimmed = f"{trimmed}/v1"
+        return trimmed
+
+    @staticmethod
+    def _sanitize_provider_key(name: str) -> str:
+        cleaned = re.sub(r"[^a-z0-9-]+", "-", name.strip().lower())
+        return cleaned.strip("-") or "provider"
+
+    @staticmethod
+    def _unique_provider_key(base: str, used_keys: set) -> str:
+        candidate = base
+        index = 2
+        while candidate in used_keys:
+            candidate = f"{base}-{index}"
+            index += 1
+        used_keys.add(candidate)
+        return candidate
+
+    def scan_external_configs(self) -> Dict:
+        """扫描所有支持的外部配置文件"""
+        results = {}
+        test_root = Path(__file__).parent / "test"
+
+        # Claude Code配置
+        claude_settings = ConfigPaths.get_import_path("claude")
+        if claude_settings is None:
+            claude_settings = ConfigPaths.get_claude_settings()
+            if not claude_settings.exists() and test_root.exists():
+                test_path = test_root / ".claude" / "settings.json"
+                if test_path.exists():
+                    claude_settings = test_path
+        results["Claude Code Settings"] = {
+            "path": str(claude_settings),
+            "exists": claude_settings.exists(),
+            "data": ConfigManager.load_json(claude_settings)
+            if claude_settings.exists()
+            else None,
+            "type": "claude",
+        }
+
+        claude_providers = ConfigPaths.get_import_path("claude_providers")
+        if claude_providers is None:
+            claude_providers = ConfigPaths.get_claude_providers()
+            if not claude_providers.exists() and test_root.exists():
+                test_path = test_root / ".claude" / "providers.json"
+                if test_path.exists():
+                    claude_providers = test_path
+        results["Claude Providers"] = {
+            "path": str(claude_providers),
+            "exists": claude_providers.exists(),
+            "data": ConfigManager.load_json(claude_providers)
+            if claude_providers.exists()
+            else None,
+            "type": "claude_providers",
+        }
+
+        # Codex配置 (TOML格式)
+        codex_config = ConfigPaths.get_import_path("codex")
+        if codex_config is None:
+            codex_config = Path.home() / ".codex" / "config.toml"
+            if not codex_config.exists() and test_root.exists():
+                test_path = test_root / ".codex" / "config.toml"
+                if test_path.exists():
+                    codex_config = test_path
+        results["Codex Config"] = {
+            "path": str(codex_config),
+            "exists": codex_config.exists(),
+            "data": self._parse_toml(codex_config) if codex_config.exists() else None,
+            "type": "codex",
+        }
+
+        # Gemini配置
+        gemini_dir = Path.home() / ".gemini"
+        gemini_config = ConfigPaths.get_import_path("gemini")
+        if gemini_config is None:
+            gemini_config = self._first_existing_path(
+                [gemini_dir / "config.json", gemini_dir / "settings.json"]
+            )
+            if not gemini_config.exists() and test_root.exists():
+                test_path = test_root / ".gemini" / "settings.json"
+                if test_path.exists():
+                    gemini_config = test_path
+        results["Gemini Config"] = {
+            "path": str(gemini_config),
+            "exists": gemini_config.exists(),
+            "data": ConfigManager.load_json(gemini_config)
+            if gemini_config.exists()
+            else None,
+            "type": "gemini",
+        }
+
+        # cc-switch配置
+        ccswitch_dir = Path.home() / ".cc-switch"
+        ccswitch_config = ConfigPaths.get_import_path("ccswitch")
+        if ccswitch_config is None:
+            ccswitch_config = self._first_existing_path(
+                [
+                    ccswitch_dir / "config.json.migrated",
+                    ccswitch_dir / "config.json.bak",
+                    ccswitch_dir / "config.json",
+                ]
+            )
+            if not ccswitch_config.exists() and test_root.exists():
+                test_path = test_root / ".cc-switch" / "config.json.migrated"
+                if test_path.exists():
+                    ccswitch_config = test_path
+        results["CC-Switch Config"] = {
+            "path": str(ccswitch_config),
+            "exists": ccswitch_config.exists(),
+            "data": ConfigManager.load_json(ccswitch_config)
+            if ccswitch_config.exists()
+            else None,
+            "type": "ccswitch",
+        }
+
+        return results
+
+    def _parse_toml(self, path: Path) -> Optional[Dict]:
+        """简易TOML解析器"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            return self._parse_toml_string(content)
+        except Exception as e:
+            print(f"TOML parse failed: {e}")
+            return None
+
+    @staticmethod
+    def _extract_from_env(env: Dict[str, Any]) -> Dict[str, str]:
+        if not isinstance(env, dict):
+            return {}
+        api_key = env.get("ANTHROPIC_AUTH_TOKEN") or env.get("ANTHROPIC_API_TOKEN")
+        base_url = env.get("ANTHROPIC_BASE_URL") or ""
+        default_model = env.get("ANTHROPIC_MODEL")
+        return {
+            "api_key": api_key or "",
+            "base_url": base_url or "",
+            "default_model": default_model or "",
+        }
+
+    @staticmethod
+    def _extract_provider_items(source_data: Any) -> List[Dict[str, Any]]:
+        if isinstance(source_data, list):
+            return [item for item in source_data if isinstance(item, dict)]
+        if isinstance(source_data, dict):
+            if "providers" in source_data and isinstance(
+                source_data["providers"], dict
+            ):
+                items = []
+                for item in source_data["providers"].values():
+                    if isinstance(item, dict):
+                        items.append(item)
+                return items
+            return [source_data]
+        return []
+
+    @staticmethod
+    def _collect_model_ids(*values: Any) -> List[str]:
+        model_ids: List[str] = []
+
+        def add_value(value: Any) -> None:
+            if value is None:
+                return
+            if isinstance(value, str):
+                cleaned = value.strip()
+                if cleaned:
+                    model_ids.append(cleaned)
+                return
+            if isinstance(value, list):
+                for item in value:
+                    add_value(item)
+                return
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    key_upper = str(key).upper()
+                    if "MODEL" in key_upper:
+                        add_value(item)
+                for key in (
+                    "model",
+                    "default_model",
+                    "defaultModel",
+                    "model_id",
+                    "modelId",
+                    "id",
+                    "name",
+                ):
+                    if key in value:
+                        add_value(value.get(key))
+                if "models" in value:
+                    add_value(value.get("models"))
+
+        for value in values:
+            add_value(value)
+
+        seen = set()
+        deduped: List[str] = []
+        for item in model_ids:
+            lowered = item.lower()
+            if lowered in {"opus", "sonnet", "haiku"}:
+                continue
+            if re.fullmatch(
+                r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", lowered
+            ):
+                continue
+            if item not in seen:
+                seen.add(item)
+                deduped.append(item)
+        return deduped
+
+    def convert_to_opencode(
+        self, source_type: str, source_data: Dict
+    ) -> Optional[Dict]:
+        """将外部配置转换为OpenCode格式"""
+        if not source_data:
+            return None
+
+        result = {"provider": {}, "permission": {}}
+        used_keys: set = set()
+
+        def add_provider(
+            key: str,
+            display_name: str,
+            npm: str,
+            api_key: str,
+            base_url: str,
+            require_v1: bool = False,
+            model_ids: Optional[List[str]] = None,
+        ) -> None:
+            provider_key = self._unique_provider_key(key, used_keys)
+            normalized_url = self._normalize_base_url(base_url, require_v1)
+            models: Dict[str, Any] = {}
+            if model_ids:
+                for model_id in model_ids:
+                    if model_id and isinstance(model_id, str):
+                        models[model_id] = {"name": model_id}
+            result["provider"][provider_key] = {
+                "npm": npm,
+                "name": display_name,
+                "options": {
+                    "apiKey": api_key or "",
+                    "baseURL": normalized_url,
+                },
+                "models": models,
+            }
+
+        if source_type == "claude":
+            env = source_data.get("env", source_data)
+            extracted = self._extract_from_env(env)
+            model_ids = self._collect_model_ids(
+                extracted.get("default_model"),
+                source_data.get("model"),
+                source_data.get("default_model"),
+                source_data.get("defaultModel"),
+            )
+            if extracted["api_key"] or extracted["base_url"] or model_ids:
+                add_provider(
+                    "anthropic",
+                    "Anthropic (Claude)",
+                    "@ai-sdk/anthropic",
+                    extracted["api_key"],
+                    extracted["base_url"],
+                    require_v1=False,
+                    model_ids=model_ids or None,
+                )
+            if "permissions" in source_data:
+                for tool, perm in source_data.get("permissions", {}).items():
+                    result["permission"][tool] = perm
+
+        elif source_type == "claude_providers":
+            for provider_data in self._extract_provider_items(source_data):
+                display_name = provider_data.get("name") or provider_data.get("id")
+                display_name = display_name or "Anthropic (Claude)"
+                provider_key = self._sanitize_provider_key(display_name)
+                api_key = provider_data.get("api_key") or provider_data.get(
+                    "auth_token"
+                )
+                base_url = provider_data.get("base_url") or ""
+                model_ids = self._collect_model_ids(
+                    provider_data.get("models"),
+                    provider_data.get("model"),
+                    provider_data.get("default_model"),
+                    provider_data.get("defaultModel"),
+                )
+                add_provider(
+                    provider_key,
+                    display_name,
+                    "@ai-sdk/anthropic",
+                    api_key or "",
+                    base_url,
+                    require_v1=False,
+                    model_ids=model_ids or None,
+                )
+
+        elif source_type == "codex":
+            model_providers = source_data.get("model_providers", {})
+            provider_name = source_data.get("model_provider")
+            provider_config = None
+            if provider_name and isinstance(model_providers, dict):
+                provider_config = model_providers.get(provider_name)
+            if provider_config is None and isinstance(model_providers, dict):
+                provider_name = next(iter(model_providers.keys()), None)
+                provider_config = (
+                    model_providers.get(provider_name) if provider_name else None
+                )
+            model_ids = self._collect_model_ids(
+                source_data.get("model"),
+                source_data.get("default_model"),
+                source_data.get("defaultModel"),
+                provider_config,
+            )
+            if isinstance(provider_config, dict):
+                display_name = provider_config.get("name") or provider_name or "Codex"
+                provider_key = self._sanitize_provider_key(
+                    provider_name or display_name
+                )
+                base_url = provider_config.get("base_url", "")
+                add_provider(
+                    provider_key,
+                    display_name,
+                    "@ai-sdk/openai",
+                    "",
+                    base_url,
+                    require_v1=True,
+                    model_ids=model_ids or None,
+                )
+            elif model_ids:
+                add_provider(
+                    "codex",
+                    "Codex",
+                    "@ai-sdk/openai",
+                    "",
+                    "",
+                    require_v1=True,
+                    model_ids=model_ids,
+                )
+
+        elif source_type == "gemini":
+            env = source_data.get("env", source_data)
+            api_key = ""
+            if isinstance(env, dict):
+                api_key = env.get("GOOGLE_API_KEY") or env.get("GEMINI_API_KEY")
+            api_key = api_key or source_data.get("apiKey") or ""
+            base_url = source_data.get("baseURL") or source_data.get("base_url") or ""
+            if api_key or base_url:
+                add_provider(
+                    "google",
+                    "Google (Gemini)",
+                    "@ai-sdk/google",
+                    api_key,
+                    base_url,
+                    require_v1=False,
+                )
+
+        elif source_type == "ccswitch":
+            claude = source_data.get("claude", {})
+            claude_providers = claude.get("providers", {})
+            if isinstance(claude_providers, dict):
+                for provider_data in claude_providers.values():
+                    if not isinstance(provider_data, dict):
+                        continue
+                    settings = provider_data.get("settingsConfig", {})
+                    extracted = self._extract_from_env(settings.get("env", {}))
+                    model_ids = self._collect_model_ids(
+                        settings.get("env", {}),
+                        settings.get("config", {}),
+                        provider_data,
+                        claude,
+                    )
+                    if not (extracted["api_key"] or extracted["base_url"] or model_ids):
+                        continue
+                    display_name = provider_data.get("name", "Anthropic (Claude)")
+                    provider_key = self._sanitize_provider_key(display_name)
+                    add_provider(
+                        provider_key,
+                        display_name,
+                        "@ai-sdk/anthropic",
+                        extracted["api_key"],
+                        extracted["base_url"],
+                        require_v1=False,
+                        model_ids=model_ids or None,
+                    )
+
+            codex = source_data.get("codex", {})
+            codex_providers = codex.get("providers", {})
+            if isinstance(codex_providers, dict):
+                for provider_data in codex_providers.values():
+                    if not isinstance(provider_data, dict):
+                        continue
+                    settings = provider_data.get("settingsConfig", {})
+                    auth = settings.get("auth", {})
+                    config = settings.get("config", {})
+                    if isinstance(config, str):
+                        config = self._parse_toml_string(config)
+                    api_key = ""
+                    if isinstance(auth, dict):
+                        api_key = auth.get("OPENAI_API_KEY") or ""
+                    base_url = ""
+                    if isinstance(config, dict):
+                        base_url = config.get("base_url", "")
+                    model_ids = self._collect_model_ids(
+                        auth,
+                        config,
+                        settings.get("env", {}),
+                        provider_data,
+                        codex,
+                    )
+                    if not (api_key or base_url or model_ids):
+                        continue
+                    display_name = provider_data.get("name", "Codex")
+                    provider_key = self._sanitize_provider_key(display_name)
+                    require_v1 = True
+                    if "/v1/" in base_url or base_url.rstrip("/").endswith("/v1"):
+                        require_v1 = False
+                    add_provider(
+                        provider_key,
+                        display_name,
+                        "@ai-sdk/openai",
+                        api_key,
+                        base_url,
+                        require_v1=require_v1,
+                        model_ids=model_ids or None,
+                    )
+
+        return result
+
+
+# ==================== 批量修改 ====================
+def copy_json(value: Any) -> Any:
+    """复制 JSON 数据（只含 dict/list/标量，比 copy.deepcopy 快数倍）"""
+    if isinstance(value, dict):
+        return {k: copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_json(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class BatchSelector:
+    """批量修改的目标条目
+
+    - section: "agents" / "categories"（Oh My OpenCode 配置）或 "models"（OpenCode 配置）
+    - pattern: 名称通配符（fnmatch，区分大小写）；models 匹配 "provider/model"
+    - provider: 只选择该 Provider 下的模型（仅 models）
+    - names: 精确名称集合（models 为模型 ID），与 pattern 同时生效
+    """
+
+    section: str
+    pattern: str = "*"
+    provider: Optional[str] = None
+    names: Optional[FrozenSet[str]] = None
+
+    def iter_entries(self, config: Optional[Dict]) -> Iterator[Tuple[str, Dict]]:
+        """遍历匹配的 (名称, 条目字典)，跳过非字典条目"""
+        config = config or {}
+        if self.section == "models":
+            providers = config.get("provider", {})
+            if not isinstance(providers, dict):
+                return
+            if self.provider is not None:
+                providers = {self.provider: providers.get(self.provider)}
+            for provider_name, provider_data in providers.items():
+                if not isinstance(provider_data, dict):
+                    continue
+                models = provider_data.get("models", {})
+                if not isinstance(models, dict):
+                    continue
+                for model_id, entry in models.items():
+                    ref = f"{provider_name}/{model_id}"
+                    if self._matches(model_id, ref) and isinstance(entry, dict):
+                        yield ref, entry
+            return
+        if self.section not in ("agents", "categories"):
+            raise ValueError(f"不支持的批量修改目标: {self.section}")
+        section = config.get(self.section, {})
+        if not isinstance(section, dict):
+            return
+        for name, entry in section.items():
+            if self._matches(name, name) and isinstance(entry, dict):
+                yield name, entry
+
+    def _matches(self, name: str, ref: str) -> bool:
+        if self.names is not None and name not in self.names:
+            return False
+        return self.pattern == "*" or fnmatch.fnmatchcase(ref, self.pattern)
+
+
+def apply_batch(
+    config: Optional[Dict], selector: BatchSelector, patch: Mapping[str, Any]
+) -> List[str]:
+    """一次遍历把 patch 合并进所有匹配条目，返回实际发生变化的条目名称
+
+    patch 的第一层字段直接覆盖条目字段，值为 None 表示删除该字段。patch 可以是
+    多次调用共享的只读预设：写入条目的是副本，条目之间不会共享可变对象。
+    """
+    changed: List[str] = []
+    for name, entry in selector.iter_entries(config):
+        modified = False
+        for key, value in patch.items():
+            if value is None:
+                if key in entry:
+                    del entry[key]
+                    modified = True
+            elif key not in entry or entry[key] != value:
+                entry[key] = copy_json(value)
+                modified = True
+        if modified:
+            changed.append(name)
+    return changed
+
+
+# ==================== Skill 发现器 ====================
+@dataclass
+class DiscoveredSkill:
+    """发现的 Skill 信息"""
+
+    name: str
+    description: str
+    path: Path
+    source: (
+        str  # 'opencode-global', 'opencode-project', 'claude-global', 'claude-project'
+    )
+    license_info: Optional[str] = None
+    compatibility: Optional[str] = None
+    metadata: Optional[Dict[str, str]] = None
+    content: str = ""
+
+
+class SkillIndex:
+    """持久化的 Skill 索引（skill-index.json）
+
+    记录每个搜索根目录及其子目录的 mtime、子目录中的 SKILL.md/SKILL.txt，
+    以及按 (路径, mtime, 大小) 缓存的 frontmatter 解析结果：
+    - 根目录 mtime 未变化时不再遍历，子目录 mtime 未变化时不再查找 Skill 文件
+    - Skill 文件 mtime 与大小未变化时不再读取和解析，变化的文件在线程池中并行解析
+    - 按名称查找是一次字典查找
+    索引只保存 frontmatter，正文由 SkillDiscovery.load_content 按需读取。
+    """
+
+    VERSION = 1
+    SKILL_FILENAMES = ("SKILL.md", "SKILL.txt")
+    # 并行解析 frontmatter 的线程数上限
+    PARSE_WORKERS = 8
+
+    def __init__(self, index_file: Optional[Path] = None):
+        self.index_file = index_file or (
+            ConfigPaths.get_config_base_dir() / "skill-index.json"
+        )
+        # 根目录 -> {"mtime_ns", "dirs": {子目录: {"mtime_ns", "file"}}}
+        self._roots: Dict[str, Dict] = {}
+        # Skill 文件 -> {"mtime_ns", "size", "skill": frontmatter 字段或 None}
+        self._files: Dict[str, Dict] = {}
+        self._skills: List[DiscoveredSkill] = []
+        self._by_name: Dict[str, DiscoveredSkill] = {}
+        self._loaded = False
+
+    def skills(self) -> List[DiscoveredSkill]:
+        """上次 refresh 得到的 Skill 列表（同名时保留搜索顺序中的第一个）"""
+        return list(self._skills)
+
+    def get(self, name: str) -> Optional[DiscoveredSkill]:
+        return self._by_name.get(name)
+
+    def watch_paths(self) -> List[str]:
+        """需要监视的目录：各根目录与其中的 Skill 子目录"""
+        paths = []
+        for root, root_entry in self._roots.items():
+            paths.append(root)
+            paths.extend(root_entry["dirs"])
+        return paths
+
+    def refresh(self, roots: Dict[str, Path]) -> bool:
+        """按 {来源: 根目录} 校验并更新索引，返回是否有变化（有变化时写回索引文件）"""
+        self._load()
+        changed = False
+        to_parse: List[Tuple[str, os.stat_result]] = []
+        new_roots: Dict[str, Dict] = {}
+        for base_path in roots.values():
+            root = str(base_path)
+            try:
+                root_mtime = os.stat(root).st_mtime_ns
+            except OSError:
+                changed = changed or root in self._roots
+                continue
+            cached = self._roots.get(root)
+            if cached and cached["mtime_ns"] == root_mtime:
+                dirs = cached["dirs"]
+            else:
+                dirs = self._scan_root(base_path, cached)
+                changed = True
+            new_dirs: Dict[str, Dict] = {}
+            for skill_dir, dir_entry in dirs.items():
+                entry, dir_changed = self._check_dir(skill_dir, dir_entry, to_parse)
+                if entry is not None:
+                    new_dirs[skill_dir] = entry
+                changed = changed or dir_changed
+            new_roots[root] = {"mtime_ns": root_mtime, "dirs": new_dirs}
+        self._roots = new_roots
+        if to_parse:
+            self._parse_files(to_parse)
+
+        if changed or not self._loaded:
+            self._rebuild()
+        if changed:
+            self._save()
+        self._loaded = True
+        return changed
+
+    def _scan_root(self, base_path: Path, cached: Optional[Dict]) -> Dict[str, Dict]:
+        """遍历根目录下的子目录，沿用已缓存子目录的记录"""
+        old_dirs = cached["dirs"] if cached else {}
+        dirs: Dict[str, Dict] = {}
+        try:
+            for skill_dir in base_path.iterdir():
+                if skill_dir.is_dir():
+                    key = str(skill_dir)
+                    dirs[key] = old_dirs.get(key, {"mtime_ns": None, "file": None})
+        except OSError as e:
+            # 遍历目录失败，记录但继续处理其他路径
+            print(f"遍历目录失败 {base_path}: {e}")
+        return dirs
+
+    def _check_dir(
+        self,
+        skill_dir: str,
+        dir_entry: Dict,
+        to_parse: List[Tuple[str, os.stat_result]],
+    ) -> Tuple[Optional[Dict], bool]:
+        """校验子目录与其中的 Skill 文件，返回 (新记录, 是否变化)；目录已删除返回 None
+
+        需要重新解析的 Skill 文件追加到 to_parse，由 _parse_files 统一并行解析。
+        """
+        try:
+            dir_mtime = os.stat(skill_dir).st_mtime_ns
+        except OSError:
+            return None, True
+        changed = False
+        skill_file = dir_entry["file"]
+        if dir_mtime != dir_entry["mtime_ns"]:
+            # 目录内容变化：重新查找 SKILL.md 或 SKILL.txt
+            skill_file = None
+            for filename in self.SKILL_FILENAMES:
+                candidate = os.path.join(skill_dir, filename)
+                if os.path.exists(candidate):
+                    skill_file = candidate
+                    break
+            changed = True
+        if skill_file is not None:
+            try:
+                st = os.stat(skill_file)
+            except OSError:
+                return {"mtime_ns": None, "file": None}, True
+            cached = self._files.get(skill_file)
+            if (
+                cached is None
+                or cached["mtime_ns"] != st.st_mtime_ns
+                or cached["size"] != st.st_size
+            ):
+                to_parse.append((skill_file, st))
+                changed = True
+        return {"mtime_ns": dir_mtime, "file": skill_file}, changed
+
+    def _parse_files(self, files: List[Tuple[str, os.stat_result]]) -> None:
+        """并行解析变化的 Skill 文件（只读取 frontmatter，以 IO 为主）"""
+        paths = [Path(skill_file) for skill_file, _ in files]
+        if len(paths) == 1:
+            results = [self._parse(paths[0])]
+        else:
+            workers = min(self.PARSE_WORKERS, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._parse, paths))
+        for (skill_file, st), fields in zip(files, results):
+            self._files[skill_file] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "skill": fields,
+            }
+
+    @staticmethod
+    def _parse(skill_file: Path) -> Optional[Dict]:
+        try:
+            skill = SkillDiscovery.parse_skill_file(skill_file, include_body=False)
+        except Exception as e:
+            # 解析单个skill失败，记录但继续处理其他skills
+            print(f"解析 skill 失败 {skill_file.parent.name}: {e}")
+            return None
+        if skill is None:
+            return None
+        return {
+            "name": skill.name,
+            "description": skill.description,
+            "source": skill.source,
+            "license_info": skill.license_info,
+            "compatibility": skill.compatibility,
+            "metadata": skill.metadata,
+        }
+
+    def _rebuild(self) -> None:
+        skills: List[DiscoveredSkill] = []
+        by_name: Dict[str, DiscoveredSkill] = {}
+        for root_entry in self._roots.values():
+            for dir_entry in root_entry["dirs"].values():
+                skill_file = dir_entry["file"]
+                fields = (
+                    self._files.get(skill_file, {}).get("skill") if skill_file else None
+                )
+                if not fields or fields["name"] in by_name:
+                    continue
+                skill = DiscoveredSkill(path=Path(skill_file), **fields)
+                skills.append(skill)
+                by_name[skill.name] = skill
+        self._skills = skills
+        self._by_name = by_name
+
+    def _load(self) -> None:
+        if self._loaded or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._roots = data["roots"]
+                self._files = data["files"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"读取 Skill 索引失败: {e}")
+
+    def _save(self) -> None:
+        """写回索引，只保留仍被引用的 Skill 文件"""
+        referenced = {
+            dir_entry["file"]
+            for root_entry in self._roots.values()
+            for dir_entry in root_entry["dirs"].values()
+            if dir_entry["file"]
+        }
+        self._files = {k: v for k, v in self._files.items() if k in referenced}
+        data = {"version": self.VERSION, "roots": self._roots, "files": self._files}
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            print(f"保存 Skill 索引失败: {e}")
+
+
+class SkillDiscovery:
+    """Skill 发现器 - 扫描所有路径发现已有的 Skill"""
+
+    # Skill 搜索路径配置
+    SKILL_PATHS = {
+        "opencode-global": Path.home() / ".config" / "opencode" / "skills",
+        "claude-global": Path.home() / ".claude" / "skills",
+    }
+
+    # 读取 frontmatter 的字符数上限，超过仍未遇到结束的 --- 视为格式错误
+    FRONTMATTER_READ_LIMIT = 64 * 1024
+
+    _index: Optional[SkillIndex] = None
+
+    @classmethod
+    def index(cls) -> SkillIndex:
+        """共享的持久化 Skill 索引"""
+        if cls._index is None:
+            cls._index = SkillIndex()
+        return cls._index
+
+    @classmethod
+    def search_paths(cls) -> Dict[str, Path]:
+        """所有 Skill 搜索路径（按优先级排序）"""
+        return {**cls.SKILL_PATHS, **cls.get_project_paths()}
+
+    @staticmethod
+    def get_project_paths() -> Dict[str, Path]:
+        """获取项目级别的 Skill 路径"""
+        cwd = Path.cwd()
+        return {
+            "opencode-project": cwd / ".opencode" / "skills",
+            "claude-project": cwd / ".claude" / "skills",
+        }
+
+    @staticmethod
+    def validate_skill_name(name: str) -> Tuple[bool, str]:
+        """验证 Skill 名称是否符合规范
+
+        规则：
+        - 1-64 字符
+        - 小写字母数字 + 单连字符分隔
+        - 不能以 - 开头或结尾
+        - 不能有连续 --
+
+        Returns:
+            (是否有效, 错误信息)
+        """
+        if not name:
+            return False, "名称不能为空"
+        if len(name) > 64:
+            return False, "名称不能超过 64 字符"
+        if not re.match(r"^[a-z0-9]+(-[a-z0-9]+)*$", name):
+            return False, "名称格式错误：只能使用小写字母、数字、单连字符分隔"
+        return True, ""
+
+    @staticmethod
+    def validate_description(desc: str) -> Tuple[bool, str]:
+        """验证描述是否符合规范
+
+        规则：1-1024 字符
+        """
+        if not desc:
+            return False, "描述不能为空"
+        if len(desc) > 1024:
+            return False, "描述不能超过 1024 字符"
+        return True, ""
+
+    @staticmethod
+    def read_frontmatter(
+        skill_path: Path, include_body: bool = False
+    ) -> Tuple[Optional[str], str]:
+        """逐行读取 frontmatter 块（两个 --- 之间的文本）
+
+        读到结束的 --- 即停止，最多读取 FRONTMATTER_READ_LIMIT 个字符；
+        include_body 为 True 时才继续读取正文。
+
+        Returns:
+            (frontmatter 文本, 正文)，没有完整的 frontmatter 时文本为 None
+        """
+        limit = SkillDiscovery.FRONTMATTER_READ_LIMIT
+        with open(skill_path, "r", encoding="utf-8") as f:
+            line = f.readline(limit)
+            if not line.startswith("---"):
+                return None, ""
+            line = line[3:]
+            parts: List[str] = []
+            read = 0
+            while True:
+                end = line.find("---")
+                if end >= 0:
+                    parts.append(line[:end])
+                    body = (line[end + 3 :] + f.read()).strip() if include_body else ""
+                    return "".join(parts), body
+                parts.append(line)
+                read += len(line)
+                if read >= limit:
+                    return None, ""
+                line = f.readline(limit)
+                if not line:
+                    return None, ""
+
+    @staticmethod
+    def parse_skill_file(
+        skill_path: Path, include_body: bool = True
+    ) -> Optional[DiscoveredSkill]:
+        """解析 SKILL.md 文件
+
+        Args:
+            skill_path: SKILL.md 文件路径
+            include_body: 是否读取正文；为 False 时只读取 frontmatter，content 为空
+
+        Returns:
+            解析后的 DiscoveredSkill 对象，解析失败返回 None
+        """
+        try:
+            yaml_content, body = SkillDiscovery.read_frontmatter(
+                skill_path, include_body
+            )
+        except Exception:
+            return None
+        if yaml_content is None:
+            return None
+
+        # 解析 frontmatter
+        frontmatter = {}
+        try:
+            # 简单的 YAML 解析（不依赖 pyyaml）
+            for line in yaml_content.strip().split("\n"):
+                line = line.strip()
+                if ":" in line and not line.startswith("#"):
+                    key, value = line.split(":", 1)
+                    key = key.strip()
+                    value = value.strip().strip('"').strip("'")
+                    # 处理 metadata 子对象
+                    if key == "metadata":
+                        frontmatter["metadata"] = {}
+                    elif key.startswith("  ") and "metadata" in frontmatter:
+                        # metadata 子项
+                        sub_key = key.strip()
+                        frontmatter["metadata"][sub_key] = value
+                    else:
+                        frontmatter[key] = value
+        except Exception:
+            pass
+
+        name = frontmatter.get("name", "")
+        description = frontmatter.get("description", "")
+
+        if not name or not description:
+            return None
+
+        # 确定来源
+        skill_dir = skill_path.parent
+        source = "unknown"
+        for src, base_path in SkillDiscovery.SKILL_PATHS.items():
+            try:
+                if skill_dir.is_relative_to(base_path):
+                    source = src
+                    break
+            except (ValueError, TypeError):
+                pass
+
+        if source == "unknown":
+            for src, base_path in SkillDiscovery.get_project_paths().items():
+                try:
+                    if skill_dir.is_relative_to(base_path):
+                        source = src
+                        break
+                except (ValueError, TypeError):
+                    pass
+
+        return DiscoveredSkill(
+            name=name,
+            description=description,
+            path=skill_path,
+            source=source,
+            license_info=frontmatter.get("license"),
+            compatibility=frontmatter.get("compatibility"),
+            metadata=frontmatter.get("metadata")
+            if isinstance(frontmatter.get("metadata"), dict)
+            else None,
+            content=body,
+        )
+
+    @classmethod
+    def discover_all(cls) -> List[DiscoveredSkill]:
+        """发现所有 Skill（通过索引，只重新解析新增或变化的 Skill 文件）
+
+        Returns:
+            发现的 Skill 列表
+        """
+        index = cls.index()
+        index.refresh(cls.search_paths())
+        return index.skills()
+
+    @classmethod
+    def get_skill_by_name(cls, name: str) -> Optional[DiscoveredSkill]:
+        """根据名称获取 Skill（索引中找不到时刷新一次索引）"""
+        index = cls.index()
+        skill = index.get(name)
+        if skill is None or not skill.path.exists():
+            index.refresh(cls.search_paths())
+            skill = index.get(name)
+        return skill
+
+    @staticmethod
+    def load_content(skill: DiscoveredSkill) -> str:
+        """按需读取 Skill 正文（frontmatter 之后的部分）并缓存到 skill.content"""
+        if not skill.content:
+            try:
+                _, skill.content = SkillDiscovery.read_frontmatter(
+                    skill.path, include_body=True
+                )
+            except Exception:
+                skill.content = ""
+        return skill.content
+
+
+# ==================== Plugin 插件管理 ====================
+@dataclass
+class PluginConfig:
+    """插件配置数据类"""
+
+    name: str  # 插件名称（npm包名或文件名）
+    version: str  # 版本号（npm插件）
+    type: str  # 类型：npm / local
+    source: str  # 来源：npm包名 / 本地文件路径
+    enabled: bool  # 是否启用
+    description: str  # 描述
+    homepage: str  # 主页链接
+    installed_at: str  # 安装时间
+
+
+class PluginManager:
+    """插件管理器"""
+
+    @staticmethod
+    def get_installed_plugins(config: Dict[str, Any]) -> List[PluginConfig]:
+        """获取已安装的插件列表"""
+        plugins: List[PluginConfig] = []
+
+        # 1. 从opencode.json的plugin字段读取npm插件
+        plugin_list = config.get("plugin", [])
+        if isinstance(plugin_list, list):
+            for plugin_entry in plugin_list:
+                if isinstance(plugin_entry, str):
+                    # 解析包名和版本（如opencode-skills@0.1.0）
+                    if "@" in plugin_entry and not plugin_entry.startswith("@"):
+                        # 普通包带版本
+                        parts = plugin_entry.rsplit("@", 1)
+                        name = parts[0]
+                        version = parts[1] if len(parts) > 1 else "latest"
+                    elif plugin_entry.startswith("@") and plugin_entry.count("@") > 1:
+                        # scoped包带版本（如@my-org/plugin@1.0.0）
+                        parts = plugin_entry.rsplit("@", 1)
+                        name = parts[0]
+                        version = parts[1] if len(parts) > 1 else "latest"
+                    else:
+                        # 无版本号
+                        name = plugin_entry
+                        version = "latest"
+
+                    plugins.append(
+                        PluginConfig(
+                            name=name,
+                            version=version,
+                            type="npm",
+                            source=plugin_entry,
+                            enabled=True,
+                            description="",
+                            homepage="",
+                            installed_at="",
+                        )
+                    )
+
+        # 2. 扫描本地插件目录（暂不实现，留待后续）
+        # TODO: 扫描~/.config/opencode/plugins/和.opencode/plugins/
+
+        return plugins
+
+    @staticmethod
+    def install_npm_plugin(
+        config: Dict[str, Any], package_name: str, version: str = ""
+    ) -> bool:
+        """安装npm插件"""
+        try:
+            # 构建完整的包名（带版本）
+            if version and version != "latest":
+                full_name = f"{package_name}@{version}"
+            else:
+                full_name = package_name
+
+            # 读取plugin数组
+            if "plugin" not in config:
+                config["plugin"] = []
+
+            plugin_list = config["plugin"]
+            if not isinstance(plugin_list, list):
+                plugin_list = []
+                config["plugin"] = plugin_list
+
+            # 检查是否已存在（去除版本号比较）
+            base_name = package_name.split("@")[0]
+            for i, existing in enumerate(plugin_list):
+                if isinstance(existing, str):
+                    existing_base = existing.split("@")[0]
+                    if existing_base == base_name:
+                        # 已存在，更新版本
+                        plugin_list[i] = full_name
+                        return True
+
+            # 不存在，添加新插件
+            plugin_list.append(full_name)
+            return True
+
+        except Exception as e:
+            print(f"安装插件失败: {e}")
+            return False
+
+    @staticmethod
+    def uninstall_plugin(config: Dict[str, Any], plugin: PluginConfig) -> bool:
+        """卸载插件"""
+        try:
+            if plugin.type == "npm":
+                # 从plugin数组移除
+                plugin_list = config.get("plugin", [])
+                if isinstance(plugin_list, list):
+                    # 移除匹配的插件（忽略版本号）
+                    base_name = plugin.name.split("@")[0]
+                    config["plugin"] = [
+                        p
+                        for p in plugin_list
+                        if not (isinstance(p, str) and p.split("@")[0] == base_name)
+                    ]
+                    return True
+            elif plugin.type == "local":
+                # TODO: 删除本地文件和元数据
+                pass
+
+            return False
+
+        except Exception as e:
+            print(f"卸载插件失败: {e}")
+            return False
+
+    @staticmethod
+    def check_npm_version(package_name: str) -> str:
+        """检查npm包的最新版本"""
+        try:
+            import requests
+
+            url = f"https://registry.npmjs.org/{package_name}/latest"
+            response = requests.get(url, timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("version", "")
+        except Exception as e:
+            print(f"检查版本失败: {e}")
+
+        return ""
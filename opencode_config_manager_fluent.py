@@ -11,19 +11,19 @@ OpenCode & Oh My OpenCode 配置管理器 v1.7.1 (QFluentWidgets 版本)
 # 必须在所有其他 import 之前执行
 import os
 import sys
-import platform
-import traceback
 import time
 
 
 # macOS 崩溃处理器 (必须在 PyQt5 导入之前设置)
 def setup_macos_crash_handler():
     """设置 macOS 崩溃处理器"""
-    if platform.system() != "Darwin":
+    if sys.platform != "darwin":
         return
 
     def exception_handler(exc_type, exc_value, exc_traceback):
         """捕获未处理的异常"""
+        import platform
+        import traceback
         from pathlib import Path
 
         # 写入崩溃日志
@@ -89,28 +89,239 @@ if sys.platform == "win32" and getattr(sys, "frozen", False):
             os.environ["TEMP"] = safe_temp
             os.environ["TMP"] = safe_temp
 
+
+# ==================== 启动阶段分析 ====================
+class StartupProfiler:
+    """启动阶段计时器（默认关闭）
+
+    通过环境变量 OCCM_PROFILE_STARTUP=1（或报告路径）或命令行参数
+    --profile-startup[=报告路径] 启用。记录嵌套的阶段时间线，首帧绘制后
+    写出 Chrome Trace 格式的 JSON 报告（可在 chrome://tracing 或 Perfetto
+    中打开）并在控制台打印汇总表。超出 PHASE_BUDGET_MS 预算的阶段会被标记，
+    并列在报告的 otherData.over_budget 中；模块导入预算由
+    tests/test_import_budget.py 在子进程中测量并断言，回退会导致测试失败。
+    """
+
+    ENV_VAR = "OCCM_PROFILE_STARTUP"
+    CLI_FLAG = "--profile-startup"
+    DEFAULT_REPORT_NAME = "occm-startup-trace.json"
+    # 阶段耗时预算（毫秒，按已缓存字节码的冷启动测得值留出余量）
+    PHASE_BUDGET_MS = {
+        "module import": 500,
+        "MainWindow": 400,
+    }
+
+    def __init__(self, enabled: bool = False, report_path: str = ""):
+        self.enabled = enabled
+        self.report_path = report_path or self.DEFAULT_REPORT_NAME
+        self._origin = time.perf_counter()
+        # 已结束的阶段: (名称, 深度, 开始秒, 结束秒)
+        self._phases = []
+        # 进行中的阶段: [(名称, 开始秒)]
+        self._stack = []
+        self._finished = False
+
+    @classmethod
+    def from_environment(cls, argv=None) -> "StartupProfiler":
+        """根据环境变量与命令行参数创建"""
+        argv = sys.argv if argv is None else argv
+        value = os.environ.get(cls.ENV_VAR, "")
+        for arg in argv[1:]:
+            if arg == cls.CLI_FLAG:
+                value = value or "1"
+            elif arg.startswith(cls.CLI_FLAG + "="):
+                value = arg.split("=", 1)[1] or "1"
+        if not value or value.lower() in ("0", "false", "no", "off"):
+            return cls(False)
+        if value.lower() in ("1", "true", "yes", "on"):
+            return cls(True)
+        return cls(True, value)
+
+    def begin(self, name: str) -> None:
+        if self.enabled and not self._finished:
+            self._stack.append((name, time.perf_counter()))
+
+    def end(self) -> None:
+        if self.enabled and self._stack and not self._finished:
+            name, start = self._stack.pop()
+            self._phases.append((name, len(self._stack), start, time.perf_counter()))
+
+    def phase(self, name: str) -> "StartupProfiler._Phase":
+        """阶段上下文管理器: with profiler.phase("name"): ..."""
+        return self._Phase(self, name)
+
+    class _Phase:
+        def __init__(self, profiler: "StartupProfiler", name: str):
+            self._profiler = profiler
+            self._name = name
+
+        def __enter__(self):
+            self._profiler.begin(self._name)
+            return self
+
+        def __exit__(self, exc_type, exc_value, exc_traceback):
+            self._profiler.end()
+            return False
+
+    def _ordered_rows(self):
+        """按开始时间排序，计算每个阶段的总耗时与自身耗时（毫秒）"""
+        phases = sorted(self._phases, key=lambda p: (p[2], p[1]))
+        rows = []
+        for index, (name, depth, start, end) in enumerate(phases):
+            children = sum(
+                c_end - c_start
+                for c_name, c_depth, c_start, c_end in phases[index + 1 :]
+                if c_depth == depth + 1 and c_start >= start and c_end <= end
+            )
+            rows.append(
+                {
+                    "name": name,
+                    "depth": depth,
+                    "start_ms": round((start - self._origin) * 1000, 3),
+                    "total_ms": round((end - start) * 1000, 3),
+                    "self_ms": round((end - start - children) * 1000, 3),
+                    "budget_ms": self.PHASE_BUDGET_MS.get(name),
+                }
+            )
+        return rows
+
+    @staticmethod
+    def _over_budget(row) -> bool:
+        return row["budget_ms"] is not None and row["total_ms"] > row["budget_ms"]
+
+    def finish(self) -> list:
+        """结束计时，写出报告并打印汇总表（只执行一次）
+
+        Returns:
+            超出预算的阶段名称列表
+        """
+        if not self.enabled or self._finished:
+            return []
+        while self._stack:
+            self.end()
+        self._finished = True
+
+        import json
+        import platform
+
+        rows = self._ordered_rows()
+        total_ms = max((r["start_ms"] + r["total_ms"] for r in rows), default=0.0)
+        over_budget = [r["name"] for r in rows if self._over_budget(r)]
+        pid = os.getpid()
+        report = {
+            "traceEvents": [
+                {
+                    "name": row["name"],
+                    "cat": "startup",
+                    "ph": "X",
+                    "ts": int(row["start_ms"] * 1000),
+                    "dur": int(row["total_ms"] * 1000),
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {"self_ms": row["self_ms"]},
+                }
+                for row in rows
+            ],
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "total_ms": round(total_ms, 3),
+                "over_budget": over_budget,
+            },
+            "summary": rows,
+        }
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Failed to write startup profile: {e}")
+
+        name_width = max((len(r["name"]) + 2 * r["depth"] for r in rows), default=5)
+        name_width = max(name_width, len("Phase"))
+        print(f"{'Phase':<{name_width}}  {'Total(ms)':>10}  {'Self(ms)':>10}")
+        print("-" * (name_width + 24))
+        for row in rows:
+            label = "  " * row["depth"] + row["name"]
+            line = f"{label:<{name_width}}  {row['total_ms']:>10.1f}  {row['self_ms']:>10.1f}"
+            if self._over_budget(row):
+                line += f"  ! over budget ({row['budget_ms']} ms)"
+            print(line)
+        print("-" * (name_width + 24))
+        print(f"{'Startup total':<{name_width}}  {total_ms:>10.1f}")
+        if over_budget:
+            print("Phases over budget: " + ", ".join(over_budget))
+        print(f"Startup profile written to: {os.path.abspath(self.report_path)}")
+        return over_budget
+
+
+_startup_profiler = StartupProfiler.from_environment()
+_startup_profiler.begin("module import")
+
 import sys
 import json
 import re
 import shutil
-import webbrowser
 import threading
-import urllib.request
-import urllib.error
 import hashlib
-import copy
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple, Deque
+from typing import Dict, List, Optional, Any, Tuple, Deque, Callable
 from functools import partial
 from dataclasses import dataclass
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import time
 import socket
 from urllib.parse import urlparse
 
+# 不依赖 Qt 的核心逻辑（配置读写、验证、导入导出、分组、Skill、插件等）
+from occm_core import (
+    CLIToolStatus,
+    ValidationResult,
+    ExportResult,
+    BatchExportResult,
+    BackupInfo,
+    CLIExportError,
+    ProviderValidationError,
+    ConfigWriteError,
+    ConfigParseError,
+    BackupError,
+    RestoreError,
+    ConfigChange,
+    GroupApplyPlan,
+    AgentGroupManager,
+    AuthManager,
+    AuthField,
+    OptionField,
+    NativeProviderConfig,
+    NATIVE_PROVIDERS,
+    NATIVE_DEFAULT_BASE_URLS,
+    get_native_provider,
+    EnvVarDetector,
+    ConfigPaths,
+    ConfigManager,
+    BackupManager,
+    ConfigTransaction,
+    ConfigTransactionError,
+    CLIConfigWriter,
+    CLIBackupManager,
+    CLIConfigGenerator,
+    CLIExportManager,
+    ConfigValidator,
+    ModelRegistry,
+    ImportService,
+    BatchSelector,
+    apply_batch,
+    copy_json,
+    DiscoveredSkill,
+    SkillDiscovery,
+    PluginConfig,
+    PluginManager,
+)
+
 
 def _resolve_env_value(value: str) -> str:
     """解析 {env:VAR} 形式的环境变量引用"""
@@ -173,6007 +384,2705 @@ class MonitorResult:
     message: str
 
 
-# ==================== CLI 导出模块数据类 ====================
-@dataclass
-class CLIToolStatus:
-    """CLI 工具安装状态"""
-
-    cli_type: str  # "claude" | "codex" | "gemini"
-    installed: bool  # 是否已安装（配置目录存在）
-    config_dir: Optional[Path]  # 配置目录路径
-    has_config: bool  # 是否已有配置文件
-    version: Optional[str] = None  # CLI 版本（如果可检测）
-
+STATUS_LABELS = {
+    "operational": "monitor.status_operational",
+    "degraded": "monitor.status_degraded",
+    "failed": "monitor.status_failed",
+    "error": "monitor.status_error",
+    "no_config": "monitor.status_no_config",
+}
 
-@dataclass
-class ValidationResult:
-    """Provider 配置验证结果"""
+# 状态颜色 - 与 UIConfig 配色方案一致
+STATUS_COLORS = {
+    "operational": "#4CAF50",  # UIConfig.COLOR_SUCCESS
+    "degraded": "#FF9800",  # UIConfig.COLOR_WARNING
+    "failed": "#F44336",  # UIConfig.COLOR_ERROR
+    "error": "#F44336",  # UIConfig.COLOR_ERROR
+    "no_config": "#9E9E9E",  # UIConfig.COLOR_TEXT_SECONDARY
+}
 
-    valid: bool
-    errors: List[str]  # 错误信息列表
-    warnings: List[str]  # 警告信息列表
+STATUS_BG_COLORS = {
+    "operational": "#1B3D1B",
+    "degraded": "#3D3018",
+    "failed": "#3D1B1B",
+    "error": "#3D1B1B",
+    "no_config": "#0d1117",
+}
 
-    @staticmethod
-    def success() -> "ValidationResult":
-        """创建成功的验证结果"""
-        return ValidationResult(valid=True, errors=[], warnings=[])
 
-    @staticmethod
-    def failure(
-        errors: List[str], warnings: Optional[List[str]] = None
-    ) -> "ValidationResult":
-        """创建失败的验证结果"""
-        return ValidationResult(valid=False, errors=errors, warnings=warnings or [])
+def _format_latency(value: Optional[int]) -> str:
+    return f"{value} ms" if isinstance(value, int) else "—"
 
 
-@dataclass
-class ExportResult:
-    """单个 CLI 工具导出结果"""
+def _calc_availability(history: Deque[MonitorResult]) -> Optional[float]:
+    if not history:
+        return None
+    total = len(history)
+    ok = sum(1 for item in history if item.status in ("operational", "degraded"))
+    if total == 0:
+        return None
+    return ok * 100.0 / total
 
-    success: bool
-    cli_type: str
-    backup_path: Optional[Path]
-    error_message: Optional[str]
-    files_written: List[Path]
 
-    @staticmethod
-    def ok(
-        cli_type: str, files_written: List[Path], backup_path: Optional[Path] = None
-    ) -> "ExportResult":
-        """创建成功的导出结果"""
-        return ExportResult(
-            success=True,
-            cli_type=cli_type,
-            backup_path=backup_path,
-            error_message=None,
-            files_written=files_written,
-        )
+def _measure_ping(origin: str, timeout_sec: float = 3.0) -> Optional[int]:
+    if not origin:
+        return None
+    parsed = urlparse(origin)
+    host = parsed.hostname
+    if not host:
+        return None
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    start = time.time()
+    try:
+        sock = socket.create_connection((host, port), timeout=timeout_sec)
+        sock.close()
+    except Exception:
+        return None
+    return int((time.time() - start) * 1000)
 
-    @staticmethod
-    def fail(
-        cli_type: str, error_message: str, backup_path: Optional[Path] = None
-    ) -> "ExportResult":
-        """创建失败的导出结果"""
-        return ExportResult(
-            success=False,
-            cli_type=cli_type,
-            backup_path=backup_path,
-            error_message=error_message,
-            files_written=[],
-        )
 
+def _safe_json_load(data: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(data.decode("utf-8"))
+    except Exception:
+        return None
 
-@dataclass
-class BatchExportResult:
-    """批量导出结果"""
 
-    total: int
-    successful: int
-    failed: int
-    results: List[ExportResult]
+_startup_profiler.begin("import PyQt5")
+from PyQt5.QtCore import (
+    Qt,
+    QUrl,
+    pyqtSignal,
+    QTimer,
+    QObject,
+    QRegularExpression,
+    Qt as QtCore,
+    QMetaObject,
+    Q_ARG,
+    pyqtSlot,
+    QSize,
+    QEvent,
+    QModelIndex,
+    QAbstractListModel,
+    QAbstractTableModel,
+    QSortFilterProxyModel,
+    QFileSystemWatcher,
+)
+from PyQt5.QtGui import (
+    QIcon,
+    QDesktopServices,
+    QFont,
+    QPixmap,
+    QColor,
+    QPainter,
+    QPen,
+    QTextCharFormat,
+    QSyntaxHighlighter,
+    QTextCursor,
+    QFontMetrics,
+    QKeySequence,
+)
+from PyQt5.QtWidgets import (
+    QApplication,
+    QWidget,
+    QFrame,
+    QVBoxLayout,
+    QHBoxLayout,
+    QGridLayout,
+    QFormLayout,
+    QLabel,
+    QStackedWidget,
+    QSplitter,
+    QScrollArea,
+    QSizePolicy,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+    QMessageBox,
+    QFileDialog,
+    QDialog,
+    QDialogButtonBox,
+    QTextEdit,
+    QListWidgetItem,
+    QGroupBox,
+    QShortcut,
+    QComboBox as QNativeComboBox,
+)
+from PyQt5 import sip
 
-    @property
-    def all_success(self) -> bool:
-        """是否全部成功"""
-        return self.failed == 0
+_startup_profiler.end()
 
-    @property
-    def partial_success(self) -> bool:
-        """是否部分成功"""
-        return self.successful > 0 and self.failed > 0
+_startup_profiler.begin("import qfluentwidgets")
+from qfluentwidgets import (
+    FluentWindow,
+    NavigationItemPosition,
+    MessageBox as FluentMessageBox,
+    MessageBoxBase,
+    InfoBar,
+    InfoBarPosition,
+    InfoBarIcon,
+    StateToolTip,
+    PushButton,
+    PrimaryPushButton,
+    TransparentPushButton,
+    TransparentToolButton,
+    HyperlinkButton,
+    HyperlinkLabel,
+    ToolButton,
+    LineEdit,
+    SearchLineEdit,
+    TextEdit,
+    PlainTextEdit,
+    ComboBox,
+    CheckBox,
+    RadioButton,
+    Slider,
+    SpinBox,
+    SubtitleLabel,
+    BodyLabel,
+    CaptionLabel,
+    StrongBodyLabel,
+    TitleLabel,
+    SimpleCardWidget,
+    ElevatedCardWidget,
+    HeaderCardWidget,
+    GroupHeaderCardWidget,
+    CardWidget,
+    TableWidget,
+    TableView,
+    TableItemDelegate,
+    TreeWidget,
+    ListWidget,
+    ListView,
+    ListItemDelegate,
+    FlowLayout,
+    ExpandLayout,
+    Pivot,
+    SegmentedWidget,
+    FluentIcon as FIF,
+    setTheme,
+    Theme,
+    isDarkTheme,
+    qconfig,
+    setThemeColor,
+    setFont,
+    SystemThemeListener,
+)
 
+_startup_profiler.end()
 
-@dataclass
-class BackupInfo:
-    """备份信息"""
 
-    path: Path
-    cli_type: str
-    created_at: datetime
-    files: List[str]
+# ==================== 语言管理器 ====================
+class LanguageManager(QObject):
+    """多语言管理器"""
 
+    language_changed = pyqtSignal(str)  # 语言切换信号
 
-# ==================== CLI 导出模块异常类 ====================
-class CLIExportError(Exception):
-    """CLI 导出错误基类"""
+    _instance = None
+    _current_language = "zh_CN"
+    # {语言代码: {"skill.title": "文本", ...}} 加载时展平的翻译表
+    _translations = {}
+    # 带参数翻译的格式化结果缓存 {(key, 参数): 文本}，切换语言时清空
+    _format_cache = {}
+    FORMAT_CACHE_SIZE = 4096
+    # ui_config.json 中已保存的语言，用于避免重复写入
+    _saved_language = None
 
-    pass
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            QObject.__init__(cls._instance)
+        return cls._instance
 
+    def __init__(self):
+        if not self._translations:
+            self._load_language(self._current_language)
 
-class ProviderValidationError(CLIExportError):
-    """Provider 配置验证错误"""
+    @staticmethod
+    def _locales_dir() -> Path:
+        return Path(__file__).parent / "locales"
 
-    def __init__(self, missing_fields: List[str]):
-        self.missing_fields = missing_fields
-        super().__init__(f"Provider 配置不完整: 缺少 {', '.join(missing_fields)}")
+    def _load_language(self, lang_code: str) -> bool:
+        """按需加载单个语言文件（首次切换到该语言时才读取）"""
+        if lang_code in self._translations:
+            return True
+        lang_file = self._locales_dir() / f"{lang_code}.json"
+        if not lang_file.exists():
+            return False
+        try:
+            with open(lang_file, "r", encoding="utf-8") as f:
+                self._translations[lang_code] = self._flatten(json.load(f))
+            return True
+        except Exception as e:
+            print(f"Failed to load language file {lang_file}: {e}")
+            return False
 
+    @classmethod
+    def _flatten(cls, data: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+        """将嵌套的翻译字典展平为 {"a.b.c": 文本}，查找时无需逐级遍历"""
+        flat = {}
+        for key, value in data.items():
+            if isinstance(value, dict):
+                flat.update(cls._flatten(value, f"{prefix}{key}."))
+            elif value is not None:
+                flat[f"{prefix}{key}"] = str(value)
+        return flat
 
-class ConfigWriteError(CLIExportError):
-    """配置写入错误"""
+    def set_language(self, lang_code: str):
+        """设置当前语言（语言未变化时不写配置、不发信号）"""
+        if not self._load_language(lang_code):
+            return
+        changed = lang_code != self._current_language
+        self._current_language = lang_code
+        # 仅在与已保存的偏好不同时写入配置文件
+        if lang_code != self._saved_language:
+            self._save_language_preference(lang_code)
+        if changed:
+            self._format_cache.clear()
+            # 发出语言切换信号
+            self.language_changed.emit(lang_code)
 
-    def __init__(self, path: Path, reason: str):
-        self.path = path
-        self.reason = reason
-        super().__init__(f"写入配置失败 ({path}): {reason}")
+    def get_current_language(self) -> str:
+        """获取当前语言"""
+        return self._current_language
 
+    def get_available_languages(self) -> List[str]:
+        """获取可用语言列表"""
+        locales_dir = self._locales_dir()
+        if not locales_dir.exists():
+            return []
+        return [lang_file.stem for lang_file in locales_dir.glob("*.json")]
 
-class ConfigParseError(CLIExportError):
-    """配置解析错误"""
+    def tr(self, key: str, **kwargs) -> str:
+        """翻译文本
 
-    def __init__(self, path: Path, format_type: str, reason: str):
-        self.path = path
-        self.format_type = format_type
-        self.reason = reason
-        super().__init__(f"解析 {format_type} 配置失败 ({path}): {reason}")
+        Args:
+            key: 翻译键，支持点号分隔的路径，如 "skill.title"
+            **kwargs: 格式化参数
 
+        Returns:
+            翻译后的文本
+        """
+        value = self._translations.get(self._current_language, {}).get(key)
+        if value is None:
+            return key
+        if not kwargs:
+            return value
 
-class BackupError(CLIExportError):
-    """备份操作错误"""
+        # 格式化参数（结果按 key + 参数缓存）
+        try:
+            cache_key = (key, tuple((k, type(v), v) for k, v in sorted(kwargs.items())))
+            cached = self._format_cache.get(cache_key)
+        except TypeError:
+            # 参数不可哈希，直接格式化
+            cache_key = cached = None
+        if cached is not None:
+            return cached
 
-    def __init__(self, cli_type: str, reason: str):
-        self.cli_type = cli_type
-        self.reason = reason
-        super().__init__(f"备份 {cli_type} 配置失败: {reason}")
+        try:
+            result = value.format(**kwargs)
+        except KeyError:
+            result = value
+
+        if cache_key is not None:
+            if len(self._format_cache) >= self.FORMAT_CACHE_SIZE:
+                self._format_cache.clear()
+            self._format_cache[cache_key] = result
+        return result
 
+    def _save_language_preference(self, lang_code: str):
+        """保存语言偏好到配置文件"""
+        config_file = Path.home() / ".config" / "opencode" / "ui_config.json"
+        config_file.parent.mkdir(parents=True, exist_ok=True)
 
-class RestoreError(CLIExportError):
-    """恢复操作错误"""
-
-    def __init__(self, backup_path: Path, reason: str):
-        self.backup_path = backup_path
-        self.reason = reason
-        super().__init__(f"恢复备份失败 ({backup_path}): {reason}")
-
-
-# ==================== Agent 分组管理 ====================
-class AgentGroupManager:
-    """Agent分组管理器
-
-    管理OpenCode和Oh My OpenCode的Agent分组配置，支持：
-    - 创建、编辑、删除自定义分组
-    - 快速应用预设或自定义分组
-    - 导入/导出分组配置
-    - 使用统计追踪
-    """
-
-    # 预设模板定义
-    PRESETS = [
-        {
-            "id": "preset-minimal",
-            "name": "最小化配置",
-            "name_en": "Minimal",
-            "description": "仅启用核心Agent，适合简单任务",
-            "description_en": "Core agents only, for simple tasks",
-            "icon": "⚡",
-            "agents": {
-                "opencode": [{"agent_id": "build", "enabled": True, "config": {}}],
-                "oh_my_opencode": [{"agent_id": "sisyphus-junior", "enabled": True}],
-            },
-        },
-        {
-            "id": "preset-standard",
-            "name": "标准配置",
-            "name_en": "Standard",
-            "description": "平衡的Agent组合，适合大多数任务",
-            "description_en": "Balanced agent combination for most tasks",
-            "icon": "⚙️",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-full",
-            "name": "常用配置",
-            "name_en": "Common",
-            "description": "常用Agent组合，适合大多数复杂项目",
-            "description_en": "Common agent combination for most complex projects",
-            "icon": "🚀",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                    {"agent_id": "librarian", "enabled": True},
-                    {"agent_id": "explore", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-complete",
-            "name": "完整配置",
-            "name_en": "Complete",
-            "description": "启用所有Agent，最大化功能",
-            "description_en": "All agents enabled, maximum functionality",
-            "icon": "💎",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                    {"agent_id": "code-reviewer", "enabled": True, "config": {}},
-                    {"agent_id": "oracle", "enabled": True, "config": {}},
-                    {"agent_id": "librarian", "enabled": True, "config": {}},
-                    {"agent_id": "prometheus", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                    {"agent_id": "librarian", "enabled": True},
-                    {"agent_id": "explore", "enabled": True},
-                    {"agent_id": "atlas", "enabled": True},
-                    {"agent_id": "metis", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-frontend",
-            "name": "前端开发",
-            "name_en": "Frontend",
-            "description": "针对前端UI/UX开发优化",
-            "description_en": "Optimized for frontend UI/UX development",
-            "icon": "🎨",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                ],
-            },
-        },
-        {
-            "id": "preset-backend",
-            "name": "后端开发",
-            "name_en": "Backend",
-            "description": "针对后端API/数据库开发优化",
-            "description_en": "Optimized for backend API/database development",
-            "icon": "🔧",
-            "agents": {
-                "opencode": [
-                    {"agent_id": "build", "enabled": True, "config": {}},
-                    {"agent_id": "plan", "enabled": True, "config": {}},
-                    {"agent_id": "explore", "enabled": True, "config": {}},
-                ],
-                "oh_my_opencode": [
-                    {"agent_id": "prometheus", "enabled": True},
-                    {"agent_id": "sisyphus-junior", "enabled": True},
-                    {"agent_id": "oracle", "enabled": True},
-                ],
-            },
-        },
-    ]
-
-    def __init__(self, config_dir: Path):
-        """初始化分组管理器
+        config = {}
+        if config_file.exists():
+            try:
+                with open(config_file, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+            except Exception:
+                pass
 
-        Args:
-            config_dir: 配置文件目录 (~/.config/opencode)
-        """
-        self.config_dir = config_dir
-        self.groups_file = config_dir / "agent-groups.json"
-        self.backup_dir = config_dir / "backups"
-        self.groups_data = {}
-        self.load_groups()
-
-    # ========== 数据加载/保存 ==========
-
-    def load_groups(self) -> None:
-        """从文件加载分组配置"""
-        if not self.groups_file.exists():
-            # 初始化默认配置
-            self.groups_data = {
-                "version": "1.0.0",
-                "groups": [],
-                "settings": {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                },
-            }
-            self.save_groups()
-            return
+        config["language"] = lang_code
 
         try:
-            with open(self.groups_file, "r", encoding="utf-8") as f:
-                self.groups_data = json.load(f)
-
-            # 确保必要的字段存在
-            if "groups" not in self.groups_data:
-                self.groups_data["groups"] = []
-            if "settings" not in self.groups_data:
-                self.groups_data["settings"] = {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                }
+            with open(config_file, "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+            self._saved_language = lang_code
         except Exception as e:
-            print(f"加载分组配置失败: {e}")
-            self.groups_data = {
-                "version": "1.0.0",
-                "groups": [],
-                "settings": {
-                    "auto_backup": True,
-                    "show_usage_stats": True,
-                    "default_group_id": None,
-                },
-            }
-
-    def save_groups(self) -> None:
-        """保存分组配置到文件"""
-        try:
-            # 确保目录存在
-            self.config_dir.mkdir(parents=True, exist_ok=True)
+            print(f"Failed to save language preference: {e}")
 
-            # 保存前备份
-            if self.groups_data.get("settings", {}).get("auto_backup", True):
-                if self.groups_file.exists():
-                    self.backup_groups()
+    def _load_language_preference(self) -> str:
+        """从配置文件加载语言偏好，如果没有则自动识别系统语言"""
+        config_file = Path.home() / ".config" / "opencode" / "ui_config.json"
+        if config_file.exists():
+            try:
+                with open(config_file, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+                    saved_lang = config.get("language")
+                    if saved_lang:
+                        self._saved_language = saved_lang
+                        return saved_lang
+            except Exception:
+                pass
 
-            # 保存配置
-            with open(self.groups_file, "w", encoding="utf-8") as f:
-                json.dump(self.groups_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"保存分组配置失败: {e}")
-            raise
+        # 自动识别系统语言
+        return self._detect_system_language()
 
-    def backup_groups(self) -> Optional[Path]:
-        """备份当前分组配置
+    def _detect_system_language(self) -> str:
+        """自动识别系统语言
 
         Returns:
-            Path: 备份文件路径，失败返回None
+            语言代码，zh_CN 或 en_US
         """
         try:
-            # 确保备份目录存在
-            self.backup_dir.mkdir(parents=True, exist_ok=True)
-
-            # 生成备份文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.backup_dir / f"agent-groups-backup-{timestamp}.json"
-
-            # 复制当前配置
-            if self.groups_file.exists():
-                import shutil
-
-                shutil.copy2(self.groups_file, backup_file)
-
-                # 清理旧备份（保留最近10个）
-                self._cleanup_old_backups()
+            # 方法1: 使用 PyQt5 的 QLocale
+            from PyQt5.QtCore import QLocale
 
-                return backup_file
-        except Exception as e:
-            print(f"备份分组配置失败: {e}")
-            return None
+            system_locale = QLocale.system()
+            locale_name = system_locale.name()  # 例如: "zh_CN", "en_US", "ja_JP"
 
-    def _cleanup_old_backups(self, keep_count: int = 10) -> None:
-        """清理旧备份文件
+            # 判断是否为中文
+            if locale_name.startswith("zh"):
+                return "zh_CN"
+            else:
+                return "en_US"
+        except Exception:
+            pass
 
-        Args:
-            keep_count: 保留的备份数量
-        """
         try:
-            # 获取所有备份文件
-            backup_files = sorted(
-                self.backup_dir.glob("agent-groups-backup-*.json"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
-
-            # 删除多余的备份
-            for backup_file in backup_files[keep_count:]:
-                backup_file.unlink()
-        except Exception as e:
-            print(f"清理旧备份失败: {e}")
-
-    # ========== 分组CRUD操作 ==========
-
-    def create_group(
-        self, name: str, description: str, agents: Dict, icon: str = "📁"
-    ) -> str:
-        """创建新分组
-
-        Args:
-            name: 分组名称
-            description: 分组描述
-            agents: Agent配置字典
-            icon: 分组图标
-
-        Returns:
-            str: 分组ID (UUID)
-        """
-        import uuid
-
-        group_id = f"group-{uuid.uuid4().hex[:8]}"
-        now = datetime.now().isoformat()
-
-        group = {
-            "id": group_id,
-            "name": name,
-            "description": description,
-            "type": "custom",
-            "icon": icon,
-            "created_at": now,
-            "updated_at": now,
-            "agents": agents,
-            "statistics": {"usage_count": 0, "last_used": None},
-        }
-
-        self.groups_data["groups"].append(group)
-        self.save_groups()
+            # 方法2: 使用 Python 的 locale 模块
+            import locale
 
-        return group_id
+            system_locale = locale.getdefaultlocale()[0]  # 例如: "zh_CN", "en_US"
+            if system_locale and system_locale.startswith("zh"):
+                return "zh_CN"
+            else:
+                return "en_US"
+        except Exception:
+            pass
 
-    def update_group(self, group_id: str, **kwargs) -> bool:
-        """更新分组配置
+        # 默认返回中文
+        return "zh_CN"
 
-        Args:
-            group_id: 分组ID
-            **kwargs: 要更新的字段
 
-        Returns:
-            bool: 是否成功
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return False
+# 全局语言管理器实例
+with _startup_profiler.phase("LanguageManager"):
+    _lang_manager = LanguageManager()
 
-        # 更新字段
-        for key, value in kwargs.items():
-            if key in ["name", "description", "icon", "agents"]:
-                group[key] = value
 
-        # 更新时间戳
-        group["updated_at"] = datetime.now().isoformat()
+def tr(key: str, **kwargs) -> str:
+    """全局翻译函数"""
+    return _lang_manager.tr(key, **kwargs)
 
-        self.save_groups()
-        return True
 
-    def delete_group(self, group_id: str) -> bool:
-        """删除分组
+class TranslationRegistry:
+    """可翻译属性绑定注册表
 
-        Args:
-            group_id: 分组ID
+    创建控件时通过 bind_tr() 登记 (控件, 属性, 翻译键, 参数)。切换语言时只重设
+    已登记的属性：可见控件立即更新，其余（未显示的页面、隐藏的对话框）在空闲时
+    分批更新，切换耗时与已构建页面的数量无关。
+    """
 
-        Returns:
-            bool: 是否成功
-        """
-        groups = self.groups_data["groups"]
-        original_len = len(groups)
+    BATCH_SIZE = 200  # 每个空闲周期最多更新的绑定数
+
+    def __init__(self, lang_manager: LanguageManager):
+        # {(控件弱引用, setter 名称): (翻译键, 格式化参数)}
+        self._bindings: Dict[Tuple[Any, str], Tuple[str, Dict[str, Any]]] = {}
+        self._pending: Deque[Tuple[Any, str, str, Dict[str, Any]]] = deque()
+        lang_manager.language_changed.connect(self._on_language_changed)
+
+    def bind(self, widget: QWidget, key: str, prop: str = "text", **kwargs) -> str:
+        """设置控件属性为翻译文本并登记，重复绑定同一属性时覆盖旧的翻译键"""
+        setter = f"set{prop[0].upper()}{prop[1:]}"
+        text = tr(key, **kwargs)
+        getattr(widget, setter)(text)
+        self._bindings[(weakref.ref(widget), setter)] = (key, kwargs)
+        return text
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def _on_language_changed(self, _lang_code: str) -> None:
+        self._pending.clear()
+        for binding_key, (key, kwargs) in list(self._bindings.items()):
+            ref, setter = binding_key
+            widget = ref()
+            if widget is None or sip.isdeleted(widget):
+                # 控件已销毁，顺便清理
+                del self._bindings[binding_key]
+            elif widget.isVisible():
+                getattr(widget, setter)(tr(key, **kwargs))
+            else:
+                self._pending.append((ref, setter, key, kwargs))
+        if self._pending:
+            QTimer.singleShot(0, self._apply_pending)
 
-        self.groups_data["groups"] = [g for g in groups if g["id"] != group_id]
+    def _apply_pending(self) -> None:
+        """空闲时分批更新不可见控件"""
+        for _ in range(min(self.BATCH_SIZE, len(self._pending))):
+            ref, setter, key, kwargs = self._pending.popleft()
+            widget = ref()
+            if widget is not None and not sip.isdeleted(widget):
+                getattr(widget, setter)(tr(key, **kwargs))
+        if self._pending:
+            QTimer.singleShot(0, self._apply_pending)
 
-        if len(self.groups_data["groups"]) < original_len:
-            self.save_groups()
-            return True
 
-        return False
+_tr_registry = TranslationRegistry(_lang_manager)
 
-    def get_group(self, group_id: str) -> Optional[Dict]:
-        """获取分组配置
 
-        Args:
-            group_id: 分组ID
+def bind_tr(widget: QWidget, key: str, prop: str = "text", **kwargs) -> str:
+    """设置控件的可翻译属性（text / title / windowTitle / placeholderText /
+    toolTip 等），切换语言时自动更新"""
+    return _tr_registry.bind(widget, key, prop, **kwargs)
 
-        Returns:
-            Optional[Dict]: 分组配置，不存在返回None
-        """
-        for group in self.groups_data["groups"]:
-            if group["id"] == group_id:
-                return group
-        return None
 
-    def list_groups(self, include_presets: bool = False) -> List[Dict]:
-        """列出所有分组
+# ==================== UI 样式配置 ====================
+class UIConfig:
+    """全局 UI 配置"""
 
-        Args:
-            include_presets: 是否包含预设模板
+    # 字体配置 - 参考 Any-code 项目，优先使用系统原生字体
+    # Sans-serif 字体栈：优先系统字体，中文字体作为 fallback
+    FONT_FAMILY_SANS = "-apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', 'Fira Sans', 'Droid Sans', 'Helvetica Neue', 'Microsoft YaHei UI', '微软雅黑', 'PingFang SC', 'Hiragino Sans GB', 'SimSun', '宋体', 'Arial Unicode MS', sans-serif"
 
-        Returns:
-            List[Dict]: 分组列表
-        """
-        groups = self.groups_data["groups"].copy()
+    # Monospace 字体栈：用于代码和等宽文本
+    FONT_FAMILY_MONO = "'JetBrains Mono', 'Fira Code', 'SF Mono', 'Menlo', 'Monaco', 'Consolas', 'Liberation Mono', 'Courier New', 'Microsoft YaHei Mono', '微软雅黑', monospace"
 
-        if include_presets:
-            # 添加预设模板（标记为preset类型）
-            for preset in self.PRESETS:
-                preset_copy = preset.copy()
-                preset_copy["type"] = "preset"
-                groups.append(preset_copy)
+    # 字体大小配置
+    FONT_SIZE_TITLE = 16
+    FONT_SIZE_BODY = 14
+    FONT_SIZE_SMALL = 12
+    FONT_SIZE_NUMBER = 20
 
-        return groups
+    # 状态颜色（不随主题变化）
+    COLOR_PRIMARY = "#2196F3"  # 高亮/主色
+    COLOR_SUCCESS = "#4CAF50"  # 成功
+    COLOR_WARNING = "#FF9800"  # 警告
+    COLOR_ERROR = "#F44336"  # 错误
 
-    # ========== 分组应用 ==========
+    # 深色主题颜色 (GitHub Dark 风格 - 接近纯黑)
+    DARK_BG = "#0d1117"  # 主背景
+    DARK_CARD = "#161b22"  # 卡片背景
+    DARK_BORDER = "#30363d"  # 边框
 
-    def apply_group(
-        self, group_id: str, opencode_config: Dict, omo_config: Dict
-    ) -> Tuple[Dict, Dict]:
-        """应用分组配置到OpenCode和Oh My OpenCode
+    # 布局
+    WINDOW_WIDTH = 1200
+    WINDOW_HEIGHT = 870
 
-        Args:
-            group_id: 分组ID
-            opencode_config: 当前OpenCode配置
-            omo_config: 当前Oh My OpenCode配置
+    @staticmethod
+    def get_stylesheet() -> str:
+        """获取全局 QSS 样式表 - 优化字体渲染，解决英文显示和遮挡问题"""
+        # 字体栈定义
+        font_sans = "-apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', 'Fira Sans', 'Droid Sans', 'Helvetica Neue', 'Microsoft YaHei UI', '微软雅黑', 'PingFang SC', 'Hiragino Sans GB', 'SimSun', '宋体', 'Arial Unicode MS', sans-serif"
+        font_mono = "'JetBrains Mono', 'Fira Code', 'SF Mono', 'Menlo', 'Monaco', 'Consolas', 'Liberation Mono', 'Courier New', 'Microsoft YaHei Mono', '微软雅黑', monospace"
 
-        Returns:
-            Tuple[Dict, Dict]: 更新后的(opencode_config, omo_config)
-        """
-        # 获取分组配置（支持预设模板）
-        group = self.get_group(group_id)
-        if not group:
-            # 尝试从预设模板中查找
-            for preset in self.PRESETS:
-                if preset["id"] == group_id:
-                    group = preset
-                    break
+        return f"""
+            /* ==================== 全局字体 ==================== */
+            * {{
+                font-family: {font_sans};
+            }}
+            QWidget {{
+                font-family: {font_sans};
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+            }}
 
-        if not group:
-            return opencode_config, omo_config
-
-        # 1. 更新OpenCode Agent配置
-        if "agent" not in opencode_config:
-            opencode_config["agent"] = {}
-
-        # 获取所有OpenCode Agent ID
-        all_opencode_agents = set()
-        for agent_cfg in group["agents"].get("opencode", []):
-            all_opencode_agents.add(agent_cfg["agent_id"])
-
-        # 应用分组配置
-        for agent_cfg in group["agents"].get("opencode", []):
-            agent_id = agent_cfg["agent_id"]
-            if agent_cfg["enabled"]:
-                # 启用Agent并应用配置
-                if agent_id not in opencode_config["agent"]:
-                    opencode_config["agent"][agent_id] = {}
-
-                # 合并配置
-                config = agent_cfg.get("config", {})
-                opencode_config["agent"][agent_id].update(config)
+            /* ==================== 字体大小层级 ==================== */
+            TitleLabel {{
+                font-size: 18px;
+                font-weight: bold;
+                font-family: {font_sans};
+            }}
+            SubtitleLabel {{
+                font-size: {UIConfig.FONT_SIZE_TITLE}px;
+                font-weight: bold;
+                font-family: {font_sans};
+            }}
+            BodyLabel {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+            }}
+            CaptionLabel {{
+                font-size: {UIConfig.FONT_SIZE_SMALL}px;
+                font-family: {font_sans};
+            }}
+            StrongBodyLabel {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-weight: bold;
+                font-family: {font_sans};
+            }}
 
-                # 确保disable字段为False或不存在
-                if "disable" in opencode_config["agent"][agent_id]:
-                    opencode_config["agent"][agent_id]["disable"] = False
-            else:
-                # 禁用Agent
-                if agent_id in opencode_config["agent"]:
-                    opencode_config["agent"][agent_id]["disable"] = True
-
-        # 2. 更新Oh My OpenCode Agent配置
-        if "agents" not in omo_config:
-            omo_config["agents"] = {}
-
-        # 获取所有Oh My OpenCode Agent ID
-        all_omo_agents = set()
-        for agent_cfg in group["agents"].get("oh_my_opencode", []):
-            all_omo_agents.add(agent_cfg["agent_id"])
-
-        # 应用分组配置
-        for agent_cfg in group["agents"].get("oh_my_opencode", []):
-            agent_id = agent_cfg["agent_id"]
-            if agent_cfg["enabled"]:
-                # 启用Agent并应用配置
-                omo_config["agents"][agent_id] = {
-                    "provider": agent_cfg.get("provider", ""),
-                    "model": agent_cfg.get("model", ""),
-                }
-            else:
-                # 禁用Agent（从配置中移除）
-                if agent_id in omo_config["agents"]:
-                    del omo_config["agents"][agent_id]
+            /* ==================== 按钮字体 ==================== */
+            QPushButton, PushButton, PrimaryPushButton, TransparentPushButton, ToolButton {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+                padding: 6px 16px;
+                min-height: 32px;
+            }}
 
-        # 3. 更新使用统计（仅对自定义分组）
-        if group.get("type") == "custom":
-            self.update_usage_stats(group_id)
+            /* ==================== 输入框字体 ==================== */
+            QLineEdit, LineEdit {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+                padding: 6px 12px;
+                min-height: 32px;
+            }}
+            
+            QTextEdit, TextEdit, QPlainTextEdit, PlainTextEdit {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_mono};
+                line-height: 1.6;
+            }}
 
-        return opencode_config, omo_config
+            /* ==================== 下拉框字体 ==================== */
+            QComboBox, ComboBox {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+                padding: 6px 12px;
+                min-height: 32px;
+            }}
+            
+            QComboBox::drop-down {{
+                width: 30px;
+            }}
+            
+            QComboBox QAbstractItemView {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+                padding: 4px;
+            }}
 
-    def get_current_group_match(
-        self, opencode_config: Dict, omo_config: Dict
-    ) -> Optional[str]:
-        """检测当前配置是否匹配某个分组
-
-        Args:
-            opencode_config: 当前OpenCode配置
-            omo_config: 当前Oh My OpenCode配置
-
-        Returns:
-            Optional[str]: 匹配的分组ID，无匹配返回None
-        """
-        # 获取当前启用的Agent
-        current_opencode_agents = set()
-        for agent_id, config in opencode_config.get("agent", {}).items():
-            if not config.get("disable", False):
-                current_opencode_agents.add(agent_id)
-
-        current_omo_agents = set(omo_config.get("agents", {}).keys())
-
-        # 检查所有分组（包括预设）
-        all_groups = self.list_groups(include_presets=True)
-
-        for group in all_groups:
-            # 获取分组中启用的Agent
-            group_opencode_agents = set()
-            for agent_cfg in group["agents"].get("opencode", []):
-                if agent_cfg["enabled"]:
-                    group_opencode_agents.add(agent_cfg["agent_id"])
-
-            group_omo_agents = set()
-            for agent_cfg in group["agents"].get("oh_my_opencode", []):
-                if agent_cfg["enabled"]:
-                    group_omo_agents.add(agent_cfg["agent_id"])
-
-            # 检查是否匹配
-            if (
-                current_opencode_agents == group_opencode_agents
-                and current_omo_agents == group_omo_agents
-            ):
-                return group["id"]
-
-        return None
-
-    # ========== 预设模板 ==========
-
-    def get_presets(self) -> List[Dict]:
-        """获取所有预设模板
-
-        Returns:
-            List[Dict]: 预设模板列表
-        """
-        return self.PRESETS.copy()
-
-    def create_from_preset(
-        self, preset_id: str, name: str, description: Optional[str] = None
-    ) -> Optional[str]:
-        """从预设模板创建分组
-
-        Args:
-            preset_id: 预设模板ID
-            name: 新分组名称
-            description: 新分组描述（可选）
-
-        Returns:
-            Optional[str]: 新分组ID，失败返回None
-        """
-        # 查找预设模板
-        preset = None
-        for p in self.PRESETS:
-            if p["id"] == preset_id:
-                preset = p
-                break
-
-        if not preset:
-            return None
-
-        # 使用预设的描述（如果未提供）
-        if description is None:
-            description = preset["description"]
-
-        # 创建新分组
-        return self.create_group(
-            name=name,
-            description=description,
-            agents=preset["agents"],
-            icon=preset["icon"],
-        )
-
-    # ========== 导入/导出 ==========
-
-    def export_group(self, group_id: str, file_path: Path) -> bool:
-        """导出分组到文件
-
-        Args:
-            group_id: 分组ID
-            file_path: 导出文件路径
-
-        Returns:
-            bool: 是否成功
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return False
-
-        try:
-            # 创建导出数据
-            export_data = {
-                "version": "1.0.0",
-                "exported_at": datetime.now().isoformat(),
-                "group": group,
-            }
-
-            # 写入文件
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            return True
-        except Exception as e:
-            print(f"导出分组失败: {e}")
-            return False
-
-    def import_group(self, file_path: Path, overwrite: bool = False) -> Optional[str]:
-        """从文件导入分组
-
-        Args:
-            file_path: 导入文件路径
-            overwrite: 是否覆盖同名分组
-
-        Returns:
-            Optional[str]: 导入的分组ID，失败返回None
-        """
-        try:
-            # 读取文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                import_data = json.load(f)
-
-            # 验证格式
-            if "group" not in import_data:
-                print("导入文件格式错误：缺少group字段")
-                return None
-
-            group = import_data["group"]
-
-            # 检查同名分组
-            existing_group = None
-            for g in self.groups_data["groups"]:
-                if g["name"] == group["name"]:
-                    existing_group = g
-                    break
-
-            if existing_group and not overwrite:
-                print(f"分组 '{group['name']}' 已存在")
-                return None
-
-            if existing_group and overwrite:
-                # 覆盖现有分组
-                group_id = existing_group["id"]
-                self.update_group(
-                    group_id,
-                    description=group["description"],
-                    icon=group.get("icon", "📁"),
-                    agents=group["agents"],
-                )
-                return group_id
-            else:
-                # 创建新分组
-                return self.create_group(
-                    name=group["name"],
-                    description=group["description"],
-                    agents=group["agents"],
-                    icon=group.get("icon", "📁"),
-                )
-        except Exception as e:
-            print(f"导入分组失败: {e}")
-            return None
-
-    # ========== 统计信息 ==========
-
-    def update_usage_stats(self, group_id: str) -> None:
-        """更新分组使用统计
-
-        Args:
-            group_id: 分组ID
-        """
-        group = self.get_group(group_id)
-        if not group:
-            return
-
-        if "statistics" not in group:
-            group["statistics"] = {"usage_count": 0, "last_used": None}
-
-        group["statistics"]["usage_count"] = (
-            group["statistics"].get("usage_count", 0) + 1
-        )
-        group["statistics"]["last_used"] = datetime.now().isoformat()
+            /* ==================== 表格字体 ==================== */
+            QTableWidget, TableWidget {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+            }}
+            QHeaderView::section {{
+                font-weight: 600;
+                font-size: 13px;
+                font-family: {font_sans};
+                padding: 8px 12px;
+                min-height: 36px;
+            }}
+            
+            /* ==================== 修复表格左上角单元格白色问题 ==================== */
+            QTableWidget QTableCornerButton::section {{
+                background-color: transparent;
+                border: none;
+            }}
 
-        self.save_groups()
+            /* ==================== 列表字体 ==================== */
+            QListWidget, ListWidget {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+            }}
+            
+            QListWidget::item {{
+                padding: 8px 12px;
+                min-height: 36px;
+            }}
 
-    def get_usage_stats(self, group_id: str) -> Dict:
-        """获取分组使用统计
+            /* ==================== 菜单字体 ==================== */
+            QMenu {{
+                font-size: {UIConfig.FONT_SIZE_BODY}px;
+                font-family: {font_sans};
+                padding: 4px;
+            }}
+            
+            QMenu::item {{
+                padding: 8px 24px 8px 12px;
+                min-height: 32px;
+            }}
 
-        Args:
-            group_id: 分组ID
+            /* ==================== 滚动条样式 ==================== */
+            QScrollBar:vertical {{
+                width: 8px;
+            }}
+            QScrollBar:horizontal {{
+                height: 8px;
+            }}
 
-        Returns:
-            Dict: 统计信息
+            /* ==================== 工具提示字体 ==================== */
+            QToolTip {{
+                font-size: {UIConfig.FONT_SIZE_SMALL}px;
+                font-family: {font_sans};
+                padding: 6px 10px;
+            }}
+            
+            /* ==================== 代码/等宽文本 ==================== */
+            code, pre, .monospace {{
+                font-family: {font_mono};
+                font-size: {UIConfig.FONT_SIZE_SMALL}px;
+            }}
         """
-        group = self.get_group(group_id)
-        if not group:
-            return {"usage_count": 0, "last_used": None}
-
-        return group.get("statistics", {"usage_count": 0, "last_used": None})
 
 
-# ==================== 原生 Provider 认证管理 ====================
-class AuthManager:
-    """认证凭证管理器 - 管理 auth.json 文件的读写操作
+class StyleSheetCache:
+    """样式表缓存 - 按 (用途, 主题, 尺寸档位) 缓存生成好的样式表
 
-    auth.json 存储原生 Provider 的认证凭证，路径：
-    - Windows: %LOCALAPPDATA%/opencode/auth.json 或 ~/.local/share/opencode/auth.json
-    - macOS/Linux: ~/.local/share/opencode/auth.json
+    apply() 在控件当前样式表与目标一致时直接跳过：每次 setStyleSheet 都会让
+    Qt 重新 polish 整棵子控件树，重复应用相同样式是主题切换与缩放卡顿的主因。
     """
 
-    def __init__(self):
-        self._auth_path: Optional[Path] = None
-
-    @property
-    def auth_path(self) -> Path:
-        """获取 auth.json 路径（延迟初始化）"""
-        if self._auth_path is None:
-            self._auth_path = self._get_auth_path()
-        return self._auth_path
-
-    def _get_auth_path(self) -> Path:
-        """获取 auth.json 路径（跨平台支持）
-
-        Windows: 优先使用 %LOCALAPPDATA%/opencode，回退到 ~/.local/share/opencode
-        Unix: 使用 ~/.local/share/opencode
-        """
-        if sys.platform == "win32":
-            # Windows: 优先使用 LOCALAPPDATA
-            local_app_data = os.environ.get("LOCALAPPDATA", "")
-            if local_app_data:
-                base = Path(local_app_data) / "opencode"
-            else:
-                # 回退到 Unix 风格路径
-                base = Path.home() / ".local" / "share" / "opencode"
-        else:
-            # macOS / Linux
-            base = Path.home() / ".local" / "share" / "opencode"
-
-        return base / "auth.json"
-
-    def _ensure_parent_dir(self) -> None:
-        """确保 auth.json 的父目录存在"""
-        parent = self.auth_path.parent
-        if not parent.exists():
-            parent.mkdir(parents=True, exist_ok=True)
-
-    def read_auth(self) -> Dict[str, Any]:
-        """读取 auth.json 文件
-
-        Returns:
-            认证配置字典，文件不存在时返回空字典
-
-        Raises:
-            json.JSONDecodeError: 当文件格式错误时（由调用方处理）
-        """
-        if not self.auth_path.exists():
-            return {}
-
-        try:
-            with open(self.auth_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    return {}
-                return json.loads(content)
-        except json.JSONDecodeError:
-            # 重新抛出，让调用方决定如何处理
-            raise
-        except Exception:
-            # 其他读取错误，返回空字典
-            return {}
-
-    def write_auth(self, auth_data: Dict[str, Any]) -> None:
-        """写入 auth.json 文件
-
-        Args:
-            auth_data: 要写入的认证配置字典
-        """
-        self._ensure_parent_dir()
-        with open(self.auth_path, "w", encoding="utf-8") as f:
-            json.dump(auth_data, f, indent=2, ensure_ascii=False)
-
-    def get_provider_auth(self, provider_id: str) -> Optional[Dict[str, Any]]:
-        """获取指定 Provider 的认证信息
-
-        Args:
-            provider_id: Provider 标识符（如 'anthropic', 'openai'）
-
-        Returns:
-            Provider 的认证配置字典，不存在时返回 None
-            返回格式兼容旧格式：{'apiKey': 'xxx'} 用于UI显示
-        """
-        auth_data = self.read_auth()
-        provider_auth = auth_data.get(provider_id)
-
-        if not provider_auth:
-            return None
-
-        # 如果是新格式 {"type": "api", "key": "xxx"}，转换为UI兼容格式
-        if "key" in provider_auth and "type" in provider_auth:
-            return {"apiKey": provider_auth["key"], "type": provider_auth["type"]}
-
-        # 保持原格式（用于特殊Provider或旧数据）
-        return provider_auth
-
-    def set_provider_auth(self, provider_id: str, auth_config: Dict[str, Any]) -> None:
-        """设置指定 Provider 的认证信息
-
-        Args:
-            provider_id: Provider 标识符
-            auth_config: 认证配置字典（如 {'apiKey': 'sk-xxx'}）
-        """
-        auth_data = self.read_auth()
-
-        # 转换为OpenCode官方格式：{"type": "api", "key": "xxx"}
-        # 支持输入格式：{'apiKey': 'xxx'} 或 {'key': 'xxx'}
-        api_key = auth_config.get("apiKey") or auth_config.get("key")
-        auth_type = auth_config.get("type", "api")  # 默认为api类型
+    _cache: Dict[tuple, str] = {}
 
-        if api_key:
-            auth_data[provider_id] = {"type": auth_type, "key": api_key}
-        else:
-            # 如果没有apiKey/key字段，保持原样（用于特殊Provider如AWS）
-            auth_data[provider_id] = auth_config
-
-        self.write_auth(auth_data)
-
-    def delete_provider_auth(self, provider_id: str) -> bool:
-        """删除指定 Provider 的认证信息
-
-        Args:
-            provider_id: Provider 标识符
-
-        Returns:
-            是否成功删除（Provider 不存在时返回 False）
-        """
-        auth_data = self.read_auth()
-        if provider_id in auth_data:
-            del auth_data[provider_id]
-            self.write_auth(auth_data)
-            return True
-        return False
+    @classmethod
+    def get(cls, key: tuple, builder: Callable[[], str]) -> str:
+        """获取缓存的样式表，未命中时调用 builder 生成"""
+        stylesheet = cls._cache.get(key)
+        if stylesheet is None:
+            stylesheet = cls._cache[key] = builder()
+        return stylesheet
 
     @staticmethod
-    def mask_api_key(api_key: str) -> str:
-        """遮蔽 API Key，只显示首尾字符
-
-        Args:
-            api_key: 原始 API Key
-
-        Returns:
-            遮蔽后的字符串：
-            - 长度 > 8: 显示首 4 字符 + ... + 尾 4 字符
-            - 长度 <= 8: 显示 ****
-        """
-        if not api_key:
-            return ""
-        if len(api_key) <= 8:
-            return "****"
-        return f"{api_key[:4]}...{api_key[-4:]}"
-
-
-# ==================== 原生 Provider 配置数据类 ====================
-@dataclass
-class AuthField:
-    """认证字段定义"""
-
-    key: str  # 字段键名（如 'apiKey', 'accessKeyId'）
-    label: str  # 显示标签（如 'API Key', 'Access Key ID'）
-    field_type: str  # 字段类型: text, password, file
-    required: bool  # 是否必填
-    placeholder: str  # 占位符文本
-
-
-@dataclass
-class OptionField:
-    """选项字段定义"""
-
-    key: str  # 字段键名（如 'baseURL', 'region'）
-    label: str  # 显示标签
-    field_type: str  # 字段类型: text, select
-    options: List[str]  # 可选值（select 类型时使用）
-    default: str  # 默认值
-
-
-@dataclass
-class NativeProviderConfig:
-    """原生 Provider 配置定义"""
-
-    id: str  # Provider ID（如 'anthropic', 'openai'）
-    name: str  # 显示名称（如 'Anthropic (Claude)'）
-    sdk: str  # SDK 包名（如 '@ai-sdk/anthropic'）
-    auth_fields: List[AuthField]  # 认证字段列表
-    option_fields: List[OptionField]  # 选项字段列表
-    env_vars: List[str]  # 相关环境变量
-    test_endpoint: Optional[str]  # 测试端点（用于连接测试）
-
-
-# 所有支持的原生 Provider 配置
-NATIVE_PROVIDERS: List[NativeProviderConfig] = [
-    NativeProviderConfig(
-        id="anthropic",
-        name="Anthropic (Claude)",
-        sdk="@ai-sdk/anthropic",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "sk-ant-..."),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["ANTHROPIC_API_KEY"],
-        test_endpoint="/v1/models",
-    ),
-    NativeProviderConfig(
-        id="openai",
-        name="OpenAI",
-        sdk="@ai-sdk/openai",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "sk-..."),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["OPENAI_API_KEY"],
-        test_endpoint="/v1/models",
-    ),
-    NativeProviderConfig(
-        id="gemini",
-        name="Google Gemini",
-        sdk="@ai-sdk/google",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["GEMINI_API_KEY", "GOOGLE_API_KEY"],
-        test_endpoint="/v1/models",
-    ),
-    NativeProviderConfig(
-        id="amazon-bedrock",
-        name="Amazon Bedrock",
-        sdk="@ai-sdk/amazon-bedrock",
-        auth_fields=[
-            AuthField("accessKeyId", "Access Key ID", "password", False, "AKIA..."),
-            AuthField("secretAccessKey", "Secret Access Key", "password", False, ""),
-            AuthField("profile", "AWS Profile", "text", False, "default"),
-        ],
-        option_fields=[
-            OptionField(
-                "region",
-                "Region",
-                "select",
-                ["us-east-1", "us-west-2", "eu-west-1", "ap-northeast-1"],
-                "us-east-1",
-            ),
-            OptionField("endpoint", "VPC Endpoint", "text", [], ""),
-        ],
-        env_vars=[
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "AWS_PROFILE",
-            "AWS_REGION",
-        ],
-        test_endpoint=None,
-    ),
-    NativeProviderConfig(
-        id="azure",
-        name="Azure OpenAI",
-        sdk="@ai-sdk/azure",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-            AuthField("resourceName", "Resource Name", "text", True, ""),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["AZURE_OPENAI_API_KEY", "AZURE_RESOURCE_NAME"],
-        test_endpoint=None,
-    ),
-    NativeProviderConfig(
-        id="github-copilot",
-        name="GitHub Copilot",
-        sdk="@ai-sdk/openai",
-        auth_fields=[
-            AuthField("token", "GitHub Token", "password", True, ""),
-        ],
-        option_fields=[],
-        env_vars=[],
-        test_endpoint=None,
-    ),
-    NativeProviderConfig(
-        id="xai",
-        name="xAI (Grok)",
-        sdk="@ai-sdk/xai",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["XAI_API_KEY"],
-        test_endpoint="/v1/models",
-    ),
-    NativeProviderConfig(
-        id="groq",
-        name="Groq",
-        sdk="@ai-sdk/groq",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "gsk_..."),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], ""),
-        ],
-        env_vars=["GROQ_API_KEY"],
-        test_endpoint="/openai/v1/models",
-    ),
-    NativeProviderConfig(
-        id="openrouter",
-        name="OpenRouter",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "sk-or-..."),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL", "Base URL", "text", [], "https://openrouter.ai/api/v1"
-            ),
-        ],
-        env_vars=["OPENROUTER_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="google-vertex",
-        name="Google Vertex AI",
-        sdk="@ai-sdk/google-vertex",
-        auth_fields=[
-            AuthField("credentials", "Service Account JSON", "file", False, ""),
-            AuthField("projectId", "Project ID", "text", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "location",
-                "Location",
-                "select",
-                ["global", "us-central1", "us-east1", "europe-west1", "asia-east1"],
-                "global",
-            ),
-        ],
-        env_vars=[
-            "GOOGLE_APPLICATION_CREDENTIALS",
-            "GOOGLE_CLOUD_PROJECT",
-            "VERTEX_LOCATION",
-        ],
-        test_endpoint=None,
-    ),
-    NativeProviderConfig(
-        id="deepseek",
-        name="DeepSeek",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "sk-..."),
-        ],
-        option_fields=[
-            OptionField("baseURL", "Base URL", "text", [], "https://api.deepseek.com"),
-        ],
-        env_vars=["DEEPSEEK_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="zhipuai",
-        name="Zhipu AI (智谱GLM)",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "text",
-                [],
-                "https://open.bigmodel.cn/api/paas/v4",
-            ),
-        ],
-        env_vars=["ZHIPU_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="zhipuai-coding-plan",
-        name="Zhipu AI Coding Plan (智谱GLM编码套餐)",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "text",
-                [],
-                "https://open.bigmodel.cn/api/coding/paas/v4",
-            ),
-        ],
-        env_vars=["ZHIPU_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="zai",
-        name="Z.AI",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "text",
-                [],
-                "https://api.z.ai/api/paas/v4",
-            ),
-        ],
-        env_vars=["ZHIPU_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="zai-coding-plan",
-        name="Z.AI Coding Plan",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "text",
-                [],
-                "https://api.z.ai/api/coding/paas/v4",
-            ),
-        ],
-        env_vars=["ZHIPU_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="qwen",
-        name="千问 Qwen",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, "sk-..."),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "text",
-                [],
-                "https://dashscope.aliyuncs.com/compatible-mode/v1",
-            ),
-        ],
-        env_vars=["DASHSCOPE_API_KEY", "QWEN_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="moonshot",
-        name="Moonshot AI (Kimi)",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL", "Base URL", "text", [], "https://api.moonshot.cn/v1"
-            ),
-        ],
-        env_vars=["MOONSHOT_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="yi",
-        name="零一万物 Yi",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL", "Base URL", "text", [], "https://api.lingyiwanwu.com/v1"
-            ),
-        ],
-        env_vars=["YI_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="minimax",
-        name="MiniMax",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL",
-                "Base URL",
-                "select",
-                [
-                    "https://api.minimax.io/v1",
-                    "https://api.minimaxi.com/v1",
-                ],
-                "https://api.minimax.io/v1",
-            ),
-        ],
-        env_vars=["MINIMAX_API_KEY"],
-        test_endpoint="/models",
-    ),
-    NativeProviderConfig(
-        id="opencode",
-        name="OpenCode Zen",
-        sdk="@ai-sdk/openai-compatible",
-        auth_fields=[
-            AuthField("apiKey", "API Key", "password", True, ""),
-        ],
-        option_fields=[
-            OptionField(
-                "baseURL", "Base URL", "text", [], "https://api.opencode.ai/v1"
-            ),
-        ],
-        env_vars=[],
-        test_endpoint="/models",
-    ),
-]
-
-
-def get_native_provider(provider_id: str) -> Optional[NativeProviderConfig]:
-    """根据 ID 获取原生 Provider 配置"""
-    for provider in NATIVE_PROVIDERS:
-        if provider.id == provider_id:
-            return provider
-    return None
-
+    def apply(widget: QWidget, stylesheet: str) -> bool:
+        """应用样式表，未变化时跳过；返回是否实际应用"""
+        if widget.styleSheet() == stylesheet:
+            return False
+        widget.setStyleSheet(stylesheet)
+        return True
 
-# ==================== 环境变量检测器 ====================
-class EnvVarDetector:
-    """环境变量检测器 - 检测系统中已设置的 Provider 相关环境变量"""
-
-    # Provider 与环境变量的映射
-    PROVIDER_ENV_VARS: Dict[str, List[str]] = {
-        "anthropic": ["ANTHROPIC_API_KEY"],
-        "openai": ["OPENAI_API_KEY"],
-        "gemini": ["GEMINI_API_KEY", "GOOGLE_API_KEY"],
-        "amazon-bedrock": [
-            "AWS_ACCESS_KEY_ID",
-            "AWS_SECRET_ACCESS_KEY",
-            "AWS_PROFILE",
-            "AWS_REGION",
-        ],
-        "azure": ["AZURE_OPENAI_API_KEY", "AZURE_RESOURCE_NAME"],
-        "xai": ["XAI_API_KEY"],
-        "groq": ["GROQ_API_KEY"],
-        "openrouter": ["OPENROUTER_API_KEY"],
-        "google-vertex": [
-            "GOOGLE_APPLICATION_CREDENTIALS",
-            "GOOGLE_CLOUD_PROJECT",
-            "VERTEX_LOCATION",
-        ],
-        "deepseek": ["DEEPSEEK_API_KEY"],
-        "zhipuai": ["ZHIPU_API_KEY"],
-        "zhipuai-coding-plan": ["ZHIPU_API_KEY"],
-        "zai": ["ZHIPU_API_KEY"],
-        "zai-coding-plan": ["ZHIPU_API_KEY"],
-        "qwen": ["DASHSCOPE_API_KEY", "QWEN_API_KEY"],
-        "moonshot": ["MOONSHOT_API_KEY"],
-        "yi": ["YI_API_KEY"],
-        "minimax": ["MINIMAX_API_KEY"],
-    }
 
-    # 环境变量到认证字段的映射
-    ENV_TO_AUTH_FIELD: Dict[str, str] = {
-        "ANTHROPIC_API_KEY": "apiKey",
-        "OPENAI_API_KEY": "apiKey",
-        "GEMINI_API_KEY": "apiKey",
-        "GOOGLE_API_KEY": "apiKey",
-        "AWS_ACCESS_KEY_ID": "accessKeyId",
-        "AWS_SECRET_ACCESS_KEY": "secretAccessKey",
-        "AWS_PROFILE": "profile",
-        "AZURE_OPENAI_API_KEY": "apiKey",
-        "AZURE_RESOURCE_NAME": "resourceName",
-        "XAI_API_KEY": "apiKey",
-        "GROQ_API_KEY": "apiKey",
-        "OPENROUTER_API_KEY": "apiKey",
-        "GOOGLE_APPLICATION_CREDENTIALS": "credentials",
-        "GOOGLE_CLOUD_PROJECT": "projectId",
-        "DEEPSEEK_API_KEY": "apiKey",
-    }
+APP_VERSION = "1.7.1"
+GITHUB_REPO = "icysaintdx/OpenCode-Config-Manager"
+GITHUB_URL = f"https://github.com/{GITHUB_REPO}"
+GITHUB_RELEASES_API = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
+AUTHOR_NAME = "IcySaint"
+AUTHOR_GITHUB = "https://github.com/icysaintdx"
 
-    def detect_env_vars(self, provider_id: str) -> Dict[str, str]:
-        """检测指定 Provider 的环境变量
+# 监控页面配置
+MONITOR_POLL_INTERVAL_MS = 60000
+MONITOR_HISTORY_LIMIT = 60
+DEGRADED_THRESHOLD_MS = 6000
 
-        Args:
-            provider_id: Provider 标识符
+# ==================== 版本检查配置 ====================
+STARTUP_VERSION_CHECK_ENABLED = True  # 启动时是否检查版本
+IMMEDIATE_VERSION_CHECK_MS = 5000  # 启动后首次检查延迟 (5秒)
+UPDATE_INTERVAL_MS = 60 * 60 * 1000  # 定时检查间隔 (1小时)
 
-        Returns:
-            已设置的环境变量字典 {变量名: 值}
-        """
-        env_vars = self.PROVIDER_ENV_VARS.get(provider_id, [])
-        detected = {}
-        for var in env_vars:
-            value = os.environ.get(var)
-            if value:
-                detected[var] = value
-        return detected
+# ==================== 页面延迟加载配置 ====================
+LAZY_PAGE_PREFETCH_ENABLED = True  # 启动后空闲时是否逐个预加载页面
+LAZY_PAGE_PREFETCH_DELAY_MS = 3000  # 启动后开始预加载的延迟 (3秒)
+LAZY_PAGE_PREFETCH_INTERVAL_MS = 200  # 相邻两个页面预加载的间隔
 
-    def detect_all_env_vars(self) -> Dict[str, Dict[str, str]]:
-        """检测所有 Provider 的环境变量
+# ==================== 余额定时刷新配置 ====================
+BALANCE_AUTO_REFRESH_ENABLED = True  # 是否在后台定时刷新余额并记录历史
+BALANCE_REFRESH_INTERVAL_MS = 30 * 60 * 1000  # 定时刷新间隔 (30分钟)
+BALANCE_LOW_DAYS_THRESHOLD = 3  # 预计可用天数低于该值时提示
 
-        Returns:
-            {provider_id: {变量名: 值}}
-        """
-        result = {}
-        for provider_id in self.PROVIDER_ENV_VARS:
-            detected = self.detect_env_vars(provider_id)
-            if detected:
-                result[provider_id] = detected
-        return result
+# ==================== 主题切换配置 ====================
+THEME_REFRESH_DELAY_MS = 0  # 合并同一轮事件循环内的多次主题变更后统一刷新
 
-    @staticmethod
-    def format_env_reference(var_name: str) -> str:
-        """格式化环境变量引用
 
-        Args:
-            var_name: 环境变量名
+def get_resource_path(relative_path: str) -> Path:
+    """获取资源文件路径 - 兼容 PyInstaller 打包后的环境"""
+    base_path_value = getattr(sys, "_MEIPASS", None)
+    base_path = Path(base_path_value) if base_path_value else Path(__file__).parent
+    return base_path / relative_path
 
-        Returns:
-            格式化的引用字符串 {env:VARIABLE_NAME}
-        """
-        return f"{{env:{var_name}}}"
 
-    def get_auth_field_for_env(self, env_var: str) -> Optional[str]:
-        """获取环境变量对应的认证字段名
-
-        Args:
-            env_var: 环境变量名
-
-        Returns:
-            对应的认证字段名，未找到时返回 None
-        """
-        return self.ENV_TO_AUTH_FIELD.get(env_var)
-
-
-STATUS_LABELS = {
-    "operational": "monitor.status_operational",
-    "degraded": "monitor.status_degraded",
-    "failed": "monitor.status_failed",
-    "error": "monitor.status_error",
-    "no_config": "monitor.status_no_config",
-}
-
-# 状态颜色 - 与 UIConfig 配色方案一致
-STATUS_COLORS = {
-    "operational": "#4CAF50",  # UIConfig.COLOR_SUCCESS
-    "degraded": "#FF9800",  # UIConfig.COLOR_WARNING
-    "failed": "#F44336",  # UIConfig.COLOR_ERROR
-    "error": "#F44336",  # UIConfig.COLOR_ERROR
-    "no_config": "#9E9E9E",  # UIConfig.COLOR_TEXT_SECONDARY
-}
-
-STATUS_BG_COLORS = {
-    "operational": "#1B3D1B",
-    "degraded": "#3D3018",
-    "failed": "#3D1B1B",
-    "error": "#3D1B1B",
-    "no_config": "#0d1117",
-}
-
-
-def _format_latency(value: Optional[int]) -> str:
-    return f"{value} ms" if isinstance(value, int) else "—"
-
-
-def _calc_availability(history: Deque[MonitorResult]) -> Optional[float]:
-    if not history:
-        return None
-    total = len(history)
-    ok = sum(1 for item in history if item.status in ("operational", "degraded"))
-    if total == 0:
-        return None
-    return ok * 100.0 / total
-
-
-def _measure_ping(origin: str, timeout_sec: float = 3.0) -> Optional[int]:
-    if not origin:
-        return None
-    parsed = urlparse(origin)
-    host = parsed.hostname
-    if not host:
-        return None
-    port = parsed.port or (443 if parsed.scheme == "https" else 80)
-    start = time.time()
-    try:
-        sock = socket.create_connection((host, port), timeout=timeout_sec)
-        sock.close()
-    except Exception:
-        return None
-    return int((time.time() - start) * 1000)
-
-
-def _safe_json_load(data: bytes) -> Optional[Dict[str, Any]]:
-    try:
-        return json.loads(data.decode("utf-8"))
-    except Exception:
-        return None
-
-
-from PyQt5.QtCore import (
-    Qt,
-    QUrl,
-    pyqtSignal,
-    QTimer,
-    QObject,
-    QRegularExpression,
-    Qt as QtCore,
-    QMetaObject,
-    Q_ARG,
-    pyqtSlot,
-    QSize,
-)
-from PyQt5.QtGui import (
-    QIcon,
-    QDesktopServices,
-    QFont,
-    QPixmap,
-    QColor,
-    QPainter,
-    QPen,
-    QTextCharFormat,
-    QSyntaxHighlighter,
-    QTextCursor,
-    QFontMetrics,
-)
-from PyQt5.QtWidgets import (
-    QApplication,
-    QWidget,
-    QFrame,
-    QVBoxLayout,
-    QHBoxLayout,
-    QGridLayout,
-    QFormLayout,
-    QLabel,
-    QStackedWidget,
-    QSplitter,
-    QScrollArea,
-    QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
-    QHeaderView,
-    QAbstractItemView,
-    QMessageBox,
-    QFileDialog,
-    QDialog,
-    QDialogButtonBox,
-    QTextEdit,
-    QListWidgetItem,
-    QGroupBox,
-    QComboBox as QNativeComboBox,
-)
-
-from qfluentwidgets import (
-    FluentWindow,
-    NavigationItemPosition,
-    MessageBox as FluentMessageBox,
-    MessageBoxBase,
-    InfoBar,
-    InfoBarPosition,
-    InfoBarIcon,
-    StateToolTip,
-    PushButton,
-    PrimaryPushButton,
-    TransparentPushButton,
-    TransparentToolButton,
-    HyperlinkButton,
-    HyperlinkLabel,
-    ToolButton,
-    LineEdit,
-    SearchLineEdit,
-    TextEdit,
-    PlainTextEdit,
-    ComboBox,
-    CheckBox,
-    RadioButton,
-    Slider,
-    SpinBox,
-    SubtitleLabel,
-    BodyLabel,
-    CaptionLabel,
-    StrongBodyLabel,
-    TitleLabel,
-    SimpleCardWidget,
-    ElevatedCardWidget,
-    HeaderCardWidget,
-    GroupHeaderCardWidget,
-    CardWidget,
-    TableWidget,
-    TreeWidget,
-    ListWidget,
-    FlowLayout,
-    ExpandLayout,
-    Pivot,
-    SegmentedWidget,
-    FluentIcon as FIF,
-    setTheme,
-    Theme,
-    isDarkTheme,
-    qconfig,
-    setThemeColor,
-    setFont,
-    SystemThemeListener,
-)
-
-
-# ==================== 语言管理器 ====================
-class LanguageManager(QObject):
-    """多语言管理器"""
-
-    language_changed = pyqtSignal(str)  # 语言切换信号
-
-    _instance = None
-    _current_language = "zh_CN"
-    _translations = {}
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            QObject.__init__(cls._instance)
-        return cls._instance
-
-    def __init__(self):
-        if not self._translations:
-            self._load_translations()
-
-    def _load_translations(self):
-        """加载所有语言文件"""
-        locales_dir = Path(__file__).parent / "locales"
-        if not locales_dir.exists():
-            return
-
-        for lang_file in locales_dir.glob("*.json"):
-            lang_code = lang_file.stem
-            try:
-                with open(lang_file, "r", encoding="utf-8") as f:
-                    self._translations[lang_code] = json.load(f)
-            except Exception as e:
-                print(f"Failed to load language file {lang_file}: {e}")
-
-    def set_language(self, lang_code: str):
-        """设置当前语言"""
-        if lang_code in self._translations:
-            self._current_language = lang_code
-            # 保存到配置文件
-            self._save_language_preference(lang_code)
-            # 发出语言切换信号
-            self.language_changed.emit(lang_code)
-
-    def get_current_language(self) -> str:
-        """获取当前语言"""
-        return self._current_language
-
-    def get_available_languages(self) -> List[str]:
-        """获取可用语言列表"""
-        return list(self._translations.keys())
-
-    def tr(self, key: str, **kwargs) -> str:
-        """翻译文本
-
-        Args:
-            key: 翻译键，支持点号分隔的路径，如 "skill.title"
-            **kwargs: 格式化参数
-
-        Returns:
-            翻译后的文本
-        """
-        keys = key.split(".")
-        value = self._translations.get(self._current_language, {})
-
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return key
-
-        if value is None:
-            return key
-
-        # 格式化参数
-        if kwargs and isinstance(value, str):
-            try:
-                return value.format(**kwargs)
-            except KeyError:
-                return value
-
-        return str(value)
-
-    def _save_language_preference(self, lang_code: str):
-        """保存语言偏好到配置文件"""
-        config_file = Path.home() / ".config" / "opencode" / "ui_config.json"
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-
-        config = {}
-        if config_file.exists():
-            try:
-                with open(config_file, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-            except Exception:
-                pass
-
-        config["language"] = lang_code
-
-        try:
-            with open(config_file, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Failed to save language preference: {e}")
-
-    def _load_language_preference(self) -> str:
-        """从配置文件加载语言偏好，如果没有则自动识别系统语言"""
-        config_file = Path.home() / ".config" / "opencode" / "ui_config.json"
-        if config_file.exists():
-            try:
-                with open(config_file, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    saved_lang = config.get("language")
-                    if saved_lang:
-                        return saved_lang
-            except Exception:
-                pass
-
-        # 自动识别系统语言
-        return self._detect_system_language()
-
-    def _detect_system_language(self) -> str:
-        """自动识别系统语言
-
-        Returns:
-            语言代码，zh_CN 或 en_US
-        """
-        try:
-            # 方法1: 使用 PyQt5 的 QLocale
-            from PyQt5.QtCore import QLocale
-
-            system_locale = QLocale.system()
-            locale_name = system_locale.name()  # 例如: "zh_CN", "en_US", "ja_JP"
-
-            # 判断是否为中文
-            if locale_name.startswith("zh"):
-                return "zh_CN"
-            else:
-                return "en_US"
-        except Exception:
-            pass
-
-        try:
-            # 方法2: 使用 Python 的 locale 模块
-            import locale
-
-            system_locale = locale.getdefaultlocale()[0]  # 例如: "zh_CN", "en_US"
-            if system_locale and system_locale.startswith("zh"):
-                return "zh_CN"
-            else:
-                return "en_US"
-        except Exception:
-            pass
-
-        # 默认返回中文
-        return "zh_CN"
-
-
-# 全局语言管理器实例
-_lang_manager = LanguageManager()
-
-
-def tr(key: str, **kwargs) -> str:
-    """全局翻译函数"""
-    return _lang_manager.tr(key, **kwargs)
-
-
-# ==================== UI 样式配置 ====================
-class UIConfig:
-    """全局 UI 配置"""
-
-    # 字体配置 - 参考 Any-code 项目，优先使用系统原生字体
-    # Sans-serif 字体栈：优先系统字体，中文字体作为 fallback
-    FONT_FAMILY_SANS = "-apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', 'Fira Sans', 'Droid Sans', 'Helvetica Neue', 'Microsoft YaHei UI', '微软雅黑', 'PingFang SC', 'Hiragino Sans GB', 'SimSun', '宋体', 'Arial Unicode MS', sans-serif"
-
-    # Monospace 字体栈：用于代码和等宽文本
-    FONT_FAMILY_MONO = "'JetBrains Mono', 'Fira Code', 'SF Mono', 'Menlo', 'Monaco', 'Consolas', 'Liberation Mono', 'Courier New', 'Microsoft YaHei Mono', '微软雅黑', monospace"
-
-    # 字体大小配置
-    FONT_SIZE_TITLE = 16
-    FONT_SIZE_BODY = 14
-    FONT_SIZE_SMALL = 12
-    FONT_SIZE_NUMBER = 20
-
-    # 状态颜色（不随主题变化）
-    COLOR_PRIMARY = "#2196F3"  # 高亮/主色
-    COLOR_SUCCESS = "#4CAF50"  # 成功
-    COLOR_WARNING = "#FF9800"  # 警告
-    COLOR_ERROR = "#F44336"  # 错误
-
-    # 深色主题颜色 (GitHub Dark 风格 - 接近纯黑)
-    DARK_BG = "#0d1117"  # 主背景
-    DARK_CARD = "#161b22"  # 卡片背景
-    DARK_BORDER = "#30363d"  # 边框
-
-    # 布局
-    WINDOW_WIDTH = 1200
-    WINDOW_HEIGHT = 870
-
-    @staticmethod
-    def get_stylesheet() -> str:
-        """获取全局 QSS 样式表 - 优化字体渲染，解决英文显示和遮挡问题"""
-        # 字体栈定义
-        font_sans = "-apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', 'Fira Sans', 'Droid Sans', 'Helvetica Neue', 'Microsoft YaHei UI', '微软雅黑', 'PingFang SC', 'Hiragino Sans GB', 'SimSun', '宋体', 'Arial Unicode MS', sans-serif"
-        font_mono = "'JetBrains Mono', 'Fira Code', 'SF Mono', 'Menlo', 'Monaco', 'Consolas', 'Liberation Mono', 'Courier New', 'Microsoft YaHei Mono', '微软雅黑', monospace"
-
-        return f"""
-            /* ==================== 全局字体 ==================== */
-            * {{
-                font-family: {font_sans};
-            }}
-            QWidget {{
-                font-family: {font_sans};
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-            }}
-
-            /* ==================== 字体大小层级 ==================== */
-            TitleLabel {{
-                font-size: 18px;
-                font-weight: bold;
-                font-family: {font_sans};
-            }}
-            SubtitleLabel {{
-                font-size: {UIConfig.FONT_SIZE_TITLE}px;
-                font-weight: bold;
-                font-family: {font_sans};
-            }}
-            BodyLabel {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-            }}
-            CaptionLabel {{
-                font-size: {UIConfig.FONT_SIZE_SMALL}px;
-                font-family: {font_sans};
-            }}
-            StrongBodyLabel {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-weight: bold;
-                font-family: {font_sans};
-            }}
-
-            /* ==================== 按钮字体 ==================== */
-            QPushButton, PushButton, PrimaryPushButton, TransparentPushButton, ToolButton {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-                padding: 6px 16px;
-                min-height: 32px;
-            }}
-
-            /* ==================== 输入框字体 ==================== */
-            QLineEdit, LineEdit {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-                padding: 6px 12px;
-                min-height: 32px;
-            }}
-            
-            QTextEdit, TextEdit, QPlainTextEdit, PlainTextEdit {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_mono};
-                line-height: 1.6;
-            }}
-
-            /* ==================== 下拉框字体 ==================== */
-            QComboBox, ComboBox {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-                padding: 6px 12px;
-                min-height: 32px;
-            }}
-            
-            QComboBox::drop-down {{
-                width: 30px;
-            }}
-            
-            QComboBox QAbstractItemView {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-                padding: 4px;
-            }}
-
-            /* ==================== 表格字体 ==================== */
-            QTableWidget, TableWidget {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-            }}
-            QHeaderView::section {{
-                font-weight: 600;
-                font-size: 13px;
-                font-family: {font_sans};
-                padding: 8px 12px;
-                min-height: 36px;
-            }}
-            
-            /* ==================== 修复表格左上角单元格白色问题 ==================== */
-            QTableWidget QTableCornerButton::section {{
-                background-color: transparent;
-                border: none;
-            }}
-
-            /* ==================== 列表字体 ==================== */
-            QListWidget, ListWidget {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-            }}
-            
-            QListWidget::item {{
-                padding: 8px 12px;
-                min-height: 36px;
-            }}
-
-            /* ==================== 菜单字体 ==================== */
-            QMenu {{
-                font-size: {UIConfig.FONT_SIZE_BODY}px;
-                font-family: {font_sans};
-                padding: 4px;
-            }}
-            
-            QMenu::item {{
-                padding: 8px 24px 8px 12px;
-                min-height: 32px;
-            }}
-
-            /* ==================== 滚动条样式 ==================== */
-            QScrollBar:vertical {{
-                width: 8px;
-            }}
-            QScrollBar:horizontal {{
-                height: 8px;
-            }}
-
-            /* ==================== 工具提示字体 ==================== */
-            QToolTip {{
-                font-size: {UIConfig.FONT_SIZE_SMALL}px;
-                font-family: {font_sans};
-                padding: 6px 10px;
-            }}
-            
-            /* ==================== 代码/等宽文本 ==================== */
-            code, pre, .monospace {{
-                font-family: {font_mono};
-                font-size: {UIConfig.FONT_SIZE_SMALL}px;
-            }}
-        """
-
-
-APP_VERSION = "1.7.1"
-GITHUB_REPO = "icysaintdx/OpenCode-Config-Manager"
-GITHUB_URL = f"https://github.com/{GITHUB_REPO}"
-GITHUB_RELEASES_API = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
-AUTHOR_NAME = "IcySaint"
-AUTHOR_GITHUB = "https://github.com/icysaintdx"
-
-# 监控页面配置
-MONITOR_POLL_INTERVAL_MS = 60000
-MONITOR_HISTORY_LIMIT = 60
-DEGRADED_THRESHOLD_MS = 6000
-
-# ==================== 版本检查配置 ====================
-STARTUP_VERSION_CHECK_ENABLED = True  # 启动时是否检查版本
-IMMEDIATE_VERSION_CHECK_MS = 5000  # 启动后首次检查延迟 (5秒)
-UPDATE_INTERVAL_MS = 60 * 60 * 1000  # 定时检查间隔 (1小时)
-
-
-def get_resource_path(relative_path: str) -> Path:
-    """获取资源文件路径 - 兼容 PyInstaller 打包后的环境"""
-    base_path_value = getattr(sys, "_MEIPASS", None)
-    base_path = Path(base_path_value) if base_path_value else Path(__file__).parent
-    return base_path / relative_path
-
-
-# ==================== 参数说明提示（用于Tooltip） ====================
-# 根据 OpenCode 官方文档，所有提示都包含：关键字 + 白话解释 + 使用场景 + 示例
-TOOLTIPS = {
-    # ==================== Provider 相关 ====================
-    "provider_name": """Provider 名称 (provider_name) ⓘ
-
-【作用】Provider的唯一标识符，用于在配置中引用此Provider
-
-【格式要求】
-• 使用小写字母和连字符
-• 不能有空格或特殊字符
-
-【常见示例】
-• anthropic - Anthropic官方
-• openai - OpenAI官方
-• my-proxy - 自定义中转站
-
-【使用场景】
-配置模型时需要指定 provider/model-id 格式""",
-    "provider_display": """显示名称 (display name) ⓘ
-
-【作用】在界面中显示的友好名称，方便识别
-
-【格式要求】
-• 可以使用中文、空格
-• 建议简洁明了
-
-【常见示例】
-• Anthropic (Claude)
-• OpenAI 官方
-• 我的中转站""",
-    "provider_sdk": """SDK 包名 (npm package) ⓘ
-
-【作用】指定使用哪个AI SDK来调用API
-
-【选择指南】
-• Claude系列 → @ai-sdk/anthropic
-• GPT/OpenAI系列 → @ai-sdk/openai
-• Gemini系列 → @ai-sdk/google
-• Azure OpenAI → @ai-sdk/azure
-• 其他兼容OpenAI的API → @ai-sdk/openai-compatible
-
-【重要提示】
-SDK必须与模型厂商匹配，否则无法正常调用！""",
-    "provider_url": """API 地址 (baseURL) ⓘ
-
-【作用】API服务的访问地址
-
-【使用场景】
-• 使用官方API → 留空（自动使用默认地址）
-• 使用中转站 → 填写中转站地址
-• 使用私有部署 → 填写私有服务地址
-
-【格式示例】
-• https://api.openai.com/v1
-• https://my-proxy.com/api
-• 留空 = 使用SDK默认地址""",
-    "provider_apikey": """API 密钥 (apiKey) ⓘ
-
-【作用】用于身份验证的密钥
-
-【获取方式】
-• Anthropic: console.anthropic.com
-• OpenAI: platform.openai.com
-• Google: aistudio.google.com
-
-【安全提示】
-• 支持环境变量引用: {env:ANTHROPIC_API_KEY}
-• 不要将密钥提交到代码仓库
-• 定期轮换密钥""",
-    "provider_timeout": """请求超时 (timeout) ⓘ
-
-【作用】API请求的最大等待时间
-
-【单位】毫秒 (ms)
-
-【推荐设置】
-• 默认: 300000 (5分钟)
-• 快速响应场景: 60000 (1分钟)
-• 长文本生成: 600000 (10分钟)
-
-【特殊值】
-• false = 禁用超时（不推荐）""",
-    # ==================== Model 相关 ====================
-    "model_id": """模型 ID (model identifier) ⓘ
-
-【作用】模型的唯一标识符，必须与API提供商的模型ID完全一致
-
-【格式要求】
-• 必须是API支持的有效模型名称
-• 区分大小写
-
-【常见示例】
-• Claude: claude-sonnet-4-5-20250929
-• GPT: gpt-5, gpt-4o
-• Gemini: gemini-3-pro
-
-【重要提示】
-模型ID错误会导致API调用失败！""",
-    "model_name": """显示名称 (display name) ⓘ
-
-【作用】在界面中显示的友好名称
-
-【建议】
-• 使用易于识别的名称
-• 可以包含版本信息
-
-【示例】
-• Claude Sonnet 4.5
-• GPT-5 旗舰版
-• Gemini 3 Pro""",
-    "model_attachment": """支持附件 (attachment support) ⓘ
-
-【作用】是否支持上传文件（图片、文档等）
-
-【支持情况】
-✓ 多模态模型通常支持（Claude、GPT-4o、Gemini）
-✗ 纯文本模型不支持（o1系列）
-
-【使用场景】
-• 图片分析
-• 文档解读
-• 代码截图理解""",
-    "model_context": """上下文窗口 (context window) ⓘ
-
-【作用】模型能处理的最大输入长度（tokens）
-
-【单位】tokens（约等于0.75个英文单词或0.5个中文字符）
-
-【常见大小】
-• 128K = 128,000 tokens ≈ 10万字
-• 200K = 200,000 tokens ≈ 15万字
-• 1M = 1,048,576 tokens ≈ 80万字
-• 2M = 2,097,152 tokens ≈ 160万字
-
-【影响】
-上下文越大，能处理的对话历史和文件越多""",
-    "model_output": """最大输出 (max output) ⓘ
-
-【作用】模型单次回复的最大长度（tokens）
-
-【常见大小】
-• 8K = 8,192 tokens ≈ 6000字
-• 16K = 16,384 tokens ≈ 12000字
-• 32K = 32,768 tokens ≈ 24000字
-• 64K = 65,536 tokens ≈ 48000字
-
-【影响】
-输出限制越大，单次回复可以越长""",
-    "model_options": """模型默认配置 (Options) ⓘ
-
-【作用】每次调用模型时自动使用的参数
-
-【重要区别】
-• Options = 默认配置，每次都用
-• Variants = 可切换的预设，按需切换
-
-【Claude thinking模式】
-thinking.type = "enabled"
-thinking.budgetTokens = 16000
-
-【OpenAI推理模式】
-reasoningEffort = "high"
-textVerbosity = "low"
-
-【Gemini thinking模式】
-thinkingConfig.thinkingBudget = 8000
-
-【提示】选择预设模型会自动填充推荐配置""",
-    "model_variants": """模型变体 (Variants) ⓘ
-
-【作用】可通过快捷键切换的预设配置组合
-
-【使用场景】
-• 同一模型的不同配置
-• 快速切换推理强度
-• 切换thinking开关
-
-【切换方式】
-使用 variant_cycle 快捷键循环切换
-
-【配置示例】
-high: {reasoningEffort: high}
-low: {reasoningEffort: low}
-
-【与Options的区别】
-Options是默认值，Variants是可选预设""",
-    "model_preset_category": """预设模型分类 ⓘ
-
-【作用】快速选择常用模型系列
-
-【可选分类】
-• Claude 系列 - Anthropic的Claude模型
-• OpenAI/Codex 系列 - GPT和推理模型
-• Gemini 系列 - Google的Gemini模型
-• 其他模型 - DeepSeek、Qwen等
-
-【使用方法】
-选择分类后，在右侧选择具体模型""",
-    "model_preset_model": """预设模型选择 ⓘ
-
-【作用】从预设列表中快速选择模型
-
-【自动填充】
-选择预设模型后会自动填充：
-• 模型ID
-• 显示名称
-• 上下文/输出限制
-• Options默认配置
-• Variants变体配置
-
-【提示】
-选择后仍可手动修改任何参数""",
-    # ==================== Options 快捷添加 ====================
-    "option_reasoningEffort": """推理强度 (reasoningEffort) - OpenAI模型 ⓘ
-
-【作用】控制模型的推理深度和思考时间
-
-【可选值】
-• xhigh - 超高强度，最深入的推理（GPT-5专属）
-• high - 高强度，更准确但更慢
-• medium - 中等强度，平衡速度和质量
-• low - 低强度，更快但可能不够准确
-
-【适用模型】
-GPT-5、o1、o3系列
-
-【使用建议】
-• 复杂问题 → high/xhigh
-• 简单问题 → low/medium""",
-    "option_textVerbosity": """输出详细程度 (textVerbosity) - OpenAI模型 ⓘ
-
-【作用】控制回复的详细程度
-
-【可选值】
-• low - 简洁输出，只给关键信息
-• high - 详细输出，包含更多解释
-
-【适用模型】
-GPT-5系列
-
-【使用建议】
-• 代码生成 → low（减少废话）
-• 学习解释 → high（详细说明）""",
-    "option_reasoningSummary": """推理摘要 (reasoningSummary) - OpenAI模型 ⓘ
-
-【作用】是否生成推理过程的摘要
-
-【可选值】
-• auto - 自动决定是否生成摘要
-• none - 不生成摘要
-
-【适用模型】
-GPT-5、o1、o3系列
-
-【使用场景】
-• 需要了解推理过程 → auto
-• 只要结果 → none""",
-    "option_thinking_type": """Thinking模式类型 (thinking.type) - Claude模型 ⓘ
-
-【作用】是否启用Claude的extended thinking功能
-
-【可选值】
-• enabled - 启用thinking模式
-• disabled - 禁用thinking模式
-
-【什么是Thinking模式？】
-让Claude在回答前进行深度思考，
-类似于人类的"让我想想..."
-
-【适用模型】
-Claude Opus 4.5、Claude Sonnet 4.5
-
-【使用建议】
-• 复杂推理/编程 → enabled
-• 简单对话 → disabled""",
-    "option_thinking_budget": """Thinking预算 (budgetTokens/thinkingBudget) ⓘ
-
-【作用】控制模型思考的token数量
-
-【单位】tokens
-
-【推荐值】
-• Claude: 8000-32000
-• Gemini: 4000-16000
-
-【影响】
-• 预算越高 → 思考越深入 → 回答越准确
-• 预算越高 → 消耗tokens越多 → 成本越高
-
-【使用建议】
-• 简单问题: 4000-8000
-• 复杂问题: 16000-32000
-• 极难问题: 32000-64000""",
-    # ==================== OpenCode Agent 相关 ====================
-    "agent_name": """Agent 名称 (agent name) ⓘ
-
-【作用】Agent的唯一标识符
-
-【格式要求】
-• 小写字母、数字、连字符
-• 不能有空格
-
-【内置Agent】
-• build - 默认主Agent
-• plan - 规划分析Agent
-
-【自定义示例】
-• code-reviewer
-• docs-writer
-• security-auditor""",
-    "agent_model": """绑定模型 (model) ⓘ
-
-【作用】指定Agent使用的模型
-
-【格式】
-provider/model-id
-
-【示例】
-• anthropic/claude-sonnet-4-5-20250929
-• openai/gpt-5
-• google/gemini-3-pro
-
-【留空】
-使用系统默认模型""",
-    "agent_description": """Agent 描述 (description) ⓘ
-
-【作用】描述Agent的功能和用途
-
-【要求】
-• 必填项
-• 简洁明了地说明Agent的专长
-
-【示例】
-• 代码审查专家，专注于代码质量和安全分析
-• 技术文档写作专家，擅长README和API文档
-• 快速代码库探索，用于搜索和模式发现""",
-    "opencode_agent_mode": """Agent 模式 (mode) ⓘ
-
-【作用】定义Agent的调用方式
-
-【可选值】
-• primary - 主Agent，可通过Tab键切换
-• subagent - 子Agent，通过@提及调用
-• all - 两种模式都支持
-
-【使用场景】
-• primary: 常用的主力Agent
-• subagent: 专门任务的辅助Agent
-• all: 灵活使用的通用Agent""",
-    "opencode_agent_temperature": """生成温度 (temperature) ⓘ
-
-【作用】控制回复的随机性和创造性
-
-【取值范围】0.0 - 2.0
-
-【推荐设置】
-• 0.0-0.2: 确定性高，适合代码/分析
-• 0.3-0.5: 平衡创造性和准确性
-• 0.6-1.0: 创造性高，适合创意任务
-• 1.0-2.0: 高度随机，可能不稳定
-
-【使用建议】
-• 代码生成 → 0.1-0.3
-• 文档写作 → 0.3-0.5
-• 创意写作 → 0.7-1.0""",
-    "opencode_agent_maxSteps": """最大步数 (maxSteps) ⓘ
-
-【作用】限制Agent执行的工具调用次数
-
-【工作原理】
-Agent每调用一次工具算一步，
-达到限制后强制返回文本响应
-
-【推荐设置】
-• 留空 = 无限制
-• 10-20: 简单任务
-• 50-100: 复杂任务
-
-【使用场景】
-防止Agent陷入无限循环""",
-    "opencode_agent_prompt": """系统提示词 (prompt) ⓘ
-
-【作用】定义Agent的行为和专长
-
-【支持格式】
-• 直接写入提示词文本
-• 文件引用: {file:./prompts/agent.txt}
-
-【编写建议】
-• 明确Agent的角色和专长
-• 说明工作方式和限制
-• 给出输出格式要求""",
-    "opencode_agent_tools": """工具配置 (tools) ⓘ
-
-【作用】配置Agent可用的工具
-
-【格式】JSON对象
-
-【配置方式】
-• true - 启用工具
-• false - 禁用工具
-
-【支持通配符】
-• mcp_* - 匹配所有MCP工具
-
-【示例】
-{"write": true, "edit": true, "bash": false}""",
-    "opencode_agent_permission": """权限配置 (permission) ⓘ
-
-【作用】配置Agent的操作权限
-
-【格式】JSON对象
-
-【权限级别】
-• allow - 允许，无需确认
-• ask - 每次询问用户
-• deny - 禁止使用
-
-【示例】
-{"edit": "ask", "bash": "deny"}""",
-    "opencode_agent_hidden": """隐藏 (hidden) ⓘ
-
-【作用】是否在@自动完成中隐藏此Agent
-
-【仅对subagent有效】
-
-【使用场景】
-• 内部使用的辅助Agent
-• 不希望用户直接调用的Agent
-
-【注意】
-隐藏的Agent仍可被其他Agent调用""",
-    "opencode_agent_disable": """禁用 (disable) ⓘ
-
-【作用】完全禁用此Agent
-
-【使用场景】
-• 临时停用某个Agent
-• 保留配置但不加载
-
-【与hidden的区别】
-• hidden: 隐藏但可调用
-• disable: 完全不加载""",
-    # ==================== Oh My OpenCode Agent 相关 ====================
-    "ohmyopencode_agent_name": """Agent 名称 ⓘ
-
-【作用】Oh My OpenCode中Agent的唯一标识符
-
-【预设Agent】
-• oracle - 架构设计、代码审查专家
-• librarian - 文档查找、实现示例专家
-• explore - 代码库探索专家
-• frontend-ui-ux-engineer - UI/UX专家
-• document-writer - 技术文档专家""",
-    "ohmyopencode_agent_model": """绑定模型 ⓘ
-
-【作用】指定Agent使用的模型
-
-【格式】provider/model-id
-
-【示例】
-• anthropic/claude-sonnet-4-5-20250929
-• openai/gpt-5
-
-【注意】
-必须是已配置的Provider下的模型""",
-    "ohmyopencode_agent_description": """Agent 描述 ⓘ
-
-【作用】描述Agent的功能和适用场景
-
-【建议】
-• 说明Agent的专长领域
-• 描述适合处理的任务类型""",
-    "ohmyopencode_preset_agent": """预设 Agent ⓘ
-
-【作用】快速选择预配置的Agent模板
-
-【可选预设】
-• oracle - 复杂决策和深度分析
-• librarian - 查找外部资源和文档
-• explore - 代码搜索和模式发现
-• code-reviewer - 代码审查任务
-• debugger - 调试和问题排查""",
-    # ==================== Category 相关 ====================
-    "category_name": """Category 名称 ⓘ
-
-【作用】任务分类的唯一标识符
-
-【预设分类】
-• visual - 前端、UI/UX相关
-• business-logic - 后端逻辑、架构
-• documentation - 文档编写
-• code-analysis - 代码审查、重构""",
-    "category_model": """绑定模型 ⓘ
-
-【作用】该分类使用的默认模型
-
-【格式】provider/model-id
-
-【使用场景】
-不同类型的任务使用不同的模型""",
-    "category_temperature": """Temperature (温度) ⓘ
-
-【作用】控制该分类任务的回复随机性
-
-【推荐设置】
-• visual (前端): 0.7 - 需要创造性
-• business-logic (后端): 0.1 - 需要准确性
-• documentation (文档): 0.3 - 平衡
-• code-analysis (分析): 0.2 - 需要准确性""",
-    "category_description": """分类描述 ⓘ
-
-【作用】说明该分类的用途和适用场景
-
-【示例】
-• 前端、UI/UX、设计相关任务
-• 后端逻辑、架构设计、战略推理
-• 文档编写、技术写作任务""",
-    # ==================== Permission 相关 ====================
-    "permission_tool": """工具名称 (tool name) ⓘ
-
-【作用】指定要配置权限的工具
-
-【内置工具】
-• Bash - 执行命令行命令
-• Read - 读取文件
-• Write - 写入文件
-• Edit - 编辑文件
-• Glob - 文件搜索
-• Grep - 内容搜索
-• WebFetch - 网页抓取
-• WebSearch - 网页搜索
-• Task - 任务管理
-
-【MCP工具格式】
-mcp_servername_toolname""",
-    "permission_level": """权限级别 (permission level) ⓘ
-
-【作用】控制工具的使用权限
-
-【可选值】
-• allow (允许) - 直接使用，无需确认
-• ask (询问) - 每次使用前询问用户
-• deny (拒绝) - 禁止使用
-
-【安全建议】
-• 危险操作 → ask 或 deny
-• 只读操作 → allow
-• 网络操作 → ask""",
-    "permission_bash_pattern": """Bash 命令模式 ⓘ
-
-【作用】精细控制Bash命令的权限
-
-【支持通配符】
-• * - 匹配所有命令
-• git * - 匹配所有git命令
-• git push - 匹配特定命令
-
-【示例配置】
-git *: allow
-rm *: ask
-sudo *: deny""",
-    # ==================== MCP 相关 ====================
-    "mcp_name": """MCP 名称 (server name) ⓘ
-
-【作用】MCP服务器的唯一标识符
-
-【命名建议】
-• 简洁明了
-• 反映服务功能
-
-【常见示例】
-• context7 - Context7文档服务
-• sentry - Sentry错误追踪
-• gh_grep - GitHub代码搜索
-• filesystem - 文件系统操作""",
-    "mcp_type": """MCP 类型 (type) ⓘ
-
-【作用】指定MCP服务器的运行方式
-
-【可选值】
-• local - 本地进程
-  通过命令启动，运行在本机
-  
-• remote - 远程服务
-  通过URL连接，运行在远程服务器
-
-【选择建议】
-• 自己开发的MCP → local
-• 第三方托管服务 → remote""",
-    "mcp_enabled": """启用状态 (enabled) ⓘ
-
-【作用】是否启用此MCP服务器
-
-【使用场景】
-• 勾选 = 启动时加载
-• 不勾选 = 保留配置但不加载
-
-【提示】
-禁用后可随时重新启用""",
-    "mcp_command": """启动命令 (command) - Local类型 ⓘ
-
-【作用】本地MCP的启动命令
-
-【格式】JSON数组
-
-【常见格式】
-• npx方式: ["npx", "-y", "@mcp/server"]
-• bun方式: ["bun", "x", "my-mcp"]
-• node方式: ["node", "./mcp-server.js"]
-• python方式: ["python", "-m", "mcp_server"]""",
-    "mcp_url": """服务器 URL (url) - Remote类型 ⓘ
-
-【作用】远程MCP服务器的访问地址
-
-【格式】完整的HTTP/HTTPS URL
-
-【示例】
-• https://mcp.context7.com/mcp
-• https://api.example.com/mcp/v1
-
-【注意】
-确保URL可访问且支持MCP协议""",
-    "mcp_headers": """请求头 (headers) - Remote类型 ⓘ
-
-【作用】远程MCP请求时附带的HTTP头
-
-【格式】JSON对象
-
-【常见用途】
-• 身份认证
-• API密钥传递
-
-【示例】
-{"Authorization": "Bearer your-api-key"}""",
-    "mcp_environment": """环境变量 (environment) - Local类型 ⓘ
-
-【作用】本地MCP启动时的环境变量
-
-【格式】JSON对象
-
-【常见用途】
-• 传递API密钥
-• 配置运行参数
-
-【示例】
-{"API_KEY": "your-api-key", "DEBUG": "true"}""",
-    "mcp_timeout": """超时时间 (timeout) ⓘ
-
-【作用】MCP工具获取的超时时间
-
-【单位】毫秒 (ms)
-
-【默认值】5000 (5秒)
-
-【调整建议】
-• 网络慢 → 增加超时
-• 本地MCP → 可以减少""",
-    "mcp_oauth": """OAuth 配置 (oauth) ⓘ
-
-【作用】OAuth认证配置
-
-【可选值】
-• 留空 - 自动检测
-• false - 禁用OAuth
-• JSON对象 - 预注册凭证""",
-    # ==================== Skill 相关 ====================
-    "skill_name": """Skill 名称 (skill name) ⓘ
-
-【作用】Skill的唯一标识符
-
-【格式要求】
-• 1-64字符
-• 小写字母、数字、连字符
-• 不能以连字符开头或结尾
-• 不能有连续的连字符
-
-【示例】
-• git-release
-• pr-review
-• code-format""",
-    "skill_permission": """Skill 权限 (permission) ⓘ
-
-【作用】控制Skill的加载权限
-
-【可选值】
-• allow - 立即加载，无需确认
-• deny - 隐藏并拒绝访问
-• ask - 加载前询问用户
-
-【安全建议】
-• 信任的Skill → allow
-• 未知来源 → ask
-• 不需要的 → deny""",
-    "skill_pattern": """权限模式 (pattern) ⓘ
-
-【作用】使用通配符批量配置Skill权限
-
-【支持通配符】
-• * - 匹配所有Skill
-• internal-* - 匹配internal-开头的Skill
-• *-review - 匹配以-review结尾的Skill""",
-    # ==================== Instructions/Rules 相关 ====================
-    "instructions_path": """指令文件路径 (instructions) ⓘ
-
-【作用】指定额外的指令文件
-
-【支持格式】
-• 相对路径: CONTRIBUTING.md
-• 绝对路径: /path/to/rules.md
-• Glob模式: docs/*.md
-• 远程URL: https://example.com/rules.md
-
-【使用场景】
-• 复用现有文档作为指令
-• 团队共享规则
-• 项目特定指南""",
-    "rules_agents_md": """AGENTS.md 文件 ⓘ
-
-【作用】项目级AI指令文件
-
-【文件位置】
-• 项目级: 项目根目录/AGENTS.md
-• 全局级: ~/.config/opencode/AGENTS.md
-
-【内容建议】
-• 项目结构说明
-• 代码规范要求
-• 特殊约定说明
-
-【创建方式】
-运行 /init 命令自动生成""",
-    # ==================== Compaction 相关 ====================
-    "compaction_auto": """自动压缩 (auto) ⓘ
-
-【作用】当上下文接近满时自动压缩会话
-
-【工作原理】
-OpenCode会自动检测上下文使用情况，
-在接近限制时压缩历史消息
-
-【建议】
-• 长对话 → 启用
-• 短对话 → 可以禁用
-
-【默认值】true (启用)""",
-    "compaction_prune": """修剪旧输出 (prune) ⓘ
-
-【作用】删除旧的工具输出以节省tokens
-
-【工作原理】
-保留工具调用记录，但删除详细输出内容
-
-【好处】
-• 节省tokens
-• 保持对话连续性
-• 减少成本
-
-【默认值】true (启用)""",
-}
-
-
-def get_tooltip(key: str) -> str:
-    """获取tooltip文本，如果不存在返回空字符串"""
-    return TOOLTIPS.get(key, "")
-
-
-# ==================== 预设常用模型（含完整配置） ====================
-# 根据 OpenCode 官方文档 (https://opencode.ai/docs/models/)
-# - options: 模型的默认配置参数，每次调用都会使用
-# - variants: 可切换的变体配置，用户可通过 variant_cycle 快捷键切换
-PRESET_MODEL_CONFIGS = {
-    "Claude 系列": {
-        "sdk": "@ai-sdk/anthropic",
-        "models": {
-            "claude-opus-4-5-20251101": {
-                "name": "Claude Opus 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 32000},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
-                "variants": {},
-                "description": "最强大的Claude模型，支持extended thinking模式\noptions.thinking.budgetTokens 控制思考预算",
-            },
-            "claude-sonnet-4-5-20250929": {
-                "name": "Claude Sonnet 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 16000},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinking": {"type": "enabled", "budgetTokens": 8000}},
-                "variants": {},
-                "description": "平衡性能与成本的Claude模型，支持thinking模式",
-            },
-            "claude-sonnet-4-20250514": {
-                "name": "Claude Sonnet 4",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "Claude Sonnet 4基础版，不支持thinking",
-            },
-            "claude-haiku-4-5-20250514": {
-                "name": "Claude Haiku 4.5",
-                "attachment": True,
-                "limit": {"context": 200000, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "快速响应的轻量级Claude模型",
-            },
-        },
-    },
-    "OpenAI/Codex 系列": {
-        "sdk": "@ai-sdk/openai",
-        "models": {
-            "gpt-5": {
-                "name": "GPT-5",
-                "attachment": True,
-                "limit": {"context": 256000, "output": 32768},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {
-                    "reasoningEffort": "high",
-                    "textVerbosity": "low",
-                    "reasoningSummary": "auto",
-                },
-                "variants": {
-                    "high": {
-                        "reasoningEffort": "high",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "medium": {
-                        "reasoningEffort": "medium",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "low": {
-                        "reasoningEffort": "low",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                    "xhigh": {
-                        "reasoningEffort": "xhigh",
-                        "textVerbosity": "low",
-                        "reasoningSummary": "auto",
-                    },
-                },
-                "description": "OpenAI最新旗舰模型\noptions.reasoningEffort: high/medium/low/xhigh",
-            },
-            "gpt-5.1-codex": {
-                "name": "GPT-5.1 Codex",
-                "attachment": True,
-                "limit": {"context": 256000, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"reasoningEffort": "high", "textVerbosity": "low"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI代码专用模型，针对编程任务优化",
-            },
-            "gpt-4o": {
-                "name": "GPT-4o",
-                "attachment": True,
-                "limit": {"context": 128000, "output": 16384},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "OpenAI多模态模型",
-            },
-            "o1-preview": {
-                "name": "o1 Preview",
-                "attachment": False,
-                "limit": {"context": 128000, "output": 32768},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {"reasoningEffort": "high"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI推理模型，支持reasoningEffort参数",
-            },
-            "o3-mini": {
-                "name": "o3 Mini",
-                "attachment": False,
-                "limit": {"context": 200000, "output": 100000},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {"reasoningEffort": "high"},
-                "variants": {
-                    "high": {"reasoningEffort": "high"},
-                    "medium": {"reasoningEffort": "medium"},
-                    "low": {"reasoningEffort": "low"},
-                },
-                "description": "OpenAI最新推理模型",
-            },
-        },
-    },
-    "Gemini 系列": {
-        "sdk": "@ai-sdk/google",
-        "models": {
-            "gemini-3-pro": {
-                "name": "Gemini 3 Pro",
-                "attachment": True,
-                "limit": {"context": 2097152, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 8000}},
-                "variants": {
-                    "low": {"thinkingConfig": {"thinkingBudget": 4000}},
-                    "high": {"thinkingConfig": {"thinkingBudget": 16000}},
-                    "max": {"thinkingConfig": {"thinkingBudget": 32000}},
-                },
-                "description": "Google最新Pro模型，支持thinking模式",
-            },
-            "gemini-2.0-flash": {
-                "name": "Gemini 2.0 Flash",
-                "attachment": True,
-                "limit": {"context": 1048576, "output": 8192},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 4000}},
-                "variants": {
-                    "low": {"thinkingConfig": {"thinkingBudget": 2000}},
-                    "high": {"thinkingConfig": {"thinkingBudget": 8000}},
-                },
-                "description": "Google Flash模型，支持thinking模式",
-            },
-            "gemini-2.0-flash-thinking-exp": {
-                "name": "Gemini 2.0 Flash Thinking",
-                "attachment": True,
-                "limit": {"context": 1048576, "output": 65536},
-                "modalities": {"input": ["text", "image"], "output": ["text"]},
-                "options": {"thinkingConfig": {"thinkingBudget": 10000}},
-                "variants": {},
-                "description": "Gemini专用thinking实验模型",
-            },
-            "gemini-1.5-pro": {
-                "name": "Gemini 1.5 Pro",
-                "attachment": True,
-                "limit": {"context": 2097152, "output": 8192},
-                "modalities": {
-                    "input": ["text", "image", "audio", "video"],
-                    "output": ["text"],
-                },
-                "options": {},
-                "variants": {},
-                "description": "超长上下文的Gemini Pro模型",
-            },
-        },
-    },
-    "其他模型": {
-        "sdk": "@ai-sdk/openai-compatible",
-        "models": {
-            "minimax-m2.1": {
-                "name": "Minimax M2.1",
-                "attachment": False,
-                "limit": {"context": 128000, "output": 16384},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "Minimax M2.1模型",
-            },
-            "deepseek-chat": {
-                "name": "DeepSeek Chat",
-                "attachment": False,
-                "limit": {"context": 64000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "DeepSeek对话模型",
-            },
-            "deepseek-reasoner": {
-                "name": "DeepSeek Reasoner",
-                "attachment": False,
-                "limit": {"context": 64000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "DeepSeek推理模型",
-            },
-            "qwen-max": {
-                "name": "Qwen Max",
-                "attachment": False,
-                "limit": {"context": 32000, "output": 8192},
-                "modalities": {"input": ["text"], "output": ["text"]},
-                "options": {},
-                "variants": {},
-                "description": "阿里通义千问Max模型",
-            },
-        },
-    },
-}
-
-# 简化的模型列表（用于下拉选择）
-PRESET_MODELS = {
-    category: list(data["models"].keys())
-    for category, data in PRESET_MODEL_CONFIGS.items()
-}
-
-PRESET_SDKS = [
-    "@ai-sdk/anthropic",
-    "@ai-sdk/openai",
-    "@ai-sdk/google",
-    "@ai-sdk/azure",
-    "@ai-sdk/openai-compatible",
-]
-
-# 模型配置包预设（用于批量添加时的可选模板）
-MODEL_PRESET_PACKS = {
-    "Claude 系列": {
-        "默认": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
-            "variants": {},
-        },
-        "高思考": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 32000}},
-            "variants": {},
-        },
-        "最大思考": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "enabled", "budgetTokens": 64000}},
-            "variants": {},
-        },
-        "轻量": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"thinking": {"type": "disabled"}},
-            "variants": {},
-        },
-    },
-    "OpenAI/Codex 系列": {
-        "基础": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {},
-            "variants": {},
-        },
-        "fast": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "low"},
-            "variants": {},
-        },
-        "high": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "high"},
-            "variants": {},
-        },
-        "xhigh": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 200000, "output": 16000},
-            "options": {"reasoningEffort": "xhigh"},
-            "variants": {},
-        },
-    },
-    "Gemini 系列": {
-        "默认": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 8000}},
-            "variants": {},
-        },
-        "16k": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 16000}},
-            "variants": {},
-        },
-        "高": {
-            "attachment": True,
-            "modalities": {"input": ["text", "image"], "output": ["text"]},
-            "limit": {"context": 1048576, "output": 8192},
-            "options": {"thinkingConfig": {"thinkingBudget": 32000}},
-            "variants": {},
-        },
-    },
-    "其他模型": {
-        "基础": {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 64000, "output": 8192},
-            "options": {},
-            "variants": {},
-        }
-    },
-}
-
-MODEL_PRESET_DEFAULT = {
-    "Claude 系列": "默认",
-    "OpenAI/Codex 系列": "基础",
-    "Gemini 系列": "默认",
-    "其他模型": "基础",
-}
-
-MODEL_PRESET_CUSTOM = {
-    "Claude 系列": {},
-    "OpenAI/Codex 系列": {},
-    "Gemini 系列": {},
-    "其他模型": {},
-}
-
-# SDK与模型厂商的对应关系（用于提示）
-SDK_MODEL_COMPATIBILITY = {
-    "@ai-sdk/anthropic": ["Claude 系列"],
-    "@ai-sdk/openai": ["OpenAI/Codex 系列", "其他模型"],
-    "@ai-sdk/google": ["Gemini 系列"],
-    "@ai-sdk/azure": ["OpenAI/Codex 系列"],
-    "@ai-sdk/openai-compatible": ["其他模型"],
-}
-
-# Oh My OpenCode Agent 预设
-PRESET_AGENTS = {
-    "oracle": "架构设计、代码审查、策略规划专家 - 用于复杂决策和深度分析",
-    "librarian": "多仓库分析、文档查找、实现示例专家 - 用于查找外部资源和文档",
-    "explore": "快速代码库探索和模式匹配专家 - 用于代码搜索和模式发现",
-    "frontend-ui-ux-engineer": "UI/UX 设计和前端开发专家 - 用于前端视觉相关任务",
-    "document-writer": "技术文档写作专家 - 用于生成README、API文档等",
-    "multimodal-looker": "视觉内容分析专家 - 用于分析图片、PDF等媒体文件",
-    "code-reviewer": "代码质量审查、安全分析专家 - 用于代码审查任务",
-    "debugger": "问题诊断、Bug 修复专家 - 用于调试和问题排查",
-}
-
-# OpenCode 原生 Agent 预设
-PRESET_OPENCODE_AGENTS = {
-    "build": {
-        "mode": "primary",
-        "description": "默认主Agent，拥有所有工具权限，用于开发工作",
-        "tools": {"write": True, "edit": True, "bash": True},
-    },
-    "plan": {
-        "mode": "primary",
-        "description": "规划分析Agent，限制写入权限，用于代码分析和规划",
-        "permission": {"edit": "ask", "bash": "ask"},
-    },
-    "general": {
-        "mode": "subagent",
-        "description": "通用子Agent，用于研究复杂问题和执行多步骤任务",
-    },
-    "explore": {
-        "mode": "subagent",
-        "description": "快速探索Agent，用于代码库搜索和模式发现",
-    },
-    "code-reviewer": {
-        "mode": "subagent",
-        "description": "代码审查Agent，只读权限，专注于代码质量分析",
-        "tools": {"write": False, "edit": False},
-    },
-    "docs-writer": {
-        "mode": "subagent",
-        "description": "文档编写Agent，专注于技术文档创作",
-        "tools": {"bash": False},
-    },
-    "security-auditor": {
-        "mode": "subagent",
-        "description": "安全审计Agent，只读权限，专注于安全漏洞分析",
-        "tools": {"write": False, "edit": False},
-    },
-}
-
-# Category 预设
-PRESET_CATEGORIES = {
-    "visual": {"temperature": 0.7, "description": "前端、UI/UX、设计相关任务"},
-    "business-logic": {
-        "temperature": 0.1,
-        "description": "后端逻辑、架构设计、战略推理",
-    },
-    "documentation": {"temperature": 0.3, "description": "文档编写、技术写作任务"},
-    "code-analysis": {"temperature": 0.2, "description": "代码审查、重构分析任务"},
-}
-
-# 参数说明提示（用于Tooltip）- 根据 OpenCode 官方文档
-TOOLTIPS = {
-    # Provider相关
-    "provider_name": "Provider 名称 - Provider的唯一标识符，用于在配置中引用\n格式：小写字母和连字符，如 anthropic, openai, my-proxy",
-    "provider_display": "显示名称 - 在界面中显示的友好名称\n示例：Anthropic (Claude)、OpenAI 官方",
-    "provider_sdk": "SDK 包名 - 指定使用哪个AI SDK来调用API\n• Claude系列 → @ai-sdk/anthropic\n• GPT/OpenAI系列 → @ai-sdk/openai\n• Gemini系列 → @ai-sdk/google",
-    "provider_url": "API 地址 (baseURL) - API服务的访问地址\n• 官方API → 留空（自动使用默认地址）\n• 中转站 → 填写中转站地址",
-    "provider_apikey": "API 密钥 - 用于身份验证的密钥\n支持环境变量: {env:ANTHROPIC_API_KEY}",
-    "provider_timeout": "请求超时 - 单位：毫秒 (ms)\n默认：300000 (5分钟)",
-    # Model相关
-    "model_id": "模型 ID - 模型的唯一标识符，必须与API提供商一致\n示例：claude-sonnet-4-5-20250929, gpt-5",
-    "model_name": "显示名称 - 在界面中显示的友好名称",
-    "model_attachment": "支持附件 - 是否支持上传文件（图片、文档等）",
-    "model_context": "上下文窗口 - 模型能处理的最大输入长度（tokens）",
-    "model_output": "最大输出 - 模型单次回复的最大长度（tokens）",
-    "model_options": "模型默认配置 (Options) - 每次调用模型时自动使用的参数\n• Claude thinking: thinking.type, thinking.budgetTokens\n• OpenAI: reasoningEffort, textVerbosity\n• Gemini: thinkingConfig.thinkingBudget",
-    "model_variants": "模型变体 (Variants) - 可通过快捷键切换的预设配置组合\n用于同一模型的不同配置，如不同的thinking预算",
-    # Agent相关 (Oh My OpenCode)
-    "agent_name": "Agent 名称 - Agent的唯一标识符\n预设Agent：oracle, librarian, explore, code-reviewer",
-    "agent_model": "绑定模型 - 格式：provider/model-id\n示例：anthropic/claude-sonnet-4-5-20250929",
-    "agent_description": "Agent 描述 - 描述Agent的功能和适用场景",
-    # Agent相关 (OpenCode原生)
-    "opencode_agent_mode": "Agent 模式\n• primary - 主Agent，可通过Tab键切换\n• subagent - 子Agent，通过@提及调用\n• all - 两种模式都支持",
-    "opencode_agent_temperature": "生成温度 - 取值范围：0.0 - 2.0\n• 0.0-0.2: 适合代码/分析\n• 0.3-0.5: 平衡创造性和准确性",
-    "opencode_agent_maxSteps": "最大步数 - 限制Agent执行的工具调用次数\n留空 = 无限制",
-    "opencode_agent_prompt": "系统提示词 - 定义Agent的行为和专长\n支持文件引用: {file:./prompts/agent.txt}",
-    "opencode_agent_tools": "工具配置 - JSON对象格式\n• true - 启用工具\n• false - 禁用工具",
-    "opencode_agent_permission": "权限配置\n• allow - 允许，无需确认\n• ask - 每次询问用户\n• deny - 禁止使用",
-    "opencode_agent_hidden": "隐藏 - 是否在@自动完成中隐藏此Agent\n仅对subagent有效",
-    # Category相关
-    "category_name": "Category 名称\n预设分类：visual, business-logic, documentation, code-analysis",
-    "category_model": "绑定模型 - 格式：provider/model-id",
-    "category_temperature": "Temperature - 推荐设置：\n• visual (前端): 0.7\n• business-logic (后端): 0.1\n• documentation (文档): 0.3",
-    "category_description": "分类描述 - 说明该分类的用途和适用场景",
-    # Permission相关
-    "permission_tool": "工具名称\n内置工具：Bash, Read, Write, Edit, Glob, Grep, WebFetch, WebSearch, Task\nMCP工具格式：mcp_servername_toolname",
-    "permission_level": "权限级别\n• allow - 直接使用，无需确认\n• ask - 每次使用前询问用户\n• deny - 禁止使用",
-    "permission_bash_pattern": "Bash 命令模式 - 支持通配符\n• * - 匹配所有命令\n• git * - 匹配所有git命令",
-    # MCP相关
-    "mcp_name": "MCP 名称 - MCP服务器的唯一标识符\n示例：context7, sentry, gh_grep",
-    "mcp_type": "MCP 类型\n• local - 本地进程，通过命令启动\n• remote - 远程服务，通过URL连接",
-    "mcp_enabled": "启用状态 - 是否启用此MCP服务器\n禁用后保留配置但不加载",
-    "mcp_command": '启动命令 (Local类型) - JSON数组格式\n示例：["npx", "-y", "@mcp/server"]',
-    "mcp_url": "服务器 URL (Remote类型) - 完整的HTTP/HTTPS URL",
-    "mcp_headers": '请求头 (Remote类型) - JSON对象格式\n示例：{"Authorization": "Bearer your-api-key"}',
-    "mcp_environment": '环境变量 (Local类型) - JSON对象格式\n示例：{"API_KEY": "xxx"}',
-    "mcp_timeout": "超时时间 - 单位：毫秒 (ms)\n默认值：5000 (5秒)",
-    # Skill相关
-    "skill_name": "Skill 名称 - 1-64字符，小写字母、数字、连字符\n示例：git-release, pr-review",
-    "skill_permission": "Skill 权限\n• allow - 立即加载，无需确认\n• deny - 隐藏并拒绝访问\n• ask - 加载前询问用户",
-    "skill_pattern": "权限模式 - 支持通配符\n• * - 匹配所有Skill\n• internal-* - 匹配internal-开头的Skill",
-    "skill_description": "Skill 描述 - 描述Skill的功能，帮助Agent选择",
-    # Instructions/Rules相关
-    "instructions_path": "指令文件路径 - 支持相对路径、绝对路径、Glob模式、远程URL",
-    "rules_agents_md": "AGENTS.md 文件 - 项目级或全局级的规则文件\n内容建议：项目结构说明、代码规范要求",
-    # Compaction相关
-    "compaction_auto": "自动压缩 - 当上下文接近满时自动压缩会话\n默认值：true (启用)",
-    "compaction_prune": "修剪旧输出 - 删除旧的工具输出以节省tokens\n默认值：true (启用)",
-}
-
-
-# ==================== 核心服务类 ====================
-class ConfigPaths:
-    """
-    配置文件路径管理 - 跨平台支持 (Windows/Linux/macOS)
-
-    默认路径：
-    - Windows: C:/Users/<user>/.config/opencode/
-    - Linux: /home/<user>/.config/opencode/
-    - macOS: /Users/<user>/.config/opencode/
-
-    支持 .json 和 .jsonc 扩展名，支持自定义路径
-    """
-
-    # 自定义路径存储（None 表示使用默认路径）
-    _custom_opencode_path: Optional[Path] = None
-    _custom_ohmyopencode_path: Optional[Path] = None
-    _custom_backup_path: Optional[Path] = None
-    _custom_import_paths: Optional[Dict[str, Path]] = None
-
-    @staticmethod
-    def get_user_home() -> Path:
-        """获取用户主目录（跨平台）"""
-        return Path.home()
-
-    @staticmethod
-    def get_platform() -> str:
-        """获取当前平台: windows, linux, macos"""
-        import platform
-
-        system = platform.system().lower()
-        if system == "darwin":
-            return "macos"
-        return system
-
-    @classmethod
-    def get_config_base_dir(cls) -> Path:
-        """
-        获取配置文件基础目录（跨平台）
-
-        所有平台统一使用 ~/.config/opencode/
-        """
-        return cls.get_user_home() / ".config" / "opencode"
-
-    @classmethod
-    def _get_config_path(cls, base_dir: Path, base_name: str) -> Path:
-        """获取配置文件路径，优先检测 .jsonc，其次 .json"""
-        jsonc_path = base_dir / f"{base_name}.jsonc"
-        json_path = base_dir / f"{base_name}.json"
-
-        # 优先返回存在的 .jsonc 文件
-        if jsonc_path.exists():
-            return jsonc_path
-        # 其次返回存在的 .json 文件
-        if json_path.exists():
-            return json_path
-        # 都不存在时，默认返回 .json 路径（用于创建新文件）
-        return json_path
-
-    @classmethod
-    def check_config_conflict(cls, base_name: str) -> Optional[Tuple[Path, Path]]:
-        """
-        检查是否同时存在 .json 和 .jsonc 配置文件
-
-        Args:
-            base_name: 配置文件基础名称（如 "opencode" 或 "oh-my-opencode"）
-
-        Returns:
-            如果存在冲突，返回 (json_path, jsonc_path)；否则返回 None
-        """
-        base_dir = cls.get_config_base_dir()
-        jsonc_path = base_dir / f"{base_name}.jsonc"
-        json_path = base_dir / f"{base_name}.json"
-
-        if jsonc_path.exists() and json_path.exists():
-            return (json_path, jsonc_path)
-        return None
-
-    @classmethod
-    def get_config_file_info(cls, path: Path) -> Dict:
-        """获取配置文件信息（大小、修改时间）"""
-        import os
-        from datetime import datetime
-
-        if not path.exists():
-            return {"exists": False}
-
-        stat = os.stat(path)
-        return {
-            "exists": True,
-            "size": stat.st_size,
-            "size_str": f"{stat.st_size:,} 字节",
-            "mtime": datetime.fromtimestamp(stat.st_mtime),
-            "mtime_str": datetime.fromtimestamp(stat.st_mtime).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            ),
-        }
-
-    @classmethod
-    def get_opencode_config(cls) -> Path:
-        """获取 OpenCode 配置路径（优先使用自定义路径）"""
-        if cls._custom_opencode_path is not None:
-            return cls._custom_opencode_path
-        return cls._get_config_path(cls.get_config_base_dir(), "opencode")
-
-    @classmethod
-    def set_opencode_config(cls, path: Optional[Path]) -> None:
-        """设置自定义 OpenCode 配置路径"""
-        cls._custom_opencode_path = path
-
-    @classmethod
-    def get_ohmyopencode_config(cls) -> Path:
-        """获取 Oh My OpenCode 配置路径（优先使用自定义路径）"""
-        if cls._custom_ohmyopencode_path is not None:
-            return cls._custom_ohmyopencode_path
-        return cls._get_config_path(cls.get_config_base_dir(), "oh-my-opencode")
-
-    @classmethod
-    def set_ohmyopencode_config(cls, path: Optional[Path]) -> None:
-        """设置自定义 Oh My OpenCode 配置路径"""
-        cls._custom_ohmyopencode_path = path
-
-    @classmethod
-    def is_custom_path(cls, config_type: str) -> bool:
-        """检查是否使用自定义路径"""
-        if config_type == "opencode":
-            return cls._custom_opencode_path is not None
-        elif config_type == "ohmyopencode":
-            return cls._custom_ohmyopencode_path is not None
-        elif config_type == "backup":
-            return cls._custom_backup_path is not None
-        return False
-
-    @classmethod
-    def reset_to_default(cls, config_type: str) -> None:
-        """重置为默认路径"""
-        if config_type == "opencode":
-            cls._custom_opencode_path = None
-        elif config_type == "ohmyopencode":
-            cls._custom_ohmyopencode_path = None
-        elif config_type == "backup":
-            cls._custom_backup_path = None
-
-    @classmethod
-    def get_claude_settings(cls) -> Path:
-        """获取 Claude Code 设置路径"""
-        base_dir = cls.get_user_home() / ".claude"
-        return cls._get_config_path(base_dir, "settings")
-
-    @classmethod
-    def get_claude_providers(cls) -> Path:
-        """获取 Claude Code providers 路径"""
-        base_dir = cls.get_user_home() / ".claude"
-        return cls._get_config_path(base_dir, "providers")
-
-    @classmethod
-    def get_backup_dir(cls) -> Path:
-        """获取备份目录（优先使用自定义路径）"""
-        if cls._custom_backup_path is not None:
-            return cls._custom_backup_path
-        return cls.get_config_base_dir() / "backups"
-
-    @classmethod
-    def set_backup_dir(cls, path: Optional[Path]) -> None:
-        """设置自定义备份目录"""
-        cls._custom_backup_path = path
-
-    @classmethod
-    def get_import_path(cls, source_type: str) -> Optional[Path]:
-        """获取自定义导入路径"""
-        if cls._custom_import_paths is None:
-            return None
-        return cls._custom_import_paths.get(source_type)
-
-    @classmethod
-    def set_import_path(cls, source_type: str, path: Optional[Path]) -> None:
-        """设置自定义导入路径"""
-        if cls._custom_import_paths is None:
-            cls._custom_import_paths = {}
-        if path is None:
-            cls._custom_import_paths.pop(source_type, None)
-            return
-        cls._custom_import_paths[source_type] = path
-
-
-# ==================== JSON语法高亮器 ====================
-class JsonSyntaxHighlighter(QSyntaxHighlighter):
-    """JSON语法高亮器 - 支持彩色括号、关键字高亮、括号匹配"""
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._setup_formats()
-        self._bracket_level = 0  # 跨行括号层级追踪
-
-    def _setup_formats(self):
-        """设置高亮格式"""
-        # 键名（属性名）- 蓝色
-        self.key_format = QTextCharFormat()
-        self.key_format.setForeground(QColor("#9CDCFE"))  # 浅蓝色
-
-        # 字符串值 - 橙色
-        self.string_format = QTextCharFormat()
-        self.string_format.setForeground(QColor("#CE9178"))  # 橙色
-
-        # 数字 - 浅绿色
-        self.number_format = QTextCharFormat()
-        self.number_format.setForeground(QColor("#B5CEA8"))  # 浅绿色
-
-        # 布尔值和null - 紫色
-        self.keyword_format = QTextCharFormat()
-        self.keyword_format.setForeground(QColor("#569CD6"))  # 蓝紫色
-
-        # 括号 - 彩色括号（6种颜色循环）
-        self.bracket_colors = [
-            QColor("#FFD700"),  # 金色 - 第1层
-            QColor("#DA70D6"),  # 兰花紫 - 第2层
-            QColor("#87CEEB"),  # 天蓝色 - 第3层
-            QColor("#FF6347"),  # 番茄红 - 第4层
-            QColor("#98FB98"),  # 淡绿色 - 第5层
-            QColor("#DDA0DD"),  # 梅红色 - 第6层
-        ]
-
-        # 匹配括号高亮格式
-        self.matched_bracket_format = QTextCharFormat()
-        self.matched_bracket_format.setBackground(QColor("#3a3d41"))
-        self.matched_bracket_format.setForeground(QColor("#FFFF00"))
-        self.matched_bracket_format.setFontWeight(QFont.Bold)
-
-    def highlightBlock(self, text):
-        """高亮当前文本块"""
-        import re
-
-        # 获取前一个块的括号层级状态
-        prev_block = self.currentBlock().previous()
-        if prev_block.isValid():
-            prev_state = prev_block.userState()
-            if prev_state >= 0:
-                self._bracket_level = prev_state
-            else:
-                self._bracket_level = 0
-        else:
-            self._bracket_level = 0
-
-        # 高亮键名（"key":）
-        for match in re.finditer(r'"([^"\\]|\\.)*"\s*:', text):
-            self.setFormat(
-                match.start(), match.end() - match.start() - 1, self.key_format
-            )
-
-        # 高亮字符串值（不是键名的字符串）
-        i = 0
-        while i < len(text):
-            if text[i] == '"':
-                # 找到字符串的结束位置
-                j = i + 1
-                while j < len(text):
-                    if text[j] == '"' and (j == i + 1 or text[j - 1] != "\\"):
-                        break
-                    j += 1
-
-                # 检查是否是键名（后面跟着冒号）
-                is_key = False
-                k = j + 1
-                while k < len(text) and text[k] in " \t":
-                    k += 1
-                if k < len(text) and text[k] == ":":
-                    is_key = True
-
-                if not is_key:
-                    self.setFormat(i, j - i + 1, self.string_format)
-
-                i = j + 1
-            else:
-                i += 1
-
-        # 高亮数字
-        for match in re.finditer(r"\b-?\d+\.?\d*\b", text):
-            self.setFormat(
-                match.start(), match.end() - match.start(), self.number_format
-            )
-
-        # 高亮关键字（true, false, null）
-        for match in re.finditer(r"\b(true|false|null)\b", text):
-            self.setFormat(
-                match.start(), match.end() - match.start(), self.keyword_format
-            )
-
-        # 高亮括号（彩色括号 - 跨行层级追踪）
-        for i, char in enumerate(text):
-            if char in "{[":
-                level = self._bracket_level % len(self.bracket_colors)
-                bracket_format = QTextCharFormat()
-                bracket_format.setForeground(self.bracket_colors[level])
-                bracket_format.setFontWeight(QFont.Bold)
-                self.setFormat(i, 1, bracket_format)
-                self._bracket_level += 1
-            elif char in "}]":
-                self._bracket_level = max(0, self._bracket_level - 1)
-                level = self._bracket_level % len(self.bracket_colors)
-                bracket_format = QTextCharFormat()
-                bracket_format.setForeground(self.bracket_colors[level])
-                bracket_format.setFontWeight(QFont.Bold)
-                self.setFormat(i, 1, bracket_format)
-
-        # 保存当前块的括号层级状态
-        self.currentBlock().setUserState(self._bracket_level)
-
-
-class JsonBracketMatcher:
-    """JSON括号匹配器 - 用于高亮匹配的括号对"""
-
-    OPEN_BRACKETS = "{["
-    CLOSE_BRACKETS = "}]"
-    BRACKET_PAIRS = {"{": "}", "[": "]", "}": "{", "]": "["}
-
-    def __init__(self, text_edit: QTextEdit):
-        self.text_edit = text_edit
-        self.extra_selections = []
-
-    def highlight_matching_bracket(self):
-        """高亮当前光标位置的匹配括号"""
-        self.extra_selections = []
-
-        cursor = self.text_edit.textCursor()
-        text = self.text_edit.toPlainText()
-        pos = cursor.position()
-
-        if not text or pos < 0 or pos > len(text):
-            self.text_edit.setExtraSelections([])
-            return
-
-        # 检查光标位置和前一个位置的字符
-        char_at_pos = text[pos] if pos < len(text) else ""
-        char_before = text[pos - 1] if pos > 0 else ""
-
-        bracket_pos = -1
-        bracket_char = ""
-
-        # 优先检查光标前的字符
-        if char_before in self.OPEN_BRACKETS + self.CLOSE_BRACKETS:
-            bracket_pos = pos - 1
-            bracket_char = char_before
-        elif char_at_pos in self.OPEN_BRACKETS + self.CLOSE_BRACKETS:
-            bracket_pos = pos
-            bracket_char = char_at_pos
-
-        if bracket_pos < 0:
-            self.text_edit.setExtraSelections([])
-            return
-
-        # 查找匹配的括号
-        match_pos = self._find_matching_bracket(text, bracket_pos, bracket_char)
-
-        if match_pos >= 0:
-            # 高亮两个括号
-            self._add_bracket_highlight(bracket_pos)
-            self._add_bracket_highlight(match_pos)
-
-        self.text_edit.setExtraSelections(self.extra_selections)
-
-    def _find_matching_bracket(self, text: str, pos: int, bracket: str) -> int:
-        """查找匹配的括号位置"""
-        if bracket in self.OPEN_BRACKETS:
-            # 向前搜索闭括号
-            target = self.BRACKET_PAIRS[bracket]
-            direction = 1
-            start = pos + 1
-            end = len(text)
-        else:
-            # 向后搜索开括号
-            target = self.BRACKET_PAIRS[bracket]
-            direction = -1
-            start = pos - 1
-            end = -1
-
-        depth = 1
-        i = start
-
-        while (direction == 1 and i < end) or (direction == -1 and i > end):
-            char = text[i]
-
-            # 跳过字符串内的括号
-            if char == '"':
-                # 找到字符串的另一端
-                if direction == 1:
-                    i += 1
-                    while i < len(text):
-                        if text[i] == '"' and text[i - 1] != "\\":
-                            break
-                        i += 1
-                else:
-                    i -= 1
-                    while i >= 0:
-                        if text[i] == '"':
-                            # 检查是否是转义的引号
-                            escape_count = 0
-                            j = i - 1
-                            while j >= 0 and text[j] == "\\":
-                                escape_count += 1
-                                j -= 1
-                            if escape_count % 2 == 0:
-                                break
-                        i -= 1
-                i += direction
-                continue
-
-            if char == bracket:
-                depth += 1
-            elif char == target:
-                depth -= 1
-                if depth == 0:
-                    return i
-
-            i += direction
-
-        return -1
-
-    def _add_bracket_highlight(self, pos: int):
-        """添加括号高亮"""
-        selection = QTextEdit.ExtraSelection()
-
-        # 设置高亮格式
-        selection.format.setBackground(QColor("#515a6b"))
-        selection.format.setForeground(QColor("#FFFF00"))
-        selection.format.setFontWeight(QFont.Bold)
-
-        # 设置光标位置
-        cursor = self.text_edit.textCursor()
-        cursor.setPosition(pos)
-        cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor)
-        selection.cursor = cursor
-
-        self.extra_selections.append(selection)
-
-
-class ConfigManager:
-    """配置文件读写管理 - 支持 JSON 和 JSONC (带注释的JSON)"""
-
-    @staticmethod
-    def strip_jsonc_comments(content: str) -> str:
-        """移除 JSONC 中的注释，支持 // 单行注释和 /* */ 多行注释"""
-        result = []
-        i = 0
-        in_string = False
-        escape_next = False
-
-        while i < len(content):
-            char = content[i]
-
-            # 处理字符串内的转义
-            if escape_next:
-                result.append(char)
-                escape_next = False
-                i += 1
-                continue
-
-            # 检测转义字符
-            if char == "\\" and in_string:
-                result.append(char)
-                escape_next = True
-                i += 1
-                continue
-
-            # 检测字符串边界
-            if char == '"' and not escape_next:
-                in_string = not in_string
-                result.append(char)
-                i += 1
-                continue
-
-            # 不在字符串内时处理注释
-            if not in_string:
-                # 检测单行注释 //
-                if char == "/" and i + 1 < len(content) and content[i + 1] == "/":
-                    # 跳过到行尾
-                    while i < len(content) and content[i] != "\n":
-                        i += 1
-                    # 保留换行符（如果存在）
-                    if i < len(content) and content[i] == "\n":
-                        result.append("\n")
-                        i += 1
-                    continue
-
-                # 检测多行注释 /* */
-                if char == "/" and i + 1 < len(content) and content[i + 1] == "*":
-                    i += 2  # 跳过 /*
-                    # 查找 */
-                    while i < len(content):
-                        if (
-                            content[i] == "*"
-                            and i + 1 < len(content)
-                            and content[i + 1] == "/"
-                        ):
-                            i += 2  # 跳过 */
-                            break
-                        i += 1
-                    continue
-
-            result.append(char)
-            i += 1
-
-        return "".join(result)
-
-    @staticmethod
-    def load_json(path: Path) -> Optional[Dict]:
-        """加载 JSON/JSONC 文件"""
-        try:
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # 尝试直接解析 JSON
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError as e1:
-                    # 如果失败，尝试移除注释后再解析 (JSONC)
-                    try:
-                        stripped_content = ConfigManager.strip_jsonc_comments(content)
-                        return json.loads(stripped_content)
-                    except json.JSONDecodeError as e2:
-                        # 详细记录解析失败原因
-                        print(f"Load failed {path}:")
-                        print(f"  - 标准JSON解析失败: {e1}")
-                        print(f"  - JSONC解析失败: {e2}")
-                        print(f"  - 文件大小: {len(content)} 字节")
-                        # 打印前200个字符用于调试
-                        preview = content[:200].replace("\n", "\\n")
-                        print(f"  - 文件预览: {preview}...")
-                        return None
-        except Exception as e:
-            print(f"Load failed {path}: {e}")
-        return None
-
-    @staticmethod
-    def is_jsonc_file(path: Path) -> bool:
-        """检查文件是否为 JSONC 格式（包含注释）"""
-        try:
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                # 尝试直接解析，如果失败说明可能有注释
-                try:
-                    json.loads(content)
-                    return False  # 标准 JSON
-                except json.JSONDecodeError:
-                    return True  # 可能是 JSONC
-        except Exception:
-            pass
-        return False
-
-    @staticmethod
-    def has_jsonc_comments(path: Path) -> bool:
-        """检查文件是否包含 JSONC 注释（// 或 /* */）"""
-        try:
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                # 检查是否包含注释标记（简单检测）
-                # 需要排除字符串内的 // 和 /*
-                in_string = False
-                escape_next = False
-                i = 0
-                while i < len(content):
-                    char = content[i]
-                    if escape_next:
-                        escape_next = False
-                        i += 1
-                        continue
-                    if char == "\\" and in_string:
-                        escape_next = True
-                        i += 1
-                        continue
-                    if char == '"' and not escape_next:
-                        in_string = not in_string
-                        i += 1
-                        continue
-                    if not in_string:
-                        # 检测 // 或 /*
-                        if char == "/" and i + 1 < len(content):
-                            next_char = content[i + 1]
-                            if next_char == "/" or next_char == "*":
-                                return True
-                    i += 1
-        except Exception:
-            pass
-        return False
-
-    @staticmethod
-    def save_json(path: Path, data: Dict, backup_manager=None) -> Tuple[bool, bool]:
-        """
-        保存为标准 JSON 格式
-
-        注意：如果原文件是 JSONC 格式（带注释），保存后注释会丢失。
-        会自动检测并备份 JSONC 文件。
-
-        Args:
-            path: 保存路径
-            data: 要保存的数据
-            backup_manager: 备份管理器实例（用于自动备份 JSONC 文件）
-
-        Returns:
-            Tuple[bool, bool]: (保存是否成功, 是否为 JSONC 文件且注释已丢失)
-        """
-        jsonc_warning = False
-        try:
-            # 保存前自动备份当前文件
-            if backup_manager and path.exists():
-                backup_manager.backup(path, tag="before-save")
-
-            # 检测是否为 JSONC 文件（包含注释）
-            if path.exists() and ConfigManager.has_jsonc_comments(path):
-                jsonc_warning = True
-                # 自动备份 JSONC 文件
-                if backup_manager:
-                    backup_manager.backup(path, tag="jsonc-auto")
-
-            # 如果是 oh-my-opencode 配置文件，自动添加 $schema 字段
-            if "oh-my-opencode" in str(path):
-                # 创建新的数据副本，避免修改原始数据
-                data_to_save = data.copy()
-                # 添加 $schema 字段到最前面
-                schema_url = "https://raw.githubusercontent.com/code-yeongyu/oh-my-opencode/master/assets/oh-my-opencode.schema.json"
-                # 使用 OrderedDict 确保 $schema 在最前面
-                from collections import OrderedDict
-
-                ordered_data = OrderedDict()
-                ordered_data["$schema"] = schema_url
-                # 添加其他字段
-                for key, value in data_to_save.items():
-                    if key != "$schema":  # 避免重复
-                        ordered_data[key] = value
-                data_to_save = ordered_data
-            else:
-                data_to_save = data
-
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, indent=2, ensure_ascii=False)
-            return True, jsonc_warning
-        except Exception as e:
-            print(f"Save failed {path}: {e}")
-            return False, jsonc_warning
-
-
-class BackupManager:
-    """备份管理器"""
-
-    def __init__(self):
-        self.backup_dir = ConfigPaths.get_backup_dir()
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-
-    def backup(self, config_path: Path, tag: str = "auto") -> Optional[Path]:
-        """创建配置文件备份，支持自定义标签"""
-        try:
-            if not config_path.exists():
-                return None
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{config_path.stem}.{timestamp}.{tag}.bak"
-            backup_path = self.backup_dir / backup_name
-            shutil.copy2(config_path, backup_path)
-            return backup_path
-        except Exception as e:
-            print(f"Backup failed: {e}")
-            return None
-
-    def backup_data(
-        self, config_path: Path, data: Dict, tag: str = "memory"
-    ) -> Optional[Path]:
-        """备份当前内存态配置（不依赖磁盘内容）"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"{config_path.stem}.{timestamp}.{tag}.bak"
-            backup_path = self.backup_dir / backup_name
-            with open(backup_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            return backup_path
-        except Exception as e:
-            print(f"Backup data failed: {e}")
-            return None
-
-    @staticmethod
-    def file_hash(path: Path) -> Optional[str]:
-        """计算文件哈希，用于检测外部修改"""
-        try:
-            if not path.exists():
-                return None
-            with open(path, "rb") as f:
-                data = f.read()
-            return hashlib.md5(data).hexdigest()
-        except Exception as e:
-            print(f"Hash failed: {e}")
-            return None
-
-    def list_backups(self, config_name: Optional[str] = None) -> List[Dict]:
-        """列出所有备份文件，按时间倒序"""
-        try:
-            backups = []
-            for f in self.backup_dir.glob("*.bak"):
-                parts = f.stem.split(".")
-                if len(parts) >= 3:
-                    name = parts[0]
-                    timestamp = parts[1]
-                    tag = parts[2] if len(parts) > 2 else "auto"
-                    if config_name is None or name == config_name:
-                        backups.append(
-                            {
-                                "path": f,
-                                "name": name,
-                                "timestamp": timestamp,
-                                "tag": tag,
-                                "display": f"{name} - {timestamp} ({tag})",
-                            }
-                        )
-            backups.sort(key=lambda x: x["timestamp"], reverse=True)
-            return backups
-        except Exception as e:
-            print(f"List backups failed: {e}")
-            return []
-
-    def restore(self, backup_path: Path, target_path: Path) -> bool:
-        """从备份恢复配置"""
-        try:
-            if not backup_path.exists():
-                return False
-            self.backup(target_path, tag="before_restore")
-            shutil.copy2(backup_path, target_path)
-            return True
-        except Exception as e:
-            print(f"Restore failed: {e}")
-            return False
-
-    def delete_backup(self, backup_path: Path) -> bool:
-        """删除指定备份"""
-        try:
-            if backup_path.exists():
-                backup_path.unlink()
-                return True
-            return False
-        except Exception as e:
-            print(f"Delete backup failed: {e}")
-            return False
-
-
-# ==================== CLI 导出模块 ====================
-class CLIConfigWriter:
-    """CLI 配置写入器 - 原子写入配置文件"""
-
-    @staticmethod
-    def get_claude_dir() -> Path:
-        """获取 Claude 配置目录 (~/.claude/)"""
-        return Path.home() / ".claude"
-
-    @staticmethod
-    def get_codex_dir() -> Path:
-        """获取 Codex 配置目录 (~/.codex/)"""
-        return Path.home() / ".codex"
-
-    @staticmethod
-    def get_gemini_dir() -> Path:
-        """获取 Gemini 配置目录 (~/.gemini/)"""
-        return Path.home() / ".gemini"
-
-    @staticmethod
-    def get_cli_dir(cli_type: str) -> Path:
-        """根据 CLI 类型获取配置目录"""
-        if cli_type == "claude":
-            return CLIConfigWriter.get_claude_dir()
-        elif cli_type == "codex":
-            return CLIConfigWriter.get_codex_dir()
-        elif cli_type == "gemini":
-            return CLIConfigWriter.get_gemini_dir()
-        else:
-            raise ValueError(f"Unknown CLI type: {cli_type}")
-
-    def atomic_write_json(self, path: Path, data: Dict) -> None:
-        """原子写入 JSON 文件
-
-        1. 写入临时文件 (path.tmp.timestamp)
-        2. 验证 JSON 格式
-        3. 重命名替换原文件
-
-        Raises:
-            ConfigWriteError: 写入失败时抛出
-        """
-        # 确保父目录存在
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        # 生成临时文件路径
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        temp_path = path.parent / f"{path.name}.tmp.{timestamp}"
-
-        try:
-            # 写入临时文件
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            # 验证写入的 JSON 格式
-            with open(temp_path, "r", encoding="utf-8") as f:
-                json.load(f)
-
-            # 原子替换（Windows 需要先删除目标文件）
-            if sys.platform == "win32" and path.exists():
-                path.unlink()
-            temp_path.rename(path)
-
-        except json.JSONDecodeError as e:
-            if temp_path.exists():
-                temp_path.unlink()
-            raise ConfigWriteError(path, f"JSON 格式验证失败: {e}")
-        except Exception as e:
-            if temp_path.exists():
-                temp_path.unlink()
-            raise ConfigWriteError(path, str(e))
-
-    def atomic_write_text(self, path: Path, content: str) -> None:
-        """原子写入文本文件 (用于 TOML/.env)
-
-        Raises:
-            ConfigWriteError: 写入失败时抛出
-        """
-        # 确保父目录存在
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        # 生成临时文件路径
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        temp_path = path.parent / f"{path.name}.tmp.{timestamp}"
-
-        try:
-            # 写入临时文件
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(content)
-
-            # 原子替换
-            if sys.platform == "win32" and path.exists():
-                path.unlink()
-            temp_path.rename(path)
-
-        except Exception as e:
-            if temp_path.exists():
-                temp_path.unlink()
-            raise ConfigWriteError(path, str(e))
-
-    def set_file_permissions(self, path: Path, mode: int = 0o600) -> None:
-        """设置文件权限 (Unix only)
-
-        Args:
-            path: 文件路径
-            mode: 权限模式，默认 600 (仅所有者可读写)
-        """
-        if sys.platform != "win32" and path.exists():
-            try:
-                path.chmod(mode)
-            except Exception as e:
-                print(f"设置文件权限失败 ({path}): {e}")
-
-    def write_claude_settings(self, config: Dict, merge: bool = True) -> None:
-        """写入 Claude settings.json
-
-        Args:
-            config: 要写入的配置（包含 env 字段）
-            merge: 是否与现有配置合并 (保留非 env 字段)
-        """
-        settings_path = self.get_claude_dir() / "settings.json"
-
-        if merge and settings_path.exists():
-            try:
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                # 合并配置：保留现有字段，更新 env
-                existing["env"] = config.get("env", {})
-                config = existing
-            except (json.JSONDecodeError, Exception):
-                # 现有文件无效，直接覆盖
-                pass
-
-        self.atomic_write_json(settings_path, config)
-
-    def write_codex_auth(self, auth: Dict) -> None:
-        """写入 Codex auth.json"""
-        auth_path = self.get_codex_dir() / "auth.json"
-        self.atomic_write_json(auth_path, auth)
-
-    def write_codex_config(self, config_toml: str, merge: bool = True) -> None:
-        """写入 Codex config.toml
-
-        Args:
-            config_toml: TOML 格式配置字符串
-            merge: 是否保留现有的 MCP 配置等
-        """
-        config_path = self.get_codex_dir() / "config.toml"
-
-        if merge and config_path.exists():
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    existing_content = f.read()
-                # 简单合并：保留 [mcp] 段
-                mcp_section = self._extract_toml_section(existing_content, "mcp")
-                if mcp_section:
-                    config_toml = config_toml.rstrip() + "\n\n" + mcp_section
-            except Exception:
-                pass
-
-        self.atomic_write_text(config_path, config_toml)
-
-    def _extract_toml_section(self, content: str, section_name: str) -> Optional[str]:
-        """从 TOML 内容中提取指定段落"""
-        lines = content.split("\n")
-        result = []
-        in_section = False
-
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith(f"[{section_name}"):
-                in_section = True
-                result.append(line)
-            elif in_section:
-                if stripped.startswith("[") and not stripped.startswith(
-                    f"[{section_name}"
-                ):
-                    break
-                result.append(line)
-
-        return "\n".join(result) if result else None
-
-    def write_gemini_env(self, env_map: Dict[str, str]) -> None:
-        """写入 Gemini .env 文件
-
-        格式: KEY=VALUE (每行一个)
-        """
-        env_path = self.get_gemini_dir() / ".env"
-
-        # 生成 .env 内容
-        lines = [f"{key}={value}" for key, value in env_map.items()]
-        content = "\n".join(lines) + "\n"
-
-        self.atomic_write_text(env_path, content)
-
-        # 设置文件权限 (Unix: 600)
-        self.set_file_permissions(env_path, 0o600)
-
-    def write_gemini_settings(self, security_config: Dict, merge: bool = True) -> None:
-        """写入 Gemini settings.json
-
-        Args:
-            security_config: security.auth.selectedType 配置
-            merge: 是否保留现有的 mcpServers 等字段
-        """
-        settings_path = self.get_gemini_dir() / "settings.json"
-
-        config = {"security": security_config.get("security", security_config)}
-
-        if merge and settings_path.exists():
-            try:
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    existing = json.load(f)
-                # 合并配置：保留 mcpServers 等字段
-                for key, value in existing.items():
-                    if key != "security":
-                        config[key] = value
-                # 深度合并 security 字段
-                if "security" in existing:
-                    existing_security = existing["security"]
-                    new_security = config.get("security", {})
-                    for key, value in existing_security.items():
-                        if key not in new_security:
-                            new_security[key] = value
-                    config["security"] = new_security
-            except (json.JSONDecodeError, Exception):
-                pass
-
-        self.atomic_write_json(settings_path, config)
-
-
-class CLIBackupManager:
-    """CLI 配置备份管理器"""
-
-    BACKUP_DIR = Path.home() / ".opencode-backup"
-    MAX_BACKUPS = 5
-
-    def __init__(self):
-        self.backup_dir = self.BACKUP_DIR
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
-
-    def create_backup(self, cli_type: str) -> Optional[Path]:
-        """创建指定 CLI 工具的配置备份
-
-        Args:
-            cli_type: "claude" | "codex" | "gemini"
-
-        Returns:
-            备份目录路径，如 ~/.opencode-backup/claude_20250119_143052/
-
-        Raises:
-            BackupError: 备份失败时抛出
-        """
-        try:
-            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
-            if not cli_dir.exists():
-                return None
+# ==================== 预设常用模型（含完整配置） ====================
+# 根据 OpenCode 官方文档 (https://opencode.ai/docs/models/)
+# - options: 模型的默认配置参数，每次调用都会使用
+# - variants: 可切换的变体配置，用户可通过 variant_cycle 快捷键切换
+PRESET_MODEL_CONFIGS = {
+    "Claude 系列": {
+        "sdk": "@ai-sdk/anthropic",
+        "models": {
+            "claude-opus-4-5-20251101": {
+                "name": "Claude Opus 4.5",
+                "attachment": True,
+                "limit": {"context": 200000, "output": 32000},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
+                "variants": {},
+                "description": "最强大的Claude模型，支持extended thinking模式\noptions.thinking.budgetTokens 控制思考预算",
+            },
+            "claude-sonnet-4-5-20250929": {
+                "name": "Claude Sonnet 4.5",
+                "attachment": True,
+                "limit": {"context": 200000, "output": 16000},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"thinking": {"type": "enabled", "budgetTokens": 8000}},
+                "variants": {},
+                "description": "平衡性能与成本的Claude模型，支持thinking模式",
+            },
+            "claude-sonnet-4-20250514": {
+                "name": "Claude Sonnet 4",
+                "attachment": True,
+                "limit": {"context": 200000, "output": 8192},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "Claude Sonnet 4基础版，不支持thinking",
+            },
+            "claude-haiku-4-5-20250514": {
+                "name": "Claude Haiku 4.5",
+                "attachment": True,
+                "limit": {"context": 200000, "output": 8192},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "快速响应的轻量级Claude模型",
+            },
+        },
+    },
+    "OpenAI/Codex 系列": {
+        "sdk": "@ai-sdk/openai",
+        "models": {
+            "gpt-5": {
+                "name": "GPT-5",
+                "attachment": True,
+                "limit": {"context": 256000, "output": 32768},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {
+                    "reasoningEffort": "high",
+                    "textVerbosity": "low",
+                    "reasoningSummary": "auto",
+                },
+                "variants": {
+                    "high": {
+                        "reasoningEffort": "high",
+                        "textVerbosity": "low",
+                        "reasoningSummary": "auto",
+                    },
+                    "medium": {
+                        "reasoningEffort": "medium",
+                        "textVerbosity": "low",
+                        "reasoningSummary": "auto",
+                    },
+                    "low": {
+                        "reasoningEffort": "low",
+                        "textVerbosity": "low",
+                        "reasoningSummary": "auto",
+                    },
+                    "xhigh": {
+                        "reasoningEffort": "xhigh",
+                        "textVerbosity": "low",
+                        "reasoningSummary": "auto",
+                    },
+                },
+                "description": "OpenAI最新旗舰模型\noptions.reasoningEffort: high/medium/low/xhigh",
+            },
+            "gpt-5.1-codex": {
+                "name": "GPT-5.1 Codex",
+                "attachment": True,
+                "limit": {"context": 256000, "output": 65536},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"reasoningEffort": "high", "textVerbosity": "low"},
+                "variants": {
+                    "high": {"reasoningEffort": "high"},
+                    "medium": {"reasoningEffort": "medium"},
+                    "low": {"reasoningEffort": "low"},
+                },
+                "description": "OpenAI代码专用模型，针对编程任务优化",
+            },
+            "gpt-4o": {
+                "name": "GPT-4o",
+                "attachment": True,
+                "limit": {"context": 128000, "output": 16384},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "OpenAI多模态模型",
+            },
+            "o1-preview": {
+                "name": "o1 Preview",
+                "attachment": False,
+                "limit": {"context": 128000, "output": 32768},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {"reasoningEffort": "high"},
+                "variants": {
+                    "high": {"reasoningEffort": "high"},
+                    "medium": {"reasoningEffort": "medium"},
+                    "low": {"reasoningEffort": "low"},
+                },
+                "description": "OpenAI推理模型，支持reasoningEffort参数",
+            },
+            "o3-mini": {
+                "name": "o3 Mini",
+                "attachment": False,
+                "limit": {"context": 200000, "output": 100000},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {"reasoningEffort": "high"},
+                "variants": {
+                    "high": {"reasoningEffort": "high"},
+                    "medium": {"reasoningEffort": "medium"},
+                    "low": {"reasoningEffort": "low"},
+                },
+                "description": "OpenAI最新推理模型",
+            },
+        },
+    },
+    "Gemini 系列": {
+        "sdk": "@ai-sdk/google",
+        "models": {
+            "gemini-3-pro": {
+                "name": "Gemini 3 Pro",
+                "attachment": True,
+                "limit": {"context": 2097152, "output": 65536},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"thinkingConfig": {"thinkingBudget": 8000}},
+                "variants": {
+                    "low": {"thinkingConfig": {"thinkingBudget": 4000}},
+                    "high": {"thinkingConfig": {"thinkingBudget": 16000}},
+                    "max": {"thinkingConfig": {"thinkingBudget": 32000}},
+                },
+                "description": "Google最新Pro模型，支持thinking模式",
+            },
+            "gemini-2.0-flash": {
+                "name": "Gemini 2.0 Flash",
+                "attachment": True,
+                "limit": {"context": 1048576, "output": 8192},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"thinkingConfig": {"thinkingBudget": 4000}},
+                "variants": {
+                    "low": {"thinkingConfig": {"thinkingBudget": 2000}},
+                    "high": {"thinkingConfig": {"thinkingBudget": 8000}},
+                },
+                "description": "Google Flash模型，支持thinking模式",
+            },
+            "gemini-2.0-flash-thinking-exp": {
+                "name": "Gemini 2.0 Flash Thinking",
+                "attachment": True,
+                "limit": {"context": 1048576, "output": 65536},
+                "modalities": {"input": ["text", "image"], "output": ["text"]},
+                "options": {"thinkingConfig": {"thinkingBudget": 10000}},
+                "variants": {},
+                "description": "Gemini专用thinking实验模型",
+            },
+            "gemini-1.5-pro": {
+                "name": "Gemini 1.5 Pro",
+                "attachment": True,
+                "limit": {"context": 2097152, "output": 8192},
+                "modalities": {
+                    "input": ["text", "image", "audio", "video"],
+                    "output": ["text"],
+                },
+                "options": {},
+                "variants": {},
+                "description": "超长上下文的Gemini Pro模型",
+            },
+        },
+    },
+    "其他模型": {
+        "sdk": "@ai-sdk/openai-compatible",
+        "models": {
+            "minimax-m2.1": {
+                "name": "Minimax M2.1",
+                "attachment": False,
+                "limit": {"context": 128000, "output": 16384},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "Minimax M2.1模型",
+            },
+            "deepseek-chat": {
+                "name": "DeepSeek Chat",
+                "attachment": False,
+                "limit": {"context": 64000, "output": 8192},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "DeepSeek对话模型",
+            },
+            "deepseek-reasoner": {
+                "name": "DeepSeek Reasoner",
+                "attachment": False,
+                "limit": {"context": 64000, "output": 8192},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "DeepSeek推理模型",
+            },
+            "qwen-max": {
+                "name": "Qwen Max",
+                "attachment": False,
+                "limit": {"context": 32000, "output": 8192},
+                "modalities": {"input": ["text"], "output": ["text"]},
+                "options": {},
+                "variants": {},
+                "description": "阿里通义千问Max模型",
+            },
+        },
+    },
+}
 
-            # 创建备份目录
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = self.backup_dir / f"{cli_type}_{timestamp}"
-            backup_path.mkdir(parents=True, exist_ok=True)
-
-            # 复制所有配置文件
-            files_backed_up = []
-            for item in cli_dir.iterdir():
-                if item.is_file():
-                    dest = backup_path / item.name
-                    shutil.copy2(item, dest)
-                    files_backed_up.append(item.name)
-
-            if not files_backed_up:
-                # 没有文件需要备份，删除空目录
-                backup_path.rmdir()
-                return None
+# 简化的模型列表（用于下拉选择）
+PRESET_MODELS = {
+    category: list(data["models"].keys())
+    for category, data in PRESET_MODEL_CONFIGS.items()
+}
 
-            # 清理旧备份
-            self.cleanup_old_backups(cli_type)
+PRESET_SDKS = [
+    "@ai-sdk/anthropic",
+    "@ai-sdk/openai",
+    "@ai-sdk/google",
+    "@ai-sdk/azure",
+    "@ai-sdk/openai-compatible",
+]
 
-            return backup_path
+# 模型配置包预设（用于批量添加时的可选模板）
+MODEL_PRESET_PACKS = {
+    "Claude 系列": {
+        "默认": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"thinking": {"type": "enabled", "budgetTokens": 16000}},
+            "variants": {},
+        },
+        "高思考": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"thinking": {"type": "enabled", "budgetTokens": 32000}},
+            "variants": {},
+        },
+        "最大思考": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"thinking": {"type": "enabled", "budgetTokens": 64000}},
+            "variants": {},
+        },
+        "轻量": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"thinking": {"type": "disabled"}},
+            "variants": {},
+        },
+    },
+    "OpenAI/Codex 系列": {
+        "基础": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {},
+            "variants": {},
+        },
+        "fast": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"reasoningEffort": "low"},
+            "variants": {},
+        },
+        "high": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"reasoningEffort": "high"},
+            "variants": {},
+        },
+        "xhigh": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 200000, "output": 16000},
+            "options": {"reasoningEffort": "xhigh"},
+            "variants": {},
+        },
+    },
+    "Gemini 系列": {
+        "默认": {
+            "attachment": True,
+            "modalities": {"input": ["text", "image"], "output": ["text"]},
+            "limit": {"context": 1048576, "output": 8192},
+            "options": {"thinkingConfig": {"thinkingBudget": 8000}},
+            "variants": {},
+        },
+        "16k": {
+            "attachment": True,
+            "modalities": {"input": ["text", "image"], "output": ["text"]},
+            "limit": {"context": 1048576, "output": 8192},
+            "options": {"thinkingConfig": {"thinkingBudget": 16000}},
+            "variants": {},
+        },
+        "高": {
+            "attachment": True,
+            "modalities": {"input": ["text", "image"], "output": ["text"]},
+            "limit": {"context": 1048576, "output": 8192},
+            "options": {"thinkingConfig": {"thinkingBudget": 32000}},
+            "variants": {},
+        },
+    },
+    "其他模型": {
+        "基础": {
+            "attachment": False,
+            "modalities": {"input": ["text"], "output": ["text"]},
+            "limit": {"context": 64000, "output": 8192},
+            "options": {},
+            "variants": {},
+        }
+    },
+}
 
-        except Exception as e:
-            raise BackupError(cli_type, str(e))
+MODEL_PRESET_DEFAULT = {
+    "Claude 系列": "默认",
+    "OpenAI/Codex 系列": "基础",
+    "Gemini 系列": "默认",
+    "其他模型": "基础",
+}
 
-    def restore_backup(self, backup_path: Path, cli_type: str) -> bool:
-        """从备份恢复配置
+MODEL_PRESET_CUSTOM = {
+    "Claude 系列": {},
+    "OpenAI/Codex 系列": {},
+    "Gemini 系列": {},
+    "其他模型": {},
+}
 
-        Args:
-            backup_path: 备份目录路径
-            cli_type: CLI 类型
+# SDK与模型厂商的对应关系（用于提示）
+SDK_MODEL_COMPATIBILITY = {
+    "@ai-sdk/anthropic": ["Claude 系列"],
+    "@ai-sdk/openai": ["OpenAI/Codex 系列", "其他模型"],
+    "@ai-sdk/google": ["Gemini 系列"],
+    "@ai-sdk/azure": ["OpenAI/Codex 系列"],
+    "@ai-sdk/openai-compatible": ["其他模型"],
+}
 
-        Returns:
-            是否恢复成功
+# Oh My OpenCode Agent 预设
+PRESET_AGENTS = {
+    "oracle": "架构设计、代码审查、策略规划专家 - 用于复杂决策和深度分析",
+    "librarian": "多仓库分析、文档查找、实现示例专家 - 用于查找外部资源和文档",
+    "explore": "快速代码库探索和模式匹配专家 - 用于代码搜索和模式发现",
+    "frontend-ui-ux-engineer": "UI/UX 设计和前端开发专家 - 用于前端视觉相关任务",
+    "document-writer": "技术文档写作专家 - 用于生成README、API文档等",
+    "multimodal-looker": "视觉内容分析专家 - 用于分析图片、PDF等媒体文件",
+    "code-reviewer": "代码质量审查、安全分析专家 - 用于代码审查任务",
+    "debugger": "问题诊断、Bug 修复专家 - 用于调试和问题排查",
+}
 
-        Raises:
-            RestoreError: 恢复失败时抛出
-        """
-        try:
-            if not backup_path.exists():
-                raise RestoreError(backup_path, "备份目录不存在")
+# OpenCode 原生 Agent 预设
+PRESET_OPENCODE_AGENTS = {
+    "build": {
+        "mode": "primary",
+        "description": "默认主Agent，拥有所有工具权限，用于开发工作",
+        "tools": {"write": True, "edit": True, "bash": True},
+    },
+    "plan": {
+        "mode": "primary",
+        "description": "规划分析Agent，限制写入权限，用于代码分析和规划",
+        "permission": {"edit": "ask", "bash": "ask"},
+    },
+    "general": {
+        "mode": "subagent",
+        "description": "通用子Agent，用于研究复杂问题和执行多步骤任务",
+    },
+    "explore": {
+        "mode": "subagent",
+        "description": "快速探索Agent，用于代码库搜索和模式发现",
+    },
+    "code-reviewer": {
+        "mode": "subagent",
+        "description": "代码审查Agent，只读权限，专注于代码质量分析",
+        "tools": {"write": False, "edit": False},
+    },
+    "docs-writer": {
+        "mode": "subagent",
+        "description": "文档编写Agent，专注于技术文档创作",
+        "tools": {"bash": False},
+    },
+    "security-auditor": {
+        "mode": "subagent",
+        "description": "安全审计Agent，只读权限，专注于安全漏洞分析",
+        "tools": {"write": False, "edit": False},
+    },
+}
 
-            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
-            cli_dir.mkdir(parents=True, exist_ok=True)
+# Category 预设
+PRESET_CATEGORIES = {
+    "visual": {"temperature": 0.7, "description": "前端、UI/UX、设计相关任务"},
+    "business-logic": {
+        "temperature": 0.1,
+        "description": "后端逻辑、架构设计、战略推理",
+    },
+    "documentation": {"temperature": 0.3, "description": "文档编写、技术写作任务"},
+    "code-analysis": {"temperature": 0.2, "description": "代码审查、重构分析任务"},
+}
 
-            # 先备份当前配置
-            self.create_backup(cli_type)
+# 参数说明提示（用于Tooltip）- 根据 OpenCode 官方文档
+TOOLTIPS = {
+    # Provider相关
+    "provider_name": "Provider 名称 - Provider的唯一标识符，用于在配置中引用\n格式：小写字母和连字符，如 anthropic, openai, my-proxy",
+    "provider_display": "显示名称 - 在界面中显示的友好名称\n示例：Anthropic (Claude)、OpenAI 官方",
+    "provider_sdk": "SDK 包名 - 指定使用哪个AI SDK来调用API\n• Claude系列 → @ai-sdk/anthropic\n• GPT/OpenAI系列 → @ai-sdk/openai\n• Gemini系列 → @ai-sdk/google",
+    "provider_url": "API 地址 (baseURL) - API服务的访问地址\n• 官方API → 留空（自动使用默认地址）\n• 中转站 → 填写中转站地址",
+    "provider_apikey": "API 密钥 - 用于身份验证的密钥\n支持环境变量: {env:ANTHROPIC_API_KEY}",
+    "provider_timeout": "请求超时 - 单位：毫秒 (ms)\n默认：300000 (5分钟)",
+    # Model相关
+    "model_id": "模型 ID - 模型的唯一标识符，必须与API提供商一致\n示例：claude-sonnet-4-5-20250929, gpt-5",
+    "model_name": "显示名称 - 在界面中显示的友好名称",
+    "model_attachment": "支持附件 - 是否支持上传文件（图片、文档等）",
+    "model_context": "上下文窗口 - 模型能处理的最大输入长度（tokens）",
+    "model_output": "最大输出 - 模型单次回复的最大长度（tokens）",
+    "model_options": "模型默认配置 (Options) - 每次调用模型时自动使用的参数\n• Claude thinking: thinking.type, thinking.budgetTokens\n• OpenAI: reasoningEffort, textVerbosity\n• Gemini: thinkingConfig.thinkingBudget",
+    "model_variants": "模型变体 (Variants) - 可通过快捷键切换的预设配置组合\n用于同一模型的不同配置，如不同的thinking预算",
+    # Agent相关 (Oh My OpenCode)
+    "agent_name": "Agent 名称 - Agent的唯一标识符\n预设Agent：oracle, librarian, explore, code-reviewer",
+    "agent_model": "绑定模型 - 格式：provider/model-id\n示例：anthropic/claude-sonnet-4-5-20250929",
+    "agent_description": "Agent 描述 - 描述Agent的功能和适用场景",
+    # Agent相关 (OpenCode原生)
+    "opencode_agent_mode": "Agent 模式\n• primary - 主Agent，可通过Tab键切换\n• subagent - 子Agent，通过@提及调用\n• all - 两种模式都支持",
+    "opencode_agent_temperature": "生成温度 - 取值范围：0.0 - 2.0\n• 0.0-0.2: 适合代码/分析\n• 0.3-0.5: 平衡创造性和准确性",
+    "opencode_agent_maxSteps": "最大步数 - 限制Agent执行的工具调用次数\n留空 = 无限制",
+    "opencode_agent_prompt": "系统提示词 - 定义Agent的行为和专长\n支持文件引用: {file:./prompts/agent.txt}",
+    "opencode_agent_tools": "工具配置 - JSON对象格式\n• true - 启用工具\n• false - 禁用工具",
+    "opencode_agent_permission": "权限配置\n• allow - 允许，无需确认\n• ask - 每次询问用户\n• deny - 禁止使用",
+    "opencode_agent_hidden": "隐藏 - 是否在@自动完成中隐藏此Agent\n仅对subagent有效",
+    # Category相关
+    "category_name": "Category 名称\n预设分类：visual, business-logic, documentation, code-analysis",
+    "category_model": "绑定模型 - 格式：provider/model-id",
+    "category_temperature": "Temperature - 推荐设置：\n• visual (前端): 0.7\n• business-logic (后端): 0.1\n• documentation (文档): 0.3",
+    "category_description": "分类描述 - 说明该分类的用途和适用场景",
+    # Permission相关
+    "permission_tool": "工具名称\n内置工具：Bash, Read, Write, Edit, Glob, Grep, WebFetch, WebSearch, Task\nMCP工具格式：mcp_servername_toolname",
+    "permission_level": "权限级别\n• allow - 直接使用，无需确认\n• ask - 每次使用前询问用户\n• deny - 禁止使用",
+    "permission_bash_pattern": "Bash 命令模式 - 支持通配符\n• * - 匹配所有命令\n• git * - 匹配所有git命令",
+    # MCP相关
+    "mcp_name": "MCP 名称 - MCP服务器的唯一标识符\n示例：context7, sentry, gh_grep",
+    "mcp_type": "MCP 类型\n• local - 本地进程，通过命令启动\n• remote - 远程服务，通过URL连接",
+    "mcp_enabled": "启用状态 - 是否启用此MCP服务器\n禁用后保留配置但不加载",
+    "mcp_command": '启动命令 (Local类型) - JSON数组格式\n示例：["npx", "-y", "@mcp/server"]',
+    "mcp_url": "服务器 URL (Remote类型) - 完整的HTTP/HTTPS URL",
+    "mcp_headers": '请求头 (Remote类型) - JSON对象格式\n示例：{"Authorization": "Bearer your-api-key"}',
+    "mcp_environment": '环境变量 (Local类型) - JSON对象格式\n示例：{"API_KEY": "xxx"}',
+    "mcp_timeout": "超时时间 - 单位：毫秒 (ms)\n默认值：5000 (5秒)",
+    # Skill相关
+    "skill_name": "Skill 名称 - 1-64字符，小写字母、数字、连字符\n示例：git-release, pr-review",
+    "skill_permission": "Skill 权限\n• allow - 立即加载，无需确认\n• deny - 隐藏并拒绝访问\n• ask - 加载前询问用户",
+    "skill_pattern": "权限模式 - 支持通配符\n• * - 匹配所有Skill\n• internal-* - 匹配internal-开头的Skill",
+    "skill_description": "Skill 描述 - 描述Skill的功能，帮助Agent选择",
+    # Instructions/Rules相关
+    "instructions_path": "指令文件路径 - 支持相对路径、绝对路径、Glob模式、远程URL",
+    "rules_agents_md": "AGENTS.md 文件 - 项目级或全局级的规则文件\n内容建议：项目结构说明、代码规范要求",
+    # Compaction相关
+    "compaction_auto": "自动压缩 - 当上下文接近满时自动压缩会话\n默认值：true (启用)",
+    "compaction_prune": "修剪旧输出 - 删除旧的工具输出以节省tokens\n默认值：true (启用)",
+}
 
-            # 恢复备份文件
-            for item in backup_path.iterdir():
-                if item.is_file():
-                    dest = cli_dir / item.name
-                    shutil.copy2(item, dest)
 
-            return True
+def get_tooltip(key: str) -> str:
+    """获取tooltip文本，如果不存在返回空字符串"""
+    return TOOLTIPS.get(key, "")
 
-        except RestoreError:
-            raise
-        except Exception as e:
-            raise RestoreError(backup_path, str(e))
 
-    def list_backups(self, cli_type: str) -> List[BackupInfo]:
-        """列出指定 CLI 工具的所有备份
+# ==================== JSON语法高亮器 ====================
+class JsonSyntaxHighlighter(QSyntaxHighlighter):
+    """JSON语法高亮器 - 支持彩色括号、关键字高亮、括号匹配"""
 
-        Args:
-            cli_type: CLI 类型
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._setup_formats()
+        self._bracket_level = 0  # 跨行括号层级追踪
 
-        Returns:
-            备份信息列表，按时间倒序
-        """
-        backups = []
-        prefix = f"{cli_type}_"
+    def _setup_formats(self):
+        """设置高亮格式"""
+        # 键名（属性名）- 蓝色
+        self.key_format = QTextCharFormat()
+        self.key_format.setForeground(QColor("#9CDCFE"))  # 浅蓝色
 
-        try:
-            for item in self.backup_dir.iterdir():
-                if item.is_dir() and item.name.startswith(prefix):
-                    # 解析时间戳
-                    timestamp_str = item.name[len(prefix) :]
-                    try:
-                        created_at = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    except ValueError:
-                        continue
-
-                    # 获取备份文件列表
-                    files = [f.name for f in item.iterdir() if f.is_file()]
-
-                    backups.append(
-                        BackupInfo(
-                            path=item,
-                            cli_type=cli_type,
-                            created_at=created_at,
-                            files=files,
-                        )
-                    )
+        # 字符串值 - 橙色
+        self.string_format = QTextCharFormat()
+        self.string_format.setForeground(QColor("#CE9178"))  # 橙色
 
-            # 按时间倒序排序
-            backups.sort(key=lambda x: x.created_at, reverse=True)
+        # 数字 - 浅绿色
+        self.number_format = QTextCharFormat()
+        self.number_format.setForeground(QColor("#B5CEA8"))  # 浅绿色
 
-        except Exception as e:
-            print(f"列出备份失败: {e}")
+        # 布尔值和null - 紫色
+        self.keyword_format = QTextCharFormat()
+        self.keyword_format.setForeground(QColor("#569CD6"))  # 蓝紫色
 
-        return backups
+        # 括号 - 彩色括号（6种颜色循环）
+        self.bracket_colors = [
+            QColor("#FFD700"),  # 金色 - 第1层
+            QColor("#DA70D6"),  # 兰花紫 - 第2层
+            QColor("#87CEEB"),  # 天蓝色 - 第3层
+            QColor("#FF6347"),  # 番茄红 - 第4层
+            QColor("#98FB98"),  # 淡绿色 - 第5层
+            QColor("#DDA0DD"),  # 梅红色 - 第6层
+        ]
 
-    def cleanup_old_backups(self, cli_type: str) -> None:
-        """清理旧备份，保留最近 MAX_BACKUPS 个
+        # 匹配括号高亮格式
+        self.matched_bracket_format = QTextCharFormat()
+        self.matched_bracket_format.setBackground(QColor("#3a3d41"))
+        self.matched_bracket_format.setForeground(QColor("#FFFF00"))
+        self.matched_bracket_format.setFontWeight(QFont.Bold)
 
-        Args:
-            cli_type: CLI 类型
-        """
-        backups = self.list_backups(cli_type)
+    def highlightBlock(self, text):
+        """高亮当前文本块"""
+        import re
 
-        # 删除超出限制的旧备份
-        for backup in backups[self.MAX_BACKUPS :]:
-            try:
-                shutil.rmtree(backup.path)
-            except Exception as e:
-                print(f"删除旧备份失败 ({backup.path}): {e}")
+        # 获取前一个块的括号层级状态
+        prev_block = self.currentBlock().previous()
+        if prev_block.isValid():
+            prev_state = prev_block.userState()
+            if prev_state >= 0:
+                self._bracket_level = prev_state
+            else:
+                self._bracket_level = 0
+        else:
+            self._bracket_level = 0
 
+        # 高亮键名（"key":）
+        for match in re.finditer(r'"([^"\\]|\\.)*"\s*:', text):
+            self.setFormat(
+                match.start(), match.end() - match.start() - 1, self.key_format
+            )
 
-class CLIConfigGenerator:
-    """CLI 配置生成器 - 将 OpenCode 配置转换为各 CLI 工具格式"""
+        # 高亮字符串值（不是键名的字符串）
+        i = 0
+        while i < len(text):
+            if text[i] == '"':
+                # 找到字符串的结束位置
+                j = i + 1
+                while j < len(text):
+                    if text[j] == '"' and (j == i + 1 or text[j - 1] != "\\"):
+                        break
+                    j += 1
 
-    def generate_claude_config(self, provider: Dict, model: str = None) -> Dict:
-        """生成 Claude Code settings.json 配置
+                # 检查是否是键名（后面跟着冒号）
+                is_key = False
+                k = j + 1
+                while k < len(text) and text[k] in " \t":
+                    k += 1
+                if k < len(text) and text[k] == ":":
+                    is_key = True
 
-        Args:
-            provider: OpenCode Provider 配置，包含 baseURL 和 apiKey
-            model: 默认模型 ID，如果为 None 或空字符串则不包含 ANTHROPIC_MODEL
+                if not is_key:
+                    self.setFormat(i, j - i + 1, self.string_format)
 
-        Returns:
-            Claude settings.json 配置字典
-        """
-        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
-            "baseURL", ""
-        )
-        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
-            "apiKey", ""
-        )
+                i = j + 1
+            else:
+                i += 1
 
-        env = {
-            "ANTHROPIC_BASE_URL": base_url,
-            "ANTHROPIC_AUTH_TOKEN": api_key,
-        }
+        # 高亮数字
+        for match in re.finditer(r"\b-?\d+\.?\d*\b", text):
+            self.setFormat(
+                match.start(), match.end() - match.start(), self.number_format
+            )
 
-        # 仅当 model 有值时才添加
-        if model:
-            env["ANTHROPIC_MODEL"] = model
+        # 高亮关键字（true, false, null）
+        for match in re.finditer(r"\b(true|false|null)\b", text):
+            self.setFormat(
+                match.start(), match.end() - match.start(), self.keyword_format
+            )
 
-        # 添加模型映射（如果有）
-        model_mappings = provider.get("modelMappings", {})
-        if model_mappings.get("haiku"):
-            env["ANTHROPIC_DEFAULT_HAIKU_MODEL"] = model_mappings["haiku"]
-        if model_mappings.get("sonnet"):
-            env["ANTHROPIC_DEFAULT_SONNET_MODEL"] = model_mappings["sonnet"]
-        if model_mappings.get("opus"):
-            env["ANTHROPIC_DEFAULT_OPUS_MODEL"] = model_mappings["opus"]
+        # 高亮括号（彩色括号 - 跨行层级追踪）
+        for i, char in enumerate(text):
+            if char in "{[":
+                level = self._bracket_level % len(self.bracket_colors)
+                bracket_format = QTextCharFormat()
+                bracket_format.setForeground(self.bracket_colors[level])
+                bracket_format.setFontWeight(QFont.Bold)
+                self.setFormat(i, 1, bracket_format)
+                self._bracket_level += 1
+            elif char in "}]":
+                self._bracket_level = max(0, self._bracket_level - 1)
+                level = self._bracket_level % len(self.bracket_colors)
+                bracket_format = QTextCharFormat()
+                bracket_format.setForeground(self.bracket_colors[level])
+                bracket_format.setFontWeight(QFont.Bold)
+                self.setFormat(i, 1, bracket_format)
 
-        return {"env": env}
+        # 保存当前块的括号层级状态
+        self.currentBlock().setUserState(self._bracket_level)
 
-    def generate_codex_auth(self, provider: Dict) -> Dict:
-        """生成 Codex auth.json 配置
 
-        Args:
-            provider: OpenCode Provider 配置
+class JsonBracketMatcher:
+    """JSON括号匹配器 - 用于高亮匹配的括号对"""
 
-        Returns:
-            Codex auth.json 配置字典
-        """
-        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
-            "apiKey", ""
-        )
-        return {"OPENAI_API_KEY": api_key}
+    OPEN_BRACKETS = "{["
+    CLOSE_BRACKETS = "}]"
+    BRACKET_PAIRS = {"{": "}", "[": "]", "}": "{", "]": "["}
 
-    def generate_codex_config(self, provider: Dict, model: str) -> str:
-        """生成 Codex config.toml 配置
+    def __init__(self, text_edit: QTextEdit):
+        self.text_edit = text_edit
+        self.extra_selections = []
 
-        Args:
-            provider: OpenCode Provider 配置
-            model: 默认模型 ID
+    def highlight_matching_bracket(self):
+        """高亮当前光标位置的匹配括号"""
+        self.extra_selections = []
 
-        Returns:
-            TOML 格式配置字符串
-        """
-        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
-            "baseURL", ""
-        )
+        cursor = self.text_edit.textCursor()
+        text = self.text_edit.toPlainText()
+        pos = cursor.position()
 
-        # 确保 base_url 以 /v1 结尾
-        if base_url and not base_url.rstrip("/").endswith("/v1"):
-            base_url = base_url.rstrip("/") + "/v1"
+        if not text or pos < 0 or pos > len(text):
+            self.text_edit.setExtraSelections([])
+            return
 
-        provider_name = provider.get("name", "newapi")
+        # 检查光标位置和前一个位置的字符
+        char_at_pos = text[pos] if pos < len(text) else ""
+        char_before = text[pos - 1] if pos > 0 else ""
 
-        lines = [
-            f'model_provider = "{provider_name}"',
-            f'model = "{model}"',
-            'model_reasoning_effort = "high"',
-            "disable_response_storage = true",
-            "",
-            f"[model_providers.{provider_name}]",
-            f'name = "{provider_name}"',
-            f'base_url = "{base_url}"',
-            'wire_api = "responses"',
-            "requires_openai_auth = true",
-        ]
+        bracket_pos = -1
+        bracket_char = ""
 
-        return "\n".join(lines) + "\n"
+        # 优先检查光标前的字符
+        if char_before in self.OPEN_BRACKETS + self.CLOSE_BRACKETS:
+            bracket_pos = pos - 1
+            bracket_char = char_before
+        elif char_at_pos in self.OPEN_BRACKETS + self.CLOSE_BRACKETS:
+            bracket_pos = pos
+            bracket_char = char_at_pos
 
-    def generate_gemini_env(self, provider: Dict, model: str) -> Dict[str, str]:
-        """生成 Gemini .env 配置
+        if bracket_pos < 0:
+            self.text_edit.setExtraSelections([])
+            return
 
-        Args:
-            provider: OpenCode Provider 配置
-            model: 默认模型 ID
+        # 查找匹配的括号
+        match_pos = self._find_matching_bracket(text, bracket_pos, bracket_char)
 
-        Returns:
-            环境变量字典
-        """
-        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
-            "baseURL", ""
-        )
-        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
-            "apiKey", ""
-        )
+        if match_pos >= 0:
+            # 高亮两个括号
+            self._add_bracket_highlight(bracket_pos)
+            self._add_bracket_highlight(match_pos)
 
-        return {
-            "GOOGLE_GEMINI_BASE_URL": base_url,
-            "GEMINI_API_KEY": api_key,
-            "GEMINI_MODEL": model,
-        }
+        self.text_edit.setExtraSelections(self.extra_selections)
 
-    def generate_gemini_settings(self, auth_type: str = "gemini-api-key") -> Dict:
-        """生成 Gemini settings.json 中的 security 配置
+    def _find_matching_bracket(self, text: str, pos: int, bracket: str) -> int:
+        """查找匹配的括号位置"""
+        if bracket in self.OPEN_BRACKETS:
+            # 向前搜索闭括号
+            target = self.BRACKET_PAIRS[bracket]
+            direction = 1
+            start = pos + 1
+            end = len(text)
+        else:
+            # 向后搜索开括号
+            target = self.BRACKET_PAIRS[bracket]
+            direction = -1
+            start = pos - 1
+            end = -1
 
-        Args:
-            auth_type: 认证类型，默认 "gemini-api-key"
+        depth = 1
+        i = start
 
-        Returns:
-            security 配置字典
-        """
-        return {"security": {"auth": {"selectedType": auth_type}}}
+        while (direction == 1 and i < end) or (direction == -1 and i > end):
+            char = text[i]
 
+            # 跳过字符串内的括号
+            if char == '"':
+                # 找到字符串的另一端
+                if direction == 1:
+                    i += 1
+                    while i < len(text):
+                        if text[i] == '"' and text[i - 1] != "\\":
+                            break
+                        i += 1
+                else:
+                    i -= 1
+                    while i >= 0:
+                        if text[i] == '"':
+                            # 检查是否是转义的引号
+                            escape_count = 0
+                            j = i - 1
+                            while j >= 0 and text[j] == "\\":
+                                escape_count += 1
+                                j -= 1
+                            if escape_count % 2 == 0:
+                                break
+                        i -= 1
+                i += direction
+                continue
 
-class CLIExportManager:
-    """CLI 工具导出管理器"""
+            if char == bracket:
+                depth += 1
+            elif char == target:
+                depth -= 1
+                if depth == 0:
+                    return i
 
-    def __init__(self):
-        self.config_generator = CLIConfigGenerator()
-        self.config_writer = CLIConfigWriter()
-        self.backup_manager = CLIBackupManager()
+            i += direction
 
-    def detect_cli_tools(self) -> Dict[str, CLIToolStatus]:
-        """检测已安装的 CLI 工具
+        return -1
 
-        Returns:
-            {cli_type: CLIToolStatus} 字典
-        """
-        result = {}
+    def _add_bracket_highlight(self, pos: int):
+        """添加括号高亮"""
+        selection = QTextEdit.ExtraSelection()
 
-        for cli_type in ["claude", "codex", "gemini"]:
-            cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
-            installed = cli_dir.exists()
+        # 设置高亮格式
+        selection.format.setBackground(QColor("#515a6b"))
+        selection.format.setForeground(QColor("#FFFF00"))
+        selection.format.setFontWeight(QFont.Bold)
 
-            # 检查是否有配置文件
-            has_config = False
-            if installed:
-                if cli_type == "claude":
-                    has_config = (cli_dir / "settings.json").exists()
-                elif cli_type == "codex":
-                    has_config = (cli_dir / "config.toml").exists() or (
-                        cli_dir / "auth.json"
-                    ).exists()
-                elif cli_type == "gemini":
-                    has_config = (cli_dir / "settings.json").exists() or (
-                        cli_dir / ".env"
-                    ).exists()
-
-            result[cli_type] = CLIToolStatus(
-                cli_type=cli_type,
-                installed=installed,
-                config_dir=cli_dir if installed else None,
-                has_config=has_config,
-                version=None,  # 版本检测暂不实现
-            )
+        # 设置光标位置
+        cursor = self.text_edit.textCursor()
+        cursor.setPosition(pos)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor)
+        selection.cursor = cursor
 
-        return result
+        self.extra_selections.append(selection)
 
-    def validate_provider(self, provider: Dict) -> ValidationResult:
-        """验证 Provider 配置完整性
 
-        Args:
-            provider: OpenCode Provider 配置
+class ModelFetchService(QObject):
+    """模型列表获取服务
 
-        Returns:
-            ValidationResult
-        """
-        errors = []
-        warnings = []
+    所有请求都在后台线程执行，结果通过信号回到主线程。
+    同一 Provider 的重复请求会合并为一个进行中的请求，可通过 cancel() 取消。
+    """
 
-        # 检查 baseURL
-        base_url = provider.get("baseURL", "") or provider.get("options", {}).get(
-            "baseURL", ""
-        )
-        if not base_url or not base_url.strip():
-            errors.append("缺少 API 地址 (baseURL)")
+    fetch_finished = pyqtSignal(str, list, str)  # provider_name, model_ids, error
+    items_fetched = pyqtSignal(str, list, str)  # provider_name, 原始模型条目, error
+    fetch_cancelled = pyqtSignal(str, str)  # provider_name, 请求类型 ("ids"/"items")
 
-        # 检查 apiKey
-        api_key = provider.get("apiKey", "") or provider.get("options", {}).get(
-            "apiKey", ""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        # (请求类型, provider_name) -> 取消事件
+        self._inflight: Dict[Tuple[str, str], threading.Event] = {}
+
+    def fetch_async(self, provider_name: str, options: Dict[str, Any]) -> bool:
+        """异步获取模型 ID 列表，返回 False 表示该 Provider 已有进行中的请求"""
+        cancel_event = self._begin(("ids", provider_name))
+        if cancel_event is None:
+            return False
+        thread = threading.Thread(
+            target=self._fetch_models,
+            args=(provider_name, options, cancel_event),
+            daemon=True,
         )
-        if not api_key or not api_key.strip():
-            errors.append("缺少 API 密钥 (apiKey)")
-
-        # 检查 Model 配置
-        models = provider.get("models", {})
-        if not models:
-            warnings.append("未配置任何模型")
+        thread.start()
+        return True
 
-        if errors:
-            return ValidationResult.failure(errors, warnings)
-        return ValidationResult(valid=True, errors=[], warnings=warnings)
+    def fetch_items_async(
+        self, provider_name: str, models_url: str, api_key: str = ""
+    ) -> bool:
+        """异步获取完整的模型条目（含创建时间等字段），结果通过 items_fetched 发出"""
+        cancel_event = self._begin(("items", provider_name))
+        if cancel_event is None:
+            return False
+        thread = threading.Thread(
+            target=self._fetch_items,
+            args=(provider_name, models_url, api_key, cancel_event),
+            daemon=True,
+        )
+        thread.start()
+        return True
 
-    def export_to_claude(self, provider: Dict, model: str) -> ExportResult:
-        """导出到 Claude Code
+    def is_fetching(self, provider_name: str) -> bool:
+        with self._lock:
+            return any(key[1] == provider_name for key in self._inflight)
 
-        Args:
-            provider: OpenCode Provider 配置
-            model: 默认模型 ID
+    def cancel(self, provider_name: str, kind: str = "items") -> None:
+        """取消指定 Provider 的某类进行中请求（"ids" 或 "items"），其结果将被丢弃
 
-        Returns:
-            ExportResult
+        只取消该类请求，其他页面对同一 Provider 发起的另一类请求不受影响。
         """
-        cli_type = "claude"
-        backup_path = None
-
-        try:
-            # 验证 Provider
-            validation = self.validate_provider(provider)
-            if not validation.valid:
-                return ExportResult.fail(cli_type, "; ".join(validation.errors))
-
-            # 创建备份
-            backup_path = self.backup_manager.create_backup(cli_type)
+        with self._lock:
+            event = self._inflight.pop((kind, provider_name), None)
+        if event is not None:
+            event.set()
+            self.fetch_cancelled.emit(provider_name, kind)
+
+    def _begin(self, key: Tuple[str, str]) -> Optional[threading.Event]:
+        with self._lock:
+            if key in self._inflight:
+                return None
+            event = threading.Event()
+            self._inflight[key] = event
+            return event
 
-            # 生成配置
-            config = self.config_generator.generate_claude_config(provider, model)
+    def _finish(self, key: Tuple[str, str], cancel_event: threading.Event) -> bool:
+        """结束请求，返回 False 表示请求已取消，结果不应再发出"""
+        with self._lock:
+            if self._inflight.get(key) is cancel_event:
+                del self._inflight[key]
+        return not cancel_event.is_set()
 
-            # 写入配置
-            self.config_writer.write_claude_settings(config)
+    def _build_urls(self, options: Dict[str, Any]) -> List[str]:
+        base_url = (options.get("baseURL") or "").strip()
+        urls: List[str] = []
 
-            settings_path = CLIConfigWriter.get_claude_dir() / "settings.json"
-            return ExportResult.ok(cli_type, [settings_path], backup_path)
+        if not base_url:
+            return urls
 
-        except CLIExportError as e:
-            return ExportResult.fail(cli_type, str(e), backup_path)
-        except Exception as e:
-            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+        if base_url.rstrip("/").endswith("/v1"):
+            urls.append(base_url.rstrip("/") + "/models")
+            return urls
 
-    def export_to_codex(self, provider: Dict, model: str) -> ExportResult:
-        """导出到 Codex CLI
+        urls.append(base_url.rstrip("/") + "/v1/models")
+        urls.append(base_url.rstrip("/") + "/models")
+        return urls
 
-        Args:
-            provider: OpenCode Provider 配置
-            model: 默认模型 ID
+    def _extract_model_ids(self, data: Any) -> List[str]:
+        model_ids: List[str] = []
+        if isinstance(data, dict):
+            items = None
+            if isinstance(data.get("data"), list):
+                items = data.get("data")
+            elif isinstance(data.get("models"), list):
+                items = data.get("models")
+            elif isinstance(data.get("result"), list):
+                items = data.get("result")
+            if items is not None:
+                for item in items:
+                    if isinstance(item, dict):
+                        model_id = item.get("id") or item.get("name") or ""
+                        if model_id:
+                            model_ids.append(str(model_id))
+                    elif isinstance(item, str):
+                        model_ids.append(item)
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    model_id = item.get("id") or item.get("name") or ""
+                    if model_id:
+                        model_ids.append(str(model_id))
+                elif isinstance(item, str):
+                    model_ids.append(item)
+        return model_ids
 
-        Returns:
-            ExportResult
-        """
-        cli_type = "codex"
-        backup_path = None
+    def _fetch_models(
+        self,
+        provider_name: str,
+        options: Dict[str, Any],
+        cancel_event: threading.Event,
+    ) -> None:
+        import urllib.request
 
-        try:
-            # 验证 Provider
-            validation = self.validate_provider(provider)
-            if not validation.valid:
-                return ExportResult.fail(cli_type, "; ".join(validation.errors))
-
-            # 创建备份
-            backup_path = self.backup_manager.create_backup(cli_type)
-
-            # 生成配置
-            auth = self.config_generator.generate_codex_auth(provider)
-            config_toml = self.config_generator.generate_codex_config(provider, model)
-
-            # 写入配置
-            self.config_writer.write_codex_auth(auth)
-            self.config_writer.write_codex_config(config_toml)
-
-            codex_dir = CLIConfigWriter.get_codex_dir()
-            return ExportResult.ok(
-                cli_type,
-                [codex_dir / "auth.json", codex_dir / "config.toml"],
-                backup_path,
-            )
+        model_ids: List[str] = []
+        last_error = ""
+        urls = self._build_urls(options)
+        if not urls:
+            last_error = "未配置模型列表地址"
 
-        except CLIExportError as e:
-            return ExportResult.fail(cli_type, str(e), backup_path)
-        except Exception as e:
-            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+        api_key = (options.get("apiKey") or "").strip()
+        headers = {"User-Agent": "OpenCode-Config-Manager"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
 
-    def export_to_gemini(self, provider: Dict, model: str) -> ExportResult:
-        """导出到 Gemini CLI
+        for url in urls:
+            if cancel_event.is_set():
+                break
+            try:
+                req = urllib.request.Request(url, headers=headers)
+                with urllib.request.urlopen(req, timeout=10) as response:
+                    data = json.loads(response.read().decode("utf-8"))
+                model_ids = self._extract_model_ids(data)
+                if model_ids:
+                    last_error = ""
+                    break
+                last_error = "未返回可用模型列表"
+            except Exception as e:
+                last_error = str(e)
 
-        Args:
-            provider: OpenCode Provider 配置
-            model: 默认模型 ID
+        if not self._finish(("ids", provider_name), cancel_event):
+            return
+        if model_ids:
+            self.fetch_finished.emit(provider_name, model_ids, "")
+        else:
+            self.fetch_finished.emit(provider_name, [], last_error or "获取失败")
 
-        Returns:
-            ExportResult
-        """
-        cli_type = "gemini"
-        backup_path = None
+    def _fetch_items(
+        self,
+        provider_name: str,
+        models_url: str,
+        api_key: str,
+        cancel_event: threading.Event,
+    ) -> None:
+        import urllib.error
+        import urllib.request
 
+        models: List[Any] = []
+        error = ""
         try:
-            # 验证 Provider
-            validation = self.validate_provider(provider)
-            if not validation.valid:
-                return ExportResult.fail(cli_type, "; ".join(validation.errors))
-
-            # 创建备份
-            backup_path = self.backup_manager.create_backup(cli_type)
-
-            # 生成配置
-            env_map = self.config_generator.generate_gemini_env(provider, model)
-            settings = self.config_generator.generate_gemini_settings()
-
-            # 写入配置
-            self.config_writer.write_gemini_env(env_map)
-            self.config_writer.write_gemini_settings(settings)
-
-            gemini_dir = CLIConfigWriter.get_gemini_dir()
-            return ExportResult.ok(
-                cli_type,
-                [gemini_dir / ".env", gemini_dir / "settings.json"],
-                backup_path,
-            )
+            req = urllib.request.Request(models_url)
+            # 如果有API Key，添加认证头
+            if api_key:
+                req.add_header("Authorization", f"Bearer {api_key}")
+                req.add_header("x-api-key", api_key)
+
+            with urllib.request.urlopen(req, timeout=15) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
 
-        except CLIExportError as e:
-            return ExportResult.fail(cli_type, str(e), backup_path)
+            # 解析模型列表 - 支持多种格式
+            if isinstance(data, dict):
+                if "data" in data:
+                    models = data["data"]
+                elif "models" in data:
+                    models = data["models"]
+            elif isinstance(data, list):
+                models = data
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 403):
+                # 认证失败
+                if not api_key:
+                    error = f"HTTP {e.code}: {e.reason}\n\n该API需要认证。请先配置Provider的API Key。"
+                else:
+                    error = f"HTTP {e.code}: {e.reason}\n\nAPI Key可能无效或已过期。"
+            else:
+                error = f"HTTP {e.code}: {e.reason}"
         except Exception as e:
-            return ExportResult.fail(cli_type, f"导出失败: {e}", backup_path)
+            error = str(e)
 
-    def batch_export(
-        self, provider: Dict, models: Dict[str, str], targets: List[str]
-    ) -> BatchExportResult:
-        """批量导出到多个 CLI 工具
+        if not self._finish(("items", provider_name), cancel_event):
+            return
+        self.items_fetched.emit(provider_name, list(models or []), error)
 
-        Args:
-            provider: OpenCode Provider 配置
-            models: {cli_type: model_id} 字典
-            targets: 要导出的 CLI 类型列表
 
-        Returns:
-            BatchExportResult
-        """
-        results = []
+@dataclass
+class BalanceTarget:
+    """余额查询目标"""
 
-        for cli_type in targets:
-            model = models.get(cli_type, "")
+    provider_name: str
+    base_url: str
+    api_key: str
 
-            try:
-                if cli_type == "claude":
-                    result = self.export_to_claude(provider, model)
-                elif cli_type == "codex":
-                    result = self.export_to_codex(provider, model)
-                elif cli_type == "gemini":
-                    result = self.export_to_gemini(provider, model)
-                else:
-                    result = ExportResult.fail(cli_type, f"未知的 CLI 类型: {cli_type}")
-            except Exception as e:
-                result = ExportResult.fail(cli_type, f"导出异常: {e}")
 
-            results.append(result)
+@dataclass
+class BalanceTrend:
+    """Provider 余额趋势（由历史记录计算）"""
 
-        successful = sum(1 for r in results if r.success)
-        failed = len(results) - successful
+    provider_name: str
+    sample_count: int = 0
+    remaining: Optional[float] = None  # None 表示无限额度或无记录
+    spend_per_day: Optional[float] = None  # 样本跨度不足时为 None
+    days_left: Optional[float] = None  # 无消耗或无限额度时为 None
+    is_spike: bool = False
+    last_spend: float = 0.0
 
-        return BatchExportResult(
-            total=len(results), successful=successful, failed=failed, results=results
-        )
 
-    def validate_exported_config(self, cli_type: str) -> ValidationResult:
-        """验证导出后的配置
+class BalanceHistoryStore:
+    """余额历史记录 - 追加写入的 JSONL 时间序列
 
-        Args:
-            cli_type: CLI 类型
+    每次成功查询追加一行 {ts, provider, key, used, remaining}，
+    按 Provider 计算日均消耗、预计耗尽天数与消耗突增。
+    key 为 API Key 指纹，更换 Key 后只使用新 Key 的样本计算趋势。
+    """
 
-        Returns:
-            ValidationResult
-        """
-        errors = []
-        warnings = []
+    MAX_SAMPLES_PER_PROVIDER = 500
+    MIN_SAMPLE_INTERVAL_SEC = 60  # 同一 Provider 用量未变化时的最小记录间隔
+    RATE_WINDOW_SEC = 7 * 86400  # 计算消耗速率的时间窗口
+    MIN_RATE_SPAN_SEC = 3600  # 样本跨度不足 1 小时不计算速率
+    SPIKE_FACTOR = 3.0  # 最近一段消耗速率超过历史中位数的倍数
+    SPIKE_MIN_INTERVALS = 3
+    SPIKE_MIN_SPEND = 0.1  # 低于该金额（美元）的消耗不视为突增
 
-        cli_dir = CLIConfigWriter.get_cli_dir(cli_type)
+    def __init__(self, history_file: Optional[Path] = None):
+        self.history_file = history_file or (
+            ConfigPaths.get_config_base_dir() / "balance-history.jsonl"
+        )
+        self._lock = threading.Lock()
+        # provider -> [(ts, used, remaining, key)]，按时间排序
+        self._samples: Optional[
+            Dict[str, List[Tuple[float, float, Optional[float], str]]]
+        ] = None
 
-        if cli_type == "claude":
-            settings_path = cli_dir / "settings.json"
-            if not settings_path.exists():
-                errors.append("settings.json 文件不存在")
-            else:
-                try:
-                    with open(settings_path, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                    if "env" not in config:
-                        errors.append("settings.json 缺少 env 字段")
-                    else:
-                        env = config["env"]
-                        if "ANTHROPIC_BASE_URL" not in env:
-                            errors.append("缺少 ANTHROPIC_BASE_URL")
-                        if "ANTHROPIC_AUTH_TOKEN" not in env:
-                            errors.append("缺少 ANTHROPIC_AUTH_TOKEN")
-                except json.JSONDecodeError as e:
-                    errors.append(f"settings.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 settings.json 失败: {e}")
+    @staticmethod
+    def key_fingerprint(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
 
-        elif cli_type == "codex":
-            auth_path = cli_dir / "auth.json"
-            config_path = cli_dir / "config.toml"
+    def _load(self) -> Dict[str, List[Tuple[float, float, Optional[float], str]]]:
+        """加载历史记录（调用方需持有锁）"""
+        if self._samples is not None:
+            return self._samples
 
-            if not auth_path.exists():
-                errors.append("auth.json 文件不存在")
-            else:
-                try:
-                    with open(auth_path, "r", encoding="utf-8") as f:
-                        auth = json.load(f)
-                    if "OPENAI_API_KEY" not in auth:
-                        errors.append("auth.json 缺少 OPENAI_API_KEY")
-                except json.JSONDecodeError as e:
-                    errors.append(f"auth.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 auth.json 失败: {e}")
+        samples: Dict[str, List[Tuple[float, float, Optional[float], str]]] = {}
+        line_count = 0
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line_count += 1
+                        try:
+                            record = json.loads(line)
+                            remaining = record.get("remaining")
+                            samples.setdefault(record["provider"], []).append(
+                                (
+                                    float(record["ts"]),
+                                    float(record["used"]),
+                                    None if remaining is None else float(remaining),
+                                    record.get("key", ""),
+                                )
+                            )
+                        except (ValueError, KeyError, TypeError):
+                            continue
+            except OSError as e:
+                print(f"加载余额历史失败: {e}")
+
+        for rows in samples.values():
+            rows.sort()
+            del rows[: -self.MAX_SAMPLES_PER_PROVIDER]
+        self._samples = samples
+
+        # 被截断的旧记录较多时压缩文件
+        if line_count > sum(map(len, samples.values())) + self.MAX_SAMPLES_PER_PROVIDER:
+            self._rewrite()
+        return samples
+
+    def _rewrite(self) -> None:
+        """用内存中的记录重写历史文件（调用方需持有锁）"""
+        records = [
+            self._to_record(provider, sample)
+            for provider, rows in self._samples.items()
+            for sample in rows
+        ]
+        records.sort(key=lambda r: r["ts"])
+        tmp_file = self.history_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_file, self.history_file)
+        except OSError as e:
+            print(f"压缩余额历史失败: {e}")
 
-            if not config_path.exists():
-                errors.append("config.toml 文件不存在")
-            else:
-                try:
-                    with open(config_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    if "model_provider" not in content:
-                        errors.append("config.toml 缺少 model_provider")
-                    if "model =" not in content:
-                        errors.append("config.toml 缺少 model")
-                except Exception as e:
-                    errors.append(f"读取 config.toml 失败: {e}")
+    @staticmethod
+    def _to_record(
+        provider_name: str, sample: Tuple[float, float, Optional[float], str]
+    ) -> Dict[str, Any]:
+        ts, used, remaining, key = sample
+        return {
+            "ts": ts,
+            "provider": provider_name,
+            "key": key,
+            "used": used,
+            "remaining": remaining,
+        }
 
-        elif cli_type == "gemini":
-            env_path = cli_dir / ".env"
-            settings_path = cli_dir / "settings.json"
+    def record(
+        self,
+        provider_name: str,
+        api_key: str,
+        usage_data: Dict[str, Any],
+        ts: Optional[float] = None,
+    ) -> None:
+        """追加一次查询结果"""
+        remaining = usage_data.get("remaining_balance")
+        if usage_data.get("is_unlimited") or remaining in (None, float("inf")):
+            remaining = None
+        sample = (
+            time.time() if ts is None else ts,
+            float(usage_data.get("used_balance", 0) or 0),
+            remaining,
+            self.key_fingerprint(api_key),
+        )
+
+        with self._lock:
+            rows = self._load().setdefault(provider_name, [])
+            if rows:
+                last = rows[-1]
+                if (
+                    sample[0] - last[0] < self.MIN_SAMPLE_INTERVAL_SEC
+                    and sample[1:] == last[1:]
+                ):
+                    return
+            rows.append(sample)
+            del rows[: -self.MAX_SAMPLES_PER_PROVIDER]
+            try:
+                self.history_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.history_file, "a", encoding="utf-8") as f:
+                    record = self._to_record(provider_name, sample)
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"保存余额历史失败: {e}")
+
+    def providers(self) -> List[str]:
+        with self._lock:
+            return list(self._load())
+
+    def trend(self, provider_name: str) -> BalanceTrend:
+        """计算 Provider 的消耗趋势
+
+        - 日均消耗：窗口内相邻样本已用额度的正增量之和 / 时间跨度（充值或重置不计入）
+        - 预计可用天数：剩余额度 / 日均消耗
+        - 消耗突增：最近一段的消耗速率超过之前各段速率中位数的 SPIKE_FACTOR 倍
+        """
+        with self._lock:
+            rows = list(self._load().get(provider_name, ()))
+        if not rows:
+            return BalanceTrend(provider_name)
+
+        last = rows[-1]
+        rows = [
+            r
+            for r in rows
+            if r[3] == last[3] and r[0] >= last[0] - self.RATE_WINDOW_SEC
+        ]
+        intervals = [
+            (cur[0] - prev[0], max(0.0, cur[1] - prev[1]))
+            for prev, cur in zip(rows, rows[1:])
+            if cur[0] > prev[0]
+        ]
 
-            if not env_path.exists():
-                errors.append(".env 文件不存在")
-            else:
-                try:
-                    with open(env_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    if "GEMINI_API_KEY" not in content:
-                        errors.append(".env 缺少 GEMINI_API_KEY")
-                    if "GOOGLE_GEMINI_BASE_URL" not in content:
-                        errors.append(".env 缺少 GOOGLE_GEMINI_BASE_URL")
-                except Exception as e:
-                    errors.append(f"读取 .env 失败: {e}")
+        trend = BalanceTrend(provider_name, len(rows), last[2])
+        if intervals:
+            trend.last_spend = intervals[-1][1]
+
+        span = sum(dt for dt, _ in intervals)
+        if span >= self.MIN_RATE_SPAN_SEC:
+            spend_per_day = sum(spent for _, spent in intervals) / span * 86400
+            trend.spend_per_day = spend_per_day
+            if last[2] is not None and spend_per_day > 0:
+                trend.days_left = max(0.0, last[2]) / spend_per_day
+
+        if len(intervals) > self.SPIKE_MIN_INTERVALS:
+            rates = sorted(spent / dt for dt, spent in intervals[:-1])
+            median = rates[len(rates) // 2]
+            dt, spent = intervals[-1]
+            trend.is_spike = (
+                spent >= self.SPIKE_MIN_SPEND
+                and spent / dt > self.SPIKE_FACTOR * median
+            )
+        return trend
 
-            if not settings_path.exists():
-                warnings.append("settings.json 文件不存在")
-            else:
-                try:
-                    with open(settings_path, "r", encoding="utf-8") as f:
-                        config = json.load(f)
-                    if "security" not in config:
-                        warnings.append("settings.json 缺少 security 字段")
-                except json.JSONDecodeError as e:
-                    errors.append(f"settings.json 格式错误: {e}")
-                except Exception as e:
-                    errors.append(f"读取 settings.json 失败: {e}")
 
-        if errors:
-            return ValidationResult.failure(errors, warnings)
-        return ValidationResult(valid=True, errors=[], warnings=warnings)
+class BalanceService(QObject):
+    """余额查询服务
 
+    - NewAPI 与 OpenAI 两种接口并发竞速，先成功者胜出
+    - 记住每个 baseURL 可用的接口类型，之后直接使用该类型
+    - 查询结果按 TTL 缓存，实际发起的成功查询写入余额历史（history）
+    - query_all_async() 在线程池中并发查询多个 Provider，结果逐个通过信号返回
+    """
 
-class ConfigValidator:
-    """配置文件验证器 - 检查 OpenCode 配置格式是否正确"""
+    balance_ready = pyqtSignal(str, object)  # provider_name, usage_data
+    balance_failed = pyqtSignal(str, str)  # provider_name, error
+    batch_finished = pyqtSignal()
 
-    @staticmethod
-    def _is_blank(value: Any) -> bool:
-        if value is None:
-            return True
-        if isinstance(value, str):
-            return value.strip() == ""
-        return False
+    API_NEWAPI = "newapi"
+    API_OPENAI = "openai"
+    REQUEST_TIMEOUT_SEC = 30
+    CACHE_TTL_SEC = 300
+    MAX_WORKERS = 8
 
-    # Provider 必需字段
-    PROVIDER_REQUIRED_FIELDS = ["npm", "options"]
-    # Provider options 必需字段
-    PROVIDER_OPTIONS_REQUIRED = ["baseURL", "apiKey"]
-    # Model 推荐字段
-    MODEL_RECOMMENDED_FIELDS = ["name", "limit"]
-    # Oh My OpenCode 必需字段
-    OHMY_AGENT_REQUIRED_FIELDS = ["model"]
-    OHMY_CATEGORY_REQUIRED_FIELDS = ["model"]
-    # 有效的 npm 包
-    VALID_NPM_PACKAGES = [
-        "@ai-sdk/anthropic",
-        "@ai-sdk/openai",
-        "@ai-sdk/openai-compatible",
-        "@ai-sdk/google",
-        "@ai-sdk/azure",
-        "@ai-sdk/amazon-bedrock",
-        "@ai-sdk/google-vertex",
-        "@ai-sdk/mistral",
-        "@ai-sdk/xai",
-        "@ai-sdk/togetherai",
-        "@ai-sdk/cohere",
-        "@ai-sdk/deepseek",
-    ]
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        # baseURL -> 已验证可用的接口类型
+        self._api_types: Dict[str, str] = {}
+        # (baseURL, apiKey 指纹) -> (查询时间, 结果)
+        self._cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="balance"
+        )
+        self._active_batches = 0
+        self.history = BalanceHistoryStore()
+
+    # ---------- 同步查询（在后台线程中调用） ----------
+    def query(
+        self,
+        base_url: str,
+        api_key: str,
+        use_cache: bool = True,
+        provider_name: str = "",
+    ) -> Dict[str, Any]:
+        """查询单个 Provider 用量，失败时抛出异常
 
-    @staticmethod
-    def validate_opencode_config(config: Dict) -> List[Dict]:
-        """
-        验证 OpenCode 配置文件
-        返回问题列表: [{"level": "error/warning", "path": "provider.xxx", "message": "..."}]
+        指定 provider_name 时，新查询到的结果会追加到余额历史
         """
-        issues = []
+        base_url = base_url.rstrip("/")
+        cache_key = (base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+        if use_cache:
+            with self._lock:
+                cached = self._cache.get(cache_key)
+            if cached and time.time() - cached[0] < self.CACHE_TTL_SEC:
+                return cached[1]
+
+        with self._lock:
+            api_type = self._api_types.get(base_url)
+
+        usage_data = None
+        if api_type:
+            try:
+                usage_data = self._query_by_type(api_type, base_url, api_key)
+            except Exception:
+                # 接口类型可能已变化，重新竞速探测
+                with self._lock:
+                    self._api_types.pop(base_url, None)
+        if usage_data is None:
+            usage_data = self._race_query(base_url, api_key)
+
+        with self._lock:
+            self._api_types[base_url] = usage_data["api_type"]
+            self._cache[cache_key] = (time.time(), usage_data)
+        if provider_name:
+            self.history.record(provider_name, api_key, usage_data)
+        return usage_data
+
+    def get_api_type(self, base_url: str) -> Optional[str]:
+        with self._lock:
+            return self._api_types.get(base_url.rstrip("/"))
+
+    def is_busy(self) -> bool:
+        """是否有批量查询正在进行"""
+        with self._lock:
+            return self._active_batches > 0
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _query_by_type(
+        self, api_type: str, base_url: str, api_key: str
+    ) -> Dict[str, Any]:
+        if api_type == self.API_NEWAPI:
+            return self.query_newapi_usage(base_url, api_key)
+        return self.query_openai_usage(base_url, api_key)
+
+    def _race_query(self, base_url: str, api_key: str) -> Dict[str, Any]:
+        """NewAPI 与 OpenAI 接口并发竞速，返回最先成功的结果"""
+        executor = ThreadPoolExecutor(max_workers=2)
+        futures = {
+            executor.submit(self.query_newapi_usage, base_url, api_key): "NewAPI",
+            executor.submit(self.query_openai_usage, base_url, api_key): "OpenAI API",
+        }
+        # 不等待落败的请求结束
+        executor.shutdown(wait=False)
+        errors: Dict[str, str] = {}
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except Exception as e:
+                errors[futures[future]] = str(e)
+        raise Exception(
+            f"余额查询失败。NewAPI: {errors.get('NewAPI', '')[:50]}... "
+            f"OpenAI API: {errors.get('OpenAI API', '')[:50]}..."
+        )
 
-        # 区分 None 和空字典
-        if config is None:
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "root",
-                    "message": "配置文件无法解析或读取失败",
-                }
-            )
-            return issues
+    def _request_json(self, url: str, api_key: str) -> Dict[str, Any]:
+        import urllib.request
 
-        if not isinstance(config, dict):
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
-            )
-            return issues
+        req = urllib.request.Request(url)
+        req.add_header("Authorization", f"Bearer {api_key}")
+        req.add_header("Content-Type", "application/json")
+        with urllib.request.urlopen(req, timeout=self.REQUEST_TIMEOUT_SEC) as response:
+            return json.loads(response.read().decode("utf-8"))
 
-        # 空配置降级为警告（而非错误）
-        if not config or config == {}:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "root",
-                    "message": "配置为空，尚未添加任何Provider",
-                }
-            )
-            return issues
+    def query_newapi_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
+        """查询 NewAPI 用量"""
+        import urllib.error
 
-        # 验证 $schema
-        schema = config.get("$schema")
-        if schema != "https://opencode.ai/config.json":
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "$schema",
-                    "message": "建议设置 $schema 为 https://opencode.ai/config.json",
-                }
-            )
+        # NewAPI 余额查询端点
+        balance_url = f"{base_url}/api/usage/token"
+        try:
+            response_data = self._request_json(balance_url, api_key)
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode("utf-8") if e.fp else ""
+            raise Exception(f"NewAPI 查询失败: {e.code} - {error_body}")
+        except Exception as e:
+            raise Exception(f"NewAPI 请求失败: {str(e)}")
 
-        # 验证 provider 部分
-        providers = config.get("provider", {})
-        if not providers:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "provider",
-                    "message": "未配置任何 Provider",
-                }
-            )
-        if not isinstance(providers, dict):
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "provider",
-                    "message": "provider 必须是对象类型",
-                }
-            )
-            return issues
+        # 解析 NewAPI 响应
+        if not response_data.get("code") or "data" not in response_data:
+            raise Exception("NewAPI 响应格式不正确")
 
-        for provider_name, provider_data in providers.items():
-            provider_path = f"provider.{provider_name}"
+        usage_data = response_data["data"]
 
-            # 检查 provider 值是否为字典
-            if not isinstance(provider_data, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": provider_path,
-                        "message": f"Provider '{provider_name}' 的值必须是对象，当前是 {type(provider_data).__name__}",
-                    }
-                )
-                continue
+        # NewAPI 返回的是积分，需要转换为美元
+        # 转换比例: 500,000 积分 = $1
+        CONVERSION_RATE = 500000.0
 
-            # 检查必需字段
-            for field in ConfigValidator.PROVIDER_REQUIRED_FIELDS:
-                if field not in provider_data:
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 缺少必需字段 '{field}'",
-                        }
-                    )
-                elif ConfigValidator._is_blank(provider_data.get(field)):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": f"{provider_path}.{field}",
-                            "message": f"Provider '{provider_name}' 的 '{field}' 为空",
-                        }
-                    )
+        total_granted_points = usage_data.get("total_granted", 0)
+        total_used_points = usage_data.get("total_used", 0)
+        total_available_points = usage_data.get("total_available", 0)
 
-            # 检查 npm 包是否有效
-            npm = provider_data.get("npm", "")
-            if npm and npm not in ConfigValidator.VALID_NPM_PACKAGES:
-                issues.append(
-                    {
-                        "level": "warning",
-                        "path": f"{provider_path}.npm",
-                        "message": f"Provider '{provider_name}' 的 npm 包 '{npm}' 不在已知列表中",
-                    }
-                )
+        # 转换为美元
+        total_balance = total_granted_points / CONVERSION_RATE
+        used_balance = total_used_points / CONVERSION_RATE
+        remaining_balance = total_available_points / CONVERSION_RATE
 
-            # 检查 options
-            options = provider_data.get("options", {})
-            if not isinstance(options, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": f"{provider_path}.options",
-                        "message": f"Provider '{provider_name}' 的 options 必须是对象",
-                    }
-                )
-            else:
-                for opt_field in ConfigValidator.PROVIDER_OPTIONS_REQUIRED:
-                    if opt_field not in options:
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options 缺少 '{opt_field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(options.get(opt_field)):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{provider_path}.options.{opt_field}",
-                                "message": f"Provider '{provider_name}' 的 options.{opt_field} 为空",
-                            }
-                        )
+        # 判断是否为无限额度
+        is_unlimited = usage_data.get("unlimited_quota", False)
 
-            # 检查 models
-            models = provider_data.get("models", {})
-            if not isinstance(models, dict):
-                issues.append(
-                    {
-                        "level": "error",
-                        "path": f"{provider_path}.models",
-                        "message": f"Provider '{provider_name}' 的 models 必须是对象",
-                    }
-                )
-            else:
-                if not models:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{provider_path}.models",
-                            "message": f"Provider '{provider_name}' 没有配置任何模型",
-                        }
-                    )
-                for model_id, model_data in models.items():
-                    model_path = f"{provider_path}.models.{model_id}"
-                    if ConfigValidator._is_blank(model_id):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Provider '{provider_name}' 存在空模型ID",
-                            }
-                        )
-                        continue
-                    if not isinstance(model_data, dict):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": model_path,
-                                "message": f"Model '{model_id}' 的值必须是对象",
-                            }
-                        )
-                        continue
+        return {
+            "api_type": self.API_NEWAPI,
+            "token_name": usage_data.get("name", ""),
+            "total_balance": total_balance,
+            "used_balance": used_balance,
+            "remaining_balance": remaining_balance,
+            "is_unlimited": is_unlimited,
+            "access_until": usage_data.get("expires_at", 0),
+            "query_start_date": "",
+            "query_end_date": "",
+        }
 
-                    # 检查 limit 字段
-                    limit = model_data.get("limit", {})
-                    if not isinstance(limit, dict):
-                        issues.append(
-                            {
-                                "level": "warning",
-                                "path": f"{model_path}.limit",
-                                "message": f"Model '{model_id}' 的 limit 应该是对象",
-                            }
-                        )
-                    elif limit:
-                        context = limit.get("context")
-                        output = limit.get("output")
-                        if context is not None and not isinstance(context, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.context",
-                                    "message": f"Model '{model_id}' 的 context 应该是整数",
-                                }
-                            )
-                        if output is not None and not isinstance(output, int):
-                            issues.append(
-                                {
-                                    "level": "warning",
-                                    "path": f"{model_path}.limit.output",
-                                    "message": f"Model '{model_id}' 的 output 应该是整数",
-                                }
-                            )
+    def query_openai_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
+        """查询 OpenAI API 用量（订阅信息与使用情况并发请求）"""
+        import urllib.error
+        from datetime import timedelta
 
-        # 验证 mcp 部分
-        mcp = config.get("mcp", {})
-        if mcp and not isinstance(mcp, dict):
-            issues.append(
-                {"level": "error", "path": "mcp", "message": "mcp 必须是对象类型"}
-            )
-        elif isinstance(mcp, dict):
-            for mcp_name, mcp_data in mcp.items():
-                mcp_path = f"mcp.{mcp_name}"
-                if not isinstance(mcp_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": mcp_path,
-                            "message": f"MCP '{mcp_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
+        # 智能处理 /v1 路径 - 如果已经包含 /v1，就不再添加
+        if base_url.endswith("/v1"):
+            api_base = base_url
+        else:
+            api_base = f"{base_url}/v1"
 
-                mcp_type = mcp_data.get("type")
-                if mcp_type == "local" and "command" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.command",
-                            "message": f"Local MCP '{mcp_name}' 缺少 command 字段",
-                        }
-                    )
-                elif mcp_type == "remote" and "url" not in mcp_data:
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{mcp_path}.url",
-                            "message": f"Remote MCP '{mcp_name}' 缺少 url 字段",
-                        }
-                    )
+        # 使用情况查询最近100天
+        now = datetime.now()
+        start = now - timedelta(days=100)
+        start_date = start.strftime("%Y-%m-%d")
+        end_date = now.strftime("%Y-%m-%d")
 
-        # 验证 agent 部分
-        agent = config.get("agent", {})
-        if agent and not isinstance(agent, dict):
-            issues.append(
-                {"level": "error", "path": "agent", "message": "agent 必须是对象类型"}
-            )
+        subscription_url = f"{api_base}/dashboard/billing/subscription"
+        usage_url = f"{api_base}/dashboard/billing/usage?start_date={start_date}&end_date={end_date}"
 
-        return issues
+        executor = ThreadPoolExecutor(max_workers=2)
+        subscription_future = executor.submit(
+            self._request_json, subscription_url, api_key
+        )
+        usage_future = executor.submit(self._request_json, usage_url, api_key)
+        executor.shutdown(wait=False)
 
-    @staticmethod
-    def validate_ohmyopencode_config(config: Dict) -> List[Dict]:
-        """
-        验证 Oh My OpenCode 配置文件
-        返回问题列表: [{"level": "error/warning", "path": "agents.xxx", "message": "..."}]
-        """
-        issues = []
-        if not config:
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置文件为空或无法解析"}
-            )
-            return issues
-        if not isinstance(config, dict):
-            issues.append(
-                {"level": "error", "path": "root", "message": "配置根必须是对象类型"}
-            )
-            return issues
+        # 1. 订阅信息
+        try:
+            subscription_data = subscription_future.result()
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode("utf-8") if e.fp else ""
+            raise Exception(f"订阅信息查询失败: {e.code} - {error_body}")
+        except Exception as e:
+            raise Exception(f"请求订阅信息失败: {str(e)}")
 
-        agents = config.get("agents", {})
-        if not agents:
-            issues.append(
-                {"level": "warning", "path": "agents", "message": "未配置任何 Agent"}
-            )
-        if agents and not isinstance(agents, dict):
-            issues.append(
-                {"level": "error", "path": "agents", "message": "agents 必须是对象类型"}
-            )
-            return issues
+        total_balance = subscription_data.get("hard_limit_usd", 0.0)
+        access_until = subscription_data.get("access_until", 0)
+        is_unlimited = total_balance >= 100000000.0
 
-        if isinstance(agents, dict):
-            for agent_name, agent_data in agents.items():
-                agent_path = f"agents.{agent_name}"
-                if ConfigValidator._is_blank(agent_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": "Agent 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(agent_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": agent_path,
-                            "message": f"Agent '{agent_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_AGENT_REQUIRED_FIELDS:
-                    if field not in agent_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(agent_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{agent_path}.{field}",
-                                "message": f"Agent '{agent_name}' 的 '{field}' 为空",
-                            }
-                        )
-                if "description" in agent_data and ConfigValidator._is_blank(
-                    agent_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{agent_path}.description",
-                            "message": f"Agent '{agent_name}' 的 description 为空",
-                        }
-                    )
+        # 2. 使用情况
+        try:
+            usage_data = usage_future.result()
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode("utf-8") if e.fp else ""
+            raise Exception(f"使用情况查询失败: {e.code} - {error_body}")
+        except Exception as e:
+            raise Exception(f"请求使用情况失败: {str(e)}")
 
-        categories = config.get("categories", {})
-        if not categories:
-            issues.append(
-                {
-                    "level": "warning",
-                    "path": "categories",
-                    "message": "未配置任何 Category",
-                }
-            )
-        if categories and not isinstance(categories, dict):
-            issues.append(
-                {
-                    "level": "error",
-                    "path": "categories",
-                    "message": "categories 必须是对象类型",
-                }
-            )
-            return issues
+        # total_usage 是以美分为单位，需要除以100转换为美元
+        total_usage_cents = usage_data.get("total_usage", 0.0)
+        used_balance = total_usage_cents / 100.0
 
-        if isinstance(categories, dict):
-            for category_name, category_data in categories.items():
-                category_path = f"categories.{category_name}"
-                if ConfigValidator._is_blank(category_name):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": "Category 名称为空",
-                        }
-                    )
-                    continue
-                if not isinstance(category_data, dict):
-                    issues.append(
-                        {
-                            "level": "error",
-                            "path": category_path,
-                            "message": f"Category '{category_name}' 的值必须是对象",
-                        }
-                    )
-                    continue
-                for field in ConfigValidator.OHMY_CATEGORY_REQUIRED_FIELDS:
-                    if field not in category_data:
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 缺少必需字段 '{field}'",
-                            }
-                        )
-                    elif ConfigValidator._is_blank(category_data.get(field)):
-                        issues.append(
-                            {
-                                "level": "error",
-                                "path": f"{category_path}.{field}",
-                                "message": f"Category '{category_name}' 的 '{field}' 为空",
-                            }
-                        )
+        # 计算剩余额度
+        remaining_balance = (
+            float("inf") if is_unlimited else (total_balance - used_balance)
+        )
+
+        return {
+            "api_type": self.API_OPENAI,
+            "token_name": "",
+            "total_balance": total_balance,
+            "used_balance": used_balance,
+            "remaining_balance": remaining_balance,
+            "is_unlimited": is_unlimited,
+            "access_until": access_until,
+            "query_start_date": start_date,
+            "query_end_date": end_date,
+        }
 
-                temperature = category_data.get("temperature")
-                if temperature is not None and not isinstance(
-                    temperature, (int, float)
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.temperature",
-                            "message": f"Category '{category_name}' 的 temperature 应该是数字",
-                        }
-                    )
-                if "description" in category_data and ConfigValidator._is_blank(
-                    category_data.get("description")
-                ):
-                    issues.append(
-                        {
-                            "level": "warning",
-                            "path": f"{category_path}.description",
-                            "message": f"Category '{category_name}' 的 description 为空",
-                        }
-                    )
+    # ---------- 批量查询 ----------
+    @classmethod
+    def collect_targets(
+        cls, opencode_config: Dict[str, Any], auth_manager: "AuthManager"
+    ) -> List[BalanceTarget]:
+        """收集所有可查询余额的 Provider（需同时具备 baseURL 与 API Key）"""
+        targets: List[BalanceTarget] = []
+        providers = (opencode_config or {}).get("provider", {})
+        try:
+            auth_data = auth_manager.read_auth()
+        except Exception:
+            auth_data = {}
+
+        for name, provider in providers.items():
+            if not isinstance(provider, dict):
+                continue
+            options = provider.get("options", {}) or {}
+            base_url = _safe_base_url(options.get("baseURL", ""))
+            api_key = _resolve_env_value(options.get("apiKey", ""))
+            if not api_key and isinstance(auth_data.get(name), dict):
+                api_key = _resolve_env_value(auth_data[name].get("apiKey", ""))
+            if not base_url:
+                base_url = cls.default_base_url(name)
+            if base_url and api_key:
+                targets.append(BalanceTarget(name, base_url, api_key))
 
-        return issues
+        # 仅在 auth.json 中配置的原生 Provider
+        for name, auth in auth_data.items():
+            if name in providers or not isinstance(auth, dict):
+                continue
+            api_key = _resolve_env_value(auth.get("apiKey", ""))
+            base_url = cls.default_base_url(name)
+            if base_url and api_key:
+                targets.append(BalanceTarget(name, base_url, api_key))
+        return targets
 
     @staticmethod
-    def fix_provider_structure(config: Dict) -> Tuple[Dict, List[str]]:
-        """
-        修复 Provider 结构问题
-        返回: (修复后的配置, 修复日志列表)
-        """
-        fixes = []
-        if not config:
-            return config, fixes
+    def default_base_url(provider_id: str) -> str:
+        """原生 Provider 的默认主机地址（余额接口路径自行拼接，去掉 /v1 后缀）"""
+        base_url = NATIVE_DEFAULT_BASE_URLS.get(provider_id, "")
+        if base_url.endswith("/v1"):
+            base_url = base_url[: -len("/v1")]
+        return base_url
 
-        providers = config.get("provider", {})
-        if not isinstance(providers, dict):
-            return config, fixes
+    def query_all_async(
+        self, targets: List[BalanceTarget], use_cache: bool = True
+    ) -> None:
+        """并发查询所有目标，每个结果完成后立即发出信号"""
+        if not targets:
+            self.batch_finished.emit()
+            return
+        remaining = [len(targets)]
+        with self._lock:
+            self._active_batches += 1
 
-        fixed_providers = {}
-        for provider_name, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                fixes.append(f"跳过无效 Provider '{provider_name}' (值不是对象)")
-                continue
+        def run(target: BalanceTarget) -> None:
+            try:
+                usage_data = self.query(
+                    target.base_url, target.api_key, use_cache, target.provider_name
+                )
+                self.balance_ready.emit(target.provider_name, usage_data)
+            except Exception as e:
+                self.balance_failed.emit(target.provider_name, str(e))
+            finally:
+                with self._lock:
+                    remaining[0] -= 1
+                    done = remaining[0] == 0
+                    if done:
+                        self._active_batches -= 1
+                if done:
+                    self.batch_finished.emit()
 
-            # 确保必需字段存在
-            fixed_provider = dict(provider_data)
+        for target in targets:
+            self._executor.submit(run, target)
 
-            # 确保 npm 字段存在
-            if "npm" not in fixed_provider:
-                fixed_provider["npm"] = "@ai-sdk/openai"
-                fixes.append(f"Provider '{provider_name}': 添加默认 npm 字段")
 
-            # 确保 options 字段存在且为对象
-            if "options" not in fixed_provider or not isinstance(
-                fixed_provider.get("options"), dict
-            ):
-                fixed_provider["options"] = fixed_provider.get("options", {})
-                if not isinstance(fixed_provider["options"], dict):
-                    fixed_provider["options"] = {}
-                fixes.append(f"Provider '{provider_name}': 修复 options 字段")
-
-            # 确保 options 中有 baseURL 和 apiKey
-            if "baseURL" not in fixed_provider["options"]:
-                fixed_provider["options"]["baseURL"] = ""
-                fixes.append(f"Provider '{provider_name}': 添加空 baseURL")
-            if "apiKey" not in fixed_provider["options"]:
-                fixed_provider["options"]["apiKey"] = ""
-                fixes.append(f"Provider '{provider_name}': 添加空 apiKey")
-
-            # 确保 models 字段存在且为对象
-            if "models" not in fixed_provider:
-                fixed_provider["models"] = {}
-                fixes.append(f"Provider '{provider_name}': 添加空 models 字段")
-            elif not isinstance(fixed_provider.get("models"), dict):
-                fixed_provider["models"] = {}
-                fixes.append(f"Provider '{provider_name}': 修复 models 字段为对象")
-
-            # 规范化字段顺序: npm, name, options, models
-            ordered_provider = {}
-            if "npm" in fixed_provider:
-                ordered_provider["npm"] = fixed_provider["npm"]
-            if "name" in fixed_provider:
-                ordered_provider["name"] = fixed_provider["name"]
-            if "options" in fixed_provider:
-                ordered_provider["options"] = fixed_provider["options"]
-            if "models" in fixed_provider:
-                ordered_provider["models"] = fixed_provider["models"]
-            # 保留其他字段
-            for k, v in fixed_provider.items():
-                if k not in ordered_provider:
-                    ordered_provider[k] = v
-
-            fixed_providers[provider_name] = ordered_provider
-
-        config["provider"] = fixed_providers
-        return config, fixes
+@dataclass
+class NativeTestTarget:
+    """原生 Provider 连接测试目标"""
 
-    @staticmethod
-    def get_issues_summary(issues: List[Dict]) -> str:
-        """生成问题摘要"""
-        errors = [i for i in issues if i["level"] == "error"]
-        warnings = [i for i in issues if i["level"] == "warning"]
+    provider_id: str
+    test_url: str
+    api_key: str
 
-        lines = []
-        if errors:
-            lines.append(f"❌ {len(errors)} 个错误:")
-            for e in errors[:5]:  # 最多显示5个
-                lines.append(f"  • {e['message']}")
-            if len(errors) > 5:
-                lines.append(f"  ... 还有 {len(errors) - 5} 个错误")
 
-        if warnings:
-            lines.append(f"⚠️ {len(warnings)} 个警告:")
-            for w in warnings[:5]:
-                lines.append(f"  • {w['message']}")
-            if len(warnings) > 5:
-                lines.append(f"  ... 还有 {len(warnings) - 5} 个警告")
+@dataclass
+class NativeHealthResult:
+    """原生 Provider 连接测试结果"""
 
-        return "\n".join(lines) if lines else "✅ 配置格式正确"
+    provider_id: str
+    ok: bool
+    latency_ms: Optional[int]
+    message: str
+    checked_at: float
 
 
-class ModelRegistry:
-    """模型注册表 - 管理所有已配置的模型"""
+class NativeProviderHealthService(QObject):
+    """原生 Provider 连接测试服务
 
-    def __init__(
-        self,
-        opencode_config: Optional[Dict],
-        auth_manager: Optional[AuthManager] = None,
-    ):
-        self.config = opencode_config or {}
-        self.auth_manager = auth_manager or AuthManager()
-        self.models: Dict[str, bool] = {}
-        self.native_providers: Dict[str, bool] = {}  # 已配置的原生 Provider
-        self.refresh()
-
-    def refresh(self):
-        self.models = {}
-        self.native_providers = {}
-
-        # 获取自定义 Provider 的模型
-        providers = self.config.get("provider", {})
-        for provider_name, provider_data in providers.items():
-            if not isinstance(provider_data, dict):
-                continue
-            models = provider_data.get("models", {})
-            for model_id in models.keys():
-                full_ref = f"{provider_name}/{model_id}"
-                self.models[full_ref] = True
+    - 在线程池中并发测试各 Provider 的 test_endpoint，结果逐个通过信号返回
+    - 保留每个 Provider 最近一次的测试结果，供表格直接展示健康状态
+    - 同一 Provider 正在测试时不会重复发起请求
+    """
 
-        # 获取已配置的原生 Provider
-        try:
-            auth_data = self.auth_manager.read_auth()
-            for provider_id in auth_data:
-                if auth_data[provider_id]:  # 有认证数据
-                    self.native_providers[provider_id] = True
-        except Exception:
-            pass
+    result_ready = pyqtSignal(str, object)  # provider_id, NativeHealthResult
 
-    def get_all_models(self) -> List[str]:
-        return list(self.models.keys())
+    REQUEST_TIMEOUT_SEC = 10
+    MAX_WORKERS = 8
+    RESULT_TTL_SEC = 600  # 超过该时间的结果视为过期，自动测试时重新检测
 
-    def get_configured_native_providers(self) -> List[str]:
-        """获取已配置的原生 Provider ID 列表"""
-        return list(self.native_providers.keys())
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._results: Dict[str, NativeHealthResult] = {}
+        self._inflight: set = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="native-test"
+        )
 
-    def is_native_provider_configured(self, provider_id: str) -> bool:
-        """检查原生 Provider 是否已配置"""
-        return provider_id in self.native_providers
+    @classmethod
+    def resolve_target(
+        cls,
+        provider: NativeProviderConfig,
+        opencode_config: Dict[str, Any],
+        auth_data: Dict[str, Any],
+        env_detector: "EnvVarDetector",
+    ) -> Tuple[Optional[NativeTestTarget], str]:
+        """解析测试地址与 API Key，失败时返回 (None, 错误信息)
+
+        API Key 优先从 auth.json 读取，其次从环境变量；
+        baseURL 依次使用 opencode.json 配置、选项默认值、内置默认地址。
+        """
+        if not provider.test_endpoint:
+            return None, tr("native_provider.test_not_supported")
 
+        api_key = ""
+        provider_auth = auth_data.get(provider.id)
+        if isinstance(provider_auth, dict):
+            api_key = _resolve_env_value(provider_auth.get("apiKey", ""))
+        if not api_key:
+            env_vars = env_detector.detect_env_vars(provider.id)
+            if env_vars:
+                api_key = list(env_vars.values())[0]
+        if not api_key:
+            return None, tr("provider.api_key_not_found")
 
-class ImportService:
-    """外部配置导入服务 - 支持Claude Code、Codex、Gemini、cc-switch等配置格式"""
+        provider_config = (opencode_config or {}).get("provider", {}).get(provider.id)
+        options = (
+            provider_config.get("options", {})
+            if isinstance(provider_config, dict)
+            else {}
+        )
+        base_url = options.get("baseURL", "")
+        if not base_url:
+            base_url = next(
+                (
+                    field.default
+                    for field in provider.option_fields
+                    if field.name == "baseURL" and field.default
+                ),
+                "",
+            )
+        if not base_url:
+            base_url = NATIVE_DEFAULT_BASE_URLS.get(provider.id, "")
+        if not base_url:
+            return None, tr("provider.cannot_determine_api_address")
 
-    @staticmethod
-    def _first_existing_path(paths: List[Path]) -> Path:
-        for path in paths:
-            if path.exists():
-                return path
-        return paths[0]
+        test_url = base_url.rstrip("/") + provider.test_endpoint
+        return NativeTestTarget(provider.id, test_url, api_key), ""
 
-    @staticmethod
-    def _parse_toml_value(value: str):
-        lower_value = value.lower()
-        if lower_value in {"true", "false"}:
-            return lower_value == "true"
-        if (value.startswith('"') and value.endswith('"')) or (
-            value.startswith("'") and value.endswith("'")
-        ):
-            return value[1:-1]
+    @classmethod
+    def collect_targets(
+        cls,
+        opencode_config: Dict[str, Any],
+        auth_manager: "AuthManager",
+        env_detector: "EnvVarDetector",
+    ) -> List[NativeTestTarget]:
+        """收集所有已配置且支持连接测试的原生 Provider"""
         try:
-            if "." in value:
-                return float(value)
-            return int(value)
-        except ValueError:
-            return value
+            auth_data = auth_manager.read_auth()
+        except Exception:
+            auth_data = {}
+        targets = []
+        for provider in NATIVE_PROVIDERS:
+            target, _ = cls.resolve_target(
+                provider, opencode_config, auth_data, env_detector
+            )
+            if target:
+                targets.append(target)
+        return targets
 
-    def _parse_toml_string(self, content: str) -> Dict[str, Any]:
-        result: Dict[str, Any] = {}
-        current_section: Dict[str, Any] = result
-        for line in content.split("\n"):
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("[") and line.endswith("]"):
-                section = line[1:-1]
-                current_section = result
-                for part in section.split("."):
-                    current_section = current_section.setdefault(part, {})
-                continue
-            if "=" in line:
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = self._parse_toml_value(value.strip())
-                current_section[key] = value
-        return result
+    def last_result(self, provider_id: str) -> Optional[NativeHealthResult]:
+        with self._lock:
+            return self._results.get(provider_id)
 
-    @staticmethod
-    def _normalize_base_url(base_url: str, require_v1: bool) -> str:
-        if not base_url:
-            return ""
-        trimmed = base_url.rstrip("/")
-        if require_v1 and not trimmed.endswith("/v1"):
-            trimmed = f"{trimmed}/v1"
-        return trimmed
+    def is_testing(self, provider_id: str) -> bool:
+        with self._lock:
+            return provider_id in self._inflight
 
-    @staticmethod
-    def _sanitize_provider_key(name: str) -> str:
-        cleaned = re.sub(r"[^a-z0-9-]+", "-", name.strip().lower())
-        return cleaned.strip("-") or "provider"
+    def is_stale(self, provider_id: str) -> bool:
+        result = self.last_result(provider_id)
+        return result is None or time.time() - result.checked_at > self.RESULT_TTL_SEC
 
-    @staticmethod
-    def _unique_provider_key(base: str, used_keys: set) -> str:
-        candidate = base
-        index = 2
-        while candidate in used_keys:
-            candidate = f"{base}-{index}"
-            index += 1
-        used_keys.add(candidate)
-        return candidate
-
-    def scan_external_configs(self) -> Dict:
-        """扫描所有支持的外部配置文件"""
-        results = {}
-        test_root = Path(__file__).parent / "test"
-
-        # Claude Code配置
-        claude_settings = ConfigPaths.get_import_path("claude")
-        if claude_settings is None:
-            claude_settings = ConfigPaths.get_claude_settings()
-            if not claude_settings.exists() and test_root.exists():
-                test_path = test_root / ".claude" / "settings.json"
-                if test_path.exists():
-                    claude_settings = test_path
-        results["Claude Code Settings"] = {
-            "path": str(claude_settings),
-            "exists": claude_settings.exists(),
-            "data": ConfigManager.load_json(claude_settings)
-            if claude_settings.exists()
-            else None,
-            "type": "claude",
-        }
+    def test(self, target: NativeTestTarget) -> NativeHealthResult:
+        """同步测试单个 Provider（在后台线程中调用）"""
+        import urllib.error
+        import urllib.request
 
-        claude_providers = ConfigPaths.get_import_path("claude_providers")
-        if claude_providers is None:
-            claude_providers = ConfigPaths.get_claude_providers()
-            if not claude_providers.exists() and test_root.exists():
-                test_path = test_root / ".claude" / "providers.json"
-                if test_path.exists():
-                    claude_providers = test_path
-        results["Claude Providers"] = {
-            "path": str(claude_providers),
-            "exists": claude_providers.exists(),
-            "data": ConfigManager.load_json(claude_providers)
-            if claude_providers.exists()
-            else None,
-            "type": "claude_providers",
-        }
+        start_time = time.time()
+        try:
+            req = urllib.request.Request(target.test_url)
+            req.add_header("Authorization", f"Bearer {target.api_key}")
+            req.add_header("x-api-key", target.api_key)
+            with urllib.request.urlopen(req, timeout=self.REQUEST_TIMEOUT_SEC) as resp:
+                ok, message = True, f"HTTP {resp.status}"
+        except urllib.error.HTTPError as e:
+            ok, message = False, f"HTTP {e.code}: {e.reason}"
+        except Exception as e:
+            ok, message = False, str(e)
+        latency_ms = int((time.time() - start_time) * 1000)
+        return NativeHealthResult(
+            target.provider_id, ok, latency_ms if ok else None, message, time.time()
+        )
 
-        # Codex配置 (TOML格式)
-        codex_config = ConfigPaths.get_import_path("codex")
-        if codex_config is None:
-            codex_config = Path.home() / ".codex" / "config.toml"
-            if not codex_config.exists() and test_root.exists():
-                test_path = test_root / ".codex" / "config.toml"
-                if test_path.exists():
-                    codex_config = test_path
-        results["Codex Config"] = {
-            "path": str(codex_config),
-            "exists": codex_config.exists(),
-            "data": self._parse_toml(codex_config) if codex_config.exists() else None,
-            "type": "codex",
-        }
+    def test_async(self, targets: List[NativeTestTarget]) -> List[str]:
+        """并发测试多个 Provider，返回实际发起测试的 provider_id 列表"""
+        with self._lock:
+            targets = [t for t in targets if t.provider_id not in self._inflight]
+            self._inflight.update(t.provider_id for t in targets)
+        if not targets:
+            return []
 
-        # Gemini配置
-        gemini_dir = Path.home() / ".gemini"
-        gemini_config = ConfigPaths.get_import_path("gemini")
-        if gemini_config is None:
-            gemini_config = self._first_existing_path(
-                [gemini_dir / "config.json", gemini_dir / "settings.json"]
-            )
-            if not gemini_config.exists() and test_root.exists():
-                test_path = test_root / ".gemini" / "settings.json"
-                if test_path.exists():
-                    gemini_config = test_path
-        results["Gemini Config"] = {
-            "path": str(gemini_config),
-            "exists": gemini_config.exists(),
-            "data": ConfigManager.load_json(gemini_config)
-            if gemini_config.exists()
-            else None,
-            "type": "gemini",
-        }
+        def run(target: NativeTestTarget) -> None:
+            result = self.test(target)
+            with self._lock:
+                self._results[target.provider_id] = result
+                self._inflight.discard(target.provider_id)
+            self.result_ready.emit(target.provider_id, result)
 
-        # cc-switch配置
-        ccswitch_dir = Path.home() / ".cc-switch"
-        ccswitch_config = ConfigPaths.get_import_path("ccswitch")
-        if ccswitch_config is None:
-            ccswitch_config = self._first_existing_path(
-                [
-                    ccswitch_dir / "config.json.migrated",
-                    ccswitch_dir / "config.json.bak",
-                    ccswitch_dir / "config.json",
-                ]
-            )
-            if not ccswitch_config.exists() and test_root.exists():
-                test_path = test_root / ".cc-switch" / "config.json.migrated"
-                if test_path.exists():
-                    ccswitch_config = test_path
-        results["CC-Switch Config"] = {
-            "path": str(ccswitch_config),
-            "exists": ccswitch_config.exists(),
-            "data": ConfigManager.load_json(ccswitch_config)
-            if ccswitch_config.exists()
-            else None,
-            "type": "ccswitch",
-        }
+        for target in targets:
+            self._executor.submit(run, target)
+        return [t.provider_id for t in targets]
 
-        return results
 
-    def _parse_toml(self, path: Path) -> Optional[Dict]:
-        """简易TOML解析器"""
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            return self._parse_toml_string(content)
-        except Exception as e:
-            print(f"TOML parse failed: {e}")
-            return None
+class ConfigValidationService(QObject):
+    """配置验证服务
 
-    @staticmethod
-    def _extract_from_env(env: Dict[str, Any]) -> Dict[str, str]:
-        if not isinstance(env, dict):
-            return {}
-        api_key = env.get("ANTHROPIC_AUTH_TOKEN") or env.get("ANTHROPIC_API_TOKEN")
-        base_url = env.get("ANTHROPIC_BASE_URL") or ""
-        default_model = env.get("ANTHROPIC_MODEL")
-        return {
-            "api_key": api_key or "",
-            "base_url": base_url or "",
-            "default_model": default_model or "",
-        }
+    - 在后台线程中验证 OpenCode / Oh My OpenCode 配置，大配置不再阻塞界面
+    - 按 Provider/MCP/Agent/Category 子树汇报进度，进度与结果通过信号返回
+    - 同一标签的新请求会使旧请求失效，只发出最新一次的结果
+    - 调用方传入的配置必须是不再被修改的快照（MainWindow.config_snapshot），
+      后台线程不读取界面线程正在修改的实时配置
+    """
 
-    @staticmethod
-    def _extract_provider_items(source_data: Any) -> List[Dict[str, Any]]:
-        if isinstance(source_data, list):
-            return [item for item in source_data if isinstance(item, dict)]
-        if isinstance(source_data, dict):
-            if "providers" in source_data and isinstance(
-                source_data["providers"], dict
-            ):
-                items = []
-                for item in source_data["providers"].values():
-                    if isinstance(item, dict):
-                        items.append(item)
-                return items
-            return [source_data]
-        return []
+    progress = pyqtSignal(str, int, int)  # tag, 已完成子树数, 子树总数
+    finished = pyqtSignal(str, object)  # tag, {"opencode": [...], "ohmy": [...]}
+
+    PROGRESS_STEPS = 100  # 每次验证最多发出的进度信号数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
 
     @staticmethod
-    def _collect_model_ids(*values: Any) -> List[str]:
-        model_ids: List[str] = []
+    def _subtree_count(config, keys) -> int:
+        if not isinstance(config, dict):
+            return 0
+        return sum(len(v) for v in map(config.get, keys) if isinstance(v, dict))
 
-        def add_value(value: Any) -> None:
-            if value is None:
-                return
-            if isinstance(value, str):
-                cleaned = value.strip()
-                if cleaned:
-                    model_ids.append(cleaned)
-                return
-            if isinstance(value, list):
-                for item in value:
-                    add_value(item)
-                return
-            if isinstance(value, dict):
-                for key, item in value.items():
-                    key_upper = str(key).upper()
-                    if "MODEL" in key_upper:
-                        add_value(item)
-                for key in (
-                    "model",
-                    "default_model",
-                    "defaultModel",
-                    "model_id",
-                    "modelId",
-                    "id",
-                    "name",
-                ):
-                    if key in value:
-                        add_value(value.get(key))
-                if "models" in value:
-                    add_value(value.get("models"))
-
-        for value in values:
-            add_value(value)
-
-        seen = set()
-        deduped: List[str] = []
-        for item in model_ids:
-            lowered = item.lower()
-            if lowered in {"opus", "sonnet", "haiku"}:
-                continue
-            if re.fullmatch(
-                r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", lowered
+    def _is_current(self, tag: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(tag) == generation
+
+    def validate_async(
+        self, tag: str, opencode_config: Dict, ohmy_config: Optional[Dict] = None
+    ) -> None:
+        """后台验证配置快照，ohmy_config 为 None 时只验证 OpenCode 配置"""
+        with self._lock:
+            generation = self._generations.get(tag, 0) + 1
+            self._generations[tag] = generation
+
+        oc_total = self._subtree_count(opencode_config, ("provider", "mcp"))
+        total = oc_total
+        if ohmy_config is not None:
+            total += self._subtree_count(ohmy_config, ("agents", "categories"))
+        step = max(1, total // self.PROGRESS_STEPS)
+
+        def report(offset: int, done: int, _total: int) -> None:
+            done += offset
+            if (done % step == 0 or done == total) and self._is_current(
+                tag, generation
             ):
-                continue
-            if item not in seen:
-                seen.add(item)
-                deduped.append(item)
-        return deduped
-
-    def convert_to_opencode(
-        self, source_type: str, source_data: Dict
-    ) -> Optional[Dict]:
-        """将外部配置转换为OpenCode格式"""
-        if not source_data:
-            return None
+                self.progress.emit(tag, done, total)
 
-        result = {"provider": {}, "permission": {}}
-        used_keys: set = set()
-
-        def add_provider(
-            key: str,
-            display_name: str,
-            npm: str,
-            api_key: str,
-            base_url: str,
-            require_v1: bool = False,
-            model_ids: Optional[List[str]] = None,
-        ) -> None:
-            provider_key = self._unique_provider_key(key, used_keys)
-            normalized_url = self._normalize_base_url(base_url, require_v1)
-            models: Dict[str, Any] = {}
-            if model_ids:
-                for model_id in model_ids:
-                    if model_id and isinstance(model_id, str):
-                        models[model_id] = {"name": model_id}
-            result["provider"][provider_key] = {
-                "npm": npm,
-                "name": display_name,
-                "options": {
-                    "apiKey": api_key or "",
-                    "baseURL": normalized_url,
-                },
-                "models": models,
+        def validate() -> Dict[str, Optional[List[Dict]]]:
+            result = {
+                "opencode": ConfigValidator.validate_opencode_config(
+                    opencode_config, progress=lambda d, t: report(0, d, t)
+                ),
+                "ohmy": None,
             }
-
-        if source_type == "claude":
-            env = source_data.get("env", source_data)
-            extracted = self._extract_from_env(env)
-            model_ids = self._collect_model_ids(
-                extracted.get("default_model"),
-                source_data.get("model"),
-                source_data.get("default_model"),
-                source_data.get("defaultModel"),
-            )
-            if extracted["api_key"] or extracted["base_url"] or model_ids:
-                add_provider(
-                    "anthropic",
-                    "Anthropic (Claude)",
-                    "@ai-sdk/anthropic",
-                    extracted["api_key"],
-                    extracted["base_url"],
-                    require_v1=False,
-                    model_ids=model_ids or None,
-                )
-            if "permissions" in source_data:
-                for tool, perm in source_data.get("permissions", {}).items():
-                    result["permission"][tool] = perm
-
-        elif source_type == "claude_providers":
-            for provider_data in self._extract_provider_items(source_data):
-                display_name = provider_data.get("name") or provider_data.get("id")
-                display_name = display_name or "Anthropic (Claude)"
-                provider_key = self._sanitize_provider_key(display_name)
-                api_key = provider_data.get("api_key") or provider_data.get(
-                    "auth_token"
-                )
-                base_url = provider_data.get("base_url") or ""
-                model_ids = self._collect_model_ids(
-                    provider_data.get("models"),
-                    provider_data.get("model"),
-                    provider_data.get("default_model"),
-                    provider_data.get("defaultModel"),
-                )
-                add_provider(
-                    provider_key,
-                    display_name,
-                    "@ai-sdk/anthropic",
-                    api_key or "",
-                    base_url,
-                    require_v1=False,
-                    model_ids=model_ids or None,
+            if ohmy_config is not None:
+                result["ohmy"] = ConfigValidator.validate_ohmyopencode_config(
+                    ohmy_config, progress=lambda d, t: report(oc_total, d, t)
                 )
+            return result
 
-        elif source_type == "codex":
-            model_providers = source_data.get("model_providers", {})
-            provider_name = source_data.get("model_provider")
-            provider_config = None
-            if provider_name and isinstance(model_providers, dict):
-                provider_config = model_providers.get(provider_name)
-            if provider_config is None and isinstance(model_providers, dict):
-                provider_name = next(iter(model_providers.keys()), None)
-                provider_config = (
-                    model_providers.get(provider_name) if provider_name else None
-                )
-            model_ids = self._collect_model_ids(
-                source_data.get("model"),
-                source_data.get("default_model"),
-                source_data.get("defaultModel"),
-                provider_config,
-            )
-            if isinstance(provider_config, dict):
-                display_name = provider_config.get("name") or provider_name or "Codex"
-                provider_key = self._sanitize_provider_key(
-                    provider_name or display_name
-                )
-                base_url = provider_config.get("base_url", "")
-                add_provider(
-                    provider_key,
-                    display_name,
-                    "@ai-sdk/openai",
-                    "",
-                    base_url,
-                    require_v1=True,
-                    model_ids=model_ids or None,
-                )
-            elif model_ids:
-                add_provider(
-                    "codex",
-                    "Codex",
-                    "@ai-sdk/openai",
-                    "",
-                    "",
-                    require_v1=True,
-                    model_ids=model_ids,
-                )
+        def run() -> None:
+            try:
+                result = validate()
+            except Exception as e:
+                # 验证本身出错时也要发出结果，否则界面会一直停留在“验证中”
+                result = {
+                    "opencode": [
+                        {
+                            "level": "error",
+                            "path": "",
+                            "pointer": "",
+                            "message": f"验证过程出错: {e}",
+                        }
+                    ],
+                    "ohmy": None,
+                }
+            if self._is_current(tag, generation):
+                self.finished.emit(tag, result)
 
-        elif source_type == "gemini":
-            env = source_data.get("env", source_data)
-            api_key = ""
-            if isinstance(env, dict):
-                api_key = env.get("GOOGLE_API_KEY") or env.get("GEMINI_API_KEY")
-            api_key = api_key or source_data.get("apiKey") or ""
-            base_url = source_data.get("baseURL") or source_data.get("base_url") or ""
-            if api_key or base_url:
-                add_provider(
-                    "google",
-                    "Google (Gemini)",
-                    "@ai-sdk/google",
-                    api_key,
-                    base_url,
-                    require_v1=False,
-                )
+        threading.Thread(target=run, daemon=True, name=f"validate-{tag}").start()
 
-        elif source_type == "ccswitch":
-            claude = source_data.get("claude", {})
-            claude_providers = claude.get("providers", {})
-            if isinstance(claude_providers, dict):
-                for provider_data in claude_providers.values():
-                    if not isinstance(provider_data, dict):
-                        continue
-                    settings = provider_data.get("settingsConfig", {})
-                    extracted = self._extract_from_env(settings.get("env", {}))
-                    model_ids = self._collect_model_ids(
-                        settings.get("env", {}),
-                        settings.get("config", {}),
-                        provider_data,
-                        claude,
-                    )
-                    if not (extracted["api_key"] or extracted["base_url"] or model_ids):
-                        continue
-                    display_name = provider_data.get("name", "Anthropic (Claude)")
-                    provider_key = self._sanitize_provider_key(display_name)
-                    add_provider(
-                        provider_key,
-                        display_name,
-                        "@ai-sdk/anthropic",
-                        extracted["api_key"],
-                        extracted["base_url"],
-                        require_v1=False,
-                        model_ids=model_ids or None,
-                    )
 
-            codex = source_data.get("codex", {})
-            codex_providers = codex.get("providers", {})
-            if isinstance(codex_providers, dict):
-                for provider_data in codex_providers.values():
-                    if not isinstance(provider_data, dict):
-                        continue
-                    settings = provider_data.get("settingsConfig", {})
-                    auth = settings.get("auth", {})
-                    config = settings.get("config", {})
-                    if isinstance(config, str):
-                        config = self._parse_toml_string(config)
-                    api_key = ""
-                    if isinstance(auth, dict):
-                        api_key = auth.get("OPENAI_API_KEY") or ""
-                    base_url = ""
-                    if isinstance(config, dict):
-                        base_url = config.get("base_url", "")
-                    model_ids = self._collect_model_ids(
-                        auth,
-                        config,
-                        settings.get("env", {}),
-                        provider_data,
-                        codex,
-                    )
-                    if not (api_key or base_url or model_ids):
-                        continue
-                    display_name = provider_data.get("name", "Codex")
-                    provider_key = self._sanitize_provider_key(display_name)
-                    require_v1 = True
-                    if "/v1/" in base_url or base_url.rstrip("/").endswith("/v1"):
-                        require_v1 = False
-                    add_provider(
-                        provider_key,
-                        display_name,
-                        "@ai-sdk/openai",
-                        api_key,
-                        base_url,
-                        require_v1=require_v1,
-                        model_ids=model_ids or None,
-                    )
+class ConfigChangeTracker(QObject):
+    """配置变更跟踪器 - 按路径分发配置变更通知，并记录可撤销的编辑历史
 
-        return result
+    - 提交时与上次提交的快照比较，得到发生变化的路径，例如
+      ("opencode", "provider", "foo", "models")、("ohmy", "agents", "sisyphus", "model")
+    - 页面只订阅自己展示的部分（路径前缀），只在该部分变化时收到通知，
+      并可根据路径只刷新变化的行
+    - 比较时未变化的子树由 dict.__eq__ 整体跳过
+    - 快照按持久化方式更新：只复制变化路径上的各级节点，其余子树与旧快照共享且
+      不再被修改。因此每一步历史只需引用变化前后的子树，内存开销与改动大小成正比，
+      与配置文件大小无关
+    """
 
+    changed = pyqtSignal(object)  # 本次提交的全部变化路径 List[Tuple[str, ...]]
 
-class ModelFetchService(QObject):
-    """模型列表获取服务"""
+    MAX_DEPTH = 4  # 路径最多细化到 (配置名, 部分, 名称, 字段)
 
-    fetch_finished = pyqtSignal(str, list, str)  # provider_name, model_ids, error
+    MISSING = object()  # 历史记录中表示"该路径不存在"
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._snapshots: Dict[str, Any] = {}
+        self._subscribers: List[Tuple[Tuple[str, ...], Callable]] = []
+        # 每一步为 (序号, [(路径, 旧值, 新值), ...])，值与快照共享，视为只读
+        self._undo_steps: List[Tuple[int, List[Tuple]]] = []
+        self._redo_steps: List[Tuple[int, List[Tuple]]] = []
+        self._step_serial = 0
+        # 检查点名称 -> 创建时最后一步的序号（0 表示历史起点）
+        self._checkpoints: Dict[str, int] = {}
 
-    def fetch_async(self, provider_name: str, options: Dict[str, Any]) -> None:
-        thread = threading.Thread(
-            target=self._fetch_models, args=(provider_name, options), daemon=True
-        )
-        thread.start()
+    @classmethod
+    def _diff(cls, old: Any, new: Any, path: Tuple, out: List[Tuple]) -> None:
+        if old == new:
+            return
+        if (
+            isinstance(old, dict)
+            and isinstance(new, dict)
+            and len(path) < cls.MAX_DEPTH
+        ):
+            for key, value in new.items():
+                if key not in old:
+                    out.append(path + (key,))
+                else:
+                    cls._diff(old[key], value, path + (key,), out)
+            out.extend(path + (key,) for key in old if key not in new)
+        else:
+            out.append(path)
 
-    def _build_urls(self, options: Dict[str, Any]) -> List[str]:
-        base_url = (options.get("baseURL") or "").strip()
-        urls: List[str] = []
+    def subscribe(self, prefix: Tuple[str, ...], callback: Callable) -> None:
+        """订阅 prefix 下的变化，callback(paths) 只接收与 prefix 相关的路径
 
-        if not base_url:
-            return urls
+        prefix 的上级整体变化（如整个配置被重新加载）时同样会通知，
+        此时收到的路径比 prefix 短。callback 所属的控件销毁后自动取消订阅
+        """
+        self._subscribers.append((tuple(prefix), callback))
+
+    def reset(self, configs: Dict[str, Any]) -> None:
+        """记录当前配置为快照并清空编辑历史，不发出通知"""
+        for name, config in configs.items():
+            self._snapshots[name] = copy_json(config)
+        self._undo_steps.clear()
+        self._redo_steps.clear()
+        self._checkpoints.clear()
+
+    def commit(self, configs: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        """比较配置与快照，记录一步历史，通知订阅者并返回变化路径"""
+        paths: List[Tuple[str, ...]] = []
+        changes = []
+        for name, config in configs.items():
+            changed: List[Tuple[str, ...]] = []
+            self._diff(self._snapshots.get(name), config, (name,), changed)
+            for path in changed:
+                new = copy_json(self._lookup(config, path[1:]))
+                old = self._set_snapshot(path, new)
+                changes.append((path, old, new))
+            paths.extend(changed)
+        if not paths:
+            return paths
+
+        self._step_serial += 1
+        self._undo_steps.append((self._step_serial, changes))
+        self._discard_redo()
+        self.dispatch(paths)
+        return paths
 
-        if base_url.rstrip("/").endswith("/v1"):
-            urls.append(base_url.rstrip("/") + "/models")
-            return urls
+    @staticmethod
+    def _is_alive(callback: Callable) -> bool:
+        """订阅者所属的控件已销毁（如页面被重建）时返回 False"""
+        owner = getattr(callback, "__self__", None)
+        return not (isinstance(owner, QObject) and sip.isdeleted(owner))
+
+    def dispatch(self, paths: List[Tuple[str, ...]]) -> None:
+        """把变化路径分发给相关订阅者并发出 changed 信号"""
+        self._subscribers = [s for s in self._subscribers if self._is_alive(s[1])]
+        for prefix, callback in list(self._subscribers):
+            size = len(prefix)
+            matched = [
+                path
+                for path in paths
+                if path[:size] == prefix or prefix[: len(path)] == path
+            ]
+            if matched:
+                callback(matched)
+        self.changed.emit(paths)
 
-        urls.append(base_url.rstrip("/") + "/v1/models")
-        urls.append(base_url.rstrip("/") + "/models")
-        return urls
+    @classmethod
+    def _lookup(cls, node: Any, keys: Tuple[str, ...]) -> Any:
+        for key in keys:
+            if not isinstance(node, dict) or key not in node:
+                return cls.MISSING
+            node = node[key]
+        return node
 
-    def _extract_model_ids(self, data: Any) -> List[str]:
-        model_ids: List[str] = []
-        if isinstance(data, dict):
-            items = None
-            if isinstance(data.get("data"), list):
-                items = data.get("data")
-            elif isinstance(data.get("models"), list):
-                items = data.get("models")
-            elif isinstance(data.get("result"), list):
-                items = data.get("result")
-            if items is not None:
-                for item in items:
-                    if isinstance(item, dict):
-                        model_id = item.get("id") or item.get("name") or ""
-                        if model_id:
-                            model_ids.append(str(model_id))
-                    elif isinstance(item, str):
-                        model_ids.append(item)
-        elif isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    model_id = item.get("id") or item.get("name") or ""
-                    if model_id:
-                        model_ids.append(str(model_id))
-                elif isinstance(item, str):
-                    model_ids.append(item)
-        return model_ids
+    def _set_snapshot(self, path: Tuple[str, ...], value: Any) -> Any:
+        """持久化更新快照：复制路径上的各级节点后写入 value，返回原值
 
-    def _fetch_models(self, provider_name: str, options: Dict[str, Any]) -> None:
-        urls = self._build_urls(options)
-        if not urls:
-            self.fetch_finished.emit(provider_name, [], "未配置模型列表地址")
+        旧快照中的节点不会被修改，历史记录可以安全地引用它们
+        """
+        name = path[0]
+        old_root = self._snapshots.get(name, self.MISSING)
+        if len(path) == 1:
+            self._snapshots[name] = None if value is self.MISSING else value
+            return old_root
+        root, old = self._replaced(old_root, path[1:], value)
+        self._snapshots[name] = root
+        return old
+
+    @classmethod
+    def _replaced(cls, root: Dict, keys: Tuple[str, ...], value: Any) -> Tuple:
+        """返回 (把 keys 处替换为 value 的新根节点, 原值)，不修改 root"""
+        root = dict(root)
+        node = root
+        for key in keys[:-1]:
+            child = dict(node[key])
+            node[key] = child
+            node = child
+        key = keys[-1]
+        old = node.get(key, cls.MISSING)
+        if value is cls.MISSING:
+            node.pop(key, None)
+        else:
+            node[key] = value
+        return root, old
+
+    def frozen_copy(self, name: str, config: Any) -> Any:
+        """返回与实时配置内容相同的只读副本，不记录历史也不发出通知
+
+        与快照比较后只复制尚未提交的变化子树，其余子树与快照共享（快照不会被
+        原地修改），开销与未提交的改动大小成正比，可以安全地交给后台线程读取。
+        """
+        base = self._snapshots.get(name, self.MISSING)
+        changed: List[Tuple[str, ...]] = []
+        if base is not self.MISSING:
+            self._diff(base, config, (name,), changed)
+        if base is self.MISSING or (name,) in changed:
+            return copy_json(config)
+        for path in changed:
+            value = copy_json(self._lookup(config, path[1:]))
+            base, _ = self._replaced(base, path[1:], value)
+        return base
+
+    @classmethod
+    def _assign(cls, configs: Dict[str, Any], path: Tuple[str, ...], value: Any):
+        """把历史中的值写回实时配置（写入副本，实时配置会被页面原地修改）"""
+        if len(path) == 1:
+            configs[path[0]] = None if value is cls.MISSING else copy_json(value)
             return
+        node = configs[path[0]]
+        for key in path[1:-1]:
+            node = node.setdefault(key, {})
+        if value is cls.MISSING:
+            node.pop(path[-1], None)
+        else:
+            node[path[-1]] = copy_json(value)
 
-        api_key = (options.get("apiKey") or "").strip()
-        headers = {"User-Agent": "OpenCode-Config-Manager"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
+    def _discard_redo(self) -> None:
+        """新的编辑会让重做历史失效，同时删除指向这些步骤的检查点"""
+        if not self._redo_steps:
+            return
+        dropped = {serial for serial, _ in self._redo_steps}
+        self._redo_steps.clear()
+        self._checkpoints = {
+            name: serial
+            for name, serial in self._checkpoints.items()
+            if serial not in dropped
+        }
+
+    def can_undo(self) -> bool:
+        return bool(self._undo_steps)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo_steps)
+
+    def undo(self, configs: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        """撤销最近一步：修改 configs 中的实时配置并返回变化路径（不分发通知）"""
+        if not self._undo_steps:
+            return []
+        step = self._undo_steps.pop()
+        for path, old, _new in reversed(step[1]):
+            self._assign(configs, path, old)
+            self._set_snapshot(path, old)
+        self._redo_steps.append(step)
+        return [path for path, _old, _new in step[1]]
+
+    def redo(self, configs: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        """重做最近撤销的一步：修改 configs 并返回变化路径（不分发通知）"""
+        if not self._redo_steps:
+            return []
+        step = self._redo_steps.pop()
+        for path, _old, new in step[1]:
+            self._assign(configs, path, new)
+            self._set_snapshot(path, new)
+        self._undo_steps.append(step)
+        return [path for path, _old, _new in step[1]]
+
+    def checkpoint(self, name: str) -> None:
+        """把当前历史位置记为命名检查点（同名覆盖）"""
+        self._checkpoints.pop(name, None)
+        self._checkpoints[name] = self._undo_steps[-1][0] if self._undo_steps else 0
+
+    def checkpoints(self) -> List[Tuple[str, int]]:
+        """按创建顺序返回 [(名称, 距当前位置的步数)]，负数表示在重做方向"""
+        undo_serials = [serial for serial, _ in self._undo_steps]
+        redo_serials = [serial for serial, _ in reversed(self._redo_steps)]
+        result = []
+        for name, serial in self._checkpoints.items():
+            if serial == 0:
+                distance = len(undo_serials)
+            elif serial in undo_serials:
+                distance = len(undo_serials) - 1 - undo_serials.index(serial)
+            else:
+                distance = -(redo_serials.index(serial) + 1)
+            result.append((name, distance))
+        return result
+
+    def restore_checkpoint(
+        self, name: str, configs: Dict[str, Any]
+    ) -> List[Tuple[str, ...]]:
+        """撤销或重做到检查点位置，返回所有涉及的路径（不分发通知）"""
+        distance = dict(self.checkpoints()).get(name)
+        if distance is None:
+            raise KeyError(name)
+        paths: List[Tuple[str, ...]] = []
+        step = self.undo if distance > 0 else self.redo
+        for _ in range(abs(distance)):
+            paths.extend(step(configs))
+        return list(dict.fromkeys(paths))
+
+    @staticmethod
+    def changed_keys(
+        paths: List[Tuple[str, ...]], prefix: Tuple[str, ...]
+    ) -> Optional[set]:
+        """prefix 下发生变化的直接子项名称；prefix 本身整体变化时返回 None"""
+        keys = set()
+        for path in paths:
+            if len(path) <= len(prefix):
+                return None
+            keys.add(path[len(prefix)])
+        return keys
 
-        last_error = ""
-        for url in urls:
-            try:
-                req = urllib.request.Request(url, headers=headers)
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    data = json.loads(response.read().decode("utf-8"))
-                model_ids = self._extract_model_ids(data)
-                if model_ids:
-                    self.fetch_finished.emit(provider_name, model_ids, "")
-                    return
-                last_error = "未返回可用模型列表"
-            except Exception as e:
-                last_error = str(e)
 
-        self.fetch_finished.emit(provider_name, [], last_error or "获取失败")
+def _apply_native_health_item(
+    item: QTableWidgetItem, result: Optional[NativeHealthResult], testing: bool
+) -> None:
+    """在表格单元格中显示原生 Provider 的健康状态"""
+    if testing:
+        item.setText(tr("native_provider.testing"))
+        item.setForeground(QColor("#9E9E9E"))
+        return
+    if result is None:
+        item.setText("-")
+        item.setToolTip("")
+        item.setForeground(QColor("#9E9E9E"))
+        return
+    checked_at = datetime.fromtimestamp(result.checked_at).strftime("%H:%M:%S")
+    if result.ok:
+        item.setText(f"✓ {result.latency_ms}ms")
+        item.setForeground(QColor("#4CAF50"))
+    else:
+        item.setText("✗ " + result.message)
+        item.setForeground(QColor("#d13438"))
+    item.setToolTip(f"{result.message}\n{checked_at}")
 
 
 class VersionChecker(QObject):
@@ -6214,6 +3123,9 @@ class VersionChecker(QObject):
 
     def _check_update(self):
         """检查 GitHub 最新版本 - 带错误处理和速率限制"""
+        import urllib.error
+        import urllib.request
+
         try:
             req = urllib.request.Request(
                 GITHUB_RELEASES_API,
@@ -6282,10 +3194,18 @@ class BaseDialog(QDialog):
         self._apply_theme()
 
     def _apply_theme(self):
-        """根据当前主题应用样式"""
-        if isDarkTheme():
+        """根据当前主题应用样式（样式表按主题缓存，未变化时不重复应用）"""
+        dark = isDarkTheme()
+        stylesheet = StyleSheetCache.get(
+            ("dialog", dark), lambda: self._theme_stylesheet(dark)
+        )
+        StyleSheetCache.apply(self, stylesheet)
+
+    @staticmethod
+    def _theme_stylesheet(dark: bool) -> str:
+        if dark:
             # 深色主题
-            self.setStyleSheet("""
+            return """
                 QDialog {
                     background-color: #202020;
                     color: #E0E0E0;
@@ -6321,10 +3241,10 @@ class BaseDialog(QDialog):
                     color: #E0E0E0;
                     border: 1px solid #30363d;
                 }
-            """)
+            """
         else:
             # 浅色主题 - 奶白色背景（参考左侧软件）
-            self.setStyleSheet("""
+            return """
                 QDialog {
                     background-color: #F7F8FA;
                     color: #1A1A1A;
@@ -6361,22 +3281,23 @@ class BaseDialog(QDialog):
                     color: #1A1A1A;
                     border: 1px solid #E0E0E0;
                 }
-            """)
+            """
 
 
 class BasePage(QWidget):
     """页面基类 - 所有页面继承此类"""
 
-    def __init__(self, title: str, parent=None):
+    def __init__(self, title_key: str, parent=None):
         super().__init__(parent)
-        self.setObjectName(title.replace(" ", "_").lower())
+        self.setObjectName(tr(title_key).replace(" ", "_").lower())
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self._layout = QVBoxLayout(self)
         self._layout.setContentsMargins(36, 20, 36, 20)
         self._layout.setSpacing(16)
 
-        # 页面标题
-        self.title_label = TitleLabel(title, self)
+        # 页面标题（title_key 为翻译键，切换语言时自动更新；非翻译键按原文显示）
+        self.title_label = TitleLabel(self)
+        bind_tr(self.title_label, title_key)
         self._layout.addWidget(self.title_label)
         self.setLayout(self._layout)
 
@@ -6436,26 +3357,118 @@ class BasePage(QWidget):
         # 子类可以重写此方法来更新自己的界面文本
         pass
 
+    def _refresh_changed_rows(
+        self,
+        paths: List[Tuple[str, ...]],
+        prefix: Tuple[str, ...],
+        table: QTableWidget,
+        fill_row: Callable[[int, str, Dict], None],
+        reload: Callable[[], None],
+    ) -> None:
+        """根据配置变化路径只重填变化的行（表格第 0 列为名称）
+
+        整个部分被替换或有新增项（需按配置顺序插入）时调用 reload 整表重载
+        """
+        names = ConfigChangeTracker.changed_keys(paths, prefix)
+        section = self.main_window.get_config_section(prefix)
+        if names is None or not isinstance(section, dict):
+            reload()
+            return
+        rows = {}
+        for row in range(table.rowCount()):
+            item = table.item(row, 0)
+            if item is not None:
+                rows[item.text()] = row
+        if any(isinstance(section.get(n), dict) and n not in rows for n in names):
+            reload()
+            return
+
+        removed = []
+        for name in names:
+            row = rows.get(name)
+            if row is None:
+                continue
+            data = section.get(name)
+            if isinstance(data, dict):
+                fill_row(row, name, data)
+            else:
+                removed.append(row)
+        # 从后往前删除，避免行号变化
+        for row in sorted(removed, reverse=True):
+            table.removeRow(row)
+
+
+class LazyPage(QWidget):
+    """延迟构建的页面占位符
+
+    注册导航项时只创建此轻量部件，首次显示（或空闲预加载）时才调用
+    factory 构建真实页面并嵌入其中。
+    """
+
+    def __init__(self, object_name: str, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self.setObjectName(object_name)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._factory: Callable[[], QWidget] = factory
+        self._page: Optional[QWidget] = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._page is not None
+
+    def page(self) -> QWidget:
+        """获取真实页面，尚未构建时立即构建"""
+        if self._page is None:
+            self._page = self._factory()
+            self._layout.addWidget(self._page)
+        return self._page
+
+    def loaded_page(self) -> Optional[QWidget]:
+        """获取已构建的真实页面，不触发构建"""
+        return self._page
+
+    def reset(self) -> None:
+        """丢弃已构建的页面（如切换语言后），正在显示时立即重建，否则下次显示时重建"""
+        if self._page is None:
+            return
+        page, self._page = self._page, None
+        self._layout.removeWidget(page)
+        page.hide()
+        page.deleteLater()
+        if self.isVisible():
+            self.page()
+
+    def showEvent(self, event):
+        self.page()
+        super().showEvent(event)
+
 
 # ==================== 首页 ====================
 class HomePage(BasePage):
     """首页 - 显示配置文件路径、统计信息、工具栏"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("home.title"), parent)
+        super().__init__("home.title", parent)
         self.main_window = main_window
         # 隐藏页面标题
         self.title_label.hide()
         self._setup_ui()
         self._load_stats()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅配置变更（统计涉及所有部分）
+        self.main_window.config_tracker.subscribe((), self._on_config_changed)
+        validation_service = self.main_window.validation_service
+        validation_service.progress.connect(self._on_validation_progress)
+        validation_service.finished.connect(self._on_validation_finished)
 
-    def _on_config_changed(self):
+    def _on_config_changed(self, paths):
         """配置变更时刷新统计"""
         self._load_stats()
 
     def _setup_ui(self):
+        import webbrowser
+
         # ===== 关于卡片 (无标题) =====
         about_card = self.add_card()
         about_layout = about_card.layout()
@@ -6764,13 +3777,29 @@ class HomePage(BasePage):
         return "\n".join(lines)
 
     def _on_validate_config(self):
-        """手动配置检测"""
-        oc_issues = ConfigValidator.validate_opencode_config(
-            self.main_window.opencode_config or {}
-        )
-        ohmy_issues = ConfigValidator.validate_ohmyopencode_config(
-            self.main_window.ohmyopencode_config or {}
+        """手动配置检测（在后台线程中执行）"""
+        self.validate_btn.setEnabled(False)
+        self.validate_btn.setText(tr("home.validating", percent=0))
+        self.main_window.validation_service.validate_async(
+            "home",
+            self.main_window.config_snapshot("opencode") or {},
+            self.main_window.config_snapshot("ohmy") or {},
         )
+
+    def _on_validation_progress(self, tag: str, done: int, total: int):
+        if tag != "home":
+            return
+        percent = done * 100 // total if total else 100
+        self.validate_btn.setText(tr("home.validating", percent=percent))
+
+    def _on_validation_finished(self, tag: str, result: Dict):
+        if tag != "home":
+            return
+        self.validate_btn.setEnabled(True)
+        self.validate_btn.setText(tr("home.validate_config"))
+
+        oc_issues = result["opencode"]
+        ohmy_issues = result["ohmy"] or []
         issues = []
         for issue in oc_issues:
             issue_copy = dict(issue)
@@ -7202,13 +4231,23 @@ class ProviderPage(BasePage):
     """Provider 管理页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("provider.title"), parent)
+        super().__init__("provider.title", parent)
         self.main_window = main_window
 
         # 初始化原生Provider需要的管理器
         self.auth_manager = AuthManager()
         self.env_detector = EnvVarDetector()
 
+        # 原生Provider连接测试（后台并发，保留最近一次结果）
+        self.health_service: NativeProviderHealthService = (
+            main_window.native_health_service
+        )
+        self._native_manual_tests: set = set()  # 需要弹出结果提示的单个测试
+        self._native_batch_pending: set = set()  # "全部测试"尚未返回的 Provider
+        self._native_batch_ok = 0
+        self._native_batch_total = 0
+        self.health_service.result_ready.connect(self._on_native_health_result)
+
         # 初始化UI
         self._setup_ui()
 
@@ -7216,8 +4255,10 @@ class ProviderPage(BasePage):
         self._load_custom_data()
         self._load_native_data()
 
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅 Provider 配置变更（原生 Provider 表格数据来自 auth.json，与此无关）
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
 
     def _on_custom_models_fetched(
         self, provider_name: str, model_ids: List[str], error: str
@@ -7259,21 +4300,30 @@ class ProviderPage(BasePage):
             return
 
         models = provider.setdefault("models", {})
-        added = 0
+        new_by_category: Dict[str, List[str]] = {}
         for model_id in model_ids:
             if model_id in models:
                 continue
             category = self._custom_resolve_model_category(model_id)
-            model_data = {"name": model_id}
-            if batch_config:
-                model_data.update(
-                    self._custom_apply_batch_config(category, batch_config)
-                )
-            models[model_id] = model_data
-            added += 1
+            new_by_category.setdefault(category, []).append(model_id)
+            models[model_id] = {"name": model_id}
+        added = sum(len(ids) for ids in new_by_category.values())
+
+        if batch_config:
+            # 每个分类只计算一次批量配置，按分类一次性应用到新增模型
+            for category, ids in new_by_category.items():
+                patch = self._custom_apply_batch_config(category, batch_config)
+                if patch:
+                    apply_batch(
+                        config,
+                        BatchSelector(
+                            "models", provider=provider_name, names=frozenset(ids)
+                        ),
+                        patch,
+                    )
 
+        # 保存后的变更通知会刷新该 Provider 的行
         self.main_window.save_opencode_config()
-        self._load_custom_data()
         if added:
             self.show_success(
                 tr("common.success"), tr("provider.models_added", count=added)
@@ -7291,23 +4341,6 @@ class ProviderPage(BasePage):
             return tr("provider.openai_series")
         return tr("provider.other_models")
 
-    def _custom_get_preset_for_category(
-        self, category: str, preset_name: str
-    ) -> Dict[str, Any]:
-        custom = MODEL_PRESET_CUSTOM.get(category, {})
-        if preset_name in custom:
-            return copy.deepcopy(custom[preset_name])
-        presets = MODEL_PRESET_PACKS.get(category, {})
-        if preset_name in presets:
-            return copy.deepcopy(presets[preset_name])
-        return {
-            "attachment": False,
-            "modalities": {"input": ["text"], "output": ["text"]},
-            "limit": {"context": 64000, "output": 8192},
-            "options": {},
-            "variants": {},
-        }
-
     def _custom_apply_batch_config(
         self, category: str, batch_config: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -7333,10 +4366,6 @@ class ProviderPage(BasePage):
         if not batch_config:
             return result
 
-        base_preset = self._custom_get_preset_for_category(
-            category, MODEL_PRESET_DEFAULT.get(category, "基础")
-        )
-
         for key in (
             "attachment",
             "modalities",
@@ -7419,10 +4448,15 @@ class ProviderPage(BasePage):
                 continue
         return result
 
-    def _on_config_changed(self):
-        """配置变更时刷新两个标签页的数据"""
-        self._load_custom_data()
-        self._load_native_data()
+    def _on_config_changed(self, paths):
+        """Provider 配置变更时只刷新变化的行"""
+        self._refresh_changed_rows(
+            paths,
+            ("opencode", "provider"),
+            self.custom_table,
+            self._fill_custom_row,
+            self._load_custom_data,
+        )
 
     def _setup_ui(self):
         """初始化UI - 使用Pivot标签页"""
@@ -7453,6 +4487,7 @@ class ProviderPage(BasePage):
             self.stack.setCurrentIndex(0)
         else:
             self.stack.setCurrentIndex(1)
+            self._auto_test_native()
 
     def _create_custom_provider_widget(self) -> QWidget:
         """创建自定义Provider管理部件"""
@@ -7496,6 +4531,12 @@ class ProviderPage(BasePage):
         self.custom_query_balance_btn.clicked.connect(self._on_custom_query_balance)
         toolbar.addWidget(self.custom_query_balance_btn)
 
+        self.balance_dashboard_btn = PushButton(
+            FIF.PIE_SINGLE, tr("provider.balance_dashboard"), widget
+        )
+        self.balance_dashboard_btn.clicked.connect(self._on_balance_dashboard)
+        toolbar.addWidget(self.balance_dashboard_btn)
+
         toolbar.addStretch()
         layout.addLayout(toolbar)
 
@@ -7560,6 +4601,12 @@ class ProviderPage(BasePage):
         self.native_test_btn.clicked.connect(self._on_native_test)
         toolbar.addWidget(self.native_test_btn)
 
+        self.native_test_all_btn = PushButton(
+            FIF.SPEED_HIGH, tr("native_provider.test_all"), widget
+        )
+        self.native_test_all_btn.clicked.connect(self._on_native_test_all)
+        toolbar.addWidget(self.native_test_all_btn)
+
         self.native_delete_btn = PushButton(
             FIF.DELETE, tr("native_provider.delete_config"), widget
         )
@@ -7577,13 +4624,14 @@ class ProviderPage(BasePage):
 
         # Provider 列表表格
         self.native_table = TableWidget(widget)
-        self.native_table.setColumnCount(4)
+        self.native_table.setColumnCount(5)
         self.native_table.setHorizontalHeaderLabels(
             [
                 tr("native_provider.provider_name"),
                 tr("provider.sdk_type"),
                 tr("native_provider.status"),
                 tr("native_provider.env_vars"),
+                tr("native_provider.health"),
             ]
         )
 
@@ -7595,6 +4643,8 @@ class ProviderPage(BasePage):
         header.setSectionResizeMode(2, QHeaderView.Fixed)
         header.resizeSection(2, 80)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
+        header.setSectionResizeMode(4, QHeaderView.Fixed)
+        header.resizeSection(4, 140)
 
         self.native_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.native_table.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -7616,19 +4666,21 @@ class ProviderPage(BasePage):
                 continue
             row = self.custom_table.rowCount()
             self.custom_table.insertRow(row)
-            self.custom_table.setItem(row, 0, QTableWidgetItem(name))
-            self.custom_table.setItem(row, 1, QTableWidgetItem(data.get("name", "")))
-            self.custom_table.setItem(row, 2, QTableWidgetItem(data.get("npm", "")))
-            # API地址添加tooltip显示全部
-            api_url = data.get("options", {}).get("baseURL", "")
-            api_item = QTableWidgetItem(api_url)
-            api_item.setToolTip(
-                api_url if api_url else tr("provider.use_default_address")
-            )
-            self.custom_table.setItem(row, 3, api_item)
-            self.custom_table.setItem(
-                row, 4, QTableWidgetItem(str(len(data.get("models", {}))))
-            )
+            self._fill_custom_row(row, name, data)
+
+    def _fill_custom_row(self, row: int, name: str, data: Dict) -> None:
+        """填充一行（整表加载与增量刷新共用）"""
+        self.custom_table.setItem(row, 0, QTableWidgetItem(name))
+        self.custom_table.setItem(row, 1, QTableWidgetItem(data.get("name", "")))
+        self.custom_table.setItem(row, 2, QTableWidgetItem(data.get("npm", "")))
+        # API地址添加tooltip显示全部
+        api_url = data.get("options", {}).get("baseURL", "")
+        api_item = QTableWidgetItem(api_url)
+        api_item.setToolTip(api_url if api_url else tr("provider.use_default_address"))
+        self.custom_table.setItem(row, 3, api_item)
+        self.custom_table.setItem(
+            row, 4, QTableWidgetItem(str(len(data.get("models", {}))))
+        )
 
     def _on_custom_add(self):
         """添加 Provider"""
@@ -7701,302 +4753,106 @@ class ProviderPage(BasePage):
 
         self.show_warning(
             tr("common.info"), tr("provider.fetch_models_hint", name=provider_name)
-        )
-        self._model_fetch_service.fetch_async(provider_name, options)
-
-    def _on_custom_export_to_cli(self):
-        """导出到 CLI 工具"""
-        row = self.custom_table.currentRow()
-        if row < 0:
-            self.show_warning(tr("common.info"), tr("provider.select_first"))
-            return
-
-        provider_name = self.custom_table.item(row, 0).text()
-
-        # 切换到 CLI 导出页面
-        if hasattr(self.main_window, "cli_export_page"):
-            self.main_window.switchTo(self.main_window.cli_export_page)
-            # 预选当前 Provider
-            cli_page = self.main_window.cli_export_page
-            index = cli_page.provider_combo.findText(provider_name)
-            if index >= 0:
-                cli_page.provider_combo.setCurrentIndex(index)
-        else:
-            self.show_warning(tr("common.info"), tr("provider.cli_page_unavailable"))
-
-    def _on_custom_query_balance(self):
-        """查询余额"""
-        row = self.custom_table.currentRow()
-        if row < 0:
-            self.show_warning(tr("common.info"), tr("provider.select_first"))
-            return
-
-        provider_name = self.custom_table.item(row, 0).text()
-        config = self.main_window.opencode_config or {}
-        provider = config.get("provider", {}).get(provider_name, {})
-
-        if not isinstance(provider, dict):
-            self.show_warning(tr("common.info"), tr("provider.provider_not_exist"))
-            return
-
-        # 获取 baseURL 和 apiKey
-        options = provider.get("options", {})
-        base_url = options.get("baseURL", "")
-        api_key = options.get("apiKey", "")
-
-        if not base_url:
-            self.show_warning(tr("common.info"), tr("provider.no_base_url"))
-            return
-
-        if not api_key:
-            self.show_warning(tr("common.info"), tr("provider.no_api_key"))
-            return
-
-        # 显示加载提示
-        state_tooltip = StateToolTip(
-            tr("provider.querying_balance"), tr("provider.please_wait"), self.window()
-        )
-        state_tooltip.move(state_tooltip.getSuitablePos())
-        state_tooltip.show()
-
-        # 在后台线程查询余额
-        def query_thread():
-            try:
-                usage_data = self._custom_query_provider_usage(base_url, api_key)
-                # 在主线程显示结果
-                QMetaObject.invokeMethod(
-                    self,
-                    "_custom_show_balance_result",
-                    Qt.QueuedConnection,
-                    Q_ARG(str, provider_name),
-                    Q_ARG(object, usage_data),
-                    Q_ARG(str, api_key),
-                    Q_ARG(object, state_tooltip),
-                )
-            except Exception as e:
-                # 在主线程显示错误
-                QMetaObject.invokeMethod(
-                    self,
-                    "_custom_show_balance_error",
-                    Qt.QueuedConnection,
-                    Q_ARG(str, str(e)),
-                    Q_ARG(object, state_tooltip),
-                )
-
-        thread = threading.Thread(target=query_thread, daemon=True)
-        thread.start()
-
-    def _custom_query_provider_usage(
-        self, base_url: str, api_key: str
-    ) -> Dict[str, Any]:
-        """查询 Provider 用量（支持 OpenAI API 和 NewAPI）"""
-        import json
-        from datetime import datetime, timedelta
-
-        # 规范化 base_url - 移除末尾斜杠
-        base_url = base_url.rstrip("/")
-
-        # 先尝试 NewAPI 接口
-        try:
-            return self._custom_query_newapi_usage(base_url, api_key)
-        except Exception as newapi_error:
-            # NewAPI 失败，尝试 OpenAI API
-            pass
-
-        # 尝试 OpenAI API 接口
-        try:
-            return self._custom_query_openai_usage(base_url, api_key)
-        except Exception as openai_error:
-            # 两种方式都失败，抛出错误
-            raise Exception(
-                f"余额查询失败。NewAPI: {str(newapi_error)[:50]}... OpenAI API: {str(openai_error)[:50]}..."
-            )
-
-    def _custom_query_newapi_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
-        """查询 NewAPI 用量"""
-        import json
-
-        # NewAPI 余额查询端点
-        balance_url = f"{base_url}/api/usage/token"
-        req = urllib.request.Request(balance_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
-
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"NewAPI 查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"NewAPI 请求失败: {str(e)}")
-
-        # 解析 NewAPI 响应
-        if not response_data.get("code") or "data" not in response_data:
-            raise Exception("NewAPI 响应格式不正确")
-
-        usage_data = response_data["data"]
-
-        # NewAPI 返回的是积分，需要转换为美元
-        # 转换比例: 500,000 积分 = $1
-        CONVERSION_RATE = 500000.0
-
-        total_granted_points = usage_data.get("total_granted", 0)
-        total_used_points = usage_data.get("total_used", 0)
-        total_available_points = usage_data.get("total_available", 0)
-
-        # 转换为美元
-        total_balance = total_granted_points / CONVERSION_RATE
-        used_balance = total_used_points / CONVERSION_RATE
-        remaining_balance = total_available_points / CONVERSION_RATE
-
-        # 判断是否为无限额度
-        is_unlimited = usage_data.get("unlimited_quota", False)
-
-        return {
-            "api_type": "newapi",
-            "token_name": usage_data.get("name", ""),
-            "total_balance": total_balance,
-            "used_balance": used_balance,
-            "remaining_balance": remaining_balance,
-            "is_unlimited": is_unlimited,
-            "access_until": usage_data.get("expires_at", 0),
-            "query_start_date": "",
-            "query_end_date": "",
-        }
-
-    def _custom_query_openai_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
-        """查询 OpenAI API 用量"""
-        import json
-        from datetime import datetime, timedelta
-
-        # 规范化 base_url - 移除末尾斜杠
-        base_url = base_url.rstrip("/")
-
-        # 智能处理 /v1 路径 - 如果已经包含 /v1，就不再添加
-        if base_url.endswith("/v1"):
-            api_base = base_url
-        else:
-            api_base = f"{base_url}/v1"
-
-        # 1. 查询订阅信息
-        subscription_url = f"{api_base}/dashboard/billing/subscription"
-        req = urllib.request.Request(subscription_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
-
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                subscription_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"订阅信息查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求订阅信息失败: {str(e)}")
-
-        total_balance = subscription_data.get("hard_limit_usd", 0.0)
-        access_until = subscription_data.get("access_until", 0)
-        is_unlimited = total_balance >= 100000000.0
+        )
+        self._model_fetch_service.fetch_async(provider_name, options)
 
-        # 2. 查询使用情况（最近100天）
-        now = datetime.now()
-        start = now - timedelta(days=100)
-        start_date = start.strftime("%Y-%m-%d")
-        end_date = now.strftime("%Y-%m-%d")
+    def _on_custom_export_to_cli(self):
+        """导出到 CLI 工具"""
+        row = self.custom_table.currentRow()
+        if row < 0:
+            self.show_warning(tr("common.info"), tr("provider.select_first"))
+            return
 
-        usage_url = f"{api_base}/dashboard/billing/usage?start_date={start_date}&end_date={end_date}"
-        req = urllib.request.Request(usage_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
+        provider_name = self.custom_table.item(row, 0).text()
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                usage_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"使用情况查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求使用情况失败: {str(e)}")
+        # 切换到 CLI 导出页面
+        if hasattr(self.main_window, "cli_export_page"):
+            self.main_window.switchTo(self.main_window.cli_export_page)
+            # 预选当前 Provider
+            cli_page = self.main_window.cli_export_page
+            index = cli_page.provider_combo.findText(provider_name)
+            if index >= 0:
+                cli_page.provider_combo.setCurrentIndex(index)
+        else:
+            self.show_warning(tr("common.info"), tr("provider.cli_page_unavailable"))
 
-        # total_usage 是以美分为单位，需要除以100转换为美元
-        total_usage_cents = usage_data.get("total_usage", 0.0)
-        used_balance = total_usage_cents / 100.0
+    def _on_custom_query_balance(self):
+        """查询余额"""
+        row = self.custom_table.currentRow()
+        if row < 0:
+            self.show_warning(tr("common.info"), tr("provider.select_first"))
+            return
 
-        # 计算剩余额度
-        remaining_balance = (
-            float("inf") if is_unlimited else (total_balance - used_balance)
-        )
+        provider_name = self.custom_table.item(row, 0).text()
+        config = self.main_window.opencode_config or {}
+        provider = config.get("provider", {}).get(provider_name, {})
 
-        return {
-            "api_type": "openai",
-            "token_name": "",
-            "total_balance": total_balance,
-            "used_balance": used_balance,
-            "remaining_balance": remaining_balance,
-            "is_unlimited": is_unlimited,
-            "access_until": access_until,
-            "query_start_date": start_date,
-            "query_end_date": end_date,
-        }
+        if not isinstance(provider, dict):
+            self.show_warning(tr("common.info"), tr("provider.provider_not_exist"))
+            return
 
-        # 1. 查询订阅信息
-        subscription_url = f"{api_base}/dashboard/billing/subscription"
-        req = urllib.request.Request(subscription_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
+        # 获取 baseURL 和 apiKey
+        options = provider.get("options", {})
+        base_url = options.get("baseURL", "")
+        api_key = options.get("apiKey", "")
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                subscription_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"订阅信息查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求订阅信息失败: {str(e)}")
+        if not base_url:
+            self.show_warning(tr("common.info"), tr("provider.no_base_url"))
+            return
 
-        total_balance = subscription_data.get("hard_limit_usd", 0.0)
-        access_until = subscription_data.get("access_until", 0)
-        is_unlimited = total_balance >= 100000000.0
+        if not api_key:
+            self.show_warning(tr("common.info"), tr("provider.no_api_key"))
+            return
 
-        # 2. 查询使用情况（最近100天）
-        now = datetime.now()
-        start = now - timedelta(days=100)
-        start_date = start.strftime("%Y-%m-%d")
-        end_date = now.strftime("%Y-%m-%d")
+        # 显示加载提示
+        state_tooltip = StateToolTip(
+            tr("provider.querying_balance"), tr("provider.please_wait"), self.window()
+        )
+        state_tooltip.move(state_tooltip.getSuitablePos())
+        state_tooltip.show()
 
-        usage_url = f"{api_base}/dashboard/billing/usage?start_date={start_date}&end_date={end_date}"
-        req = urllib.request.Request(usage_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
+        # 在后台线程查询余额
+        def query_thread():
+            try:
+                usage_data = self._custom_query_provider_usage(
+                    base_url, api_key, provider_name
+                )
+                # 在主线程显示结果
+                QMetaObject.invokeMethod(
+                    self,
+                    "_custom_show_balance_result",
+                    Qt.QueuedConnection,
+                    Q_ARG(str, provider_name),
+                    Q_ARG(object, usage_data),
+                    Q_ARG(str, api_key),
+                    Q_ARG(object, state_tooltip),
+                )
+            except Exception as e:
+                # 在主线程显示错误
+                QMetaObject.invokeMethod(
+                    self,
+                    "_custom_show_balance_error",
+                    Qt.QueuedConnection,
+                    Q_ARG(str, str(e)),
+                    Q_ARG(object, state_tooltip),
+                )
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                usage_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"使用情况查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求使用情况失败: {str(e)}")
+        thread = threading.Thread(target=query_thread, daemon=True)
+        thread.start()
 
-        # total_usage 是以美分为单位，需要除以100转换为美元
-        total_usage_cents = usage_data.get("total_usage", 0.0)
-        used_balance = total_usage_cents / 100.0
+    def _on_balance_dashboard(self):
+        """余额总览 - 并发查询所有 Provider"""
+        dialog = BalanceDashboardDialog(self.main_window, parent=self)
+        dialog.exec_()
 
-        # 计算剩余额度
-        remaining_balance = (
-            float("inf") if is_unlimited else (total_balance - used_balance)
+    def _custom_query_provider_usage(
+        self, base_url: str, api_key: str, provider_name: str = ""
+    ) -> Dict[str, Any]:
+        """查询 Provider 用量（支持 OpenAI API 和 NewAPI）"""
+        return self.main_window.balance_service.query(
+            base_url, api_key, provider_name=provider_name
         )
 
-        return {
-            "total_balance": total_balance,
-            "used_balance": used_balance,
-            "remaining_balance": remaining_balance,
-            "is_unlimited": is_unlimited,
-            "access_until": access_until,
-            "query_start_date": start_date,
-            "query_end_date": end_date,
-        }
-
     @pyqtSlot(str, object, str, object)
     def _custom_show_balance_result(
         self,
@@ -8070,6 +4926,90 @@ class ProviderPage(BasePage):
             env_item.setToolTip(env_vars)
             self.native_table.setItem(row, 3, env_item)
 
+            # 健康状态（最近一次连接测试）
+            health_item = QTableWidgetItem()
+            _apply_native_health_item(
+                health_item,
+                self.health_service.last_result(provider.id),
+                self.health_service.is_testing(provider.id),
+            )
+            self.native_table.setItem(row, 4, health_item)
+
+    def _find_native_row(self, provider_id: str) -> int:
+        for row in range(self.native_table.rowCount()):
+            item = self.native_table.item(row, 0)
+            if item and item.data(Qt.UserRole) == provider_id:
+                return row
+        return -1
+
+    def _set_native_testing(self, provider_ids: List[str]):
+        for provider_id in provider_ids:
+            row = self._find_native_row(provider_id)
+            if row >= 0:
+                _apply_native_health_item(self.native_table.item(row, 4), None, True)
+
+    def _auto_test_native(self):
+        """切换到原生 Provider 标签时，后台测试结果已过期的 Provider"""
+        targets = [
+            target
+            for target in NativeProviderHealthService.collect_targets(
+                self.main_window.opencode_config, self.auth_manager, self.env_detector
+            )
+            if self.health_service.is_stale(target.provider_id)
+        ]
+        self._set_native_testing(self.health_service.test_async(targets))
+
+    def _on_native_test_all(self):
+        """并发测试所有已配置的原生 Provider"""
+        targets = NativeProviderHealthService.collect_targets(
+            self.main_window.opencode_config, self.auth_manager, self.env_detector
+        )
+        if not targets:
+            self.show_warning(
+                tr("common.info"), tr("native_provider.no_testable_providers")
+            )
+            return
+
+        started = self.health_service.test_async(targets)
+        # 已在测试中的 Provider 同样等待其结果
+        self._native_batch_pending = {t.provider_id for t in targets}
+        self._native_batch_total = len(targets)
+        self._native_batch_ok = 0
+        self._set_native_testing(started)
+        InfoBar.info(
+            tr("native_provider.testing"),
+            tr("native_provider.test_all_started", count=len(targets)),
+            parent=self,
+        )
+
+    def _on_native_health_result(self, provider_id: str, result: NativeHealthResult):
+        row = self._find_native_row(provider_id)
+        if row >= 0:
+            _apply_native_health_item(self.native_table.item(row, 4), result, False)
+
+        if provider_id in self._native_manual_tests:
+            self._native_manual_tests.discard(provider_id)
+            if result.ok:
+                self.show_success(
+                    tr("provider.connection_success"),
+                    f"{tr('provider.response_time')}: {result.latency_ms}ms",
+                )
+            else:
+                self.show_error(tr("provider.connection_failed"), result.message)
+
+        if provider_id in self._native_batch_pending:
+            self._native_batch_pending.discard(provider_id)
+            self._native_batch_ok += int(result.ok)
+            if not self._native_batch_pending:
+                self.show_success(
+                    tr("native_provider.test_success"),
+                    tr(
+                        "native_provider.test_all_done",
+                        ok=self._native_batch_ok,
+                        total=self._native_batch_total,
+                    ),
+                )
+
     def _get_selected_native_provider(self) -> Optional[NativeProviderConfig]:
         """获取当前选中的原生Provider"""
         row = self.native_table.currentRow()
@@ -8102,7 +5042,7 @@ class ProviderPage(BasePage):
             )
 
     def _on_native_test(self):
-        """测试连接"""
+        """测试连接（后台执行，结果通过 health_service 返回）"""
         provider = self._get_selected_native_provider()
         if not provider:
             self.show_warning(
@@ -8124,65 +5064,20 @@ class ProviderPage(BasePage):
             )
             return
 
-        api_key = auth_data.get("apiKey", "")
-        if api_key:
-            api_key = _resolve_env_value(api_key)
-
-        if not api_key:
-            self.show_error(
-                tr("provider.test_failed"), tr("provider.api_key_not_found")
-            )
-            return
-
-        # 获取 baseURL
-        config = self.main_window.opencode_config or {}
-        provider_options = (
-            config.get("provider", {}).get(provider.id, {}).get("options", {})
+        target, error = NativeProviderHealthService.resolve_target(
+            provider,
+            self.main_window.opencode_config,
+            {provider.id: auth_data},
+            self.env_detector,
         )
-        base_url = provider_options.get("baseURL", "")
-
-        if not base_url:
-            default_urls = {
-                "anthropic": "https://api.anthropic.com",
-                "openai": "https://api.openai.com",
-                "gemini": "https://generativelanguage.googleapis.com",
-                "xai": "https://api.x.ai",
-                "groq": "https://api.groq.com",
-                "openrouter": "https://openrouter.ai/api",
-                "deepseek": "https://api.deepseek.com",
-                "opencode": "https://api.opencode.ai",
-            }
-            base_url = default_urls.get(provider.id, "")
-
-        if not base_url:
-            self.show_error(
-                tr("provider.test_failed"), tr("provider.cannot_determine_api_address")
-            )
+        if target is None:
+            self.show_error(tr("provider.test_failed"), error)
             return
 
-        test_url = base_url.rstrip("/") + provider.test_endpoint
-
-        # 执行测试
+        self._native_manual_tests.add(provider.id)
+        self._set_native_testing(self.health_service.test_async([target]))
         self.show_warning("测试中", "正在测试连接...")
 
-        start_time = time.time()
-        try:
-            req = urllib.request.Request(test_url)
-            req.add_header("Authorization", f"Bearer {api_key}")
-            req.add_header("x-api-key", api_key)
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                elapsed = int((time.time() - start_time) * 1000)
-                self.show_success(
-                    tr("provider.connection_success"),
-                    f"{tr('provider.response_time')}: {elapsed}ms",
-                )
-        except urllib.error.HTTPError as e:
-            self.show_error(
-                tr("provider.connection_failed"), f"HTTP {e.code}: {e.reason}"
-            )
-        except Exception as e:
-            self.show_error(tr("provider.connection_failed"), str(e))
-
     def _on_native_delete(self):
         """删除原生Provider配置"""
         provider = self._get_selected_native_provider()
@@ -8275,17 +5170,7 @@ class ProviderPage(BasePage):
         base_url = provider_options.get("baseURL", "")
 
         if not base_url:
-            default_urls = {
-                "anthropic": "https://api.anthropic.com",
-                "openai": "https://api.openai.com",
-                "gemini": "https://generativelanguage.googleapis.com",
-                "xai": "https://api.x.ai",
-                "groq": "https://api.groq.com",
-                "openrouter": "https://openrouter.ai/api",
-                "deepseek": "https://api.deepseek.com",
-                "opencode": "https://api.opencode.ai",
-            }
-            base_url = default_urls.get(provider.id, "")
+            base_url = BalanceService.default_base_url(provider.id)
 
         if not base_url:
             self.show_error(
@@ -8303,7 +5188,9 @@ class ProviderPage(BasePage):
         # 在后台线程查询余额
         def query_thread():
             try:
-                usage_data = self._custom_query_provider_usage(base_url, api_key)
+                usage_data = self._custom_query_provider_usage(
+                    base_url, api_key, provider.id
+                )
                 # 在主线程显示结果
                 QMetaObject.invokeMethod(
                     self,
@@ -8541,21 +5428,242 @@ class BalanceResultDialog(BaseDialog):
 
         card_layout.addWidget(other_section)
 
-        # 添加说明文本
-        note_label = CaptionLabel(
-            tr("provider.balance_note"),
-            self,
+        # 添加说明文本
+        note_label = CaptionLabel(
+            tr("provider.balance_note"),
+            self,
+        )
+        note_label.setStyleSheet("color: #888888; font-style: italic;")
+        card_layout.addWidget(note_label)
+
+        layout.addWidget(card)
+        layout.addStretch()
+
+        # 关闭按钮
+        close_btn = PrimaryPushButton(tr("common.close"), self)
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+    def _format_currency(self, value: float) -> str:
+        """格式化货币"""
+        if value == float("inf"):
+            return tr("provider.unlimited")
+        return f"${value:.2f}"
+
+
+class SortableTableItem(QTableWidgetItem):
+    """按 Qt.UserRole 中的数值排序的表格项"""
+
+    def __lt__(self, other):
+        mine = self.data(Qt.UserRole)
+        theirs = other.data(Qt.UserRole)
+        if isinstance(mine, (int, float)) and isinstance(theirs, (int, float)):
+            return mine < theirs
+        return super().__lt__(other)
+
+
+class BalanceDashboardDialog(BaseDialog):
+    """余额总览对话框 - 并发查询所有 Provider 并在一张可排序的表格中展示"""
+
+    COL_PROVIDER = 0
+    COL_API_TYPE = 1
+    COL_TOTAL = 2
+    COL_USED = 3
+    COL_REMAINING = 4
+    COL_SPEND = 5
+    COL_DAYS_LEFT = 6
+    COL_STATUS = 7
+    COLUMN_COUNT = 8
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.service: BalanceService = main_window.balance_service
+        self._targets: List[BalanceTarget] = []
+        self._items: Dict[str, List[QTableWidgetItem]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._pending: set = set()
+
+        self.setWindowTitle(tr("provider.balance_dashboard"))
+        self.setMinimumSize(1040, 480)
+        self._setup_ui()
+
+        self.service.balance_ready.connect(self._on_balance_ready)
+        self.service.balance_failed.connect(self._on_balance_failed)
+        self._start_query(use_cache=True)
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+
+        layout.addWidget(TitleLabel(tr("provider.balance_dashboard"), self))
+
+        self.table = TableWidget(self)
+        self.table.setColumnCount(self.COLUMN_COUNT)
+        self.table.setHorizontalHeaderLabels(
+            [
+                tr("provider.provider_name"),
+                tr("provider.api_type"),
+                tr("provider.key_quota"),
+                tr("provider.used"),
+                tr("provider.key_balance"),
+                tr("provider.spend_per_day"),
+                tr("provider.days_left"),
+                tr("provider.balance_status"),
+            ]
         )
-        note_label.setStyleSheet("color: #888888; font-style: italic;")
-        card_layout.addWidget(note_label)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(self.COL_PROVIDER, QHeaderView.Stretch)
+        for col in (self.COL_API_TYPE, self.COL_TOTAL, self.COL_USED):
+            header.setSectionResizeMode(col, QHeaderView.Fixed)
+            header.resizeSection(col, 100)
+        for col in (self.COL_REMAINING, self.COL_SPEND, self.COL_DAYS_LEFT):
+            header.setSectionResizeMode(col, QHeaderView.Fixed)
+            header.resizeSection(col, 110)
+        header.setSectionResizeMode(self.COL_STATUS, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.doubleClicked.connect(self._on_row_double_clicked)
+        layout.addWidget(self.table, 1)
 
-        layout.addWidget(card)
-        layout.addStretch()
+        footer = QHBoxLayout()
+        self.progress_label = CaptionLabel("", self)
+        footer.addWidget(self.progress_label)
+        footer.addStretch()
+
+        self.refresh_btn = PushButton(FIF.SYNC, tr("provider.refresh_all"), self)
+        self.refresh_btn.clicked.connect(lambda: self._start_query(use_cache=False))
+        footer.addWidget(self.refresh_btn)
 
-        # 关闭按钮
         close_btn = PrimaryPushButton(tr("common.close"), self)
         close_btn.clicked.connect(self.accept)
-        layout.addWidget(close_btn)
+        footer.addWidget(close_btn)
+        layout.addLayout(footer)
+
+    def _start_query(self, use_cache: bool):
+        self._targets = BalanceService.collect_targets(
+            self.main_window.opencode_config, AuthManager()
+        )
+        self._items = {}
+        self._results = {}
+        self._pending = {target.provider_name for target in self._targets}
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        for target in self._targets:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            items = [SortableTableItem("") for _ in range(self.COLUMN_COUNT)]
+            items[self.COL_PROVIDER].setText(target.provider_name)
+            items[self.COL_STATUS].setText(tr("provider.querying_balance") + "...")
+            for col, item in enumerate(items):
+                self.table.setItem(row, col, item)
+            self._items[target.provider_name] = items
+        self.table.setSortingEnabled(True)
+
+        if not self._targets:
+            self.progress_label.setText(tr("provider.no_balance_targets"))
+            return
+
+        self.refresh_btn.setEnabled(False)
+        self._update_progress()
+        self.service.query_all_async(self._targets, use_cache=use_cache)
+
+    def _update_progress(self):
+        self.progress_label.setText(
+            tr(
+                "provider.balance_progress",
+                done=len(self._targets) - len(self._pending),
+                total=len(self._targets),
+            )
+        )
+        if not self._pending:
+            self.refresh_btn.setEnabled(True)
+
+    def _mark_done(self, provider_name: str):
+        # 定时刷新的结果也会到达，只在本轮查询内计数
+        self._pending.discard(provider_name)
+        self._update_progress()
+
+    def _on_balance_ready(self, provider_name: str, usage_data: Dict[str, Any]):
+        items = self._items.get(provider_name)
+        if items is None:
+            return
+        self._results[provider_name] = usage_data
+
+        is_unlimited = usage_data.get("is_unlimited", False)
+        api_type = usage_data.get("api_type", "")
+        items[self.COL_API_TYPE].setText(
+            "NewAPI" if api_type == BalanceService.API_NEWAPI else "OpenAI"
+        )
+        total = float("inf") if is_unlimited else usage_data.get("total_balance", 0)
+        remaining = (
+            float("inf") if is_unlimited else usage_data.get("remaining_balance", 0)
+        )
+        used = usage_data.get("used_balance", 0)
+        for col, value in (
+            (self.COL_TOTAL, total),
+            (self.COL_USED, used),
+            (self.COL_REMAINING, remaining),
+        ):
+            items[col].setText(self._format_currency(value))
+            items[col].setData(Qt.UserRole, value)
+        items[self.COL_REMAINING].setForeground(
+            QColor("#107c10" if remaining > 10 else "#d13438")
+        )
+        trend = self.service.history.trend(provider_name)
+        self._apply_trend(items, trend)
+        if trend.is_spike:
+            items[self.COL_STATUS].setText("⚠ " + tr("provider.spend_spike"))
+            items[self.COL_STATUS].setForeground(QColor("#ff8c00"))
+        else:
+            items[self.COL_STATUS].setText("✓ " + tr("provider.query_complete"))
+        items[self.COL_STATUS].setToolTip("")
+        self._mark_done(provider_name)
+
+    def _apply_trend(self, items: List[QTableWidgetItem], trend: BalanceTrend):
+        """填充日均消耗与预计可用天数（样本不足时显示 -）"""
+        spend = trend.spend_per_day
+        items[self.COL_SPEND].setText("-" if spend is None else f"${spend:.2f}")
+        items[self.COL_SPEND].setData(Qt.UserRole, -1 if spend is None else spend)
+
+        days_left = trend.days_left
+        if days_left is None:
+            items[self.COL_DAYS_LEFT].setText("-")
+            items[self.COL_DAYS_LEFT].setData(Qt.UserRole, float("inf"))
+            return
+        items[self.COL_DAYS_LEFT].setText(
+            tr("provider.days_value", days=f"{days_left:.1f}")
+        )
+        items[self.COL_DAYS_LEFT].setData(Qt.UserRole, days_left)
+        if days_left <= BALANCE_LOW_DAYS_THRESHOLD:
+            items[self.COL_DAYS_LEFT].setForeground(QColor("#d13438"))
+
+    def _on_balance_failed(self, provider_name: str, error: str):
+        items = self._items.get(provider_name)
+        if items is None:
+            return
+        items[self.COL_STATUS].setText("✗ " + error)
+        items[self.COL_STATUS].setToolTip(error)
+        items[self.COL_STATUS].setForeground(QColor("#d13438"))
+        self._mark_done(provider_name)
+
+    def _on_row_double_clicked(self, index):
+        item = self.table.item(index.row(), self.COL_PROVIDER)
+        if item is None:
+            return
+        provider_name = item.text()
+        usage_data = self._results.get(provider_name)
+        if not usage_data:
+            return
+        target = next(
+            (t for t in self._targets if t.provider_name == provider_name), None
+        )
+        dialog = BalanceResultDialog(
+            provider_name, usage_data, target.api_key if target else "", self
+        )
+        dialog.exec_()
 
     def _format_currency(self, value: float) -> str:
         """格式化货币"""
@@ -8563,6 +5671,18 @@ class BalanceResultDialog(BaseDialog):
             return tr("provider.unlimited")
         return f"${value:.2f}"
 
+    def done(self, result):
+        # 对话框关闭后不再接收后台结果
+        for signal, slot in (
+            (self.service.balance_ready, self._on_balance_ready),
+            (self.service.balance_failed, self._on_balance_failed),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        super().done(result)
+
 
 class ModelPresetCustomDialog(BaseDialog):
     """模型配置包自定义弹窗"""
@@ -8713,14 +5833,19 @@ class NativeProviderPage(BasePage):
     """原生 Provider 配置页面 - 管理 OpenCode 官方支持的原生 AI 服务提供商"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("native_provider.title"), parent)
+        super().__init__("native_provider.title", parent)
         self.main_window = main_window
         self.auth_manager = AuthManager()
         self.env_detector = EnvVarDetector()
+        self.health_service: NativeProviderHealthService = (
+            main_window.native_health_service
+        )
+        self._manual_tests: set = set()
         self._setup_ui()
         self._load_data()
         # 连接配置变更信号
         self.main_window.config_changed.connect(self._on_config_changed)
+        self.health_service.result_ready.connect(self._on_health_result)
 
     def _on_config_changed(self):
         """配置变更时刷新列表"""
@@ -8767,13 +5892,14 @@ class NativeProviderPage(BasePage):
 
         # Provider 列表表格
         self.table = TableWidget(self)
-        self.table.setColumnCount(4)
+        self.table.setColumnCount(5)
         self.table.setHorizontalHeaderLabels(
             [
                 tr("native_provider.provider_name"),
                 tr("provider.sdk_type"),
                 tr("native_provider.status"),
                 tr("native_provider.env_vars"),
+                tr("native_provider.health"),
             ]
         )
 
@@ -8784,6 +5910,8 @@ class NativeProviderPage(BasePage):
         header.setSectionResizeMode(2, QHeaderView.Fixed)
         header.resizeSection(2, 80)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
+        header.setSectionResizeMode(4, QHeaderView.Fixed)
+        header.resizeSection(4, 140)
 
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -8852,6 +5980,32 @@ class NativeProviderPage(BasePage):
             env_item.setToolTip(env_vars)
             self.table.setItem(row, 3, env_item)
 
+            # 健康状态（最近一次连接测试）
+            health_item = QTableWidgetItem()
+            _apply_native_health_item(
+                health_item,
+                self.health_service.last_result(provider.id),
+                self.health_service.is_testing(provider.id),
+            )
+            self.table.setItem(row, 4, health_item)
+
+    def _on_health_result(self, provider_id: str, result: NativeHealthResult):
+        """连接测试结果返回时更新对应行"""
+        for row in range(self.table.rowCount()):
+            if self.table.item(row, 0).data(Qt.UserRole) == provider_id:
+                _apply_native_health_item(self.table.item(row, 4), result, False)
+                break
+
+        if provider_id in self._manual_tests:
+            self._manual_tests.discard(provider_id)
+            if result.ok:
+                self.show_success(
+                    tr("provider.connection_success"),
+                    f"{tr('provider.response_time')}: {result.latency_ms}ms",
+                )
+            else:
+                self.show_error(tr("provider.connection_failed"), result.message)
+
     def _get_selected_provider(self) -> Optional[NativeProviderConfig]:
         """获取当前选中的 Provider"""
         row = self.table.currentRow()
@@ -8884,7 +6038,7 @@ class NativeProviderPage(BasePage):
             )
 
     def _on_test(self):
-        """测试连接"""
+        """测试连接（后台执行，结果通过 health_service 返回）"""
         provider = self._get_selected_provider()
         if not provider:
             self.show_warning(
@@ -8898,96 +6052,23 @@ class NativeProviderPage(BasePage):
             )
             return
 
-        # 获取认证信息 - 优先从auth.json，其次从环境变量
-        auth_data = self.auth_manager.get_provider_auth(provider.id)
-        api_key = ""
-
-        if auth_data:
-            api_key = auth_data.get("apiKey", "")
-            if api_key:
-                api_key = _resolve_env_value(api_key)
-
-        # 如果auth.json中没有，尝试从环境变量获取
-        if not api_key:
-            env_vars = self.env_detector.detect_env_vars(provider.id)
-            if env_vars:
-                # 获取第一个检测到的环境变量值
-                api_key = list(env_vars.values())[0]
-
-        if not api_key:
-            self.show_error(
-                tr("provider.test_failed"),
-                tr("provider.api_key_not_found") + "。请先配置Provider或设置环境变量。",
-            )
-            return
-
-        # 获取 baseURL - 优先从NativeProviderConfig的默认值
-        base_url = ""
-
-        # 1. 先从provider的option_fields中获取默认baseURL
-        for field in provider.option_fields:
-            if (
-                field.name == "baseURL"
-                and field.default is not None
-                and field.default != ""
-            ):
-                base_url = field.default
-                break
-
-        # 2. 如果没有默认值，从opencode_config中获取
-        if not base_url:
-            config = self.main_window.opencode_config or {}
-            provider_options = (
-                config.get("provider", {}).get(provider.id, {}).get("options", {})
-            )
-            base_url = provider_options.get("baseURL", "")
-
-        # 3. 最后使用硬编码的默认URL
-        if not base_url:
-            default_urls = {
-                "anthropic": "https://api.anthropic.com",
-                "openai": "https://api.openai.com",
-                "gemini": "https://generativelanguage.googleapis.com",
-                "xai": "https://api.x.ai",
-                "groq": "https://api.groq.com",
-                "openrouter": "https://openrouter.ai/api",
-                "deepseek": "https://api.deepseek.com",
-                "opencode": "https://api.opencode.ai/v1",
-                "zhipuai": "https://open.bigmodel.cn/api/paas/v4",
-                "zhipuai-coding-plan": "https://open.bigmodel.cn/api/coding/paas/v4",
-                "zai": "https://api.z.ai/api/paas/v4",
-                "zai-coding-plan": "https://api.z.ai/api/coding/paas/v4",
-            }
-            base_url = default_urls.get(provider.id, "")
-
-        if not base_url:
-            self.show_error(
-                tr("provider.test_failed"), tr("provider.cannot_determine_api_address")
-            )
+        # 认证信息优先从auth.json，其次从环境变量
+        auth_data = self.auth_manager.get_provider_auth(provider.id) or {}
+        target, error = NativeProviderHealthService.resolve_target(
+            provider,
+            self.main_window.opencode_config,
+            {provider.id: auth_data},
+            self.env_detector,
+        )
+        if target is None:
+            self.show_error(tr("provider.test_failed"), error)
             return
 
-        test_url = base_url.rstrip("/") + provider.test_endpoint
-
-        # 执行测试
-        InfoBar.info("测试中", f"正在测试连接: {test_url}", parent=self)
-
-        start_time = time.time()
-        try:
-            req = urllib.request.Request(test_url)
-            req.add_header("Authorization", f"Bearer {api_key}")
-            req.add_header("x-api-key", api_key)
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                elapsed = int((time.time() - start_time) * 1000)
-                self.show_success(
-                    tr("provider.connection_success"),
-                    f"{tr('provider.response_time')}: {elapsed}ms",
-                )
-        except urllib.error.HTTPError as e:
-            self.show_error(
-                tr("provider.connection_failed"), f"HTTP {e.code}: {e.reason}"
-            )
-        except Exception as e:
-            self.show_error(tr("provider.connection_failed"), str(e))
+        self._manual_tests.add(provider.id)
+        if self.health_service.test_async([target]):
+            row = self.table.currentRow()
+            _apply_native_health_item(self.table.item(row, 4), None, True)
+        InfoBar.info("测试中", f"正在测试连接: {target.test_url}", parent=self)
 
     def _on_delete(self):
         """删除配置"""
@@ -9126,7 +6207,7 @@ class NativeProviderPage(BasePage):
         # 在后台线程查询余额
         def query_thread():
             try:
-                usage_data = self._query_provider_usage(base_url, api_key)
+                usage_data = self._query_provider_usage(base_url, api_key, provider.id)
                 # 在主线程显示结果
                 QMetaObject.invokeMethod(
                     self,
@@ -9149,186 +6230,399 @@ class NativeProviderPage(BasePage):
         thread = threading.Thread(target=query_thread, daemon=True)
         thread.start()
 
-    def _query_provider_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
+    def _query_provider_usage(
+        self, base_url: str, api_key: str, provider_name: str = ""
+    ) -> Dict[str, Any]:
         """查询 Provider 用量（支持 OpenAI API 和 NewAPI）"""
-        import json
-        from datetime import datetime, timedelta
+        return self.main_window.balance_service.query(
+            base_url, api_key, provider_name=provider_name
+        )
 
-        # 规范化 base_url - 移除末尾斜杠
-        base_url = base_url.rstrip("/")
+    @pyqtSlot(str, object, str, object)
+    def _show_balance_result(
+        self,
+        provider_name: str,
+        usage_data: Dict[str, Any],
+        api_key: str,
+        state_tooltip,
+    ):
+        """显示余额查询结果"""
+        state_tooltip.setContent(tr("provider.query_complete"))
+        state_tooltip.setState(True)
+        state_tooltip.close()
 
-        # 先尝试 NewAPI 接口
-        try:
-            return self._query_newapi_usage(base_url, api_key)
-        except Exception as newapi_error:
-            # NewAPI 失败，尝试 OpenAI API
-            pass
+        # 创建结果对话框
+        dialog = BalanceResultDialog(provider_name, usage_data, api_key, self)
+        dialog.exec_()
 
-        # 尝试 OpenAI API 接口
-        try:
-            return self._query_openai_usage(base_url, api_key)
-        except Exception as openai_error:
-            # 两种方式都失败，抛出错误
-            raise Exception(
-                f"余额查询失败。NewAPI: {str(newapi_error)[:50]}... OpenAI API: {str(openai_error)[:50]}..."
-            )
+    @pyqtSlot(str, object)
+    def _show_balance_error(self, error_msg: str, state_tooltip):
+        """显示余额查询错误"""
+        state_tooltip.setContent(tr("provider.query_failed"))
+        state_tooltip.setState(False)
+        state_tooltip.close()
 
-    def _query_newapi_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
-        """查询 NewAPI 用量"""
-        import json
+        self.show_error(
+            tr("common.error"), tr("provider.query_balance_error", error=error_msg)
+        )
 
-        # NewAPI 余额查询端点
-        balance_url = f"{base_url}/api/usage/token"
-        req = urllib.request.Request(balance_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"NewAPI 查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"NewAPI 请求失败: {str(e)}")
+# ==================== 模型 ID 搜索索引 ====================
+class ModelSearchIndex:
+    """模型 ID 搜索索引
 
-        # 解析 NewAPI 响应
-        if not response_data.get("code") or "data" not in response_data:
-            raise Exception("NewAPI 响应格式不正确")
+    每个模型目录只构建一次：小写前缀 Trie 和各分组模式下的分组键在加载时构建，
+    三元组 (trigram) 倒排索引和字符位图在首次子串/模糊查询时构建。
+    查询只检查候选行，不再逐次全量扫描。
+    所有查询返回按原始顺序排列的行号；模糊查询返回按得分排序的 (行号, 得分)。
+    """
 
-        usage_data = response_data["data"]
+    TRIE_MAX_DEPTH = 12  # Trie 深度上限，更长的前缀在节点区间内再比较
+    BOUNDARY_CHARS = "-_/.: "
 
-        # NewAPI 返回的是积分，需要转换为美元
-        # 转换比例: 500,000 积分 = $1
-        CONVERSION_RATE = 500000.0
+    def __init__(
+        self,
+        model_ids: List[str],
+        group_key_func=None,
+        group_modes: Tuple[str, ...] = (),
+    ):
+        self.model_ids = list(model_ids)
+        self.lower_ids = [model_id.lower() for model_id in self.model_ids]
+        self._trigrams: Optional[Dict[str, Tuple[int, ...]]] = None
+        self._char_masks: Optional[Dict[str, int]] = None
+        self._all_mask = (1 << len(self.lower_ids)) - 1
+        self._build_trie()
+
+        self._group_keys: Dict[str, List[str]] = {}
+        self._group_rows: Dict[str, Dict[str, frozenset]] = {}
+        if group_key_func is not None:
+            for mode in group_modes:
+                keys = [group_key_func(model_id, mode) for model_id in self.model_ids]
+                buckets: Dict[str, List[int]] = {}
+                for row, key in enumerate(keys):
+                    buckets.setdefault(key, []).append(row)
+                self._group_keys[mode] = keys
+                self._group_rows[mode] = {
+                    key: frozenset(rows) for key, rows in buckets.items()
+                }
 
-        total_granted_points = usage_data.get("total_granted", 0)
-        total_used_points = usage_data.get("total_used", 0)
-        total_available_points = usage_data.get("total_available", 0)
+        # 增量输入缓存：新查询包含上一次查询时只需在上次结果中继续筛选
+        self._last_contains: Tuple[str, List[int]] = ("", [])
+        self._last_fuzzy: Tuple[str, List[int]] = ("", [])
+
+    def __len__(self) -> int:
+        return len(self.model_ids)
+
+    # ---------- 构建 ----------
+    def _build_trie(self) -> None:
+        # 节点为 [lo, hi, children]，[lo, hi) 是该前缀在 _sorted_rows 中的区间
+        lower_ids = self.lower_ids
+        self._sorted_rows = sorted(range(len(lower_ids)), key=lower_ids.__getitem__)
+        self._trie: list = [0, len(lower_ids), {}]
+        for pos, row in enumerate(self._sorted_rows):
+            node = self._trie
+            for ch in lower_ids[row][: self.TRIE_MAX_DEPTH]:
+                child = node[2].get(ch)
+                if child is None:
+                    child = [pos, pos + 1, {}]
+                    node[2][ch] = child
+                else:
+                    child[1] = pos + 1
+                node = child
+
+    def _build_trigrams(self) -> None:
+        postings: Dict[str, List[int]] = {}
+        for row, text in enumerate(self.lower_ids):
+            for gram in set(map("".join, zip(text, text[1:], text[2:]))):
+                rows = postings.get(gram)
+                if rows is None:
+                    postings[gram] = [row]
+                else:
+                    rows.append(row)
+        self._trigrams = {gram: tuple(rows) for gram, rows in postings.items()}
+
+    def _build_char_masks(self) -> None:
+        # 每个字符一个位图 (Python int)，第 row 位表示该行包含此字符
+        size = (len(self.lower_ids) + 7) // 8
+        buffers: Dict[str, bytearray] = {}
+        for row, text in enumerate(self.lower_ids):
+            byte, bit = divmod(row, 8)
+            for ch in set(text):
+                buffer = buffers.get(ch)
+                if buffer is None:
+                    buffer = buffers[ch] = bytearray(size)
+                buffer[byte] |= 1 << bit
+        self._char_masks = {
+            ch: int.from_bytes(buffer, "little") for ch, buffer in buffers.items()
+        }
 
-        # 转换为美元
-        total_balance = total_granted_points / CONVERSION_RATE
-        used_balance = total_used_points / CONVERSION_RATE
-        remaining_balance = total_available_points / CONVERSION_RATE
+    # ---------- 分组 ----------
+    def group_keys(self, mode: str) -> List[str]:
+        return self._group_keys.get(mode, [])
 
-        # 判断是否为无限额度
-        is_unlimited = usage_data.get("unlimited_quota", False)
+    def group_rows(self, mode: str, key: str) -> frozenset:
+        return self._group_rows.get(mode, {}).get(key, frozenset())
 
-        return {
-            "api_type": "newapi",
-            "token_name": usage_data.get("name", ""),
-            "total_balance": total_balance,
-            "used_balance": used_balance,
-            "remaining_balance": remaining_balance,
-            "is_unlimited": is_unlimited,
-            "access_until": usage_data.get("expires_at", 0),
-            "query_start_date": "",
-            "query_end_date": "",
-        }
+    def group_names(self, mode: str) -> List[str]:
+        return list(self._group_rows.get(mode, {}).keys())
 
-    def _query_openai_usage(self, base_url: str, api_key: str) -> Dict[str, Any]:
-        """查询 OpenAI API 用量"""
-        import json
-        from datetime import datetime, timedelta
+    # ---------- 查询 ----------
+    @staticmethod
+    def _rows_from_mask(mask: int) -> List[int]:
+        bits = bin(mask)
+        if bits.count("1") <= 64:
+            rows = []
+            while mask:
+                low = mask & -mask
+                rows.append(low.bit_length() - 1)
+                mask ^= low
+            return rows
+        return [row for row, bit in enumerate(bits[:1:-1]) if bit == "1"]
+
+    def _char_candidates(self, text: str) -> List[int]:
+        """包含 text 中全部字符的行（不考虑顺序）"""
+        if self._char_masks is None:
+            self._build_char_masks()
+        mask = self._all_mask
+        for ch in set(text):
+            mask &= self._char_masks.get(ch, 0)
+            if not mask:
+                return []
+        return self._rows_from_mask(mask)
+
+    def prefix_rows(self, prefix: str) -> List[int]:
+        prefix = prefix.lower()
+        node = self._trie
+        for ch in prefix[: self.TRIE_MAX_DEPTH]:
+            node = node[2].get(ch)
+            if node is None:
+                return []
+        rows = self._sorted_rows[node[0] : node[1]]
+        if len(prefix) > self.TRIE_MAX_DEPTH:
+            rows = [row for row in rows if self.lower_ids[row].startswith(prefix)]
+        return sorted(rows)
+
+    def contains_rows(self, text: str) -> List[int]:
+        text = text.lower()
+        if not text:
+            return list(range(len(self.lower_ids)))
+        last_text, last_rows = self._last_contains
+        if last_text and last_text in text:
+            candidates = last_rows
+        elif len(text) >= 3:
+            if self._trigrams is None:
+                self._build_trigrams()
+            postings = []
+            for gram in {text[i : i + 3] for i in range(len(text) - 2)}:
+                posting = self._trigrams.get(gram)
+                if posting is None:
+                    self._last_contains = (text, [])
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = sorted(set(postings[0]).intersection(*postings[1:]))
+        else:
+            candidates = self._char_candidates(text)
+        lower_ids = self.lower_ids
+        rows = [row for row in candidates if text in lower_ids[row]]
+        self._last_contains = (text, rows)
+        return rows
+
+    def regex_rows(self, regex) -> List[int]:
+        """正则无法使用索引，按原始 ID 顺序逐个匹配"""
+        return [
+            row for row, model_id in enumerate(self.model_ids) if regex.search(model_id)
+        ]
 
-        # 智能处理 /v1 路径 - 如果已经包含 /v1，就不再添加
-        if base_url.endswith("/v1"):
-            api_base = base_url
+    def fuzzy(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """模糊匹配，按得分从高到低返回 (行号, 得分)
+
+        query 中的字符需按顺序出现在模型 ID 中（子序列），
+        命中单词边界、连续命中、前缀命中的结果排名更靠前，
+        例如 "cl35son" 可匹配 "claude-3-5-sonnet"。
+        """
+        query = "".join(query.lower().split())
+        if not query:
+            return []
+        last_query, last_rows = self._last_fuzzy
+        if last_query and query.startswith(last_query):
+            candidates = last_rows
         else:
-            api_base = f"{base_url}/v1"
+            candidates = self._char_candidates(query)
 
-        # 1. 查询订阅信息
-        subscription_url = f"{api_base}/dashboard/billing/subscription"
-        req = urllib.request.Request(subscription_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
+        # 先用编译好的正则做子序列判定，再对命中行打分
+        subsequence = re.compile(".*?".join(re.escape(ch) for ch in query))
+        lower_ids = self.lower_ids
+        matched = [row for row in candidates if subsequence.search(lower_ids[row])]
+        self._last_fuzzy = (query, matched)
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                subscription_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"订阅信息查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求订阅信息失败: {str(e)}")
+        scored = [(row, self._fuzzy_score(query, lower_ids[row])) for row in matched]
+        scored.sort(key=lambda item: (-item[1], len(lower_ids[item[0]]), item[0]))
+        return scored[:limit] if limit else scored
 
-        total_balance = subscription_data.get("hard_limit_usd", 0.0)
-        access_until = subscription_data.get("access_until", 0)
-        is_unlimited = total_balance >= 100000000.0
+    @classmethod
+    def _fuzzy_score(cls, query: str, text: str) -> float:
+        boundaries = cls.BOUNDARY_CHARS
+        score = 0.0
+        pos = 0
+        prev = -2
+        for i, ch in enumerate(query):
+            idx = text.find(ch, pos)
+            if idx > 0 and idx != prev + 1 and text[idx - 1] not in boundaries:
+                # 若稍后的单词边界处也有该字符且其余字符仍能匹配，优先对齐到边界
+                later = text.find(ch, idx + 1)
+                while later > 0:
+                    if text[later - 1] in boundaries:
+                        if cls._is_subsequence(query[i + 1 :], text, later + 1):
+                            idx = later
+                        break
+                    later = text.find(ch, later + 1)
+            if idx == prev + 1:
+                score += 5
+            if idx == 0 or text[idx - 1] in boundaries:
+                score += 8
+            score -= (idx - pos) * 0.2
+            prev = idx
+            pos = idx + 1
+        if text.startswith(query):
+            score += 20
+        elif query in text:
+            score += 10
+        # 查询覆盖的比例越高（ID 越短）排名越靠前
+        return score + 15 * len(query) / len(text)
 
-        # 2. 查询使用情况（最近100天）
-        now = datetime.now()
-        start = now - timedelta(days=100)
-        start_date = start.strftime("%Y-%m-%d")
-        end_date = now.strftime("%Y-%m-%d")
+    @staticmethod
+    def _is_subsequence(query: str, text: str, start: int) -> bool:
+        remaining = iter(text[start:])
+        return all(ch in remaining for ch in query)
 
-        usage_url = f"{api_base}/dashboard/billing/usage?start_date={start_date}&end_date={end_date}"
-        req = urllib.request.Request(usage_url)
-        req.add_header("Authorization", f"Bearer {api_key}")
-        req.add_header("Content-Type", "application/json")
 
-        try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                usage_data = json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"使用情况查询失败: {e.code} - {error_body}")
-        except Exception as e:
-            raise Exception(f"请求使用情况失败: {str(e)}")
+# ==================== 模型选择列表 (Model/View) ====================
+class ModelSelectListModel(QAbstractListModel):
+    """模型 ID 列表模型 - 勾选状态保存在集合中，不为每行创建控件"""
+
+    check_changed = pyqtSignal()
+
+    def __init__(self, model_ids: List[str], parent=None):
+        super().__init__(parent)
+        self._model_ids = list(model_ids)
+        self._checked: set = set()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._model_ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        model_id = self._model_ids[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return model_id
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if model_id in self._checked else Qt.Unchecked
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        model_id = self._model_ids[index.row()]
+        if value == Qt.Checked:
+            self._checked.add(model_id)
+        else:
+            self._checked.discard(model_id)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_changed.emit()
+        return True
+
+    def model_ids(self) -> List[str]:
+        return self._model_ids
+
+    def is_checked(self, model_id: str) -> bool:
+        return model_id in self._checked
+
+    def checked_count(self) -> int:
+        return len(self._checked)
+
+    def set_checked(self, model_ids: List[str], checked: bool) -> None:
+        """批量设置勾选状态，只发出一次 dataChanged"""
+        if checked:
+            self._checked.update(model_ids)
+        else:
+            self._checked.difference_update(model_ids)
+        if self._model_ids:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._model_ids) - 1), [Qt.CheckStateRole]
+            )
+        self.check_changed.emit()
+
+
+class ModelSelectFilterProxy(QSortFilterProxyModel):
+    """按预先计算好的可见行集合过滤，过滤时不再逐行做字符串匹配"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accepted_rows: Optional[set] = None
+        self._ranks: Optional[Dict[int, int]] = None
+        # 勾选变化不需要重新排序/过滤
+        self.setDynamicSortFilter(False)
+
+    def set_accepted_rows(
+        self, rows: Optional[set], ranks: Optional[Dict[int, int]] = None
+    ) -> None:
+        """设置可见的源行号集合，None 表示全部可见；ranks 为源行号 -> 排名"""
+        if rows == self._accepted_rows and ranks == self._ranks:
+            return
+        self._accepted_rows = rows
+        self._ranks = ranks
+        # invalidate() 一次性重建映射，比 invalidateFilter() 逐段增删行快得多
+        self.invalidate()
+        self.sort(0 if ranks else -1)
 
-        # total_usage 是以美分为单位，需要除以100转换为美元
-        total_usage_cents = usage_data.get("total_usage", 0.0)
-        used_balance = total_usage_cents / 100.0
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        return self._accepted_rows is None or source_row in self._accepted_rows
 
-        # 计算剩余额度
-        remaining_balance = (
-            float("inf") if is_unlimited else (total_balance - used_balance)
-        )
+    def lessThan(self, left, right) -> bool:
+        if not self._ranks:
+            return left.row() < right.row()
+        return self._ranks.get(left.row(), 0) < self._ranks.get(right.row(), 0)
 
-        return {
-            "api_type": "openai",
-            "token_name": "",
-            "total_balance": total_balance,
-            "used_balance": used_balance,
-            "remaining_balance": remaining_balance,
-            "is_unlimited": is_unlimited,
-            "access_until": access_until,
-            "query_start_date": start_date,
-            "query_end_date": end_date,
-        }
 
-    @pyqtSlot(str, object, str, object)
-    def _show_balance_result(
-        self,
-        provider_name: str,
-        usage_data: Dict[str, Any],
-        api_key: str,
-        state_tooltip,
-    ):
-        """显示余额查询结果"""
-        state_tooltip.setContent(tr("provider.query_complete"))
-        state_tooltip.setState(True)
-        state_tooltip.close()
+class ModelCheckItemDelegate(ListItemDelegate):
+    """绘制式复选框委托 - 点击整行即可切换勾选"""
 
-        # 创建结果对话框
-        dialog = BalanceResultDialog(provider_name, usage_data, api_key, self)
-        dialog.exec_()
+    ROW_HEIGHT = 36
 
-    @pyqtSlot(str, object)
-    def _show_balance_error(self, error_msg: str, state_tooltip):
-        """显示余额查询错误"""
-        state_tooltip.setContent(tr("provider.query_failed"))
-        state_tooltip.setState(False)
-        state_tooltip.close()
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
 
-        self.show_error(
-            tr("common.error"), tr("provider.query_balance_error", error=error_msg)
-        )
+    def editorEvent(self, event, model, option, index) -> bool:
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and option.rect.contains(event.pos())
+        ):
+            state = index.data(Qt.CheckStateRole)
+            model.setData(
+                index,
+                Qt.Unchecked if state == Qt.Checked else Qt.Checked,
+                Qt.CheckStateRole,
+            )
+            return True
+        return False
 
 
 class ModelSelectDialog(BaseDialog):
     """模型选择对话框"""
 
+    # 分组/过滤模式，与下拉框选项顺序一致
+    GROUP_MODES = ("厂商识别", "前缀分组", "首字母")
+    MATCH_MODES = ("包含", "前缀", "正则", "模糊")
+    FILTER_DEBOUNCE_MS = 150
+
     def __init__(
         self, main_window, provider_name: str, model_ids: List[str], parent=None
     ):
@@ -9337,11 +6631,18 @@ class ModelSelectDialog(BaseDialog):
         self.provider_name = provider_name
         self.model_ids = list(dict.fromkeys(model_ids or []))
         self._selected: List[str] = []
-        self._items = []
-        self._row_widgets: Dict[str, Dict[str, Any]] = {}
         self._visible_model_ids: List[str] = []
         self._bulk_controls: Dict[str, Dict[str, Any]] = {}
         self._batch_config: Dict[str, Any] = {}
+        # 目录加载时构建一次搜索索引（含各分组模式的分组键）
+        self._index = ModelSearchIndex(
+            self.model_ids, self._get_group_key, self.GROUP_MODES
+        )
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._refresh_models)
 
         self.setWindowTitle(tr("provider.model_select_title"))
         self.setMinimumSize(900, 560)
@@ -9378,6 +6679,7 @@ class ModelSelectDialog(BaseDialog):
                 tr("provider.filter_contains"),
                 tr("provider.filter_prefix"),
                 tr("provider.filter_regex"),
+                tr("provider.filter_fuzzy"),
             ]
         )
         self.match_mode_combo.currentTextChanged.connect(self._on_filter_changed)
@@ -9385,7 +6687,8 @@ class ModelSelectDialog(BaseDialog):
 
         self.keyword_edit = LineEdit(self)
         self.keyword_edit.setPlaceholderText(tr("provider.keyword_filter"))
-        self.keyword_edit.textChanged.connect(self._on_filter_changed)
+        # 关键字输入防抖，停止输入后再过滤
+        self.keyword_edit.textChanged.connect(self._filter_timer.start)
         filter_layout.addWidget(self.keyword_edit, 1)
 
         self.clear_btn = PushButton(tr("provider.clear_filter"), self)
@@ -9407,10 +6710,17 @@ class ModelSelectDialog(BaseDialog):
         self.category_list.currentTextChanged.connect(self._on_category_list_changed)
         content_layout.addWidget(self.category_list)
 
-        self.model_list = ListWidget(self)
-        self.model_list.setSpacing(6)
+        self.list_model = ModelSelectListModel(self.model_ids, self)
+        self.list_model.check_changed.connect(self._on_check_changed)
+        self.proxy_model = ModelSelectFilterProxy(self)
+        self.proxy_model.setSourceModel(self.list_model)
+
+        self.model_list = ListView(self)
         self.model_list.setUniformItemSizes(True)
         self.model_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.model_list.setFocusPolicy(Qt.NoFocus)
+        self.model_list.setItemDelegate(ModelCheckItemDelegate(self.model_list))
+        self.model_list.setModel(self.proxy_model)
         content_layout.addWidget(self.model_list, 1)
 
         layout.addLayout(content_layout, 1)
@@ -9525,6 +6835,7 @@ class ModelSelectDialog(BaseDialog):
         self._update_batch_controls()
 
     def _on_filter_changed(self):
+        self._filter_timer.stop()
         self._refresh_models()
 
     def _clear_filters(self):
@@ -9545,13 +6856,22 @@ class ModelSelectDialog(BaseDialog):
         self.category_list.setCurrentRow(0)
         self.category_list.blockSignals(False)
 
+    def _current_group_mode(self) -> str:
+        index = self.group_mode_combo.currentIndex()
+        return self.GROUP_MODES[index] if 0 <= index < len(self.GROUP_MODES) else ""
+
+    def _current_match_mode(self) -> str:
+        index = self.match_mode_combo.currentIndex()
+        return self.MATCH_MODES[index] if 0 <= index < len(self.MATCH_MODES) else ""
+
     def _group_models(self) -> Dict[str, List[str]]:
-        mode = self.group_mode_combo.currentText()
-        groups: Dict[str, List[str]] = {}
-        for model_id in self.model_ids:
-            key = self._get_group_key(model_id, mode)
-            groups.setdefault(key, []).append(model_id)
-        return groups
+        mode = self._current_group_mode()
+        return {
+            key: [
+                self.model_ids[row] for row in sorted(self._index.group_rows(mode, key))
+            ]
+            for key in self._index.group_names(mode)
+        }
 
     def _get_group_key(self, model_id: str, mode: str) -> str:
         lower = model_id.lower()
@@ -9647,74 +6967,14 @@ class ModelSelectDialog(BaseDialog):
             "variants": {},
         }
 
-    def _on_model_check_changed(self, model_id: str, state: int):
-        if state == Qt.Checked:
-            if model_id not in self._selected:
-                self._selected.append(model_id)
-        else:
-            if model_id in self._selected:
-                self._selected.remove(model_id)
-        self._update_count_label()
-        self._sync_select_all_state()
-
-    def _toggle_model_check(self, model_id: str):
-        row = self._row_widgets.get(model_id)
-        if not row:
-            return
-        checkbox = row.get("checkbox")
-        if checkbox is None:
-            return
-        checkbox.setChecked(not checkbox.isChecked())
-
-    def _build_model_row(self, model_id: str):
-        row_widget = QWidget(self.model_list)
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(6, 4, 6, 4)
-        row_layout.setSpacing(8)
-
-        check = CheckBox("", row_widget)
-        check.setChecked(model_id in self._selected)
-        check.stateChanged.connect(
-            lambda state, mid=model_id: self._on_model_check_changed(mid, state)
-        )
-        row_layout.addWidget(check)
-
-        name_label = BodyLabel(model_id, row_widget)
-        name_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        name_label.mousePressEvent = (
-            lambda event, mid=model_id: self._toggle_model_check(mid)
-        )
-        row_layout.addWidget(name_label, 1)
-
-        row_widget.mousePressEvent = (
-            lambda event, mid=model_id: self._toggle_model_check(mid)
-        )
-
-        item = QListWidgetItem(self.model_list)
-        item.setSizeHint(row_widget.sizeHint())
-        self.model_list.setItemWidget(item, row_widget)
-
-        self._row_widgets[model_id] = {
-            "item": item,
-            "checkbox": check,
-        }
-        self._items.append(model_id)
-
     def _refresh_models(self):
-        self.model_list.blockSignals(True)
-        self.model_list.clear()
-        self._items = []
-        self._visible_model_ids = []
-        self._row_widgets = {}
-        self.model_list.setFocusPolicy(Qt.NoFocus)
-
         group = (
             self.category_list.currentItem().text()
             if self.category_list.currentItem()
             else tr("provider.all_categories")
         )
         keyword = self.keyword_edit.text().strip()
-        match_mode = self.match_mode_combo.currentText()
+        match_mode = self._current_match_mode()
         pattern = keyword.lower()
         regex = None
         if pattern and match_mode == "正则":
@@ -9723,75 +6983,68 @@ class ModelSelectDialog(BaseDialog):
             except re.error:
                 regex = None
 
-        for model_id in self.model_ids:
-            if group != tr("provider.all_categories"):
-                if (
-                    self._get_group_key(model_id, self.group_mode_combo.currentText())
-                    != group
-                ):
-                    continue
-            if pattern:
-                if match_mode == "包含":
-                    if pattern not in model_id.lower():
-                        continue
-                elif match_mode == "前缀":
-                    if not model_id.lower().startswith(pattern):
-                        continue
-                elif match_mode == "正则":
-                    if not regex or not regex.search(model_id):
-                        continue
-            self._build_model_row(model_id)
-            self._visible_model_ids.append(model_id)
-
-        self.model_list.blockSignals(False)
+        rows: Optional[List[int]] = None  # None 表示全部可见
+        ranks: Optional[Dict[int, int]] = None
+        if pattern:
+            if match_mode == "包含":
+                rows = self._index.contains_rows(pattern)
+            elif match_mode == "前缀":
+                rows = self._index.prefix_rows(pattern)
+            elif match_mode == "正则":
+                rows = self._index.regex_rows(regex) if regex else []
+            elif match_mode == "模糊":
+                rows = [row for row, _ in self._index.fuzzy(pattern)]
+                ranks = {row: rank for rank, row in enumerate(rows)}
+        if group != tr("provider.all_categories"):
+            group_rows = self._index.group_rows(self._current_group_mode(), group)
+            if rows is None:
+                rows = sorted(group_rows)
+            else:
+                rows = [row for row in rows if row in group_rows]
+
+        if rows is None:
+            self.proxy_model.set_accepted_rows(None)
+            rows = range(len(self.model_ids))
+        else:
+            self.proxy_model.set_accepted_rows(set(rows), ranks)
+        self._visible_model_ids = [self.model_ids[row] for row in rows]
+
         self._update_count_label()
         self._sync_select_all_state()
         self._update_batch_controls()
+        self.empty_label.setVisible(not self._visible_model_ids)
 
-        if not self._items:
-            self.empty_label.setVisible(True)
-        else:
-            self.empty_label.setVisible(False)
+    def _on_check_changed(self):
+        self._update_count_label()
+        self._sync_select_all_state()
 
     def _on_select_all_changed(self, state):
-        if not self._items:
+        if not self._visible_model_ids:
             return
-        target_state = state == Qt.Checked
-        for model_id, row in self._row_widgets.items():
-            checkbox = row.get("checkbox")
-            if checkbox is None:
-                continue
-            checkbox.blockSignals(True)
-            checkbox.setChecked(target_state)
-            checkbox.blockSignals(False)
-            if target_state:
-                if model_id not in self._selected:
-                    self._selected.append(model_id)
-            else:
-                if model_id in self._selected:
-                    self._selected.remove(model_id)
-        self._update_count_label()
+        self.list_model.set_checked(self._visible_model_ids, state == Qt.Checked)
 
     def _sync_select_all_state(self):
-        if not self._items:
-            self.select_all_check.setChecked(False)
-            return
-        checked = sum(1 for model_id in self._items if model_id in self._selected)
-        if checked == len(self._items):
-            self.select_all_check.setChecked(True)
-        else:
-            self.select_all_check.setChecked(False)
+        all_checked = bool(self._visible_model_ids) and all(
+            self.list_model.is_checked(model_id) for model_id in self._visible_model_ids
+        )
+        # 仅同步显示状态，不触发全选/全不选
+        self.select_all_check.blockSignals(True)
+        self.select_all_check.setChecked(all_checked)
+        self.select_all_check.blockSignals(False)
 
     def _update_count_label(self):
-        total = len(self._items)
-        selected = len(self._selected)
+        total = len(self._visible_model_ids)
+        selected = self.list_model.checked_count()
         self.count_label.setText(
             tr("provider.selected_count", selected=selected, total=total)
         )
 
     def _on_confirm(self):
-        selected = [model_id for model_id in self._items if model_id in self._selected]
-        self._selected = selected
+        self._selected = [
+            model_id
+            for model_id in self._visible_model_ids
+            if self.list_model.is_checked(model_id)
+        ]
         self.accept()
 
     def get_selected_model_ids(self) -> List[str]:
@@ -10205,16 +7458,32 @@ class ModelPage(BasePage):
     """Model 管理页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("model.title"), parent)
+        super().__init__("model.title", parent)
         self.main_window = main_window
+        # provider_name -> 进行中请求的进度提示
+        self._fetch_tooltips: Dict[str, StateToolTip] = {}
         self._setup_ui()
         self._load_providers()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        service = self._get_fetch_service()
+        service.items_fetched.connect(self._on_model_items_fetched)
+        service.fetch_cancelled.connect(self._on_fetch_cancelled)
+        # 订阅 Provider 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
 
-    def _on_config_changed(self):
-        """配置变更时刷新 Provider 列表和模型"""
+    def _on_config_changed(self, paths):
+        """配置变更时刷新 Provider 列表和模型
+
+        只有 Provider 增删或改名时才重建下拉框；否则仅在当前 Provider 变化时重载模型
+        """
         current_provider = self.provider_combo.currentData()  # 获取当前的 provider_key
+        names = ConfigChangeTracker.changed_keys(paths, ("opencode", "provider"))
+        if names is not None and all(len(p) > 3 and p[3] != "name" for p in paths):
+            if current_provider in names:
+                self._load_models(current_provider)
+            return
+
         self._load_providers()
         # 尝试恢复之前选中的 Provider
         for i in range(self.provider_combo.count()):
@@ -10509,55 +7778,77 @@ class ModelPage(BasePage):
         # 构建模型列表API URL
         models_url = base_url.rstrip("/") + "/models"
 
-        InfoBar.info("获取中", f"正在从 {models_url} 获取模型列表...", parent=self)
-
-        try:
-            req = urllib.request.Request(models_url)
+        service = self._get_fetch_service()
+        if not service.fetch_items_async(provider_name, models_url, api_key):
+            # 同一 Provider 已有进行中的请求，合并为一次
+            InfoBar.info(
+                tr("common.info"),
+                tr("model.fetch_in_progress", name=provider_name),
+                parent=self,
+            )
+            return
 
-            # 如果有API Key，添加认证头
-            if api_key:
-                req.add_header("Authorization", f"Bearer {api_key}")
-                req.add_header("x-api-key", api_key)
+        state_tooltip = StateToolTip(
+            tr("model.fetching_models"), models_url, self.window()
+        )
+        state_tooltip.move(state_tooltip.getSuitablePos())
+        # 关闭按钮即取消请求
+        state_tooltip.closedSignal.connect(
+            partial(self._on_fetch_tooltip_closed, provider_name)
+        )
+        state_tooltip.show()
+        self._fetch_tooltips[provider_name] = state_tooltip
+
+    def _get_fetch_service(self) -> ModelFetchService:
+        """获取主窗口共享的模型获取服务"""
+        service = getattr(self.main_window, "_model_fetch_service", None)
+        if service is None:
+            service = ModelFetchService(self.main_window)
+            self.main_window._model_fetch_service = service
+        return service
+
+    def _on_fetch_tooltip_closed(self, provider_name: str):
+        """进度提示被关闭时取消请求"""
+        if provider_name in self._fetch_tooltips:
+            self._get_fetch_service().cancel(provider_name, "items")
+
+    def _on_fetch_cancelled(self, provider_name: str, kind: str):
+        if kind != "items":
+            return
+        state_tooltip = self._fetch_tooltips.pop(provider_name, None)
+        if state_tooltip is None:
+            return
+        state_tooltip.close()
+        InfoBar.info(
+            tr("common.info"),
+            tr("model.fetch_cancelled", name=provider_name),
+            parent=self,
+        )
 
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
+    def _on_model_items_fetched(self, provider_name: str, models: list, error: str):
+        """后台获取完成（主线程）"""
+        state_tooltip = self._fetch_tooltips.pop(provider_name, None)
+        if state_tooltip is None:
+            # 不是本页面发起的请求
+            return
+        state_tooltip.close()
 
-                # 解析模型列表 - 支持多种格式
-                models = []
-                if isinstance(data, dict):
-                    if "data" in data:
-                        models = data["data"]
-                    elif "models" in data:
-                        models = data["models"]
-                elif isinstance(data, list):
-                    models = data
-
-                if not models:
-                    self.show_warning("获取完成", "API返回的模型列表为空")
-                    return
+        if error:
+            self.show_error(tr("provider.fetch_failed"), error)
+            return
 
-                # 显示模型选择对话框
-                dialog = FetchedModelsDialog(
-                    self.main_window, provider_name, models, parent=self
-                )
-                if dialog.exec_():
-                    self._load_models(provider_name)
-                    self.show_success("添加成功", f"已添加 {dialog.added_count} 个模型")
+        if not models:
+            self.show_warning("获取完成", "API返回的模型列表为空")
+            return
 
-        except urllib.error.HTTPError as e:
-            if e.code in (401, 403):
-                # 认证失败
-                if not api_key:
-                    error_msg = f"HTTP {e.code}: {e.reason}\n\n该API需要认证。请先配置Provider的API Key。"
-                else:
-                    error_msg = (
-                        f"HTTP {e.code}: {e.reason}\n\nAPI Key可能无效或已过期。"
-                    )
-            else:
-                error_msg = f"HTTP {e.code}: {e.reason}"
-            self.show_error(tr("provider.fetch_failed"), error_msg)
-        except Exception as e:
-            self.show_error(tr("provider.fetch_failed"), str(e))
+        # 显示模型选择对话框
+        dialog = FetchedModelsDialog(
+            self.main_window, provider_name, models, parent=self
+        )
+        if dialog.exec_():
+            if self.provider_combo.currentData() == provider_name:
+                self._load_models(provider_name)
+            self.show_success("添加成功", f"已添加 {dialog.added_count} 个模型")
 
 
 class ModelDialog(BaseDialog):
@@ -11302,16 +8593,12 @@ class ModelDialog(BaseDialog):
                 "output": output_modalities if output_modalities else ["text"],
             }
 
-        # 保存前进行配置校验，避免写入错误结构
+        # 保存前校验本次编辑的 Provider，避免写入错误结构（其他子树未变化，无需重新校验）
         temp_provider = dict(provider)
         temp_models = dict(temp_provider.get("models", {}))
         temp_models[model_id] = model_data
         temp_provider["models"] = temp_models
-        temp_config = dict(config)
-        temp_providers = dict(temp_config.get("provider", {}))
-        temp_providers[self.provider_name] = temp_provider
-        temp_config["provider"] = temp_providers
-        issues = ConfigValidator.validate_opencode_config(temp_config)
+        issues = ConfigValidator.validate_provider(self.provider_name, temp_provider)
         errors = [i for i in issues if i["level"] == "error"]
         if errors:
             msg = "\n".join(f"• {e['message']}" for e in errors[:8])
@@ -11639,16 +8926,20 @@ class MCPPage(BasePage):
     """MCP 服务器管理页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("mcp.title"), parent)
+        super().__init__("mcp.title", parent)
         self.main_window = main_window
         self._setup_ui()
         self._load_data()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅 MCP 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "mcp"), self._on_config_changed
+        )
 
-    def _on_config_changed(self):
-        """配置变更时刷新数据"""
-        self._load_data()
+    def _on_config_changed(self, paths):
+        """MCP 配置变更时只刷新变化的行"""
+        self._refresh_changed_rows(
+            paths, ("opencode", "mcp"), self.table, self._fill_row, self._load_data
+        )
 
     def _setup_ui(self):
         # 工具栏
@@ -11728,28 +9019,32 @@ class MCPPage(BasePage):
 
             row = self.table.rowCount()
             self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(name))
+            self._fill_row(row, name, data)
 
-            mcp_type = "remote" if "url" in data else "local"
-            self.table.setItem(row, 1, QTableWidgetItem(mcp_type))
+    def _fill_row(self, row: int, name: str, data: Dict) -> None:
+        """填充一行（整表加载与增量刷新共用）"""
+        self.table.setItem(row, 0, QTableWidgetItem(name))
 
-            enabled = data.get("enabled", True)
-            self.table.setItem(row, 2, QTableWidgetItem("✓" if enabled else "✗"))
-            self.table.setItem(row, 3, QTableWidgetItem(str(data.get("timeout", 5000))))
-
-            if mcp_type == "local":
-                cmd = data.get("command", [])
-                self.table.setItem(
-                    row,
-                    4,
-                    QTableWidgetItem(
-                        " ".join(cmd) if isinstance(cmd, list) else str(cmd)
-                    ),
-                )
-            else:
-                self.table.setItem(row, 4, QTableWidgetItem(data.get("url", "")))
+        mcp_type = "remote" if "url" in data else "local"
+        self.table.setItem(row, 1, QTableWidgetItem(mcp_type))
+
+        enabled = data.get("enabled", True)
+        self.table.setItem(row, 2, QTableWidgetItem("✓" if enabled else "✗"))
+        self.table.setItem(row, 3, QTableWidgetItem(str(data.get("timeout", 5000))))
+
+        if mcp_type == "local":
+            cmd = data.get("command", [])
+            self.table.setItem(
+                row,
+                4,
+                QTableWidgetItem(" ".join(cmd) if isinstance(cmd, list) else str(cmd)),
+            )
+        else:
+            self.table.setItem(row, 4, QTableWidgetItem(data.get("url", "")))
 
     def _open_awesome_mcp(self):
+        import webbrowser
+
         webbrowser.open("https://github.com/punkpeye/awesome-mcp-servers")
 
     def _on_ohmy_mcp(self):
@@ -12169,14 +9464,12 @@ class MCPDialog(BaseDialog):
         self.is_edit = mcp_name is not None
 
         if self.is_edit:
-            self.setWindowTitle(tr("mcp.dialog.edit_title"))
+            title_key = "mcp.dialog.edit_title"
+        elif mcp_type == "local":
+            title_key = "mcp.dialog.add_local_title"
         else:
-            title = (
-                tr("mcp.dialog.add_local_title")
-                if mcp_type == "local"
-                else tr("mcp.dialog.add_remote_title")
-            )
-            self.setWindowTitle(title)
+            title_key = "mcp.dialog.add_remote_title"
+        bind_tr(self, title_key, "windowTitle")
         self.setMinimumWidth(550)
         self._setup_ui()
 
@@ -12184,9 +9477,6 @@ class MCPDialog(BaseDialog):
             self._load_mcp_data()
         self._update_preview()
 
-        # 监听语言切换事件
-        _lang_manager.language_changed.connect(self._on_language_changed)
-
     def _setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setSpacing(12)
@@ -12232,7 +9522,8 @@ class MCPDialog(BaseDialog):
         layout.addLayout(name_layout)
 
         # 启用状态
-        self.enabled_check = CheckBox(tr("mcp.dialog.enable_checkbox"), self)
+        self.enabled_check = CheckBox(self)
+        bind_tr(self.enabled_check, "mcp.dialog.enable_checkbox")
         self.enabled_check.setChecked(True)
         self.enabled_check.setToolTip(get_tooltip("mcp_enabled"))
         layout.addWidget(self.enabled_check)
@@ -12285,7 +9576,8 @@ class MCPDialog(BaseDialog):
         layout.addLayout(timeout_layout)
 
         # 附加信息（默认收起）
-        self.extra_group = QGroupBox(tr("mcp.additional_info"), self)
+        self.extra_group = QGroupBox(self)
+        bind_tr(self.extra_group, "mcp.additional_info", "title")
         self.extra_group.setCheckable(True)
         self.extra_group.setChecked(False)
         self.extra_group.setToolTip(tr("dialog.tooltip_toggle_expand"))
@@ -12332,7 +9624,8 @@ class MCPDialog(BaseDialog):
         layout.addWidget(self.extra_group)
 
         # JSON 预览
-        self.preview_group = QGroupBox(tr("mcp.full_json_preview"), self)
+        self.preview_group = QGroupBox(self)
+        bind_tr(self.preview_group, "mcp.full_json_preview", "title")
         preview_layout = QVBoxLayout(self.preview_group)
         preview_layout.setSpacing(8)
 
@@ -12340,14 +9633,14 @@ class MCPDialog(BaseDialog):
         preview_header.addWidget(
             BodyLabel(tr("mcp.full_mcp_config_preview"), self.preview_group)
         )
-        self.preview_wrap_check = CheckBox(
-            tr("mcp.include_wrapper"), self.preview_group
-        )
+        self.preview_wrap_check = CheckBox(self.preview_group)
+        bind_tr(self.preview_wrap_check, "mcp.include_wrapper")
         self.preview_wrap_check.setChecked(False)
         self.preview_wrap_check.stateChanged.connect(lambda: self._update_preview())
         preview_header.addWidget(self.preview_wrap_check)
         preview_header.addStretch()
-        self.format_btn = PushButton(tr("cli_export.format_json"), self.preview_group)
+        self.format_btn = PushButton(self.preview_group)
+        bind_tr(self.format_btn, "cli_export.format_json")
         self.format_btn.clicked.connect(self._on_format_preview)
         preview_header.addWidget(self.format_btn)
         preview_layout.addLayout(preview_header)
@@ -12376,11 +9669,13 @@ class MCPDialog(BaseDialog):
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
 
-        self.cancel_btn = PushButton(tr("common.cancel"), self)
+        self.cancel_btn = PushButton(self)
+        bind_tr(self.cancel_btn, "common.cancel")
         self.cancel_btn.clicked.connect(self.reject)
         btn_layout.addWidget(self.cancel_btn)
 
-        self.save_btn = PrimaryPushButton(tr("common.save"), self)
+        self.save_btn = PrimaryPushButton(self)
+        bind_tr(self.save_btn, "common.save")
         self.save_btn.clicked.connect(self._on_save)
         btn_layout.addWidget(self.save_btn)
 
@@ -12650,32 +9945,6 @@ class MCPDialog(BaseDialog):
         self._update_preview()
         self.preview_edit.moveCursor(QTextCursor.Start)
 
-    def _on_language_changed(self, lang_code: str) -> None:
-        """处理语言切换事件"""
-        # 更新窗口标题
-        if self.is_edit:
-            self.setWindowTitle(tr("mcp.dialog.edit_title"))
-        else:
-            title = (
-                tr("mcp.dialog.add_local_title")
-                if self.mcp_type == "local"
-                else tr("mcp.dialog.add_remote_title")
-            )
-            self.setWindowTitle(title)
-
-        # 更新 QGroupBox 标题
-        self.extra_group.setTitle(tr("mcp.additional_info"))
-        self.preview_group.setTitle(tr("mcp.full_json_preview"))
-
-        # 更新 CheckBox 文本
-        self.preview_wrap_check.setText(tr("mcp.include_wrapper"))
-        self.enabled_check.setText(tr("mcp.dialog.enable_checkbox"))
-
-        # 更新按钮文本
-        self.cancel_btn.setText(tr("common.cancel"))
-        self.save_btn.setText(tr("common.save"))
-        self.format_btn.setText(tr("cli_export.format_json"))
-
 
 # ==================== Agent 分组管理 UI 组件 ====================
 
@@ -12689,9 +9958,30 @@ class AgentGroupWidget(QWidget):
         super().__init__(parent)
         self.group_manager = group_manager
         self.current_group_id = None
+        self._main_window = None
         self._init_ui()
         self._refresh_groups()
 
+    def bind_config(self, main_window) -> None:
+        """跟随配置变更自动选中与当前启用 Agent 匹配的分组"""
+        self._main_window = main_window
+        for prefix in (("opencode", "agent"), ("ohmy", "agents")):
+            main_window.config_tracker.subscribe(prefix, self._sync_current_group)
+        self._sync_current_group()
+
+    def _sync_current_group(self, paths=None) -> None:
+        if self._main_window is None:
+            return
+        # 分组签名已预先建立索引，每次配置变更只需一次哈希查找
+        group_id = self.group_manager.get_current_group_match(
+            self._main_window.opencode_config or {},
+            self._main_window.ohmyopencode_config or {},
+        )
+        if self.group_combo.findData(group_id) < 0:
+            # 分组可能在其他页面新建，下拉框尚未包含
+            self._refresh_groups()
+        self.set_current_group(group_id)
+
     def _init_ui(self):
         """初始化UI"""
         layout = QHBoxLayout(self)
@@ -12724,23 +10014,20 @@ class AgentGroupWidget(QWidget):
         self.group_combo.clear()
 
         # 添加"无分组"选项
-        self.group_combo.addItem(tr("agent_group.no_group"), None)
+        self.group_combo.addItem(tr("agent_group.no_group"), userData=None)
 
         # 添加预设模板
         presets = self.group_manager.get_presets()
         for preset in presets:
             icon = preset.get("icon", "")
             name = preset.get("name", preset["id"])
-            self.group_combo.addItem(f"{icon} {name}", preset["id"])
+            self.group_combo.addItem(f"{icon} {name}", userData=preset["id"])
 
-        # 添加自定义分组
-        groups = self.group_manager.list_groups()
-        if groups:
-            self.group_combo.insertSeparator(self.group_combo.count())
-            for group in groups:
-                icon = group.get("icon", "📁")
-                name = group["name"]
-                self.group_combo.addItem(f"{icon} {name}", group["id"])
+        # 添加自定义分组（Fluent ComboBox 不支持分隔项）
+        for group in self.group_manager.list_groups():
+            icon = group.get("icon", "📁")
+            name = group["name"]
+            self.group_combo.addItem(f"{icon} {name}", userData=group["id"])
 
     def _on_group_selected(self, index):
         """分组选择变化"""
@@ -12757,13 +10044,90 @@ class AgentGroupWidget(QWidget):
         dialog = AgentGroupDialog(self.group_manager, self)
         if dialog.exec_():
             self._refresh_groups()
+            self._sync_current_group()
 
     def set_current_group(self, group_id: Optional[str]):
         """设置当前分组"""
-        for i in range(self.group_combo.count()):
-            if self.group_combo.itemData(i) == group_id:
-                self.group_combo.setCurrentIndex(i)
-                break
+        index = self.group_combo.findData(group_id)
+        if index >= 0:
+            self.group_combo.setCurrentIndex(index)
+            self.current_group_id = group_id
+
+
+class GroupApplyPreviewDialog(BaseDialog):
+    """应用分组前的变更预览"""
+
+    KIND_KEYS = {
+        "added": "group_apply.added",
+        "removed": "group_apply.removed",
+        "changed": "group_apply.changed",
+    }
+
+    def __init__(self, plan: GroupApplyPlan, parent=None):
+        super().__init__(parent)
+        self.plan = plan
+        self.setWindowTitle(tr("group_apply.preview_title", name=plan.group["name"]))
+        self.setMinimumSize(720, 420)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+
+        layout.addWidget(
+            BodyLabel(
+                tr(
+                    "group_apply.summary",
+                    count=len(self.plan.changes),
+                    files=", ".join(self.plan.targets()),
+                ),
+                self,
+            )
+        )
+
+        table = TableWidget(self)
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels(
+            [
+                tr("group_apply.kind"),
+                tr("group_apply.config"),
+                tr("group_apply.location"),
+                tr("group_apply.value"),
+            ]
+        )
+        table.setRowCount(len(self.plan.changes))
+        for row, change in enumerate(self.plan.changes):
+            table.setItem(row, 0, QTableWidgetItem(tr(self.KIND_KEYS[change.kind])))
+            table.setItem(row, 1, QTableWidgetItem(change.target))
+            table.setItem(row, 2, QTableWidgetItem(".".join(change.path)))
+            table.setItem(row, 3, QTableWidgetItem(self._value_text(change)))
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        layout.addWidget(table, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        cancel_btn = PushButton(tr("common.cancel"), self)
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+
+        apply_btn = PrimaryPushButton(tr("agent_group.apply"), self)
+        apply_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(apply_btn)
+        layout.addLayout(btn_layout)
+
+    @staticmethod
+    def _value_text(change: ConfigChange) -> str:
+        if change.kind == "added":
+            return ConfigChange.brief(change.new)
+        if change.kind == "removed":
+            return ConfigChange.brief(change.old)
+        return f"{ConfigChange.brief(change.old)} → {ConfigChange.brief(change.new)}"
 
 
 class AgentGroupDialog(QDialog):
@@ -13630,26 +10994,30 @@ class OpenCodeAgentPage(BasePage):
     """OpenCode 原生 Agent 配置页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("agent.title"), parent)
+        super().__init__("agent.title", parent)
         self.main_window = main_window
 
-        # 初始化分组管理器
-        config_dir = Path.home() / ".config" / "opencode"
-        self.group_manager = AgentGroupManager(config_dir)
+        # 共享的分组管理器
+        self.group_manager = self.main_window.get_agent_group_manager()
 
         self._setup_ui()
         self._load_data()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅 Agent 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "agent"), self._on_config_changed
+        )
 
-    def _on_config_changed(self):
-        """配置变更时刷新数据"""
-        self._load_data()
+    def _on_config_changed(self, paths):
+        """Agent 配置变更时只刷新变化的行"""
+        self._refresh_changed_rows(
+            paths, ("opencode", "agent"), self.table, self._fill_row, self._load_data
+        )
 
     def _setup_ui(self):
         # Agent分组选择器
         self.group_widget = AgentGroupWidget(self.group_manager, self)
         self.group_widget.group_changed.connect(self._on_group_applied)
+        self.group_widget.bind_config(self.main_window)
         self._layout.addWidget(self.group_widget)
 
         # 添加分隔线
@@ -13714,17 +11082,19 @@ class OpenCodeAgentPage(BasePage):
 
             row = self.table.rowCount()
             self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-            self.table.setItem(row, 1, QTableWidgetItem(data.get("mode", "subagent")))
-            self.table.setItem(
-                row, 2, QTableWidgetItem(str(data.get("temperature", "")))
-            )
-            desc = data.get("description", "")
-            if not desc:
-                desc = PRESET_OPENCODE_AGENTS.get(name, {}).get("description", "")
-            desc_item = QTableWidgetItem(desc[:50] + "..." if len(desc) > 50 else desc)
-            desc_item.setToolTip(desc)
-            self.table.setItem(row, 3, desc_item)
+            self._fill_row(row, name, data)
+
+    def _fill_row(self, row: int, name: str, data: Dict) -> None:
+        """填充一行（整表加载与增量刷新共用）"""
+        self.table.setItem(row, 0, QTableWidgetItem(name))
+        self.table.setItem(row, 1, QTableWidgetItem(data.get("mode", "subagent")))
+        self.table.setItem(row, 2, QTableWidgetItem(str(data.get("temperature", ""))))
+        desc = data.get("description", "")
+        if not desc:
+            desc = PRESET_OPENCODE_AGENTS.get(name, {}).get("description", "")
+        desc_item = QTableWidgetItem(desc[:50] + "..." if len(desc) > 50 else desc)
+        desc_item.setToolTip(desc)
+        self.table.setItem(row, 3, desc_item)
 
     def _on_add(self):
         dialog = OpenCodeAgentDialog(self.main_window, parent=self)
@@ -13773,54 +11143,14 @@ class OpenCodeAgentPage(BasePage):
                 )
 
     def _on_group_applied(self, group_id: str):
-        """应用Agent分组"""
-        try:
-            # 获取当前配置
-            opencode_config = self.main_window.opencode_config or {}
-            omo_config = self.main_window.omo_config or {}
-
-            # 检查Oh My OpenCode是否安装
-            has_omo = (
-                hasattr(self.main_window, "ohmyopencode_config")
-                and self.main_window.ohmyopencode_config is not None
-            )
-
-            # 应用分组
-            opencode_config, omo_config = self.group_manager.apply_group(
-                group_id, opencode_config, omo_config
+        """预览并应用Agent分组（保存后的变更通知会刷新表格）"""
+        if self.main_window.apply_agent_group(group_id, self):
+            group = self.group_manager.find_group(group_id)
+            self.show_success(
+                tr("common.success"),
+                tr("agent_group.dialog.apply_info_content").format(name=group["name"]),
             )
 
-            # 保存配置
-            self.main_window.opencode_config = opencode_config
-            self.main_window.save_opencode_config()
-
-            # 只有在OMO安装时才保存OMO配置
-            if has_omo:
-                self.main_window.omo_config = omo_config
-                self.main_window.save_omo_config()
-
-            # 刷新显示
-            self._load_data()
-
-            # 显示成功提示
-            group = self.group_manager.get_group(group_id)
-            if not group:
-                # 尝试从预设中获取
-                for preset in self.group_manager.get_presets():
-                    if preset["id"] == group_id:
-                        group = preset
-                        break
-
-            if group:
-                self.show_success(
-                    tr("common.success"),
-                    tr("agent_group.dialog.apply_info_content").format(
-                        name=group["name"]
-                    ),
-                )
-        except Exception as e:
-            self.show_error(tr("common.error"), f"应用分组失败: {str(e)}")
-
 
 class OpenCodeAgentDialog(BaseDialog):
     """OpenCode Agent 编辑对话框 - 完整版本"""
@@ -14268,7 +11598,7 @@ class PermissionPage(BasePage):
     """权限管理页面 - 包含权限设置和上下文压缩"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("permission.title"), parent)
+        super().__init__("permission.title", parent)
         self.main_window = main_window
         self._setup_ui()
         self._load_data()
@@ -14613,13 +11943,15 @@ class HelpPage(BasePage):
     """帮助页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("help.title"), parent)
+        super().__init__("help.title", parent)
         self.main_window = main_window
         # 隐藏页面标题
         self.title_label.hide()
         self._setup_ui()
 
     def _setup_ui(self):
+        import webbrowser
+
         # ===== 关于卡片 - 左右布局 =====
         about_card = SimpleCardWidget(self)
         about_card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -14758,33 +12090,80 @@ class MainWindow(FluentWindow):
         super().__init__()
 
         # 加载语言偏好
-        lang_code = _lang_manager._load_language_preference()
-        _lang_manager.set_language(lang_code)
+        with _startup_profiler.phase("load language"):
+            lang_code = _lang_manager._load_language_preference()
+            _lang_manager.set_language(lang_code)
 
         # 备份管理器（需要在冲突检测之前初始化）
         self.backup_manager = BackupManager()
 
+        # 余额查询服务（各页面共享接口类型记忆与结果缓存）
+        self.balance_service = BalanceService(self)
+
+        # 原生 Provider 连接测试服务（各页面共享最近一次测试结果）
+        self.native_health_service = NativeProviderHealthService(self)
+
+        # 配置验证服务（后台线程验证，启动检测与首页手动检测共用）
+        self.validation_service = ConfigValidationService(self)
+        self.validation_service.finished.connect(self._on_validation_finished)
+
+        # 配置变更跟踪（按路径通知各页面，页面只刷新自己展示且发生变化的部分）
+        # 同时记录编辑历史，支持跨页面撤销/重做和命名检查点
+        self.config_tracker = ConfigChangeTracker(self)
+        # 本次运行中已保存过的配置文件：首次保存前做一次整文件备份，
+        # 之后的修改由编辑历史负责回退
+        self._saved_config_paths: set = set()
+        QShortcut(QKeySequence.Undo, self, self.undo_config_change)
+        QShortcut(QKeySequence.Redo, self, self.redo_config_change)
+
         # 检测配置文件冲突（同时存在 .json 和 .jsonc）
-        self._check_config_conflicts()
+        with _startup_profiler.phase("_check_config_conflicts"):
+            self._check_config_conflicts()
+
+        # 回滚上次中断的多文件写入（如应用分组时进程退出），再加载配置
+        recovered = ConfigTransaction.recover(ConfigPaths.get_journal_dir())
+        if recovered:
+            files = ", ".join(path.name for path in recovered)
+            QTimer.singleShot(
+                0,
+                lambda: InfoBar.warning(
+                    tr("common.warning"),
+                    tr("group_apply.recovered", files=files),
+                    duration=8000,
+                    parent=self,
+                ),
+            )
 
         # 加载配置
-        self.opencode_config = ConfigManager.load_json(
-            ConfigPaths.get_opencode_config()
-        )
-        self.ohmyopencode_config = ConfigManager.load_json(
-            ConfigPaths.get_ohmyopencode_config()
-        )
+        with _startup_profiler.phase("load config"):
+            self.opencode_config = ConfigManager.load_json(
+                ConfigPaths.get_opencode_config()
+            )
+            self.ohmyopencode_config = ConfigManager.load_json(
+                ConfigPaths.get_ohmyopencode_config()
+            )
 
         if self.opencode_config is None:
             self.opencode_config = {}
         if self.ohmyopencode_config is None:
             self.ohmyopencode_config = {}
+        self.config_tracker.reset(self._tracked_configs())
+
+        # 全局模型注册表：Provider 配置变化时失效，需在各页面订阅之前注册，
+        # 保证页面刷新时取到的已是新模型列表
+        self.model_registry = ModelRegistry(self.opencode_config)
+        self.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_provider_config_changed
+        )
+        # Agent 分组管理器：各页面共享，避免多个实例各自写回过期的分组文件
+        self._agent_group_manager: Optional[AgentGroupManager] = None
 
         # 初始化文件指纹
         self._refresh_file_hashes()
 
         # 启动时验证配置
-        self._validate_config_on_startup()
+        with _startup_profiler.phase("_validate_config_on_startup"):
+            self._validate_config_on_startup()
 
         # 版本检查器
         self.version_checker = VersionChecker(
@@ -14799,8 +12178,13 @@ class MainWindow(FluentWindow):
         self._ohmy_file_hash = None
         self._external_change_pending: Dict[str, Optional[str]] = {}
 
-        self._init_window()
-        self._init_navigation()
+        # 延迟构建的页面: 属性名 -> 占位部件
+        self._lazy_pages: Dict[str, LazyPage] = {}
+
+        with _startup_profiler.phase("_init_window"):
+            self._init_window()
+        with _startup_profiler.phase("_init_navigation"):
+            self._init_navigation()
 
         # 版本检查定时器
         if STARTUP_VERSION_CHECK_ENABLED:
@@ -14822,6 +12206,15 @@ class MainWindow(FluentWindow):
         self._file_watch_timer.timeout.connect(self._check_external_file_changes)
         self._file_watch_timer.start()
 
+        # 余额定时刷新（结果写入余额历史，即将耗尽或消耗突增时提示）
+        self._balance_alerts: set = set()
+        self.balance_service.balance_ready.connect(self._on_balance_sample)
+        self._balance_refresh_timer = QTimer(self)
+        self._balance_refresh_timer.setInterval(BALANCE_REFRESH_INTERVAL_MS)
+        self._balance_refresh_timer.timeout.connect(self._refresh_balances)
+        if BALANCE_AUTO_REFRESH_ENABLED:
+            self._balance_refresh_timer.start()
+
     def _init_window(self):
         self.setWindowTitle(f"OCCM - OpenCode Config Manager v{APP_VERSION}")
         self.setMinimumSize(900, 600)  # 减小最小高度
@@ -14847,8 +12240,13 @@ class MainWindow(FluentWindow):
         # 立即应用深色背景
         self._apply_dark_background()
 
-        # 监听主题变化
-        qconfig.themeChanged.connect(self._apply_dark_background)
+        # 监听主题变化：同一轮内的多次变更合并为一次批量刷新
+        self._theme_refresh_timer = QTimer(self)
+        self._theme_refresh_timer.setSingleShot(True)
+        self._theme_refresh_timer.setInterval(THEME_REFRESH_DELAY_MS)
+        self._theme_refresh_timer.timeout.connect(self._apply_theme_batch)
+        qconfig.themeChanged.connect(self._theme_refresh_timer.start)
+        qconfig.themeChangedFinished.connect(self._theme_refresh_timer.start)
 
         # 创建系统主题监听器
         self.themeListener = SystemThemeListener(self)
@@ -14882,13 +12280,21 @@ class MainWindow(FluentWindow):
         self._add_language_switcher()
 
     def _update_nav_style(self):
-        """根据窗口高度更新导航栏样式"""
+        """根据窗口高度更新导航栏样式（尺寸档位不变时跳过）"""
         height = self.height()
         # 根据窗口高度计算菜单项高度 (600px -> 24px, 900px -> 32px)
         item_height = max(24, min(32, int(height / 28)))
         font_size = max(11, min(13, int(height / 70)))
 
-        self.navigationInterface.setStyleSheet(f"""
+        stylesheet = StyleSheetCache.get(
+            ("nav", item_height, font_size),
+            lambda: self._build_nav_style(item_height, font_size),
+        )
+        StyleSheetCache.apply(self.navigationInterface, stylesheet)
+
+    @staticmethod
+    def _build_nav_style(item_height: int, font_size: int) -> str:
+        return f"""
             * {{
                 font-weight: normal;
             }}
@@ -14914,43 +12320,53 @@ class MainWindow(FluentWindow):
                 height: 1px;
                 margin: 1px 8px;
             }}
-        """)
+        """
 
     def resizeEvent(self, event):
         """窗口大小改变时更新导航栏"""
         super().resizeEvent(event)
         self._update_nav_style()
 
+    @staticmethod
+    def _build_stacked_style() -> str:
+        return f"""
+            StackedWidget {{
+                background-color: {UIConfig.DARK_BG};
+                border: 1px solid {UIConfig.DARK_BORDER};
+                border-right: none;
+                border-bottom: none;
+                border-top-left-radius: 10px;
+            }}
+        """
+
+    def _apply_theme_batch(self):
+        """批量应用主题：暂停重绘，所有样式更新完成后统一刷新一次"""
+        self.setUpdatesEnabled(False)
+        try:
+            self._apply_dark_background()
+        finally:
+            self.setUpdatesEnabled(True)
+
     def _apply_dark_background(self):
         """应用自定义背景样式"""
-        if isDarkTheme():
-            # 深色主题 - 应用自定义深黑色背景
-            if hasattr(self, "stackedWidget"):
-                self.stackedWidget.setStyleSheet(f"""
-                    StackedWidget {{
-                        background-color: {UIConfig.DARK_BG};
-                        border: 1px solid {UIConfig.DARK_BORDER};
-                        border-right: none;
-                        border-bottom: none;
-                        border-top-left-radius: 10px;
-                    }}
-                """)
-
-            # 导航栏背景
-            if hasattr(self, "navigationInterface"):
-                self._update_nav_style()
-        else:
+        if hasattr(self, "stackedWidget"):
             # 浅色主题 - 清除自定义样式，使用默认
-            if hasattr(self, "stackedWidget"):
-                self.stackedWidget.setStyleSheet("")
-            if hasattr(self, "navigationInterface"):
-                self._update_nav_style()
-
-        # 更新监控页面统计卡片样式
-        if hasattr(self, "monitor_page") and hasattr(
-            self.monitor_page, "_apply_stat_card_theme"
-        ):
-            self.monitor_page._apply_stat_card_theme()
+            stylesheet = ""
+            if isDarkTheme():
+                # 深色主题 - 应用自定义深黑色背景
+                stylesheet = StyleSheetCache.get(
+                    ("stacked", True), self._build_stacked_style
+                )
+            StyleSheetCache.apply(self.stackedWidget, stylesheet)
+
+        # 导航栏样式与主题无关，尺寸档位未变时不会重复应用
+        if hasattr(self, "navigationInterface"):
+            self._update_nav_style()
+
+        # 更新监控页面统计卡片样式（页面尚未构建时无需更新）
+        monitor_page = self._loaded_page("monitor_page")
+        if monitor_page is not None:
+            monitor_page._apply_stat_card_theme()
 
     def _add_language_switcher(self):
         """添加语言切换按钮到导航栏底部"""
@@ -14969,146 +12385,158 @@ class MainWindow(FluentWindow):
         self._refresh_all_ui_texts()
 
     def _refresh_all_ui_texts(self):
-        """刷新所有界面文本（动态切换语言）- 优化版"""
-        # 1. 更新窗口标题
-        self.setWindowTitle(f"OCCM - OpenCode Config Manager v{APP_VERSION}")
-
-        # 2. 保存当前选中的页面
-        current_widget = self.stackedWidget.currentWidget()
-        current_index = self.stackedWidget.currentIndex()
-
-        # 3. 快速替换导航栏
-        old_nav = self.navigationInterface
-        self.navigationInterface = old_nav.__class__(self, True, True)
-        self.hBoxLayout.replaceWidget(old_nav, self.navigationInterface)
-
-        # 重新初始化导航栏设置
-        self.navigationInterface.setExpandWidth(200)
-        self.navigationInterface.setCollapsible(True)
-        nav_font = QFont()
-        nav_font.setWeight(QFont.Normal)
-        self.navigationInterface.setFont(nav_font)
-        self._update_nav_style()
+        """刷新界面文本（动态切换语言）
 
-        # 重新添加所有导航项
-        self._init_navigation()
-
-        # 删除旧导航栏
-        old_nav.deleteLater()
-
-        # 4. 立即恢复当前页面
-        if current_index >= 0:
-            self.stackedWidget.setCurrentIndex(current_index)
-
-        # 5. 立即展开导航栏（无动画）
-        self.navigationInterface.expand(useAni=False)
-
-        # 6. 温和地刷新当前页面 - 只调用刷新方法，不强制重绘
-        if current_widget:
-            # 如果页面有刷新方法，调用它
-            if hasattr(current_widget, "_refresh_ui_texts"):
-                current_widget._refresh_ui_texts()
-
-            # 如果页面有加载数据方法，重新加载
-            if hasattr(current_widget, "_load_data"):
-                current_widget._load_data()
+        导航项、页面标题等通过 bind_tr() 登记的文本由 TranslationRegistry
+        在语言切换信号中增量更新。页面内其余由 tr() 生成的文本尚未登记，
+        因此丢弃所有已构建的页面：当前页面立即按新语言重建，其余页面在下次
+        显示时重建，切换耗时与已构建页面的数量无关。
+        """
+        self.setWindowTitle(f"OCCM - OpenCode Config Manager v{APP_VERSION}")
+        for lazy_page in self._lazy_pages.values():
+            lazy_page.reset()
 
     def _init_navigation(self):
+        # 除首页外的页面均延迟构建，首次访问或空闲预加载时才创建
+        self._lazy_pages = {}
+
         # ===== 顶部工具栏区域 =====
         # 添加首页/状态页面
-        self.home_page = HomePage(self)
-        self.addSubInterface(self.home_page, FIF.HOME, tr("menu.home"))
+        # 首页同样通过占位部件注册（切换语言时可重建），但立即构建
+        self._add_lazy_page("home_page", HomePage, FIF.HOME, "menu.home")
+        self._lazy_pages["home_page"].page()
 
         # ===== OpenCode 配置分组 =====
         # Provider 页面（已合并自定义和原生Provider）
-        self.provider_page = ProviderPage(self)
-        self.addSubInterface(self.provider_page, FIF.PEOPLE, tr("menu.provider"))
+        self._add_lazy_page("provider_page", ProviderPage, FIF.PEOPLE, "menu.provider")
 
         # 原生 Provider 页面（已合并到 Provider 页面）
-        # self.native_provider_page = NativeProviderPage(self)
-        # self.addSubInterface(
-        #     self.native_provider_page, FIF.GLOBE, tr("menu.native_provider")
+        # self._add_lazy_page(
+        #     "native_provider_page",
+        #     NativeProviderPage,
+        #     FIF.GLOBE,
+        #     "menu.native_provider",
         # )
 
         # Model 页面
-        self.model_page = ModelPage(self)
-        self.addSubInterface(self.model_page, FIF.ROBOT, tr("menu.model"))
+        self._add_lazy_page("model_page", ModelPage, FIF.ROBOT, "menu.model")
 
         # MCP 页面
-        self.mcp_page = MCPPage(self)
-        self.addSubInterface(self.mcp_page, FIF.CLOUD, tr("menu.mcp"))
+        self._add_lazy_page("mcp_page", MCPPage, FIF.CLOUD, "menu.mcp")
 
         # OpenCode Agent 页面
-        self.opencode_agent_page = OpenCodeAgentPage(self)
-        self.addSubInterface(
-            self.opencode_agent_page, FIF.COMMAND_PROMPT, tr("menu.agent")
+        self._add_lazy_page(
+            "opencode_agent_page",
+            OpenCodeAgentPage,
+            FIF.COMMAND_PROMPT,
+            "menu.agent",
         )
 
         # Permission 页面（包含权限设置和上下文压缩）
-        self.permission_page = PermissionPage(self)
-        self.addSubInterface(
-            self.permission_page, FIF.CERTIFICATE, tr("menu.permission")
+        self._add_lazy_page(
+            "permission_page", PermissionPage, FIF.CERTIFICATE, "menu.permission"
         )
 
         # Skill 页面
-        self.skill_page = SkillPage(self)
-        self.addSubInterface(self.skill_page, FIF.BOOK_SHELF, tr("menu.skill"))
+        self._add_lazy_page("skill_page", SkillPage, FIF.BOOK_SHELF, "menu.skill")
 
         # Plugin 页面（包含插件管理和Oh My OpenCode管理）
-        self.plugin_page = PluginPage(self)
-        self.addSubInterface(self.plugin_page, FIF.APPLICATION, "Plugin")
+        self._add_lazy_page("plugin_page", PluginPage, FIF.APPLICATION, "Plugin")
 
         # Rules 页面
-        self.rules_page = RulesPage(self)
-        self.addSubInterface(self.rules_page, FIF.DOCUMENT, tr("menu.rules"))
+        self._add_lazy_page("rules_page", RulesPage, FIF.DOCUMENT, "menu.rules")
 
         # ===== 工具分组 =====
         # Import 页面
-        self.import_page = ImportPage(self)
-        self.addSubInterface(self.import_page, FIF.DOWNLOAD, tr("menu.import"))
+        self._add_lazy_page("import_page", ImportPage, FIF.DOWNLOAD, "menu.import")
 
         # CLI 导出页面
-        self.cli_export_page = CLIExportPage(self)
-        self.addSubInterface(self.cli_export_page, FIF.SEND, tr("menu.export"))
+        self._add_lazy_page("cli_export_page", CLIExportPage, FIF.SEND, "menu.export")
 
         # 监控页面
-        self.monitor_page = MonitorPage(self)
-        self.addSubInterface(self.monitor_page, FIF.SPEED_HIGH, tr("menu.monitor"))
+        self._add_lazy_page("monitor_page", MonitorPage, FIF.SPEED_HIGH, "menu.monitor")
 
         # ===== 工具菜单 =====
         self.navigationInterface.addSeparator()
 
         # 主题切换按钮
-        self.navigationInterface.addItem(
+        theme_item = self.navigationInterface.addItem(
             routeKey="theme",
             icon=FIF.CONSTRACT,
             text=tr("menu.theme"),
             onClick=self._toggle_theme,
         )
+        bind_tr(theme_item, "menu.theme")
 
         # Backup 按钮
-        self.navigationInterface.addItem(
+        backup_item = self.navigationInterface.addItem(
             routeKey="backup",
             icon=FIF.HISTORY,
             text=tr("menu.backup"),
             onClick=self._show_backup_dialog,
         )
+        bind_tr(backup_item, "menu.backup")
 
         # Help 页面
-        self.help_page = HelpPage(self)
-        self.addSubInterface(self.help_page, FIF.HELP, tr("menu.help"))
+        self._add_lazy_page("help_page", HelpPage, FIF.HELP, "menu.help")
 
         # 语言切换按钮
-        self.navigationInterface.addItem(
+        language_item = self.navigationInterface.addItem(
             routeKey="language",
             icon=FIF.GLOBE,
             text=tr("menu.language"),
             onClick=self._on_language_switch,
         )
+        bind_tr(language_item, "menu.language")
 
         # 默认展开导航栏（在所有导航项添加完成后）
         QTimer.singleShot(100, lambda: self.navigationInterface.expand(useAni=False))
 
+        # 空闲时逐个预加载页面
+        if LAZY_PAGE_PREFETCH_ENABLED:
+            QTimer.singleShot(LAZY_PAGE_PREFETCH_DELAY_MS, self._prefetch_next_page)
+
+    def _add_lazy_page(self, attr_name: str, page_cls, icon, text_key: str):
+        """注册延迟构建的页面，构建后可通过 self.<attr_name> 访问
+
+        text_key 为导航项文字的翻译键，切换语言时自动更新
+        """
+        lazy_page = LazyPage(attr_name, lambda: page_cls(self), self)
+        self._lazy_pages[attr_name] = lazy_page
+        item = self.addSubInterface(lazy_page, icon, tr(text_key))
+        bind_tr(item, text_key)
+
+    def __getattr__(self, name: str):
+        # 访问尚未构建的延迟页面属性时立即构建
+        lazy_pages = self.__dict__.get("_lazy_pages")
+        if lazy_pages and name in lazy_pages:
+            return lazy_pages[name].page()
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def _loaded_page(self, attr_name: str) -> Optional[QWidget]:
+        """获取已构建的页面，未构建时返回 None（不触发构建）"""
+        lazy_page = self._lazy_pages.get(attr_name)
+        return lazy_page.loaded_page() if lazy_page else None
+
+    def _prefetch_next_page(self):
+        """预加载下一个尚未构建的页面，每次只构建一个以免阻塞界面"""
+        for lazy_page in list(self._lazy_pages.values()):
+            if not lazy_page.is_loaded:
+                lazy_page.page()
+                QTimer.singleShot(
+                    LAZY_PAGE_PREFETCH_INTERVAL_MS, self._prefetch_next_page
+                )
+                return
+
+    def switchTo(self, interface: QWidget):
+        # 延迟页面的真实页面嵌在占位部件中，切换到占位部件
+        parent = interface.parentWidget()
+        if isinstance(parent, LazyPage):
+            interface = parent
+        super().switchTo(interface)
+
     def _show_backup_dialog(self):
         """显示备份管理对话框"""
         dialog = BackupDialog(self, parent=self)
@@ -15116,12 +12544,15 @@ class MainWindow(FluentWindow):
 
     def save_opencode_config(self):
         """保存 OpenCode 配置"""
+        path = ConfigPaths.get_opencode_config()
         success, jsonc_warning = ConfigManager.save_json(
-            ConfigPaths.get_opencode_config(),
+            path,
             self.opencode_config,
             backup_manager=self.backup_manager,
+            backup_before_save=path not in self._saved_config_paths,
         )
         if success:
+            self._saved_config_paths.add(path)
             self.notify_config_changed()
             if jsonc_warning and not getattr(self, "_opencode_jsonc_warned", False):
                 self._opencode_jsonc_warned = True
@@ -15139,12 +12570,15 @@ class MainWindow(FluentWindow):
 
     def save_ohmyopencode_config(self):
         """保存 Oh My OpenCode 配置"""
+        path = ConfigPaths.get_ohmyopencode_config()
         success, jsonc_warning = ConfigManager.save_json(
-            ConfigPaths.get_ohmyopencode_config(),
+            path,
             self.ohmyopencode_config,
             backup_manager=self.backup_manager,
+            backup_before_save=path not in self._saved_config_paths,
         )
         if success:
+            self._saved_config_paths.add(path)
             self.notify_config_changed()
             if jsonc_warning and not getattr(self, "_ohmyopencode_jsonc_warned", False):
                 self._ohmyopencode_jsonc_warned = True
@@ -15160,9 +12594,237 @@ class MainWindow(FluentWindow):
             return True
         return False
 
+    def _tracked_configs(self) -> Dict[str, Any]:
+        return {"opencode": self.opencode_config, "ohmy": self.ohmyopencode_config}
+
+    def config_snapshot(self, name: str) -> Any:
+        """实时配置（"opencode" / "ohmy"）的只读副本，可交给后台线程读取"""
+        return self.config_tracker.frozen_copy(name, self._tracked_configs()[name])
+
+    def get_config_section(self, path: Tuple[str, ...]) -> Any:
+        """按跟踪路径取配置内容，如 ("opencode", "provider")，不存在时返回 None"""
+        node = self._tracked_configs().get(path[0])
+        for key in path[1:]:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(key)
+        return node
+
+    def apply_config_batch(
+        self, selector: BatchSelector, patch: Dict[str, Any]
+    ) -> List[str]:
+        """批量修改配置条目：一次遍历、一次保存（一次备份）、一次变更通知
+
+        agents/categories 修改 Oh My OpenCode 配置，models 修改 OpenCode 配置；
+        返回实际发生变化的条目名称
+        """
+        if selector.section == "models":
+            changed = apply_batch(self.opencode_config, selector, patch)
+            if changed:
+                self.save_opencode_config()
+        else:
+            if self.ohmyopencode_config is None:
+                self.ohmyopencode_config = {}
+            changed = apply_batch(self.ohmyopencode_config, selector, patch)
+            if changed:
+                self.save_ohmyopencode_config()
+        return changed
+
+    def get_model_registry(self) -> ModelRegistry:
+        """获取共享的模型注册表（配置对象被整体替换时自动切换）"""
+        if self.model_registry.config is not self.opencode_config:
+            self.model_registry.set_config(self.opencode_config)
+        return self.model_registry
+
+    def _on_provider_config_changed(self, paths):
+        self.model_registry.set_config(self.opencode_config)
+
+    def get_agent_group_manager(self) -> AgentGroupManager:
+        """获取共享的 Agent 分组管理器（首次使用时加载分组文件）"""
+        if self._agent_group_manager is None:
+            self._agent_group_manager = AgentGroupManager(
+                ConfigPaths.get_config_base_dir()
+            )
+        return self._agent_group_manager
+
+    def apply_agent_group(self, group_id: str, parent=None) -> bool:
+        """预览并应用 Agent 分组
+
+        先计算变更并展示，确认后把 OpenCode、Oh My OpenCode 配置与分组文件
+        作为一个事务写入：任一文件失败时全部回滚。返回是否已应用。
+        """
+        manager = self.get_agent_group_manager()
+        omo_path = ConfigPaths.get_ohmyopencode_config()
+        # 只有在 Oh My OpenCode 已安装时才修改其配置
+        plan = manager.plan_group(
+            group_id,
+            self.opencode_config,
+            self.ohmyopencode_config if omo_path.exists() else None,
+        )
+        if plan is None:
+            return False
+        if not plan.changes:
+            InfoBar.info(
+                tr("common.info"),
+                tr("group_apply.no_changes", name=plan.group["name"]),
+                parent=parent or self,
+            )
+            return False
+        if not GroupApplyPreviewDialog(plan, parent or self).exec_():
+            return False
+
+        self.create_checkpoint(
+            tr(
+                "history.before_group",
+                name=plan.group["name"],
+                time=datetime.now().strftime("%H:%M:%S"),
+            )
+        )
+        try:
+            written = manager.commit_plan(
+                plan,
+                ConfigPaths.get_opencode_config(),
+                omo_path,
+                backup_manager=self.backup_manager,
+            )
+        except ConfigTransactionError as e:
+            InfoBar.error(
+                tr("common.error"),
+                tr("group_apply.failed", error=e.reason),
+                duration=8000,
+                parent=parent or self,
+            )
+            return False
+
+        # 事务已备份并写入各文件，之后的保存不再整文件备份
+        self._saved_config_paths.update(written)
+        self.opencode_config = plan.opencode_config
+        if plan.omo_config is not None:
+            self.ohmyopencode_config = plan.omo_config
+        self._refresh_file_hashes()
+        self.notify_config_changed()
+        return True
+
     def notify_config_changed(self):
-        """通知所有页面配置已变更"""
+        """通知配置已变更：订阅者只收到其关注部分的变化路径"""
+        if self.config_tracker.commit(self._tracked_configs()):
+            self.config_changed.emit()
+
+    def _apply_history(self, move: Callable[[Dict[str, Any]], List[Tuple]]) -> bool:
+        """执行撤销/重做/恢复检查点：更新实时配置、通知页面并写回文件"""
+        # 先提交尚未通知的修改，保证历史与实时配置一致
+        self.notify_config_changed()
+        configs = self._tracked_configs()
+        paths = move(configs)
+        if not paths:
+            return False
+        self.opencode_config = configs["opencode"]
+        self.ohmyopencode_config = configs["ohmy"]
+        self.config_tracker.dispatch(paths)
         self.config_changed.emit()
+        names = {path[0] for path in paths}
+        if "opencode" in names:
+            self.save_opencode_config()
+        if "ohmy" in names:
+            self.save_ohmyopencode_config()
+        return True
+
+    @staticmethod
+    def _describe_paths(paths: List[Tuple]) -> str:
+        text = ".".join(paths[0][1:]) or paths[0][0]
+        if len(paths) > 1:
+            text += tr("history.more_changes", count=len(paths) - 1)
+        return text
+
+    def undo_config_change(self):
+        """撤销上一次配置修改（Ctrl+Z）"""
+        undone: List[Tuple] = []
+
+        def move(configs):
+            undone.extend(self.config_tracker.undo(configs))
+            return undone
+
+        if self._apply_history(move):
+            InfoBar.success(
+                tr("common.success"),
+                tr("history.undone", change=self._describe_paths(undone)),
+                parent=self,
+            )
+        else:
+            InfoBar.info(tr("common.info"), tr("history.nothing_to_undo"), parent=self)
+
+    def redo_config_change(self):
+        """重做上一次撤销的修改（Ctrl+Y / Ctrl+Shift+Z）"""
+        redone: List[Tuple] = []
+
+        def move(configs):
+            redone.extend(self.config_tracker.redo(configs))
+            return redone
+
+        if self._apply_history(move):
+            InfoBar.success(
+                tr("common.success"),
+                tr("history.redone", change=self._describe_paths(redone)),
+                parent=self,
+            )
+        else:
+            InfoBar.info(tr("common.info"), tr("history.nothing_to_redo"), parent=self)
+
+    def create_checkpoint(self, name: str):
+        """在批量操作前创建命名检查点（先提交尚未通知的修改）"""
+        self.notify_config_changed()
+        self.config_tracker.checkpoint(name)
+
+    def restore_checkpoint(self, name: str) -> bool:
+        """撤销或重做到指定检查点，返回配置是否发生变化"""
+        return self._apply_history(
+            partial(self.config_tracker.restore_checkpoint, name)
+        )
+
+    def _refresh_balances(self):
+        """后台刷新所有 Provider 余额（上一轮未结束时跳过）"""
+        if self.balance_service.is_busy():
+            return
+        targets = BalanceService.collect_targets(self.opencode_config, AuthManager())
+        if targets:
+            self.balance_service.query_all_async(targets, use_cache=False)
+
+    def _on_balance_sample(self, provider_name: str, usage_data: Dict[str, Any]):
+        """根据余额趋势提示即将耗尽或消耗突增（同一状态只提示一次）"""
+        trend = self.balance_service.history.trend(provider_name)
+        low = (
+            trend.days_left is not None
+            and trend.days_left <= BALANCE_LOW_DAYS_THRESHOLD
+        )
+        for kind, active in (("low", low), ("spike", trend.is_spike)):
+            alert_key = (provider_name, kind)
+            if not active:
+                self._balance_alerts.discard(alert_key)
+                continue
+            if alert_key in self._balance_alerts:
+                continue
+            self._balance_alerts.add(alert_key)
+            if kind == "low":
+                content = tr(
+                    "provider.balance_low_alert",
+                    provider=provider_name,
+                    days=f"{trend.days_left:.1f}",
+                )
+            else:
+                content = tr(
+                    "provider.balance_spike_alert",
+                    provider=provider_name,
+                    amount=f"${trend.last_spend:.2f}",
+                )
+            InfoBar.warning(
+                title=tr("provider.balance_alert"),
+                content=content,
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=10000,
+                parent=self,
+            )
 
     def _on_version_check(self, latest_version: str, release_url: str):
         """版本检查回调"""
@@ -15344,12 +13006,12 @@ class MainWindow(FluentWindow):
 
     def _toggle_theme(self):
         """切换深浅色主题 (手动切换会停止跟随系统)"""
+        # lazy=True: 不可见控件的样式表延迟到首次绘制时再更新；
+        # 自定义背景由 themeChanged 触发的批量刷新统一重新应用
         if isDarkTheme():
-            setTheme(Theme.LIGHT)
+            setTheme(Theme.LIGHT, lazy=True)
         else:
-            setTheme(Theme.DARK)
-        # 切换后重新应用自定义背景
-        QTimer.singleShot(50, self._apply_dark_background)
+            setTheme(Theme.DARK, lazy=True)
 
     def closeEvent(self, e):
         """关闭窗口时停止主题监听器"""
@@ -15444,12 +13106,16 @@ class MainWindow(FluentWindow):
                 )
 
     def _validate_config_on_startup(self):
-        """启动时验证配置文件"""
-        issues = ConfigValidator.validate_opencode_config(self.opencode_config)
-        errors = [i for i in issues if i["level"] == "error"]
-        warnings = [i for i in issues if i["level"] == "warning"]
+        """启动时在后台线程验证配置文件，结果由 _on_validation_finished 处理"""
+        self.validation_service.validate_async(
+            "startup", self.config_snapshot("opencode")
+        )
 
-        if not errors and not warnings:
+    def _on_validation_finished(self, tag: str, result: Dict):
+        if tag != "startup":
+            return
+        issues = result["opencode"]
+        if not issues:
             return  # 配置正常，无需提示
 
         # 延迟显示对话框，等窗口完全初始化
@@ -15548,31 +13214,243 @@ class MainWindow(FluentWindow):
             )
 
 
+# ==================== Agent/Category 表格 (Model/View) ====================
+class ConfigSectionTableModel(QAbstractTableModel):
+    """配置部分（名称 -> 字段字典）的表格模型
+
+    直接读取配置中的字典，不为每行创建单元格对象或控件；视图只查询可见行，
+    重载成本与可见行数成正比。第 0 列为名称，模型列可通过 ModelComboDelegate 编辑。
+    """
+
+    model_edited = pyqtSignal(str, str)  # (名称, 新模型)
+
+    MODEL_COLUMN = 1
+
+    def __init__(
+        self, columns: List[Tuple[str, Callable[[str, Dict], Any], int]], parent=None
+    ):
+        """columns: [(表头, 取值函数(name, data), 显示的最大字符数，0 表示不截断)]"""
+        super().__init__(parent)
+        self._columns = columns
+        self._section: Dict[str, Any] = {}
+        self._names: List[str] = []
+
+    @classmethod
+    def for_agents(cls, parent=None) -> "ConfigSectionTableModel":
+        return cls(
+            [
+                (tr("common.name"), lambda name, data: name, 0),
+                (tr("ohmyagent.model"), lambda name, data: data.get("model", ""), 0),
+                (
+                    tr("common.description"),
+                    lambda name, data: data.get("description", "")
+                    or PRESET_AGENTS.get(name, ""),
+                    50,
+                ),
+            ],
+            parent,
+        )
+
+    @classmethod
+    def for_categories(
+        cls, model_header: str, parent=None
+    ) -> "ConfigSectionTableModel":
+        return cls(
+            [
+                (tr("common.name"), lambda name, data: name, 0),
+                (model_header, lambda name, data: data.get("model", ""), 0),
+                ("Temperature", lambda name, data: data.get("temperature", 0.7), 0),
+                (
+                    tr("common.description"),
+                    lambda name, data: data.get("description", "")
+                    or PRESET_CATEGORIES.get(name, {}).get("description", ""),
+                    30,
+                ),
+            ],
+            parent,
+        )
+
+    def set_section(self, section: Any) -> None:
+        """整体替换数据（非字典的部分或条目被忽略）"""
+        self.beginResetModel()
+        self._section = section if isinstance(section, dict) else {}
+        self._names = [n for n, d in self._section.items() if isinstance(d, dict)]
+        self.endResetModel()
+
+    def update_rows(self, section: Any, names: Optional[set]) -> None:
+        """只刷新发生变化的条目；有新增条目或 names 为 None 时整体重置"""
+        if names is None or section is not self._section:
+            self.set_section(section)
+            return
+        rows = {name: row for row, name in enumerate(self._names)}
+        if any(isinstance(section.get(n), dict) and n not in rows for n in names):
+            self.set_section(section)
+            return
+        last_column = len(self._columns) - 1
+        removed = []
+        for name in names:
+            row = rows.get(name)
+            if row is None:
+                continue
+            if isinstance(section.get(name), dict):
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+            else:
+                removed.append(row)
+        # 从后往前删除，避免行号变化
+        for row in sorted(removed, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._names[row]
+            self.endRemoveRows()
+
+    def name_at(self, row: int) -> Optional[str]:
+        return self._names[row] if 0 <= row < len(self._names) else None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (
+            Qt.DisplayRole,
+            Qt.ToolTipRole,
+            Qt.EditRole,
+        ):
+            return None
+        name = self._names[index.row()]
+        _header, getter, max_chars = self._columns[index.column()]
+        text = str(getter(name, self._section.get(name) or {}))
+        if role == Qt.DisplayRole and max_chars and len(text) > max_chars:
+            return text[:max_chars] + "..."
+        if role == Qt.ToolTipRole and not max_chars:
+            return None
+        return text
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.MODEL_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if (
+            role != Qt.EditRole
+            or not index.isValid()
+            or index.column() != self.MODEL_COLUMN
+        ):
+            return False
+        name = self._names[index.row()]
+        if value and value != (self._section.get(name) or {}).get("model", ""):
+            # 由页面写入配置并保存，保存后的变更通知会刷新表格；
+            # 延迟到编辑器关闭之后，避免在提交编辑的过程中重置模型
+            QTimer.singleShot(0, partial(self.model_edited.emit, name, value))
+        return True
+
+
+class ModelComboDelegate(TableItemDelegate):
+    """模型列委托 - 只在编辑单元格时创建下拉框，所有行共享同一份模型列表"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._models: List[str] = []
+
+    def set_models(self, models: List[str]) -> None:
+        self._models = models
+
+    def createEditor(self, parent, option, index):
+        if index.column() != ConfigSectionTableModel.MODEL_COLUMN:
+            return super().createEditor(parent, option, index)
+        combo = ComboBox(parent)
+        combo.addItems(self._models)
+        # 只有用户在下拉列表中选择了某项才写回；选择即提交，不需要再点击其他单元格
+        combo.setProperty("userPicked", False)
+        combo.activated.connect(partial(self._commit_combo, combo))
+        return combo
+
+    def setEditorData(self, editor, index):
+        if not isinstance(editor, ComboBox):
+            return super().setEditorData(editor, index)
+        value = index.data(Qt.EditRole) or ""
+        row = editor.findText(value) if value else -1
+        if value and row < 0:
+            # 不在模型列表中的值（如内置模型）也要原样显示，不能显示成第一项
+            editor.insertItem(0, value)
+            row = 0
+        editor.blockSignals(True)
+        editor.setCurrentIndex(row)
+        editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        if not isinstance(editor, ComboBox):
+            return super().setModelData(editor, model, index)
+        if editor.property("userPicked"):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def _commit_combo(self, editor: ComboBox, _row: int) -> None:
+        editor.setProperty("userPicked", True)
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+
+def _setup_config_section_view(
+    view: TableView, model: ConfigSectionTableModel
+) -> ModelComboDelegate:
+    """为 Agent/Category 表格设置模型与共享的模型下拉框委托"""
+    view.setModel(model)
+    delegate = ModelComboDelegate(view)
+    view.setItemDelegate(delegate)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SingleSelection)
+    # 再次点击已选中行的模型列时才创建下拉框编辑器，键盘或切换行不会打开编辑器；
+    # 双击仍打开编辑对话框
+    view.setEditTriggers(QAbstractItemView.SelectedClicked)
+    return delegate
+
+
 # ==================== Oh My Agent 页面 ====================
 class OhMyAgentPage(BasePage):
     """Oh My OpenCode Agent 管理页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("ohmyagent.title"), parent)
+        super().__init__("ohmyagent.title", parent)
         self.main_window = main_window
 
-        # 初始化分组管理器
-        config_dir = Path.home() / ".config" / "opencode"
-        self.group_manager = AgentGroupManager(config_dir)
+        # 共享的分组管理器
+        self.group_manager = self.main_window.get_agent_group_manager()
 
         self._setup_ui()
         self._load_data()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅 Agent 配置变更，以及决定可选模型列表的 Provider 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("ohmy", "agents"), self._on_config_changed
+        )
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
 
-    def _on_config_changed(self):
-        """配置变更时刷新数据"""
-        self._load_data()
+    def _on_config_changed(self, paths):
+        """Agent 配置变更时只刷新变化的行；可选模型列表变化时整表重载"""
+        if any(path[0] != "ohmy" for path in paths):
+            self._load_data()
+            return
+        self.table_model.update_rows(
+            self.main_window.get_config_section(("ohmy", "agents")),
+            ConfigChangeTracker.changed_keys(paths, ("ohmy", "agents")),
+        )
 
     def _setup_ui(self):
         # Agent分组选择器
         self.group_widget = AgentGroupWidget(self.group_manager, self)
         self.group_widget.group_changed.connect(self._on_group_applied)
+        self.group_widget.bind_config(self.main_window)
         self._layout.addWidget(self.group_widget)
 
         # 添加分隔线
@@ -15627,21 +13505,16 @@ class OhMyAgentPage(BasePage):
         self._layout.addLayout(toolbar)
 
         # Agent 列表
-        self.table = TableWidget(self)
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(
-            [tr("common.name"), tr("ohmyagent.model"), tr("common.description")]
-        )
+        self.table = TableView(self)
+        self.table_model = ConfigSectionTableModel.for_agents(self)
+        self.table_model.model_edited.connect(self._on_row_model_changed)
+        self.model_delegate = _setup_config_section_view(self.table, self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.doubleClicked.connect(self._on_edit)
         self._layout.addWidget(self.table)
 
     def _load_data(self):
         """加载 Agent 数据"""
-        self.table.setRowCount(0)
         config = self.main_window.ohmyopencode_config or {}
         agents = config.get("agents", {})
 
@@ -15651,36 +13524,12 @@ class OhMyAgentPage(BasePage):
 
         models = self._get_available_models()
         self._refresh_bulk_model_combo(models)
-
-        for name, data in agents.items():
-            # 跳过非字典类型的值
-            if not isinstance(data, dict):
-                continue
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-
-            model_combo = ComboBox(self.table)
-            model_combo.addItems(models)
-            current_model = data.get("model", "")
-            if current_model:
-                model_combo.setCurrentText(current_model)
-            model_combo.currentIndexChanged.connect(
-                partial(self._on_row_model_changed, name, model_combo)
-            )
-            self.table.setCellWidget(row, 1, model_combo)
-
-            # 描述列添加 tooltip 显示全部
-            desc = data.get("description", "")
-            if not desc:
-                desc = PRESET_AGENTS.get(name, "")
-            desc_item = QTableWidgetItem(desc[:50] + "..." if len(desc) > 50 else desc)
-            desc_item.setToolTip(desc)
-            self.table.setItem(row, 2, desc_item)
+        self.model_delegate.set_models(models)
+        # 非字典类型的条目由表格模型跳过
+        self.table_model.set_section(agents)
 
     def _get_available_models(self) -> List[str]:
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         return registry.get_all_models()
 
     def _refresh_bulk_model_combo(self, models: List[str]) -> None:
@@ -15693,7 +13542,7 @@ class OhMyAgentPage(BasePage):
             self.bulk_model_combo.setCurrentText(current)
         self.bulk_model_combo.blockSignals(False)
 
-    def _on_row_model_changed(self, agent_name: str, combo: ComboBox) -> None:
+    def _on_row_model_changed(self, agent_name: str, model: str) -> None:
         config = self.main_window.ohmyopencode_config
         if config is None:
             config = {}
@@ -15701,24 +13550,15 @@ class OhMyAgentPage(BasePage):
         agents = config.setdefault("agents", {})
         if agent_name not in agents:
             return
-        agents[agent_name]["model"] = combo.currentText()
+        agents[agent_name]["model"] = model
         self.main_window.save_ohmyopencode_config()
 
     def _on_bulk_model_changed(self) -> None:
         model = self.bulk_model_combo.currentText()
         if model == tr("common.keep_all"):
             return
-        config = self.main_window.ohmyopencode_config
-        if config is None:
-            config = {}
-            self.main_window.ohmyopencode_config = config
-        agents = config.setdefault("agents", {})
-        if not agents:
-            return
-        for name in agents.keys():
-            agents[name]["model"] = model
-        self.main_window.save_ohmyopencode_config()
-        self._load_data()
+        # 保存后的变更通知只刷新发生变化的行
+        self.main_window.apply_config_batch(BatchSelector("agents"), {"model": model})
 
     def _on_add(self):
         """添加 Agent"""
@@ -15740,14 +13580,13 @@ class OhMyAgentPage(BasePage):
 
     def _on_edit(self):
         """编辑 Agent"""
-        row = self.table.currentRow()
-        if row < 0:
+        name = self.table_model.name_at(self.table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Agent")
             )
             return
 
-        name = self.table.item(row, 0).text()
         dialog = OhMyAgentDialog(self.main_window, agent_name=name, parent=self)
         if dialog.exec_():
             self._load_data()
@@ -15757,14 +13596,13 @@ class OhMyAgentPage(BasePage):
 
     def _on_delete(self):
         """删除 Agent"""
-        row = self.table.currentRow()
-        if row < 0:
+        name = self.table_model.name_at(self.table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Agent")
             )
             return
 
-        name = self.table.item(row, 0).text()
         w = FluentMessageBox(
             tr("common.confirm_delete_title"),
             tr("dialog.confirm_delete_agent", name=name),
@@ -15781,54 +13619,14 @@ class OhMyAgentPage(BasePage):
                 )
 
     def _on_group_applied(self, group_id: str):
-        """应用Agent分组"""
-        try:
-            # 获取当前配置
-            opencode_config = self.main_window.opencode_config or {}
-            omo_config = self.main_window.ohmyopencode_config or {}
-
-            # 检查Oh My OpenCode是否安装
-            has_omo = (
-                hasattr(self.main_window, "ohmyopencode_config")
-                and self.main_window.ohmyopencode_config is not None
-            )
-
-            # 应用分组
-            opencode_config, omo_config = self.group_manager.apply_group(
-                group_id, opencode_config, omo_config
+        """预览并应用Agent分组（保存后的变更通知会刷新表格）"""
+        if self.main_window.apply_agent_group(group_id, self):
+            group = self.group_manager.find_group(group_id)
+            self.show_success(
+                tr("common.success"),
+                tr("agent_group.dialog.apply_info_content").format(name=group["name"]),
             )
 
-            # 保存配置
-            self.main_window.opencode_config = opencode_config
-            self.main_window.save_opencode_config()
-
-            # 只有在OMO安装时才保存OMO配置
-            if has_omo:
-                self.main_window.ohmyopencode_config = omo_config
-                self.main_window.save_ohmyopencode_config()
-
-            # 刷新显示
-            self._load_data()
-
-            # 显示成功提示
-            group = self.group_manager.get_group(group_id)
-            if not group:
-                # 尝试从预设中获取
-                for preset in self.group_manager.get_presets():
-                    if preset["id"] == group_id:
-                        group = preset
-                        break
-
-            if group:
-                self.show_success(
-                    tr("common.success"),
-                    tr("agent_group.dialog.apply_info_content").format(
-                        name=group["name"]
-                    ),
-                )
-        except Exception as e:
-            self.show_error(tr("common.error"), f"应用分组失败: {str(e)}")
-
 
 class OhMyAgentDialog(BaseDialog):
     """Oh My Agent 编辑对话框"""
@@ -15900,7 +13698,7 @@ class OhMyAgentDialog(BaseDialog):
     def _load_models(self):
         """加载可用模型列表"""
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -15994,7 +13792,7 @@ class PresetOhMyAgentDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16043,16 +13841,27 @@ class CategoryPage(BasePage):
     """Category 管理页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("category.title"), parent)
+        super().__init__("category.title", parent)
         self.main_window = main_window
         self._setup_ui()
         self._load_data()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
-
-    def _on_config_changed(self):
-        """配置变更时刷新数据"""
-        self._load_data()
+        # 订阅 Category 配置变更，以及决定可选模型列表的 Provider 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("ohmy", "categories"), self._on_config_changed
+        )
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
+
+    def _on_config_changed(self, paths):
+        """Category 配置变更时只刷新变化的行；可选模型列表变化时整表重载"""
+        if any(path[0] != "ohmy" for path in paths):
+            self._load_data()
+            return
+        self.table_model.update_rows(
+            self.main_window.get_config_section(("ohmy", "categories")),
+            ConfigChangeTracker.changed_keys(paths, ("ohmy", "categories")),
+        )
 
     def _setup_ui(self):
         # 工具栏
@@ -16085,16 +13894,12 @@ class CategoryPage(BasePage):
         self._layout.addLayout(toolbar)
 
         # Category 列表
-        self.table = TableWidget(self)
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(
-            [
-                tr("common.name"),
-                tr("category.bind_model").rstrip(":"),
-                "Temperature",
-                tr("common.description"),
-            ]
+        self.table = TableView(self)
+        self.table_model = ConfigSectionTableModel.for_categories(
+            tr("category.bind_model").rstrip(":"), self
         )
+        self.table_model.model_edited.connect(self._on_row_model_changed)
+        self.model_delegate = _setup_config_section_view(self.table, self.table_model)
         # 调整列宽：名称20字符，Temperature12字符，剩余均分
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Fixed)
@@ -16103,15 +13908,11 @@ class CategoryPage(BasePage):
         header.setSectionResizeMode(2, QHeaderView.Fixed)
         header.resizeSection(2, 100)  # Temperature 12字符约100px
         header.setSectionResizeMode(3, QHeaderView.Stretch)  # 描述 均分
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.doubleClicked.connect(self._on_edit)
         self._layout.addWidget(self.table)
 
     def _load_data(self):
         """加载 Category 数据"""
-        self.table.setRowCount(0)
         config = self.main_window.ohmyopencode_config or {}
         categories = config.get("categories", {})
 
@@ -16121,39 +13922,12 @@ class CategoryPage(BasePage):
 
         models = self._get_available_models()
         self._refresh_bulk_model_combo(models)
-
-        for name, data in categories.items():
-            # 跳过非字典类型的值
-            if not isinstance(data, dict):
-                continue
-
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(name))
-
-            model_combo = ComboBox(self.table)
-            model_combo.addItems(models)
-            current_model = data.get("model", "")
-            if current_model:
-                model_combo.setCurrentText(current_model)
-            model_combo.currentIndexChanged.connect(
-                partial(self._on_row_model_changed, name, model_combo)
-            )
-            self.table.setCellWidget(row, 1, model_combo)
-
-            self.table.setItem(
-                row, 2, QTableWidgetItem(str(data.get("temperature", 0.7)))
-            )
-            # 描述列添加 tooltip 显示全部
-            desc = data.get("description", "")
-            if not desc:
-                desc = PRESET_CATEGORIES.get(name, {}).get("description", "")
-            desc_item = QTableWidgetItem(desc[:30] + "..." if len(desc) > 30 else desc)
-            desc_item.setToolTip(desc)
-            self.table.setItem(row, 3, desc_item)
+        self.model_delegate.set_models(models)
+        # 非字典类型的条目由表格模型跳过
+        self.table_model.set_section(categories)
 
     def _get_available_models(self) -> List[str]:
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         return registry.get_all_models()
 
     def _refresh_bulk_model_combo(self, models: List[str]) -> None:
@@ -16166,7 +13940,7 @@ class CategoryPage(BasePage):
             self.bulk_model_combo.setCurrentText(current)
         self.bulk_model_combo.blockSignals(False)
 
-    def _on_row_model_changed(self, category_name: str, combo: ComboBox) -> None:
+    def _on_row_model_changed(self, category_name: str, model: str) -> None:
         config = self.main_window.ohmyopencode_config
         if config is None:
             config = {}
@@ -16174,24 +13948,17 @@ class CategoryPage(BasePage):
         categories = config.setdefault("categories", {})
         if category_name not in categories:
             return
-        categories[category_name]["model"] = combo.currentText()
+        categories[category_name]["model"] = model
         self.main_window.save_ohmyopencode_config()
 
     def _on_bulk_model_changed(self) -> None:
         model = self.bulk_model_combo.currentText()
         if model == tr("common.keep_all"):
             return
-        config = self.main_window.ohmyopencode_config
-        if config is None:
-            config = {}
-            self.main_window.ohmyopencode_config = config
-        categories = config.setdefault("categories", {})
-        if not categories:
-            return
-        for name in categories.keys():
-            categories[name]["model"] = model
-        self.main_window.save_ohmyopencode_config()
-        self._load_data()
+        # 保存后的变更通知只刷新发生变化的行
+        self.main_window.apply_config_batch(
+            BatchSelector("categories"), {"model": model}
+        )
 
     def _on_add(self):
         dialog = CategoryDialog(self.main_window, parent=self)
@@ -16210,14 +13977,13 @@ class CategoryPage(BasePage):
             )
 
     def _on_edit(self):
-        row = self.table.currentRow()
-        if row < 0:
+        name = self.table_model.name_at(self.table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Category")
             )
             return
 
-        name = self.table.item(row, 0).text()
         dialog = CategoryDialog(self.main_window, category_name=name, parent=self)
         if dialog.exec_():
             self._load_data()
@@ -16226,14 +13992,13 @@ class CategoryPage(BasePage):
             )
 
     def _on_delete(self):
-        row = self.table.currentRow()
-        if row < 0:
+        name = self.table_model.name_at(self.table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Category")
             )
             return
 
-        name = self.table.item(row, 0).text()
         w = FluentMessageBox(
             tr("common.confirm_delete_title"),
             tr("dialog.confirm_delete_category", name=name),
@@ -16334,7 +14099,7 @@ class CategoryDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16433,7 +14198,7 @@ class PresetCategoryDialog(BaseDialog):
 
     def _load_models(self):
         self.model_combo.clear()
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         models = registry.get_all_models()
         self.model_combo.addItems(models)
 
@@ -16475,219 +14240,6 @@ class PresetCategoryDialog(BaseDialog):
         self.accept()
 
 
-# ==================== Skill 发现器 ====================
-@dataclass
-class DiscoveredSkill:
-    """发现的 Skill 信息"""
-
-    name: str
-    description: str
-    path: Path
-    source: (
-        str  # 'opencode-global', 'opencode-project', 'claude-global', 'claude-project'
-    )
-    license_info: Optional[str] = None
-    compatibility: Optional[str] = None
-    metadata: Optional[Dict[str, str]] = None
-    content: str = ""
-
-
-class SkillDiscovery:
-    """Skill 发现器 - 扫描所有路径发现已有的 Skill"""
-
-    # Skill 搜索路径配置
-    SKILL_PATHS = {
-        "opencode-global": Path.home() / ".config" / "opencode" / "skills",
-        "claude-global": Path.home() / ".claude" / "skills",
-    }
-
-    @staticmethod
-    def get_project_paths() -> Dict[str, Path]:
-        """获取项目级别的 Skill 路径"""
-        cwd = Path.cwd()
-        return {
-            "opencode-project": cwd / ".opencode" / "skills",
-            "claude-project": cwd / ".claude" / "skills",
-        }
-
-    @staticmethod
-    def validate_skill_name(name: str) -> Tuple[bool, str]:
-        """验证 Skill 名称是否符合规范
-
-        规则：
-        - 1-64 字符
-        - 小写字母数字 + 单连字符分隔
-        - 不能以 - 开头或结尾
-        - 不能有连续 --
-
-        Returns:
-            (是否有效, 错误信息)
-        """
-        if not name:
-            return False, "名称不能为空"
-        if len(name) > 64:
-            return False, "名称不能超过 64 字符"
-        if not re.match(r"^[a-z0-9]+(-[a-z0-9]+)*$", name):
-            return False, "名称格式错误：只能使用小写字母、数字、单连字符分隔"
-        return True, ""
-
-    @staticmethod
-    def validate_description(desc: str) -> Tuple[bool, str]:
-        """验证描述是否符合规范
-
-        规则：1-1024 字符
-        """
-        if not desc:
-            return False, "描述不能为空"
-        if len(desc) > 1024:
-            return False, "描述不能超过 1024 字符"
-        return True, ""
-
-    @staticmethod
-    def parse_skill_file(skill_path: Path) -> Optional[DiscoveredSkill]:
-        """解析 SKILL.md 文件
-
-        Args:
-            skill_path: SKILL.md 文件路径
-
-        Returns:
-            解析后的 DiscoveredSkill 对象，解析失败返回 None
-        """
-        if not skill_path.exists():
-            return None
-
-        try:
-            content = skill_path.read_text(encoding="utf-8")
-        except Exception:
-            return None
-
-        # 解析 frontmatter
-        frontmatter = {}
-        body = content
-
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                try:
-                    # 简单的 YAML 解析（不依赖 pyyaml）
-                    yaml_content = parts[1].strip()
-                    for line in yaml_content.split("\n"):
-                        line = line.strip()
-                        if ":" in line and not line.startswith("#"):
-                            key, value = line.split(":", 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            # 处理 metadata 子对象
-                            if key == "metadata":
-                                frontmatter["metadata"] = {}
-                            elif key.startswith("  ") and "metadata" in frontmatter:
-                                # metadata 子项
-                                sub_key = key.strip()
-                                frontmatter["metadata"][sub_key] = value
-                            else:
-                                frontmatter[key] = value
-                    body = parts[2].strip()
-                except Exception:
-                    pass
-
-        name = frontmatter.get("name", "")
-        description = frontmatter.get("description", "")
-
-        if not name or not description:
-            return None
-
-        # 确定来源
-        skill_dir = skill_path.parent
-        source = "unknown"
-        for src, base_path in SkillDiscovery.SKILL_PATHS.items():
-            try:
-                if skill_dir.is_relative_to(base_path):
-                    source = src
-                    break
-            except (ValueError, TypeError):
-                pass
-
-        if source == "unknown":
-            for src, base_path in SkillDiscovery.get_project_paths().items():
-                try:
-                    if skill_dir.is_relative_to(base_path):
-                        source = src
-                        break
-                except (ValueError, TypeError):
-                    pass
-
-        return DiscoveredSkill(
-            name=name,
-            description=description,
-            path=skill_path,
-            source=source,
-            license_info=frontmatter.get("license"),
-            compatibility=frontmatter.get("compatibility"),
-            metadata=frontmatter.get("metadata")
-            if isinstance(frontmatter.get("metadata"), dict)
-            else None,
-            content=body,
-        )
-
-    @classmethod
-    def discover_all(cls) -> List[DiscoveredSkill]:
-        """发现所有 Skill
-
-        Returns:
-            发现的 Skill 列表
-        """
-        skills = []
-        seen_names = set()
-
-        # 合并所有搜索路径
-        all_paths = {**cls.SKILL_PATHS, **cls.get_project_paths()}
-
-        for source, base_path in all_paths.items():
-            if not base_path.exists():
-                continue
-
-            # 遍历 skills 目录下的子目录
-            try:
-                for skill_dir in base_path.iterdir():
-                    if not skill_dir.is_dir():
-                        continue
-
-                    # 尝试查找 SKILL.md 或 SKILL.txt
-                    skill_file = None
-                    for filename in ["SKILL.md", "SKILL.txt"]:
-                        potential_file = skill_dir / filename
-                        if potential_file.exists():
-                            skill_file = potential_file
-                            break
-
-                    if not skill_file:
-                        continue
-
-                    try:
-                        skill = cls.parse_skill_file(skill_file)
-                        if skill and skill.name not in seen_names:
-                            skills.append(skill)
-                            seen_names.add(skill.name)
-                    except Exception as e:
-                        # 解析单个skill失败，记录但继续处理其他skills
-                        print(f"解析 skill 失败 {skill_dir.name}: {e}")
-                        continue
-            except Exception as e:
-                # 遍历目录失败，记录但继续处理其他路径
-                print(f"遍历目录失败 {base_path}: {e}")
-                continue
-
-        return skills
-
-    @classmethod
-    def get_skill_by_name(cls, name: str) -> Optional[DiscoveredSkill]:
-        """根据名称获取 Skill"""
-        for skill in cls.discover_all():
-            if skill.name == name:
-                return skill
-        return None
-
-
 # ==================== Skill 市场 ====================
 class SkillMarket:
     """Skill 市场 - 内置常用 Skills 列表"""
@@ -17382,7 +14934,7 @@ class SkillInstaller:
                     )
 
                 # 4. 解析 Skill 名称
-                skill = SkillDiscovery.parse_skill_file(skill_file)
+                skill = SkillDiscovery.parse_skill_file(skill_file, include_body=False)
                 if not skill:
                     return False, "SKILL 文件格式错误"
 
@@ -17464,7 +15016,7 @@ class SkillInstaller:
                 return False, "未找到 SKILL.md 文件"
 
             # 解析 Skill
-            skill = SkillDiscovery.parse_skill_file(skill_md)
+            skill = SkillDiscovery.parse_skill_file(skill_md, include_body=False)
             if not skill:
                 return False, "SKILL.md 格式错误"
 
@@ -17861,9 +15413,17 @@ class SkillPage(BasePage):
     }
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("skill.title"), parent)
+        super().__init__("skill.title", parent)
         self.main_window = main_window
         self._current_skill: Optional[DiscoveredSkill] = None
+        # 监视 Skill 根目录与各 Skill 目录，外部增删改后自动刷新列表（合并短时间内的多次变化）
+        self._skill_watcher = QFileSystemWatcher(self)
+        self._skill_refresh_timer = QTimer(self)
+        self._skill_refresh_timer.setSingleShot(True)
+        self._skill_refresh_timer.setInterval(300)
+        self._skill_refresh_timer.timeout.connect(self._refresh_skill_list)
+        self._skill_watcher.directoryChanged.connect(self._skill_refresh_timer.start)
+        self._skill_watcher.fileChanged.connect(self._skill_refresh_timer.start)
         self._setup_ui()
         self._load_all_data()
 
@@ -17906,7 +15466,7 @@ class SkillPage(BasePage):
         self._load_permission_data()
 
     def _refresh_skill_list(self):
-        """刷新 Skill 列表"""
+        """刷新 Skill 列表（索引只重新解析变化的 Skill 文件）"""
         if hasattr(self, "skill_list"):
             self.skill_list.clear()
             skills = SkillDiscovery.discover_all()
@@ -17918,6 +15478,19 @@ class SkillPage(BasePage):
                 item = QListWidgetItem(f"{skill.name} ({source_label})")
                 item.setData(Qt.UserRole, skill)
                 self.skill_list.addItem(item)
+            self._update_skill_watch()
+
+    def _update_skill_watch(self):
+        """使监视列表与索引中的目录一致（根目录不存在时监视其上级，以便发现新建）"""
+        wanted = set(SkillDiscovery.index().watch_paths())
+        for base_path in SkillDiscovery.search_paths().values():
+            if not base_path.exists() and base_path.parent.exists():
+                wanted.add(str(base_path.parent))
+        watched = set(self._skill_watcher.directories())
+        if watched - wanted:
+            self._skill_watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._skill_watcher.addPaths(list(wanted - watched))
 
     def _load_permission_data(self):
         """加载权限数据"""
@@ -18100,7 +15673,8 @@ class SkillPage(BasePage):
             f"兼容: {skill.compatibility}" if skill.compatibility else ""
         )
         self.detail_path.setText(f"{tr('skill.skill_path')}: {skill.path}")
-        self.detail_content.setText(skill.content)
+        # 列表只包含 frontmatter，正文在选中时读取
+        self.detail_content.setText(SkillDiscovery.load_content(skill))
 
         # 启用操作按钮
         self.edit_skill_btn.setEnabled(True)
@@ -18121,7 +15695,9 @@ class SkillPage(BasePage):
         self.create_desc_edit.setText(self._current_skill.description)
         self.create_license_edit.setText(self._current_skill.license_info or "")
         self.create_compat_edit.setText(self._current_skill.compatibility or "")
-        self.create_content_edit.setText(self._current_skill.content)
+        self.create_content_edit.setText(
+            SkillDiscovery.load_content(self._current_skill)
+        )
 
         # 根据路径设置保存位置
         path_str = str(self._current_skill.path)
@@ -18959,7 +16535,7 @@ class RulesPage(BasePage):
     """Rules/Instructions 管理和 AGENTS.md 编辑页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("rules.title"), parent)
+        super().__init__("rules.title", parent)
         self.main_window = main_window
         self._setup_ui()
         self._load_data()
@@ -19181,7 +16757,7 @@ class CompactionPage(BasePage):
     """上下文压缩配置页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("compaction.title"), parent)
+        super().__init__("compaction.title", parent)
         self.main_window = main_window
         self._setup_ui()
         self._load_data()
@@ -19273,7 +16849,7 @@ class MonitorPage(BasePage):
     result_ready = pyqtSignal(object)
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("monitor.title"), parent)
+        super().__init__("monitor.title", parent)
         self.title_label.hide()
         self.main_window = main_window
         # 监控数据存储: target_id -> deque[MonitorResult]
@@ -19296,16 +16872,30 @@ class MonitorPage(BasePage):
         self._chat_test_enabled = False
         self._setup_ui()
         self._load_targets()
-        # 自动启动轮询（Ping 检测始终运行，对话延迟测试由按钮控制）
-        self._start_polling()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 首次打开页面时才启动轮询（Ping 检测始终运行，对话延迟测试由按钮控制）
+        self._polling_started = False
+        # 订阅 Provider 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
         self.result_ready.connect(self._on_single_result)
 
-    def _on_config_changed(self):
-        """配置变更时重新加载目标"""
-        self._load_targets()
-        self._refresh_ui()
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._polling_started:
+            self._polling_started = True
+            self._start_polling()
+
+    def _on_config_changed(self, paths):
+        """配置变更时重新加载目标
+
+        只有目标增删或显示名称变化时才重建表格，否则只替换目标的连接信息
+        """
+        old_rows = [(t.target_id, t.provider_name, t.model_name) for t in self._targets]
+        self._collect_targets()
+        new_rows = [(t.target_id, t.provider_name, t.model_name) for t in self._targets]
+        if new_rows != old_rows:
+            self._refresh_ui()
 
     def _toggle_chat_test(self):
         """切换对话延迟测试状态 - 启动/停止按钮（只控制对话延迟，不影响其他监控）"""
@@ -19350,7 +16940,6 @@ class MonitorPage(BasePage):
 
         # 保存卡片引用以便主题切换时更新
         self._stat_cards: List[QFrame] = []
-        self._stat_labels: List[CaptionLabel] = []
 
         # 统计卡片样式
         def create_stat_card(icon, label_text, value_text, color="#58a6ff"):
@@ -19379,8 +16968,11 @@ class MonitorPage(BasePage):
 
             # 标签
             label = CaptionLabel(label_text)
-            label.setStyleSheet("font-size: 10px;")
-            self._stat_labels.append(label)
+            # 文字颜色交给 qfluentwidgets 按主题维护，主题切换时无需逐个重设
+            label.setTextColor(QColor("#57606a"), QColor("#7d8590"))
+            label_font = label.font()
+            label_font.setPixelSize(10)
+            label.setFont(label_font)
             layout.addWidget(label)
 
             return card, value
@@ -19490,6 +17082,11 @@ class MonitorPage(BasePage):
 
     def _load_targets(self):
         """从配置加载监控目标"""
+        self._collect_targets()
+        self._refresh_ui()
+
+    def _collect_targets(self):
+        """根据当前 Provider 配置重建监控目标列表"""
         self._targets.clear()
         config = self.main_window.opencode_config or {}
         providers = config.get("provider", {})
@@ -19525,8 +17122,6 @@ class MonitorPage(BasePage):
                         maxlen=MONITOR_HISTORY_LIMIT
                     )
 
-        self._refresh_ui()
-
     def _start_polling(self):
         """启动轮询定时器"""
         if self._poll_timer is None:
@@ -19730,6 +17325,9 @@ class MonitorPage(BasePage):
 
     def _check_target(self, target: MonitorTarget) -> MonitorResult:
         """检查单个目标的可用性和延迟"""
+        import urllib.error
+        import urllib.request
+
         checked_at = datetime.now()
         origin = _extract_origin(target.base_url)
 
@@ -19810,7 +17408,7 @@ class MonitorPage(BasePage):
         )
 
     def _apply_stat_card_theme(self):
-        """应用统计卡片的主题样式"""
+        """应用统计卡片的主题样式（样式未变化的卡片不会重复应用）"""
         if isDarkTheme():
             card_style = """
                 QFrame {
@@ -19819,7 +17417,6 @@ class MonitorPage(BasePage):
                     border-radius: 6px;
                 }
             """
-            label_color = "#7d8590"
         else:
             card_style = """
                 QFrame {
@@ -19828,13 +17425,9 @@ class MonitorPage(BasePage):
                     border-radius: 6px;
                 }
             """
-            label_color = "#57606a"
 
         for card in self._stat_cards:
-            card.setStyleSheet(card_style)
-
-        for label in self._stat_labels:
-            label.setStyleSheet(f"color: {label_color}; font-size: 10px;")
+            StyleSheetCache.apply(card, card_style)
 
     def _refresh_ui(self):
         """刷新所有 UI 组件"""
@@ -20282,7 +17875,7 @@ class CLIExportPage(BasePage):
     """CLI 工具导出页面 - 将 OpenCode 配置导出到 Claude Code、Codex CLI、Gemini CLI"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("cli_export.title"), parent)
+        super().__init__("cli_export.title", parent)
         self.main_window = main_window
         self.export_manager = CLIExportManager()
         self._selected_provider = None
@@ -20302,11 +17895,13 @@ class CLIExportPage(BasePage):
         self._setup_ui_v2()
         # 延迟刷新 CLI 状态，避免在初始化时阻塞
         QTimer.singleShot(100, self._refresh_cli_status)
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 订阅 Provider 配置变更
+        self.main_window.config_tracker.subscribe(
+            ("opencode", "provider"), self._on_config_changed
+        )
 
-    def _on_config_changed(self):
-        """配置变更时刷新页面"""
+    def _on_config_changed(self, paths):
+        """Provider 配置变更时刷新页面"""
         self._refresh_providers()
         self._refresh_cli_status()
         self._update_preview()
@@ -21655,7 +19250,7 @@ class ImportPage(BasePage):
     """外部配置导入页面"""
 
     def __init__(self, main_window, parent=None):
-        super().__init__(tr("import.title"), parent)
+        super().__init__("import.title", parent)
         self.main_window = main_window
         self.import_service = ImportService()
         self._last_converted: Optional[Dict[str, Any]] = None
@@ -21945,6 +19540,14 @@ class ImportPage(BasePage):
         if not w.exec_():
             return
 
+        self.main_window.create_checkpoint(
+            tr(
+                "history.before_import",
+                source=source,
+                time=datetime.now().strftime("%H:%M:%S"),
+            )
+        )
+
         # 合并配置
         config = self.main_window.opencode_config
         if config is None:
@@ -22121,6 +19724,7 @@ class BackupDialog(BaseDialog):
         self.setMinimumSize(600, 400)
         self._setup_ui()
         self._load_backups()
+        self._load_checkpoints()
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -22202,6 +19806,84 @@ class BackupDialog(BaseDialog):
 
         layout.addLayout(btn_layout)
 
+        # 本次会话检查点（基于内存中的编辑历史，无需整文件备份）
+        layout.addWidget(SubtitleLabel(tr("history.checkpoints"), self))
+
+        self.checkpoint_table = TableWidget(self)
+        self.checkpoint_table.setColumnCount(2)
+        self.checkpoint_table.setHorizontalHeaderLabels(
+            [tr("history.checkpoint_name"), tr("history.checkpoint_position")]
+        )
+        header = self.checkpoint_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.resizeSection(1, 200)
+        self.checkpoint_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.checkpoint_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.checkpoint_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.checkpoint_table.setMaximumHeight(160)
+        layout.addWidget(self.checkpoint_table)
+
+        checkpoint_layout = QHBoxLayout()
+
+        restore_checkpoint_btn = PrimaryPushButton(
+            FIF.HISTORY, tr("history.restore_checkpoint"), self
+        )
+        restore_checkpoint_btn.clicked.connect(self._restore_checkpoint)
+        checkpoint_layout.addWidget(restore_checkpoint_btn)
+
+        create_checkpoint_btn = PushButton(
+            FIF.ADD, tr("history.create_checkpoint"), self
+        )
+        create_checkpoint_btn.clicked.connect(self._create_checkpoint)
+        checkpoint_layout.addWidget(create_checkpoint_btn)
+
+        checkpoint_layout.addStretch()
+        layout.addLayout(checkpoint_layout)
+
+    def _load_checkpoints(self):
+        """加载本次会话的检查点列表（最新的在前）"""
+        self.checkpoint_table.setRowCount(0)
+        checkpoints = self.main_window.config_tracker.checkpoints()
+        for name, distance in reversed(checkpoints):
+            row = self.checkpoint_table.rowCount()
+            self.checkpoint_table.insertRow(row)
+            self.checkpoint_table.setItem(row, 0, QTableWidgetItem(name))
+            if distance == 0:
+                position = tr("history.current")
+            elif distance > 0:
+                position = tr("history.steps_back", count=distance)
+            else:
+                position = tr("history.steps_forward", count=-distance)
+            self.checkpoint_table.setItem(row, 1, QTableWidgetItem(position))
+
+    def _create_checkpoint(self):
+        """创建手动检查点"""
+        name = tr("history.manual_checkpoint", time=datetime.now().strftime("%H:%M:%S"))
+        self.main_window.create_checkpoint(name)
+        self._load_checkpoints()
+
+    def _restore_checkpoint(self):
+        """撤销/重做到选中的检查点"""
+        row = self.checkpoint_table.currentRow()
+        if row < 0:
+            InfoBar.warning(
+                tr("common.hint"), tr("history.select_checkpoint_first"), parent=self
+            )
+            return
+        name = self.checkpoint_table.item(row, 0).text()
+        if self.main_window.restore_checkpoint(name):
+            InfoBar.success(
+                tr("common.success"),
+                tr("history.checkpoint_restored", name=name),
+                parent=self,
+            )
+        else:
+            InfoBar.info(
+                tr("common.info"), tr("history.checkpoint_unchanged"), parent=self
+            )
+        self._load_checkpoints()
+
     def _load_backups(self):
         """加载备份列表"""
         self.backup_table.setRowCount(0)
@@ -22311,6 +19993,13 @@ class BackupDialog(BaseDialog):
             self,
         )
         if w.exec_():
+            self.main_window.create_checkpoint(
+                tr(
+                    "history.before_restore",
+                    name=backup_path.name,
+                    time=datetime.now().strftime("%H:%M:%S"),
+                )
+            )
             if self.backup_manager.restore(backup_path, target_path):
                 InfoBar.success(
                     tr("common.success"), tr("dialog.backup_restored"), parent=self
@@ -22324,6 +20013,9 @@ class BackupDialog(BaseDialog):
                     self.main_window.ohmyopencode_config = ConfigManager.load_json(
                         target_path
                     )
+                # 恢复本身也记入编辑历史，可以撤销
+                self.main_window.notify_config_changed()
+                self._load_checkpoints()
             else:
                 InfoBar.error(
                     tr("common.error"), tr("dialog.restore_failed"), parent=self
@@ -22356,149 +20048,6 @@ class BackupDialog(BaseDialog):
 
 
 # ==================== Plugin 插件管理 ====================
-@dataclass
-class PluginConfig:
-    """插件配置数据类"""
-
-    name: str  # 插件名称（npm包名或文件名）
-    version: str  # 版本号（npm插件）
-    type: str  # 类型：npm / local
-    source: str  # 来源：npm包名 / 本地文件路径
-    enabled: bool  # 是否启用
-    description: str  # 描述
-    homepage: str  # 主页链接
-    installed_at: str  # 安装时间
-
-
-class PluginManager:
-    """插件管理器"""
-
-    @staticmethod
-    def get_installed_plugins(config: Dict[str, Any]) -> List[PluginConfig]:
-        """获取已安装的插件列表"""
-        plugins: List[PluginConfig] = []
-
-        # 1. 从opencode.json的plugin字段读取npm插件
-        plugin_list = config.get("plugin", [])
-        if isinstance(plugin_list, list):
-            for plugin_entry in plugin_list:
-                if isinstance(plugin_entry, str):
-                    # 解析包名和版本（如opencode-skills@0.1.0）
-                    if "@" in plugin_entry and not plugin_entry.startswith("@"):
-                        # 普通包带版本
-                        parts = plugin_entry.rsplit("@", 1)
-                        name = parts[0]
-                        version = parts[1] if len(parts) > 1 else "latest"
-                    elif plugin_entry.startswith("@") and plugin_entry.count("@") > 1:
-                        # scoped包带版本（如@my-org/plugin@1.0.0）
-                        parts = plugin_entry.rsplit("@", 1)
-                        name = parts[0]
-                        version = parts[1] if len(parts) > 1 else "latest"
-                    else:
-                        # 无版本号
-                        name = plugin_entry
-                        version = "latest"
-
-                    plugins.append(
-                        PluginConfig(
-                            name=name,
-                            version=version,
-                            type="npm",
-                            source=plugin_entry,
-                            enabled=True,
-                            description="",
-                            homepage="",
-                            installed_at="",
-                        )
-                    )
-
-        # 2. 扫描本地插件目录（暂不实现，留待后续）
-        # TODO: 扫描~/.config/opencode/plugins/和.opencode/plugins/
-
-        return plugins
-
-    @staticmethod
-    def install_npm_plugin(
-        config: Dict[str, Any], package_name: str, version: str = ""
-    ) -> bool:
-        """安装npm插件"""
-        try:
-            # 构建完整的包名（带版本）
-            if version and version != "latest":
-                full_name = f"{package_name}@{version}"
-            else:
-                full_name = package_name
-
-            # 读取plugin数组
-            if "plugin" not in config:
-                config["plugin"] = []
-
-            plugin_list = config["plugin"]
-            if not isinstance(plugin_list, list):
-                plugin_list = []
-                config["plugin"] = plugin_list
-
-            # 检查是否已存在（去除版本号比较）
-            base_name = package_name.split("@")[0]
-            for i, existing in enumerate(plugin_list):
-                if isinstance(existing, str):
-                    existing_base = existing.split("@")[0]
-                    if existing_base == base_name:
-                        # 已存在，更新版本
-                        plugin_list[i] = full_name
-                        return True
-
-            # 不存在，添加新插件
-            plugin_list.append(full_name)
-            return True
-
-        except Exception as e:
-            print(f"安装插件失败: {e}")
-            return False
-
-    @staticmethod
-    def uninstall_plugin(config: Dict[str, Any], plugin: PluginConfig) -> bool:
-        """卸载插件"""
-        try:
-            if plugin.type == "npm":
-                # 从plugin数组移除
-                plugin_list = config.get("plugin", [])
-                if isinstance(plugin_list, list):
-                    # 移除匹配的插件（忽略版本号）
-                    base_name = plugin.name.split("@")[0]
-                    config["plugin"] = [
-                        p
-                        for p in plugin_list
-                        if not (isinstance(p, str) and p.split("@")[0] == base_name)
-                    ]
-                    return True
-            elif plugin.type == "local":
-                # TODO: 删除本地文件和元数据
-                pass
-
-            return False
-
-        except Exception as e:
-            print(f"卸载插件失败: {e}")
-            return False
-
-    @staticmethod
-    def check_npm_version(package_name: str) -> str:
-        """检查npm包的最新版本"""
-        try:
-            import requests
-
-            url = f"https://registry.npmjs.org/{package_name}/latest"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("version", "")
-        except Exception as e:
-            print(f"检查版本失败: {e}")
-
-        return ""
-
-
 # 预设插件市场
 PRESET_PLUGINS = [
     {
@@ -22544,10 +20093,11 @@ class PluginPage(BasePage):
         self.main_window = main_window
         self._setup_ui()
         self._load_plugins()
-        # 连接配置变更信号
-        self.main_window.config_changed.connect(self._on_config_changed)
+        # 插件启用状态、Oh My OpenCode 的 Agent/Category 及其可选模型分布在两个配置中，
+        # 订阅全部变更
+        self.main_window.config_tracker.subscribe((), self._on_config_changed)
 
-    def _on_config_changed(self):
+    def _on_config_changed(self, paths):
         """配置变更时刷新数据"""
         self._load_plugins()
         self._load_ohmy_data()
@@ -22826,17 +20376,15 @@ class PluginPage(BasePage):
         layout.addLayout(agent_toolbar)
 
         # Agent 列表
-        self.ohmy_agent_table = TableWidget(widget)
-        self.ohmy_agent_table.setColumnCount(3)
-        self.ohmy_agent_table.setHorizontalHeaderLabels(
-            [tr("common.name"), tr("ohmyagent.model"), tr("common.description")]
+        self.ohmy_agent_table = TableView(widget)
+        self.ohmy_agent_model = ConfigSectionTableModel.for_agents(widget)
+        self.ohmy_agent_model.model_edited.connect(self._on_ohmy_agent_model_changed)
+        self.ohmy_agent_delegate = _setup_config_section_view(
+            self.ohmy_agent_table, self.ohmy_agent_model
         )
         self.ohmy_agent_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
-        self.ohmy_agent_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.ohmy_agent_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.ohmy_agent_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.ohmy_agent_table.doubleClicked.connect(self._on_edit_ohmy_agent)
         layout.addWidget(self.ohmy_agent_table, 1)
 
@@ -22887,15 +20435,15 @@ class PluginPage(BasePage):
         layout.addLayout(category_toolbar)
 
         # Category 列表
-        self.ohmy_category_table = TableWidget(widget)
-        self.ohmy_category_table.setColumnCount(4)
-        self.ohmy_category_table.setHorizontalHeaderLabels(
-            [
-                tr("common.name"),
-                tr("ohmyagent.model"),
-                "Temperature",
-                tr("common.description"),
-            ]
+        self.ohmy_category_table = TableView(widget)
+        self.ohmy_category_model = ConfigSectionTableModel.for_categories(
+            tr("ohmyagent.model"), widget
+        )
+        self.ohmy_category_model.model_edited.connect(
+            self._on_ohmy_category_model_changed
+        )
+        self.ohmy_category_delegate = _setup_config_section_view(
+            self.ohmy_category_table, self.ohmy_category_model
         )
         # 调整列宽
         header = self.ohmy_category_table.horizontalHeader()
@@ -22905,9 +20453,6 @@ class PluginPage(BasePage):
         header.setSectionResizeMode(2, QHeaderView.Fixed)
         header.resizeSection(2, 100)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
-        self.ohmy_category_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.ohmy_category_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.ohmy_category_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.ohmy_category_table.doubleClicked.connect(self._on_edit_ohmy_category)
         layout.addWidget(self.ohmy_category_table, 1)
 
@@ -22974,7 +20519,7 @@ class PluginPage(BasePage):
 
     def _get_ohmy_available_models(self) -> List[str]:
         """获取可用的模型列表"""
-        registry = ModelRegistry(self.main_window.opencode_config)
+        registry = self.main_window.get_model_registry()
         return registry.get_all_models()
 
     def _on_ohmy_bulk_model_changed(self):
@@ -22982,38 +20527,21 @@ class PluginPage(BasePage):
         model = self.ohmy_bulk_model_combo.currentText()
         if model == tr("common.keep_all"):
             return
-        config = self.main_window.ohmyopencode_config
-        if config is None:
-            config = {}
-            self.main_window.ohmyopencode_config = config
-        agents = config.setdefault("agents", {})
-        if not agents:
-            return
-        for name in agents.keys():
-            agents[name]["model"] = model
-        self.main_window.save_ohmyopencode_config()
-        self._load_ohmy_agents()
+        # 保存后的变更通知会刷新表格
+        self.main_window.apply_config_batch(BatchSelector("agents"), {"model": model})
 
     def _on_ohmy_category_bulk_model_changed(self):
         """批量修改Category模型"""
         model = self.ohmy_category_bulk_model_combo.currentText()
         if model == tr("common.keep_all"):
             return
-        config = self.main_window.ohmyopencode_config
-        if config is None:
-            config = {}
-            self.main_window.ohmyopencode_config = config
-        categories = config.setdefault("categories", {})
-        if not categories:
-            return
-        for name in categories.keys():
-            categories[name]["model"] = model
-        self.main_window.save_ohmyopencode_config()
-        self._load_ohmy_categories()
+        # 保存后的变更通知会刷新表格
+        self.main_window.apply_config_batch(
+            BatchSelector("categories"), {"model": model}
+        )
 
     def _load_ohmy_agents(self):
         """加载Oh My Agent数据"""
-        self.ohmy_agent_table.setRowCount(0)
         config = self.main_window.ohmyopencode_config or {}
         agents = config.get("agents", {})
 
@@ -23031,33 +20559,11 @@ class PluginPage(BasePage):
             self.ohmy_bulk_model_combo.setCurrentText(current)
         self.ohmy_bulk_model_combo.blockSignals(False)
 
-        for name, data in agents.items():
-            if not isinstance(data, dict):
-                continue
-
-            row = self.ohmy_agent_table.rowCount()
-            self.ohmy_agent_table.insertRow(row)
-            self.ohmy_agent_table.setItem(row, 0, QTableWidgetItem(name))
-
-            # 模型下拉框
-            model_combo = ComboBox(self.ohmy_agent_table)
-            model_combo.addItems(models)
-            current_model = data.get("model", "")
-            if current_model:
-                model_combo.setCurrentText(current_model)
-            model_combo.currentIndexChanged.connect(
-                partial(self._on_ohmy_agent_model_changed, name, model_combo)
-            )
-            self.ohmy_agent_table.setCellWidget(row, 1, model_combo)
-
-            desc = data.get("description", "")
-            if not desc:
-                desc = PRESET_AGENTS.get(name, "")
-            desc_item = QTableWidgetItem(desc[:50] + "..." if len(desc) > 50 else desc)
-            desc_item.setToolTip(desc)
-            self.ohmy_agent_table.setItem(row, 2, desc_item)
+        self.ohmy_agent_delegate.set_models(models)
+        # 非字典类型的条目由表格模型跳过
+        self.ohmy_agent_model.set_section(agents)
 
-    def _on_ohmy_agent_model_changed(self, agent_name: str, combo: ComboBox):
+    def _on_ohmy_agent_model_changed(self, agent_name: str, model: str):
         """Agent模型变更"""
         config = self.main_window.ohmyopencode_config
         if config is None:
@@ -23066,12 +20572,11 @@ class PluginPage(BasePage):
         agents = config.setdefault("agents", {})
         if agent_name not in agents:
             return
-        agents[agent_name]["model"] = combo.currentText()
+        agents[agent_name]["model"] = model
         self.main_window.save_ohmyopencode_config()
 
     def _load_ohmy_categories(self):
         """加载Oh My Category数据"""
-        self.ohmy_category_table.setRowCount(0)
         config = self.main_window.ohmyopencode_config or {}
         categories = config.get("categories", {})
 
@@ -23089,37 +20594,11 @@ class PluginPage(BasePage):
             self.ohmy_category_bulk_model_combo.setCurrentText(current)
         self.ohmy_category_bulk_model_combo.blockSignals(False)
 
-        for name, data in categories.items():
-            if not isinstance(data, dict):
-                continue
-
-            row = self.ohmy_category_table.rowCount()
-            self.ohmy_category_table.insertRow(row)
-            self.ohmy_category_table.setItem(row, 0, QTableWidgetItem(name))
-
-            # 模型下拉框
-            model_combo = ComboBox(self.ohmy_category_table)
-            model_combo.addItems(models)
-            current_model = data.get("model", "")
-            if current_model:
-                model_combo.setCurrentText(current_model)
-            model_combo.currentIndexChanged.connect(
-                partial(self._on_ohmy_category_model_changed, name, model_combo)
-            )
-            self.ohmy_category_table.setCellWidget(row, 1, model_combo)
-
-            self.ohmy_category_table.setItem(
-                row, 2, QTableWidgetItem(str(data.get("temperature", 0.7)))
-            )
-
-            desc = data.get("description", "")
-            if not desc:
-                desc = PRESET_CATEGORIES.get(name, {}).get("description", "")
-            desc_item = QTableWidgetItem(desc[:30] + "..." if len(desc) > 30 else desc)
-            desc_item.setToolTip(desc)
-            self.ohmy_category_table.setItem(row, 3, desc_item)
+        self.ohmy_category_delegate.set_models(models)
+        # 非字典类型的条目由表格模型跳过
+        self.ohmy_category_model.set_section(categories)
 
-    def _on_ohmy_category_model_changed(self, category_name: str, combo: ComboBox):
+    def _on_ohmy_category_model_changed(self, category_name: str, model: str):
         """Category模型变更"""
         config = self.main_window.ohmyopencode_config
         if config is None:
@@ -23128,7 +20607,7 @@ class PluginPage(BasePage):
         categories = config.setdefault("categories", {})
         if category_name not in categories:
             return
-        categories[category_name]["model"] = combo.currentText()
+        categories[category_name]["model"] = model
         self.main_window.save_ohmyopencode_config()
 
     def _on_config_ohmy(self):
@@ -23164,14 +20643,13 @@ class PluginPage(BasePage):
 
     def _on_edit_ohmy_agent(self):
         """编辑Oh My Agent"""
-        row = self.ohmy_agent_table.currentRow()
-        if row < 0:
+        name = self.ohmy_agent_model.name_at(self.ohmy_agent_table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Agent")
             )
             return
 
-        name = self.ohmy_agent_table.item(row, 0).text()
         dialog = OhMyAgentDialog(self.main_window, agent_name=name, parent=self)
         if dialog.exec_():
             self._load_ohmy_agents()
@@ -23179,14 +20657,13 @@ class PluginPage(BasePage):
 
     def _on_delete_ohmy_agent(self):
         """删除Oh My Agent"""
-        row = self.ohmy_agent_table.currentRow()
-        if row < 0:
+        name = self.ohmy_agent_model.name_at(self.ohmy_agent_table.currentIndex().row())
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Agent")
             )
             return
 
-        name = self.ohmy_agent_table.item(row, 0).text()
         w = FluentMessageBox(
             tr("common.confirm_delete_title"),
             tr("dialog.confirm_delete_agent", name=name),
@@ -23220,14 +20697,15 @@ class PluginPage(BasePage):
 
     def _on_edit_ohmy_category(self):
         """编辑Oh My Category"""
-        row = self.ohmy_category_table.currentRow()
-        if row < 0:
+        name = self.ohmy_category_model.name_at(
+            self.ohmy_category_table.currentIndex().row()
+        )
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Category")
             )
             return
 
-        name = self.ohmy_category_table.item(row, 0).text()
         dialog = CategoryDialog(self.main_window, category_name=name, parent=self)
         if dialog.exec_():
             self._load_ohmy_categories()
@@ -23235,14 +20713,15 @@ class PluginPage(BasePage):
 
     def _on_delete_ohmy_category(self):
         """删除Oh My Category"""
-        row = self.ohmy_category_table.currentRow()
-        if row < 0:
+        name = self.ohmy_category_model.name_at(
+            self.ohmy_category_table.currentIndex().row()
+        )
+        if name is None:
             self.show_warning(
                 tr("common.info"), tr("common.please_select_first", item="Category")
             )
             return
 
-        name = self.ohmy_category_table.item(row, 0).text()
         w = FluentMessageBox(
             tr("common.confirm_delete_title"),
             tr("dialog.confirm_delete_category", name=name),
@@ -23600,6 +21079,8 @@ class PluginMarketDialog(BaseDialog):
 
 # ==================== 程序入口 ====================
 def main():
+    _startup_profiler.end()  # module import
+
     # 抑制 Qt 字体枚举警告
     import os
 
@@ -23612,7 +21093,9 @@ def main():
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps)
 
+    _startup_profiler.begin("QApplication")
     app = QApplication(sys.argv)
+    _startup_profiler.end()
     app.setApplicationName("OpenCode Config Manager")
     app.setApplicationVersion(APP_VERSION)
 
@@ -23637,14 +21120,19 @@ def main():
     app.setFont(font)
 
     # 应用全局样式
-    app.setStyleSheet(UIConfig.get_stylesheet())
+    with _startup_profiler.phase("global stylesheet"):
+        app.setStyleSheet(UIConfig.get_stylesheet())
 
-    window = MainWindow()
+    with _startup_profiler.phase("MainWindow"):
+        window = MainWindow()
 
     # 确保窗口显示在屏幕上
+    _startup_profiler.begin("first paint")
     window.show()
     window.raise_()
     window.activateWindow()
+    # 事件循环处理完首批绘制事件后结束计时并输出报告
+    QTimer.singleShot(0, _startup_profiler.finish)
 
     sys.exit(app.exec_())
 
@@ -0,0 +1,80 @@
+"""导入耗时预算测试
+
+在全新的子进程中导入 occm_core 与 opencode_config_manager_fluent，
+取多次测量的最小值与预算比较，启动耗时回退会直接表现为测试失败。
+GUI 模块的预算取自 StartupProfiler.PHASE_BUDGET_MS["module import"]。
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# occm_core 不依赖 Qt，CLI 只导入它（毫秒）
+CORE_IMPORT_BUDGET_MS = 200
+# 取最小值的测量次数，减少机器负载带来的抖动
+RUNS = 3
+
+MEASURE_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import occm_core
+core_done = time.perf_counter()
+import opencode_config_manager_fluent as gui
+gui_done = time.perf_counter()
+print(json.dumps({
+    "core_ms": (core_done - start) * 1000,
+    "gui_ms": (gui_done - start) * 1000,
+    "budget_ms": gui.StartupProfiler.PHASE_BUDGET_MS["module import"],
+}))
+"""
+
+
+def _run_import(env):
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT],
+        cwd=REPO_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def import_timings():
+    pytest.importorskip("PyQt5")
+    pytest.importorskip("qfluentwidgets")
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # 预算按已缓存字节码的导入测得，先导入一次写出 .pyc
+    _run_import(env)
+    runs = [_run_import(env) for _ in range(RUNS)]
+    return {
+        "core_ms": min(run["core_ms"] for run in runs),
+        "gui_ms": min(run["gui_ms"] for run in runs),
+        "budget_ms": runs[0]["budget_ms"],
+    }
+
+
+def test_core_import_within_budget(import_timings):
+    assert import_timings["core_ms"] <= CORE_IMPORT_BUDGET_MS, (
+        f"导入 occm_core 耗时 {import_timings['core_ms']:.1f} ms，"
+        f"超出预算 {CORE_IMPORT_BUDGET_MS} ms"
+    )
+
+
+def test_gui_import_within_budget(import_timings):
+    assert import_timings["gui_ms"] <= import_timings["budget_ms"], (
+        f"导入 opencode_config_manager_fluent 耗时 "
+        f"{import_timings['gui_ms']:.1f} ms，超出预算 "
+        f"{import_timings['budget_ms']} ms"
+    )